@@ -0,0 +1,116 @@
+"""Benchmark matching calendar events with activity logs.
+
+Generates N logs (every 30 seconds) and M overlapping events of 15 to 120
+minutes over the same period, then times ``match_events_with_logs``. The
+previous matcher, which compared every log with every event, is run on
+the first few events only and extrapolated, and its results are checked
+against the new matcher on those events.
+
+Usage:
+    uv run python scripts/benchmark_calendar.py
+    uv run python scripts/benchmark_calendar.py --logs 100000 --events 1000 \\
+        --scan-events 20 --tolerance 5
+"""
+
+import argparse
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from auto_daily.calendar import (
+    CalendarEvent,
+    LogEntry,
+    MatchResult,
+    match_events_with_logs,
+)
+
+
+def scan_match(
+    events: list[CalendarEvent], logs: list[LogEntry], tolerance_minutes: int
+) -> MatchResult:
+    """The previous matcher: every log against every event."""
+    result = MatchResult()
+    tolerance = timedelta(minutes=tolerance_minutes)
+    matched: set[int] = set()
+    for event in events:
+        hits = []
+        for i, log in enumerate(logs):
+            log_ts = log.timestamp
+            if log_ts.tzinfo is None:
+                log_ts = log_ts.replace(tzinfo=UTC)
+            if event.start - tolerance <= log_ts <= event.end + tolerance:
+                hits.append(log)
+                matched.add(i)
+        if hits:
+            result.matched.append((event, hits))
+        else:
+            result.unstarted.append(event)
+    result.unplanned = [log for i, log in enumerate(logs) if i not in matched]
+    return result
+
+
+def synthetic_data(
+    logs: int, events: int, seed: int
+) -> tuple[list[CalendarEvent], list[LogEntry]]:
+    """Generate naive log timestamps and UTC events over the same period."""
+    rng = random.Random(seed)
+    start = datetime(2024, 12, 1, 0, 0, 0)
+    entries = [
+        LogEntry(start + timedelta(seconds=30 * i), "Code", f"file{i % 50}.py")
+        for i in range(logs)
+    ]
+    span_minutes = logs // 2
+    calendar = []
+    for i in range(events):
+        event_start = start.replace(tzinfo=UTC) + timedelta(
+            minutes=rng.randrange(span_minutes)
+        )
+        duration = timedelta(minutes=rng.choice([15, 30, 60, 120]))
+        calendar.append(
+            CalendarEvent(f"Event {i}", event_start, event_start + duration, "Team")
+        )
+    return calendar, entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark calendar matching")
+    parser.add_argument("--logs", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=1_000)
+    parser.add_argument(
+        "--scan-events",
+        type=int,
+        default=20,
+        help="Events to run the full-scan matcher on (0 skips it)",
+    )
+    parser.add_argument("--tolerance", type=int, default=0, help="Minutes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    events, logs = synthetic_data(args.logs, args.events, args.seed)
+    print(f"Input:    {len(logs):,} logs x {len(events):,} events")
+
+    started = time.perf_counter()
+    result = match_events_with_logs(events, logs, args.tolerance)
+    indexed = time.perf_counter() - started
+    matches = sum(len(hits) for _, hits in result.matched)
+    print(
+        f"Indexed:  {indexed * 1000:.0f} ms "
+        f"({len(result.matched)} matched, {len(result.unstarted)} unstarted, "
+        f"{len(result.unplanned)} unplanned, {matches:,} matches)"
+    )
+
+    if args.scan_events > 0:
+        sample = events[: args.scan_events]
+        started = time.perf_counter()
+        expected = scan_match(sample, logs, args.tolerance)
+        scan = (time.perf_counter() - started) * len(events) / len(sample)
+        actual = match_events_with_logs(sample, logs, args.tolerance)
+        print(
+            f"Scan:     {scan:.1f} s (extrapolated from {len(sample)} events), "
+            f"{scan / indexed:.0f}x slower"
+        )
+        print(f"Same result on sample: {actual == expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark decoding of JSONL log entries.
+
+Generates a synthetic log of N entries and reads it back, each mode in a
+fresh process so the resident memory of one does not affect the next:
+
+    dict      json.loads into dictionaries plus a calendar.LogEntry each
+              (the decoding used before auto_daily.log_decoder)
+    <backend> LogDecoder records with the orjson, msgspec or json backend
+
+Reports the parse time and the resident memory added by keeping all
+entries, both scaled to one million entries.
+
+Usage:
+    uv run python scripts/benchmark_decode.py
+    uv run python scripts/benchmark_decode.py --entries 500000 --modes dict,json
+"""
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from auto_daily.calendar import LogEntry
+from auto_daily.log_decoder import JSON_BACKENDS, LogDecoder
+
+SYNTHETIC_WINDOWS = [
+    ("Code", ["main.py - auto-daily", "config.py - auto-daily", "README.md"]),
+    ("Google Chrome", ["Pull Request #42", "Docs", "Calendar"]),
+    ("Slack", ["general | Workspace", "random | Workspace"]),
+    ("Terminal", ["zsh", "pytest"]),
+]
+
+
+def write_synthetic_log(path: Path, entries: int, seed: int) -> None:
+    """Write a log of entries captured every 30 seconds."""
+    rng = random.Random(seed)
+    start = datetime(2024, 12, 1, 9, 0, 0)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(entries):
+            app_name, titles = rng.choice(SYNTHETIC_WINDOWS)
+            entry = {
+                "timestamp": (start + timedelta(seconds=30 * i)).isoformat(),
+                "window_info": {
+                    "app_name": app_name,
+                    "window_title": rng.choice(titles),
+                },
+                "ocr_text": f"line {rng.randrange(1000)}\n作業中のテキスト {i}",
+                "slack_context": None,
+            }
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def _rss_bytes() -> int:
+    """Return the peak resident memory of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _decode_dicts(path: Path) -> list:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            data = json.loads(line)
+            window_info = data.get("window_info", {})
+            records.append(
+                (
+                    data,
+                    LogEntry(
+                        timestamp=datetime.fromisoformat(data["timestamp"]),
+                        app_name=window_info.get("app_name", ""),
+                        window_title=window_info.get("window_title", ""),
+                        ocr_text=data.get("ocr_text", ""),
+                    ),
+                )
+            )
+    return records
+
+
+def _decode_records(path: Path, backend: str) -> list:
+    decoder = LogDecoder(backend)
+    records = []
+    with open(path, "rb") as f:
+        for line in f:
+            record = decoder.decode(line)
+            if record is not None:
+                records.append(record)
+    return records
+
+
+def run_mode(path: Path, mode: str) -> dict[str, float]:
+    """Decode the log in this process and return the measurements."""
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    if mode == "dict":
+        records = _decode_dicts(path)
+    else:
+        records = _decode_records(path, mode)
+    seconds = time.perf_counter() - start
+    return {
+        "entries": len(records),
+        "seconds": seconds,
+        "rss": _rss_bytes() - rss_before,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark log decoding")
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--modes",
+        default="dict," + ",".join(JSON_BACKENDS),
+        help="Comma-separated modes: dict, orjson, msgspec, json",
+    )
+    parser.add_argument("--run", nargs=2, metavar=("LOG", "MODE"), help="(internal)")
+    args = parser.parse_args()
+
+    if args.run is not None:
+        print(json.dumps(run_mode(Path(args.run[0]), args.run[1])))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "activity.jsonl"
+        write_synthetic_log(log, args.entries, args.seed)
+        size = log.stat().st_size
+        print(f"Log: {args.entries:,} entries, {size / 1e6:.1f} MB")
+        print(f"{'mode':<10} {'s / 1M entries':>15} {'RSS MB / 1M':>12}")
+        for mode in (m.strip() for m in args.modes.split(",") if m.strip()):
+            result = subprocess.run(
+                [sys.executable, __file__, "--run", str(log), mode],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                error = result.stderr.strip().splitlines()[-1:]
+                print(f"{mode:<10} skipped: {''.join(error)}")
+                continue
+            stats = json.loads(result.stdout)
+            scale = 1_000_000 / max(1, stats["entries"])
+            print(
+                f"{mode:<10} {stats['seconds'] * scale:>15.2f} "
+                f"{stats['rss'] * scale / 1e6:>12.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
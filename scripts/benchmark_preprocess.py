@@ -0,0 +1,96 @@
+"""Benchmark OCR image preprocessing settings.
+
+Measures, for each combination of image format, maximum long edge and
+grayscale conversion, the request payload size (Base64, as sent to vision
+APIs), the preprocessing time and optionally the OCR latency of the
+configured backend.
+
+Usage:
+    uv run python scripts/benchmark_preprocess.py capture.png
+    uv run python scripts/benchmark_preprocess.py capture.png --ocr \\
+        --formats png,jpeg,webp --max-edges 0,2048,1568,1024
+"""
+
+import argparse
+import base64
+import itertools
+import time
+from pathlib import Path
+
+from auto_daily.imaging import IMAGE_FORMATS, PreprocessOptions, preprocess_image
+from auto_daily.ocr import get_ocr_backend
+
+
+def _parse_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark OCR preprocessing")
+    parser.add_argument("images", nargs="+", type=Path, help="Captured images")
+    parser.add_argument(
+        "--formats",
+        default=",".join(IMAGE_FORMATS),
+        help="Comma-separated output formats (default: png,jpeg,webp)",
+    )
+    parser.add_argument(
+        "--max-edges",
+        default="0,2048,1568,1024",
+        help="Comma-separated maximum long edges; 0 keeps the size",
+    )
+    parser.add_argument("--quality", type=int, default=85, help="JPEG/WebP quality")
+    parser.add_argument(
+        "--grayscale",
+        choices=("both", "on", "off"),
+        default="both",
+        help="Grayscale settings to compare",
+    )
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help="Also run the configured OCR backend (OCR_BACKEND) per setting",
+    )
+    args = parser.parse_args()
+
+    grayscale = {"both": [False, True], "on": [True], "off": [False]}[args.grayscale]
+    backend = get_ocr_backend() if args.ocr else None
+
+    print(
+        f"{'format':<6} {'edge':>5} {'gray':>5} {'payload KB':>11} "
+        f"{'prep ms':>8} {'ocr ms':>8} {'chars':>6}"
+    )
+    for image_format, max_edge, gray in itertools.product(
+        _parse_list(args.formats),
+        [int(edge) for edge in _parse_list(args.max_edges)],
+        grayscale,
+    ):
+        options = PreprocessOptions(
+            grayscale=gray,
+            max_edge=max_edge,
+            image_format=image_format,
+            quality=args.quality,
+        )
+        payload = prep_ms = ocr_ms = 0.0
+        chars = 0
+        for image in args.images:
+            start = time.perf_counter()
+            data = preprocess_image(str(image), options)
+            prep_ms += (time.perf_counter() - start) * 1000
+            payload += len(base64.b64encode(data)) / 1024
+            if backend is not None:
+                start = time.perf_counter()
+                chars += len(backend.perform_ocr_buffer(data))
+                ocr_ms += (time.perf_counter() - start) * 1000
+
+        count = len(args.images)
+        ocr_column = f"{ocr_ms / count:>8.0f}" if backend is not None else f"{'-':>8}"
+        chars_column = f"{chars // count:>6}" if backend is not None else f"{'-':>6}"
+        print(
+            f"{image_format:<6} {max_edge:>5} {'yes' if gray else 'no':>5} "
+            f"{payload / count:>11.1f} {prep_ms / count:>8.1f} "
+            f"{ocr_column} {chars_column}"
+        )
+
+
+if __name__ == "__main__":
+    main()
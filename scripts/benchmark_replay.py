@@ -0,0 +1,162 @@
+"""Benchmark the capture pipeline by replaying a window/lock trace.
+
+Replays a trace recorded with ``auto-daily --start --record-trace PATH``
+(or a synthetic one) through the real window monitor, capture pipeline and
+logger. Screenshots are replaced by synthetic frames rendered from the
+window title, and OCR by a backend with a fixed latency unless --real-ocr
+is given, so the benchmark runs on Linux CI with deterministic input.
+
+Usage:
+    uv run python scripts/benchmark_replay.py trace.jsonl --speed 1000
+    uv run python scripts/benchmark_replay.py --synthetic-hours 8 --speed 0
+"""
+
+import argparse
+import io
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+from auto_daily.imaging import ImageBuffer
+from auto_daily.ocr import OCRBackend, get_ocr_backend
+from auto_daily.trace import Trace, TraceEvent, load_trace, replay_trace
+
+SYNTHETIC_APPS = [
+    ("Code", ["main.py", "config.py", "README.md"]),
+    ("Google Chrome", ["Pull Request #42", "Docs", "Calendar"]),
+    ("Slack", ["general | Workspace", "random | Workspace"]),
+    ("Terminal", ["zsh", "pytest"]),
+]
+
+
+class FixedLatencyOCR:
+    """OCR backend stand-in that sleeps for a fixed time per image."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def perform_ocr(self, image_path: str) -> str:
+        time.sleep(self.latency)
+        return f"text of {Path(image_path).name}"
+
+    def perform_ocr_buffer(self, image_data: ImageBuffer) -> str:
+        time.sleep(self.latency)
+        return f"text of {len(image_data)} bytes"
+
+
+def synthetic_trace(hours: float, seed: int) -> Trace:
+    """Generate a deterministic trace with dwell times, quick peeks and locks."""
+    rng = random.Random(seed)
+    events: list[TraceEvent] = []
+    t = 0.0
+    while t < hours * 3600:
+        app_name, titles = rng.choice(SYNTHETIC_APPS)
+        window = {"app_name": app_name, "window_title": rng.choice(titles)}
+        events.append(TraceEvent(t, "window", window=window))
+        roll = rng.random()
+        if roll < 0.3:
+            t += rng.uniform(0.2, 0.8)  # alt-tab peek
+        elif roll < 0.98:
+            t += rng.expovariate(1 / 90)
+        else:
+            events.append(TraceEvent(t + 1, "system", active=False))
+            t += rng.uniform(300, 1800)
+            events.append(TraceEvent(t, "system", active=True))
+    return Trace(datetime(2024, 12, 24, 9, 0, 0), events)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark trace replay")
+    parser.add_argument("trace", nargs="?", type=Path, help="Trace file (JSONL)")
+    parser.add_argument(
+        "--synthetic-hours",
+        type=float,
+        help="Replay a generated trace of this many hours instead of a file",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic trace seed")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1000.0,
+        help="Virtual seconds per real second; 0 replays as fast as possible",
+    )
+    parser.add_argument("--settle-ms", type=float, default=1000.0)
+    parser.add_argument("--capture-interval", type=float, default=30.0)
+    parser.add_argument(
+        "--ocr-latency-ms",
+        type=float,
+        default=50.0,
+        help="Latency of the stand-in OCR backend",
+    )
+    parser.add_argument(
+        "--real-ocr", action="store_true", help="Use the configured OCR backend"
+    )
+    args = parser.parse_args()
+
+    if args.trace is not None:
+        trace = load_trace(args.trace)
+    elif args.synthetic_hours is not None:
+        trace = synthetic_trace(args.synthetic_hours, args.seed)
+    else:
+        parser.error("either a trace file or --synthetic-hours is required")
+
+    frames: dict[tuple[str, str], bytes] = {}
+
+    def capture(context: CaptureContext) -> bytes:
+        key = context.window_key()
+        if key not in frames:
+            image = Image.new("RGB", (1440, 900), "white")
+            draw = ImageDraw.Draw(image)
+            for row in range(20):
+                draw.text((40, 40 + row * 40), f"{key[0]} {key[1]} {row}", fill="black")
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            frames[key] = buffer.getvalue()
+        return frames[key]
+
+    backend: OCRBackend = (
+        get_ocr_backend()
+        if args.real_ocr
+        else FixedLatencyOCR(args.ocr_latency_ms / 1000)
+    )
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        pipeline = AsyncCapturePipeline(ocr_backend=backend, capture=capture)
+        pipeline.start()
+        stats = replay_trace(
+            trace,
+            pipeline,
+            Path(log_dir),
+            speed=args.speed,
+            capture_interval=args.capture_interval,
+            settle_ms=args.settle_ms,
+        )
+        drain_start = time.monotonic()
+        pipeline.stop(timeout=600.0)
+        drain = time.monotonic() - drain_start
+        logged = sum(1 for _ in Path(log_dir).rglob("*.jsonl"))
+
+    pipeline_stats = pipeline.stats
+    wall = stats.wall_seconds + drain
+    print(f"Trace:        {len(trace.events)} events, {stats.virtual_seconds:.0f}s")
+    print(f"Replay:       {stats.wall_seconds:.2f}s (+{drain:.2f}s drain)")
+    print(
+        f"Submitted:    {stats.window_changes} window changes, "
+        f"{stats.periodic_captures} periodic, {stats.suppressed} suppressed"
+    )
+    print(
+        f"Pipeline:     {pipeline_stats.processed} processed, "
+        f"{pipeline_stats.failed} failed, {pipeline_stats.dropped} dropped, "
+        f"{pipeline_stats.coalesced} coalesced, {pipeline_stats.unchanged} unchanged"
+    )
+    print(f"Log files:    {logged}")
+    print(f"Throughput:   {pipeline_stats.processed / wall:.1f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,14 @@ __version__ = "0.1.0"
 
 from auto_daily.cli import create_parser
 from auto_daily.config import load_env
-from auto_daily.monitor import start_monitoring
-from auto_daily.report import run_report_command, run_summarize_command
+from auto_daily.report import (
+    run_compact_command,
+    run_import_command,
+    run_report_command,
+    run_search_command,
+    run_stats_command,
+    run_summarize_command,
+)
 
 
 def main() -> None:
@@ -16,10 +22,29 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "report":
-        run_report_command(args.date, args.with_calendar, args.auto_summarize)
+        run_report_command(
+            args.date,
+            args.with_calendar,
+            args.auto_summarize,
+            args.concurrency,
+            not args.no_cache,
+        )
     elif args.command == "summarize":
-        run_summarize_command(args.date, args.hour)
+        run_summarize_command(args.date, args.hour, not args.no_cache)
+    elif args.command == "import":
+        run_import_command(args.log_dir, args.db)
+    elif args.command == "search":
+        run_search_command(
+            " ".join(args.query), args.limit, args.app, args.since, args.until
+        )
+    elif args.command == "stats":
+        run_stats_command(args.date, args.since, args.until, args.limit)
+    elif args.command == "compact":
+        run_compact_command(args.log_dir, args.method, args.train_dictionary)
     elif args.start:
-        start_monitoring(__version__)
+        # Imported lazily: monitoring needs PyObjC, the other commands do not
+        from auto_daily.monitor import start_monitoring
+
+        start_monitoring(__version__, record_trace=args.record_trace)
     else:
         print(f"auto-daily v{__version__}")
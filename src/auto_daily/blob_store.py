@@ -0,0 +1,234 @@
+"""Content-addressed store for OCR text.
+
+Periodic captures of the same window produce the same ``ocr_text`` many
+times an hour. With blobs enabled, the text is stored once, zlib-compressed,
+in ``blobs.db`` next to the date directories, keyed by a hash of its
+content, and the log entry only carries the key in ``ocr_ref``. Readers
+resolve references transparently through an in-memory LRU cache, so an
+entry looks the same whether its text was stored inline or not.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+BLOB_DB_NAME = "blobs.db"
+
+# Key of the blob reference in a log entry
+REF_KEY = "ocr_ref"
+
+# Shorter texts stay inline; a reference would not save space
+DEFAULT_MIN_SIZE = 128
+
+# Decompressed texts kept in memory per store
+DEFAULT_CACHE_SIZE = 512
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def blob_key(text: str) -> str:
+    """Return the content address of a text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BlobStore:
+    """Compressed texts in a SQLite table keyed by content hash.
+
+    Thread-safe; writers and readers may share one instance.
+    """
+
+    def __init__(self, path: Path, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Open (and create if needed) the blob store.
+
+        Args:
+            path: Database file.
+            cache_size: Number of decompressed texts kept in the LRU cache.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _remember(self, key: str, text: str) -> None:
+        """Add a text to the LRU cache (lock must be held)."""
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def put(self, text: str) -> str:
+        """Store a text and return its key."""
+        return self.put_many([text])[0]
+
+    def put_many(self, texts: Iterable[str]) -> list[str]:
+        """Store texts in one transaction.
+
+        Texts already in the cache are not compressed again. The cache is
+        only updated once the transaction is committed, so a failed insert
+        never leaves keys in the cache for texts that were not stored.
+
+        Args:
+            texts: Texts to store.
+
+        Returns:
+            Keys of the texts, in order.
+
+        Raises:
+            sqlite3.Error: If the texts could not be stored.
+        """
+        keyed = [(blob_key(text), text) for text in texts]
+        with self._lock:
+            pending = {key: text for key, text in keyed if key not in self._cache}
+            if pending:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO blobs (key, data) VALUES (?, ?)",
+                        [
+                            (key, zlib.compress(text.encode("utf-8")))
+                            for key, text in pending.items()
+                        ],
+                    )
+            for key, text in keyed:
+                self._remember(key, text)
+        return [key for key, _ in keyed]
+
+    def get(self, key: str) -> str | None:
+        """Return the text stored under a key, or None if it is unknown."""
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+            row = self._conn.execute(
+                "SELECT data FROM blobs WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            text = zlib.decompress(row[0]).decode("utf-8")
+            self._remember(key, text)
+            return text
+
+
+_stores: dict[Path, BlobStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_blob_store(log_base: Path) -> BlobStore:
+    """Return the shared blob store of a log directory, creating it if needed.
+
+    Args:
+        log_base: Base directory for logs.
+
+    Returns:
+        The store at log_base/blobs.db.
+    """
+    path = (log_base / BLOB_DB_NAME).resolve()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = BlobStore(path)
+        return store
+
+
+def find_blob_store(log_file: Path) -> BlobStore | None:
+    """Return the blob store serving a log file, if one exists.
+
+    Hourly files live in log_base/YYYY-MM-DD/, legacy daily files directly
+    in log_base, so both directories are checked.
+
+    Args:
+        log_file: JSONL log file.
+
+    Returns:
+        The shared store, or None if no blobs were ever written.
+    """
+    for directory in (log_file.parent, log_file.parent.parent):
+        if (directory / BLOB_DB_NAME).exists():
+            return open_blob_store(directory)
+    return None
+
+
+def _replace_field(
+    entry: dict[str, Any], old: str, new: str, value: Any
+) -> dict[str, Any]:
+    """Return a copy of entry with one field renamed and set, keeping key order."""
+    return {
+        (new if k == old else k): (value if k == old else v) for k, v in entry.items()
+    }
+
+
+def externalize_entries(
+    entries: list[dict[str, Any]],
+    store: BlobStore,
+    min_size: int = DEFAULT_MIN_SIZE,
+) -> list[dict[str, Any]]:
+    """Move long OCR texts into the blob store.
+
+    Args:
+        entries: Log entries with inline ocr_text.
+        store: Blob store receiving the texts.
+        min_size: Texts shorter than this many characters stay inline.
+
+    Returns:
+        Entries with ocr_text replaced by ocr_ref where it was stored.
+    """
+    indexes = [
+        i
+        for i, entry in enumerate(entries)
+        if len(entry.get("ocr_text") or "") >= min_size
+    ]
+    if not indexes:
+        return entries
+
+    keys = store.put_many(entries[i]["ocr_text"] for i in indexes)
+    result = list(entries)
+    for i, key in zip(indexes, keys, strict=True):
+        result[i] = _replace_field(entries[i], "ocr_text", REF_KEY, key)
+    return result
+
+
+def resolve_entry(entry: dict[str, Any], store: BlobStore | None) -> dict[str, Any]:
+    """Replace a blob reference with the referenced text.
+
+    Args:
+        entry: Log entry, possibly with ocr_ref.
+        store: Blob store of the log; None resolves references to "".
+
+    Returns:
+        The entry itself if it has no reference, else a copy with ocr_text.
+    """
+    key = entry.get(REF_KEY)
+    if key is None:
+        return entry
+    text = store.get(key) if store is not None else None
+    return _replace_field(entry, REF_KEY, "ocr_text", text or "")
+
+
+def resolve_entries(
+    entries: list[dict[str, Any]], log_file: Path
+) -> list[dict[str, Any]]:
+    """Resolve the blob references of entries read from a log file."""
+    if not any(REF_KEY in entry for entry in entries):
+        return entries
+    store = find_blob_store(log_file)
+    return [resolve_entry(entry, store) for entry in entries]
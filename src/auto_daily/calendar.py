@@ -1,13 +1,26 @@
 """Calendar module for iCal integration (PBI-031, PBI-032)."""
 
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import time
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import httpx
 import yaml
 from icalendar import Calendar
 
+from auto_daily.config import get_calendar_timeout
+
+if TYPE_CHECKING:
+    from auto_daily.sessions import Session
+
 
 @dataclass
 class CalendarEvent:
@@ -38,11 +51,92 @@ class MatchResult:
         matched: List of (event, logs) tuples where event has matching logs
         unstarted: Events that have no matching logs (scheduled but not worked on)
         unplanned: Logs that don't match any event (work done outside schedule)
+
+    The logs are LogEntry objects, or Session objects when matched with
+    match_events_with_sessions.
     """
 
-    matched: list[tuple[CalendarEvent, list[LogEntry]]] = field(default_factory=list)
+    matched: list[tuple[CalendarEvent, list[LogEntry | Session]]] = field(
+        default_factory=list
+    )
     unstarted: list[CalendarEvent] = field(default_factory=list)
-    unplanned: list[LogEntry] = field(default_factory=list)
+    unplanned: list[LogEntry | Session] = field(default_factory=list)
+
+
+def _aware(timestamp: datetime) -> datetime:
+    """Return a timestamp with timezone, treating naive times as UTC."""
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=UTC)
+    return timestamp
+
+
+class _IntervalIndex:
+    """Time spans sorted by start, for finding the spans an event overlaps.
+
+    Spans are given in seconds since the epoch, so time zones are
+    normalized once when the index is built rather than on every
+    comparison. Queries bisect the sorted starts and the running maximum
+    of the ends, so each costs O(log n + spans in range) instead of a
+    scan over all spans.
+    """
+
+    def __init__(self, spans: list[tuple[float, float]]) -> None:
+        self._order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+        self._starts = [spans[i][0] for i in self._order]
+        self._ends = [spans[i][1] for i in self._order]
+        # Nondecreasing, so the first span that may reach a time is bisectable
+        self._max_ends = list(itertools.accumulate(self._ends, max))
+        self._sorted_input = self._order == list(range(len(spans)))
+        self.covered = bytearray(len(spans))
+
+    def overlapping(self, start: float, end: float) -> list[int]:
+        """Return the indices of the spans overlapping [start, end].
+
+        Matched spans are marked in covered.
+
+        Returns:
+            Indices into the spans given to the index, in ascending order.
+        """
+        lo = bisect.bisect_left(self._max_ends, start)
+        hi = bisect.bisect_right(self._starts, end)
+        indices = [self._order[k] for k in range(lo, hi) if self._ends[k] >= start]
+        if not self._sorted_input:
+            indices.sort()
+        for i in indices:
+            self.covered[i] = 1
+        return indices
+
+
+def _seconds(timestamp: datetime) -> float:
+    """Return a timestamp in seconds since the epoch, naive times as UTC."""
+    return _aware(timestamp).timestamp()
+
+
+def _match(
+    events: list[CalendarEvent],
+    items: Sequence[LogEntry | Session],
+    spans: list[tuple[float, float]],
+    tolerance_minutes: int,
+) -> MatchResult:
+    """Match events with items whose time spans are given in seconds."""
+    result = MatchResult()
+    tolerance = timedelta(minutes=tolerance_minutes)
+    index = _IntervalIndex(spans)
+
+    for event in events:
+        indices = index.overlapping(
+            _seconds(event.start - tolerance), _seconds(event.end + tolerance)
+        )
+        if indices:
+            result.matched.append((event, [items[i] for i in indices]))
+        else:
+            result.unstarted.append(event)
+
+    # Items not matched to any event were done outside the schedule
+    result.unplanned = [
+        item for item, covered in zip(items, index.covered, strict=True) if not covered
+    ]
+    return result
 
 
 def match_events_with_logs(
@@ -52,6 +146,10 @@ def match_events_with_logs(
 ) -> MatchResult:
     """Match calendar events with activity logs by time.
 
+    A log matches every event (tolerance included) its timestamp falls in,
+    so overlapping events share logs. Naive log timestamps are taken as
+    UTC.
+
     Args:
         events: List of calendar events for the day
         logs: List of activity log entries
@@ -60,39 +158,30 @@ def match_events_with_logs(
     Returns:
         MatchResult containing matched events, unstarted events, and unplanned logs
     """
-    result = MatchResult()
-    tolerance = timedelta(minutes=tolerance_minutes)
+    points = [_seconds(log.timestamp) for log in logs]
+    return _match(events, logs, [(point, point) for point in points], tolerance_minutes)
 
-    # Track which logs have been matched
-    matched_log_indices: set[int] = set()
 
-    for event in events:
-        event_start = event.start - tolerance
-        event_end = event.end + tolerance
-
-        matching_logs: list[LogEntry] = []
-        for i, log in enumerate(logs):
-            # Ensure log timestamp has timezone
-            log_ts = log.timestamp
-            if log_ts.tzinfo is None:
-                log_ts = log_ts.replace(tzinfo=UTC)
-
-            # Check if log falls within event time range
-            if event_start <= log_ts <= event_end:
-                matching_logs.append(log)
-                matched_log_indices.add(i)
-
-        if matching_logs:
-            result.matched.append((event, matching_logs))
-        else:
-            result.unstarted.append(event)
+def match_events_with_sessions(
+    events: list[CalendarEvent],
+    sessions: list[Session],
+    tolerance_minutes: int = 0,
+) -> MatchResult:
+    """Match calendar events with activity sessions by overlapping time.
 
-    # Find unplanned logs (not matched to any event)
-    for i, log in enumerate(logs):
-        if i not in matched_log_indices:
-            result.unplanned.append(log)
+    A session matches every event its time span (start to until) overlaps,
+    so a long session started before a meeting still counts for it.
 
-    return result
+    Args:
+        events: List of calendar events for the day
+        sessions: Activity sessions (see auto_daily.sessions)
+        tolerance_minutes: Extra minutes before/after event to consider as match
+
+    Returns:
+        MatchResult with sessions in place of log entries
+    """
+    spans = [(_seconds(s.start), _seconds(s.until)) for s in sessions]
+    return _match(events, sessions, spans, tolerance_minutes)
 
 
 def load_calendar_config() -> list[dict]:
@@ -153,24 +242,20 @@ def _is_event_on_date(
     return start_date <= target_date < end_date
 
 
-async def fetch_events(
-    ical_url: str, target_date: date, calendar_name: str
+def parse_events(
+    content: bytes, target_date: date, calendar_name: str
 ) -> list[CalendarEvent]:
-    """Fetch events from an iCal URL for a specific date.
+    """Parse the events of a date from iCal data.
 
     Args:
-        ical_url: The iCal URL to fetch
+        content: The iCal (.ics) data
         target_date: The date to filter events for
         calendar_name: Name of the calendar (for display)
 
     Returns:
-        List of CalendarEvent objects for the target date
+        List of CalendarEvent objects for the target date, sorted by start time
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(ical_url)
-        response.raise_for_status()
-
-    cal = Calendar.from_ical(response.content)
+    cal = Calendar.from_ical(content)
     events: list[CalendarEvent] = []
 
     for component in cal.walk():
@@ -221,34 +306,141 @@ async def fetch_events(
     return events
 
 
-async def get_all_events(target_date: date) -> list[CalendarEvent]:
-    """Get all events from all configured calendars.
+async def fetch_events(
+    ical_url: str,
+    target_date: date,
+    calendar_name: str,
+    client: httpx.AsyncClient | None = None,
+) -> list[CalendarEvent]:
+    """Fetch events from an iCal URL for a specific date.
+
+    Args:
+        ical_url: The iCal URL to fetch
+        target_date: The date to filter events for
+        calendar_name: Name of the calendar (for display)
+        client: Shared HTTP client; a new one is opened if not given
+
+    Returns:
+        List of CalendarEvent objects for the target date
+    """
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            response = await own_client.get(ical_url)
+    else:
+        response = await client.get(ical_url)
+    response.raise_for_status()
+    return parse_events(response.content, target_date, calendar_name)
+
+
+@dataclass
+class CalendarFetch:
+    """Outcome of fetching one calendar.
+
+    Attributes:
+        name: Name of the calendar.
+        events: Events of the date (empty if the fetch failed).
+        seconds: Time taken to fetch and parse the calendar.
+        error: Why the fetch failed, or None.
+    """
+
+    name: str
+    events: list[CalendarEvent] = field(default_factory=list)
+    seconds: float = 0.0
+    error: str | None = None
+
+    def format(self) -> str:
+        """Return a one-line summary for the CLI."""
+        line = f"Calendar {self.name}: "
+        if self.error is not None:
+            return line + f"failed after {self.seconds:.2f}s ({self.error})"
+        return line + f"{len(self.events)} events in {self.seconds:.2f}s"
+
+
+async def _fetch_calendar(
+    client: httpx.AsyncClient,
+    name: str,
+    ical_url: str,
+    target_date: date,
+    timeout: float,
+) -> CalendarFetch:
+    """Fetch one calendar within the timeout, recording any failure."""
+    started = time.perf_counter()
+    try:
+        events = await asyncio.wait_for(
+            fetch_events(ical_url, target_date, name, client), timeout
+        )
+    except TimeoutError:
+        error = f"timed out after {timeout:g}s"
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        error = str(e) or type(e).__name__
+    else:
+        return CalendarFetch(name, events, time.perf_counter() - started)
+    return CalendarFetch(name, [], time.perf_counter() - started, error)
+
+
+async def fetch_calendars(
+    target_date: date, timeout: float | None = None
+) -> list[CalendarFetch]:
+    """Fetch all configured calendars concurrently.
+
+    The calendars share one pooled HTTP client, and each has its own
+    timeout, so a slow or failing calendar does not delay the others.
 
     Args:
         target_date: The date to fetch events for
+        timeout: Seconds allowed per calendar. Uses
+                 AUTO_DAILY_CALENDAR_TIMEOUT env var or default if not
+                 specified.
 
     Returns:
-        List of CalendarEvent objects from all calendars, sorted by start time.
-        Returns empty list if no calendars are configured.
+        One CalendarFetch per configured calendar, in configuration order.
     """
-    calendars = load_calendar_config()
+    calendars = [
+        (calendar.get("name", "Unknown"), calendar["ical_url"])
+        for calendar in load_calendar_config()
+        if calendar.get("ical_url")
+    ]
     if not calendars:
         return []
 
-    all_events: list[CalendarEvent] = []
+    limit = timeout if timeout is not None else get_calendar_timeout()
+    async with httpx.AsyncClient(timeout=limit) as client:
+        return list(
+            await asyncio.gather(
+                *(
+                    _fetch_calendar(client, name, url, target_date, limit)
+                    for name, url in calendars
+                )
+            )
+        )
 
-    for calendar in calendars:
-        name = calendar.get("name", "Unknown")
-        ical_url = calendar.get("ical_url")
-        if not ical_url:
-            continue
 
-        try:
-            events = await fetch_events(ical_url, target_date, name)
-            all_events.extend(events)
-        except (httpx.HTTPError, ValueError, KeyError):
-            # Skip calendars that fail to fetch
-            continue
+async def get_all_events(
+    target_date: date,
+    timeout: float | None = None,
+    on_fetch: Callable[[CalendarFetch], None] | None = None,
+) -> list[CalendarEvent]:
+    """Get all events from all configured calendars.
+
+    Calendars that fail to fetch or time out are skipped.
+
+    Args:
+        target_date: The date to fetch events for
+        timeout: Seconds allowed per calendar. Uses
+                 AUTO_DAILY_CALENDAR_TIMEOUT env var or default if not
+                 specified.
+        on_fetch: Called with the outcome of each calendar (e.g., to print
+                  its latency).
+
+    Returns:
+        List of CalendarEvent objects from all calendars, sorted by start time.
+        Returns empty list if no calendars are configured.
+    """
+    all_events: list[CalendarEvent] = []
+    for fetch in await fetch_calendars(target_date, timeout):
+        if on_fetch is not None:
+            on_fetch(fetch)
+        all_events.extend(fetch.events)
 
     # Sort all events by start time
     all_events.sort(key=lambda e: e.start)
@@ -7,12 +7,25 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+type CaptureRegion = tuple[int, int, int, int]
 
-def capture_screen(output_dir: Path) -> str | None:
+
+def _screencapture_command(region: CaptureRegion | None) -> list[str]:
+    """Build the screencapture arguments shared by file and buffer capture."""
+    command = ["screencapture", "-x", "-C"]
+    if region is not None:
+        x, y, width, height = region
+        command.append(f"-R{x},{y},{width},{height}")
+    return command
+
+
+def capture_screen(output_dir: Path, region: CaptureRegion | None = None) -> str | None:
     """Capture the screen and save it as an image.
 
     Args:
         output_dir: Directory where the captured image will be saved.
+        region: Optional (x, y, width, height) rectangle in screen points to
+                capture instead of the whole screen.
 
     Returns:
         Path to the captured image file, or None if capture failed.
@@ -25,7 +38,7 @@ def capture_screen(output_dir: Path) -> str | None:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         subprocess.run(
-            ["screencapture", "-x", "-C", str(output_path)],
+            [*_screencapture_command(region), str(output_path)],
             check=True,
             capture_output=True,
         )
@@ -39,6 +52,34 @@ def capture_screen(output_dir: Path) -> str | None:
         return None
 
 
+def capture_screen_to_buffer(region: CaptureRegion | None = None) -> bytes | None:
+    """Capture the screen into memory without writing a file.
+
+    screencapture writes the PNG to its stdout, which is read through a pipe.
+
+    Args:
+        region: Optional (x, y, width, height) rectangle in screen points to
+                capture instead of the whole screen.
+
+    Returns:
+        Encoded PNG bytes, or None if capture failed.
+    """
+    try:
+        result = subprocess.run(
+            [*_screencapture_command(region), "-t", "png", "/dev/stdout"],
+            check=True,
+            capture_output=True,
+        )
+    except subprocess.CalledProcessError as e:
+        error_msg = e.stderr.decode() if e.stderr else str(e)
+        logger.debug("screencapture failed: %s", error_msg)
+        return None
+    if not result.stdout:
+        logger.debug("screencapture succeeded but produced no image data")
+        return None
+    return result.stdout
+
+
 def cleanup_image(image_path: str) -> bool:
     """Delete a captured image file.
 
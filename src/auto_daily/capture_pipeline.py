@@ -1,12 +1,55 @@
-"""Common capture pipeline for window monitoring and periodic capture."""
+"""Common capture pipeline for window monitoring and periodic capture.
 
+The pipeline consists of four stages: capture, OCR, filter and log. The
+asynchronous pipeline additionally skips OCR for screens that look unchanged
+since the last capture of the same window and can re-recognize only the
+changed region of a screen (incremental OCR).
+``execute_capture_pipeline`` runs them synchronously in the caller's thread.
+``AsyncCapturePipeline`` connects the same stages with bounded queues and an
+OCR worker pool, so that callers such as the window monitor only enqueue
+events and are never stalled by a slow OCR backend. In "memory" capture
+mode the screenshot is piped straight into the OCR backend as encoded bytes
+instead of going through a temporary file. An optional preprocessing stage
+crops captures to the active window and downscales/re-encodes them before
+OCR to keep vision API payloads small.
+"""
+
+import dataclasses
+import logging
+import threading
+from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
+from typing import Any, cast
 
-from auto_daily.capture import capture_screen, cleanup_image
+from auto_daily.capture import capture_screen, capture_screen_to_buffer, cleanup_image
+from auto_daily.config import (
+    get_capture_mode,
+    get_ocr_crop_window,
+    get_ocr_incremental,
+    get_ocr_workers,
+    get_pipeline_backpressure,
+    get_pipeline_queue_size,
+)
+from auto_daily.event_queue import BackpressurePolicy, BoundedEventQueue
+from auto_daily.imaging import ImageSource, PreprocessOptions, preprocess_image
+from auto_daily.log_writer import LogWriter
 from auto_daily.logger import append_log_hourly
-from auto_daily.ocr import perform_ocr
+from auto_daily.ocr import (
+    IncrementalOCR,
+    OCRBackend,
+    apply_ocr_filter,
+    get_ocr_backend,
+    perform_ocr,
+)
+from auto_daily.screen_dedup import ScreenDeduplicator
 from auto_daily.slack_parser import SlackContext, parse_slack_title
+from auto_daily.window_monitor import WindowBounds, get_active_window_bounds
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MODES = ("file", "memory")
 
 
 @dataclass
@@ -17,11 +60,38 @@ class CaptureContext:
         window_info: Window information (app_name, window_title).
         log_dir: Directory for storing logs and temporary captures.
         extract_slack_context: Whether to extract Slack context from window title.
+        timestamp: When the event happened. Defaults to the time of logging.
     """
 
     window_info: dict[str, str]
     log_dir: Path
     extract_slack_context: bool = False
+    timestamp: datetime | None = None
+
+    def window_key(self) -> tuple[str, str]:
+        """Return the (app_name, window_title) pair identifying the window."""
+        return (
+            self.window_info.get("app_name", ""),
+            self.window_info.get("window_title", ""),
+        )
+
+
+type CompletionCallback = Callable[[CaptureContext, bool], None]
+type CaptureFunction = Callable[[CaptureContext], ImageSource | None]
+
+
+def _get_slack_context(context: CaptureContext) -> SlackContext | None:
+    """Extract Slack context from the window title if enabled for this capture.
+
+    Args:
+        context: Capture context.
+
+    Returns:
+        Parsed Slack context, or None if extraction is disabled or not Slack.
+    """
+    if context.extract_slack_context and context.window_info.get("app_name") == "Slack":
+        return parse_slack_title(context.window_info.get("window_title", ""))
+    return None
 
 
 def execute_capture_pipeline(context: CaptureContext) -> bool:
@@ -41,14 +111,399 @@ def execute_capture_pipeline(context: CaptureContext) -> bool:
 
     ocr_text = perform_ocr(image_path)
 
-    slack_context: SlackContext | None = None
-    if context.extract_slack_context and context.window_info.get("app_name") == "Slack":
-        slack_context = parse_slack_title(context.window_info.get("window_title", ""))
+    log_kwargs: dict[str, Any] = {"slack_context": _get_slack_context(context)}
+    if context.timestamp is not None:
+        log_kwargs["timestamp"] = context.timestamp
 
-    append_log_hourly(
-        context.log_dir, context.window_info, ocr_text, slack_context=slack_context
-    )
+    append_log_hourly(context.log_dir, context.window_info, ocr_text, **log_kwargs)
 
     cleanup_image(image_path)
 
     return True
+
+
+@dataclass
+class _CapturedFrame:
+    """A captured screen waiting for OCR.
+
+    image is a temporary file path in "file" capture mode and the encoded
+    image bytes in "memory" capture mode.
+    """
+
+    context: CaptureContext
+    image: ImageSource
+
+    def window_key(self) -> tuple[str, str]:
+        """Return the window key of the originating event."""
+        return self.context.window_key()
+
+    def release(self) -> None:
+        """Delete the temporary capture file, if any."""
+        if isinstance(self.image, str):
+            cleanup_image(self.image)
+
+
+@dataclass
+class _RecognizedFrame:
+    """Raw OCR output waiting for filtering and logging.
+
+    When unchanged is True, OCR was skipped and ocr_text is the already
+    filtered text of the previous capture of the same window.
+    """
+
+    context: CaptureContext
+    ocr_text: str
+    image_hash: int | None = None
+    unchanged: bool = False
+
+
+@dataclass
+class PipelineStats:
+    """Snapshot of asynchronous capture pipeline counters.
+
+    Attributes:
+        queued: Events accepted by submit().
+        dropped: Events or frames discarded by backpressure.
+        coalesced: Events or frames replaced by a newer one for the same window.
+        processed: Events that were captured, OCR'd and logged.
+        failed: Events whose capture, OCR or logging failed.
+        unchanged: Processed events whose OCR was skipped as an unchanged screen.
+    """
+
+    queued: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    processed: int = 0
+    failed: int = 0
+    unchanged: int = 0
+
+
+class AsyncCapturePipeline:
+    """Run the capture pipeline stages on background threads.
+
+    Events flow through three bounded queues:
+    submit() → [events] → capture thread → [frames] → OCR workers
+    → [results] → log thread (filter + log).
+
+    The events and frames queues apply the configured backpressure policy,
+    so a slow OCR backend drops or coalesces work instead of stalling the
+    producer. The results queue always blocks, since logging is cheap.
+    """
+
+    def __init__(
+        self,
+        ocr_workers: int | None = None,
+        queue_size: int | None = None,
+        backpressure: BackpressurePolicy | str | None = None,
+        ocr_backend: OCRBackend | None = None,
+        on_complete: CompletionCallback | None = None,
+        deduplicator: ScreenDeduplicator | None = None,
+        incremental: bool | None = None,
+        capture_mode: str | None = None,
+        crop_window: bool | None = None,
+        preprocess: PreprocessOptions | None = None,
+        capture: CaptureFunction | None = None,
+        log_writer: LogWriter | None = None,
+        window_bounds: Callable[[], WindowBounds | None] | None = None,
+    ) -> None:
+        """Initialize the asynchronous capture pipeline.
+
+        Args:
+            ocr_workers: Number of OCR worker threads.
+                        Uses AUTO_DAILY_OCR_WORKERS env var or default if not specified.
+            queue_size: Maximum pending items per queue.
+                       Uses AUTO_DAILY_PIPELINE_QUEUE_SIZE env var or default if not specified.
+            backpressure: Policy applied when a queue is full
+                         ("drop_oldest", "coalesce", "block").
+                         Uses AUTO_DAILY_PIPELINE_BACKPRESSURE env var or default if not specified.
+            ocr_backend: OCR backend shared by the workers.
+                        Uses the configured backend if not specified.
+            on_complete: Called with (context, success) after each event finishes.
+            deduplicator: Detects unchanged screens to skip OCR.
+                         Uses AUTO_DAILY_DEDUP_MODE/THRESHOLD env vars if not specified.
+            incremental: Whether to OCR only the changed region of each capture.
+                        Uses OCR_INCREMENTAL env var if not specified.
+            capture_mode: "file" to pass captures to OCR as temporary PNG files,
+                         "memory" to pass the encoded bytes directly.
+                         Uses AUTO_DAILY_CAPTURE_MODE env var or default if not specified.
+            crop_window: Whether to capture only the active window's bounds.
+                        Uses OCR_CROP_WINDOW env var if not specified.
+            preprocess: Grayscale/downscale/re-encode settings applied before OCR.
+                       Uses OCR_GRAYSCALE, OCR_MAX_EDGE, OCR_IMAGE_FORMAT and
+                       OCR_IMAGE_QUALITY env vars if not specified.
+            capture: Replaces the screenshot step, e.g., with synthetic frames
+                    when replaying a trace. Uses screencapture if not specified.
+            log_writer: Started writer that batches log entries. Entries are
+                       appended directly with append_log_hourly if not specified.
+            window_bounds: Returns the active window's bounds when cropping,
+                          e.g., from the window helper's latest snapshot.
+                          Runs osascript per capture if not specified.
+
+        Raises:
+            ValueError: If the backpressure policy, capture mode or image
+                format is not supported.
+        """
+        self._ocr_workers = (
+            ocr_workers if ocr_workers is not None else get_ocr_workers()
+        )
+        size = queue_size if queue_size is not None else get_pipeline_queue_size()
+        policy = cast(
+            BackpressurePolicy,
+            backpressure if backpressure is not None else get_pipeline_backpressure(),
+        )
+        self._ocr_backend = ocr_backend
+        self._on_complete = on_complete
+        self._dedup = deduplicator if deduplicator is not None else ScreenDeduplicator()
+        self._incremental = (
+            incremental if incremental is not None else get_ocr_incremental()
+        )
+        self._incremental_ocr: IncrementalOCR | None = None
+        self._capture_mode = (
+            capture_mode if capture_mode is not None else get_capture_mode()
+        )
+        if self._capture_mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture mode: {self._capture_mode}")
+        self._crop_window = (
+            crop_window if crop_window is not None else get_ocr_crop_window()
+        )
+        self._preprocess = (
+            preprocess if preprocess is not None else PreprocessOptions.from_config()
+        )
+        self._capture_func = capture
+        self._log_writer = log_writer
+        self._window_bounds = window_bounds
+
+        self._events: BoundedEventQueue[CaptureContext] = BoundedEventQueue(
+            size,
+            policy,
+            key=CaptureContext.window_key,
+        )
+        self._frames: BoundedEventQueue[_CapturedFrame] = BoundedEventQueue(
+            size,
+            policy,
+            key=_CapturedFrame.window_key,
+            on_discard=_CapturedFrame.release,
+        )
+        self._results: BoundedEventQueue[_RecognizedFrame] = BoundedEventQueue(
+            size, "block"
+        )
+
+        self._lock = threading.Lock()
+        self._processed = 0
+        self._failed = 0
+        self._running = False
+        self._capture_thread: threading.Thread | None = None
+        self._ocr_threads: list[threading.Thread] = []
+        self._log_thread: threading.Thread | None = None
+
+    def submit(self, context: CaptureContext) -> bool:
+        """Enqueue a capture event.
+
+        Stamps the event with the current time if it has no timestamp, so the
+        log reflects when the event happened rather than when it was logged.
+
+        Args:
+            context: Capture context for the event.
+
+        Returns:
+            True if the event was accepted, False if the pipeline is stopped.
+        """
+        if context.timestamp is None:
+            context = dataclasses.replace(context, timestamp=datetime.now())
+        return self._events.put(context)
+
+    @property
+    def stats(self) -> PipelineStats:
+        """Return a snapshot of the pipeline counters."""
+        with self._lock:
+            processed, failed = self._processed, self._failed
+        return PipelineStats(
+            queued=self._events.stats.queued,
+            dropped=self._events.stats.dropped + self._frames.stats.dropped,
+            coalesced=self._events.stats.coalesced + self._frames.stats.coalesced,
+            processed=processed,
+            failed=failed,
+            unchanged=self._dedup.hits,
+        )
+
+    def _finish(self, context: CaptureContext, success: bool) -> None:
+        """Record the outcome of an event and notify the completion callback.
+
+        Exceptions from the callback are logged, so they cannot stop a stage.
+        """
+        with self._lock:
+            if success:
+                self._processed += 1
+            else:
+                self._failed += 1
+        if self._on_complete is not None:
+            try:
+                self._on_complete(context, success)
+            except Exception:
+                logger.exception("Completion callback failed for %s", context)
+
+    def _capture(self, context: CaptureContext) -> ImageSource | None:
+        """Take a screenshot as a file or in memory, per the capture mode.
+
+        When window cropping is enabled, only the active window's bounds are
+        captured; if they cannot be determined the whole screen is captured.
+        """
+        if self._capture_func is not None:
+            return self._capture_func(context)
+        region = None
+        if self._crop_window:
+            region = (
+                self._window_bounds()
+                if self._window_bounds is not None
+                else get_active_window_bounds()
+            )
+        if self._capture_mode == "memory":
+            return capture_screen_to_buffer(region=region)
+        return capture_screen(context.log_dir, region=region)
+
+    def _capture_loop(self) -> None:
+        """Capture stage: take a screenshot for each queued event."""
+        while (context := self._events.get()) is not None:
+            try:
+                image = self._capture(context)
+            except Exception:
+                logger.exception("Capture failed for %s", context.window_key())
+                image = None
+            if image is None:
+                self._finish(context, False)
+                continue
+            frame = _CapturedFrame(context, image)
+            if not self._frames.put(frame):
+                frame.release()
+                self._finish(context, False)
+
+    def _ocr_loop(self, backend: OCRBackend) -> None:
+        """Dedup and OCR stages: recognize text in captured frames.
+
+        Frames whose perceptual hash matches the previous capture of the same
+        window skip OCR and reuse the previous result. A frame that cannot be
+        hashed is recognized without deduplication.
+        """
+        while (frame := self._frames.get()) is not None:
+            image_hash = None
+            if self._dedup.enabled:
+                try:
+                    image_hash = self._dedup.hash_image(frame.image)
+                except Exception:
+                    logger.exception("Hashing failed for %s", frame.window_key())
+                previous_text = self._dedup.find_unchanged(
+                    frame.window_key(), image_hash
+                )
+                if previous_text is not None:
+                    frame.release()
+                    self._results.put(
+                        _RecognizedFrame(
+                            frame.context, previous_text, image_hash, unchanged=True
+                        )
+                    )
+                    continue
+
+            try:
+                ocr_text = self._recognize(backend, frame)
+            except Exception:
+                logger.exception("OCR failed for %s", frame.window_key())
+                self._finish(frame.context, False)
+                continue
+            finally:
+                frame.release()
+            self._results.put(_RecognizedFrame(frame.context, ocr_text, image_hash))
+
+    def _recognize(self, backend: OCRBackend, frame: _CapturedFrame) -> str:
+        """Preprocess a frame if configured, then run OCR on it.
+
+        OCR runs only on the changed region if incremental OCR is enabled.
+        """
+        image = frame.image
+        if self._preprocess.enabled:
+            image = preprocess_image(image, self._preprocess)
+        if self._incremental_ocr is not None:
+            return self._incremental_ocr.perform_ocr(image, frame.window_key())
+        if isinstance(image, str):
+            return backend.perform_ocr(image)
+        return backend.perform_ocr_buffer(image)
+
+    def _log_loop(self) -> None:
+        """Filter and log stages: clean up OCR text and append the log entry."""
+        while (result := self._results.get()) is not None:
+            context = result.context
+            try:
+                log_path = self._log(result)
+            except Exception:
+                logger.exception("Logging failed for %s", context.window_key())
+                log_path = None
+            self._finish(context, log_path is not None)
+
+    def _log(self, result: _RecognizedFrame) -> Path | None:
+        """Filter the OCR text of a frame and append its log entry."""
+        context = result.context
+        if result.unchanged:
+            ocr_text = result.ocr_text if self._dedup.mode == "reuse" else ""
+        else:
+            ocr_text = apply_ocr_filter(result.ocr_text)
+            self._dedup.remember(context.window_key(), result.image_hash, ocr_text)
+        log_kwargs: dict[str, Any] = {
+            "slack_context": _get_slack_context(context),
+            "timestamp": context.timestamp,
+            "unchanged": result.unchanged,
+        }
+        if self._log_writer is not None:
+            return self._log_writer.append_activity(
+                context.window_info, ocr_text, **log_kwargs
+            )
+        return append_log_hourly(
+            context.log_dir, context.window_info, ocr_text, **log_kwargs
+        )
+
+    def start(self) -> None:
+        """Start the capture thread, OCR workers and log thread."""
+        if self._running:
+            return
+
+        self._running = True
+        backend = (
+            self._ocr_backend if self._ocr_backend is not None else get_ocr_backend()
+        )
+        if self._incremental:
+            self._incremental_ocr = IncrementalOCR(backend)
+
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._ocr_threads = [
+            threading.Thread(target=self._ocr_loop, args=(backend,), daemon=True)
+            for _ in range(self._ocr_workers)
+        ]
+        self._log_thread = threading.Thread(target=self._log_loop, daemon=True)
+
+        self._capture_thread.start()
+        for thread in self._ocr_threads:
+            thread.start()
+        self._log_thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting events and drain the queues stage by stage.
+
+        Args:
+            timeout: Maximum seconds to wait for each stage to finish.
+        """
+        if not self._running:
+            return
+        self._running = False
+
+        self._events.close()
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=timeout)
+            self._capture_thread = None
+
+        self._frames.close()
+        for thread in self._ocr_threads:
+            thread.join(timeout=timeout)
+        self._ocr_threads = []
+
+        self._results.close()
+        if self._log_thread is not None:
+            self._log_thread.join(timeout=timeout)
+            self._log_thread = None
@@ -30,6 +30,12 @@ def create_parser(version: str) -> argparse.ArgumentParser:
         action="store_true",
         help="Start window monitoring",
     )
+    parser.add_argument(
+        "--record-trace",
+        type=str,
+        metavar="PATH",
+        help="With --start, record window and lock events to a JSONL trace file",
+    )
 
     # Report subcommand
     report_parser = subparsers.add_parser(
@@ -51,6 +57,17 @@ def create_parser(version: str) -> argparse.ArgumentParser:
         action="store_true",
         help="Automatically generate missing summaries before report",
     )
+    report_parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Maximum summaries generated at the same time "
+        "(default: AUTO_DAILY_SUMMARY_CONCURRENCY)",
+    )
+    report_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Send every prompt to the LLM instead of reusing cached responses",
+    )
 
     # Summarize subcommand
     summarize_parser = subparsers.add_parser(
@@ -67,5 +84,107 @@ def create_parser(version: str) -> argparse.ArgumentParser:
         type=int,
         help="Hour to summarize (0-23)",
     )
+    summarize_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Send the prompt to the LLM instead of reusing a cached response",
+    )
+
+    # Import subcommand
+    import_parser = subparsers.add_parser(
+        "import",
+        help="Import hourly JSONL logs into the activity database",
+    )
+    import_parser.add_argument(
+        "--log-dir",
+        type=str,
+        help="Log directory to import (default: AUTO_DAILY_LOG_DIR)",
+    )
+    import_parser.add_argument(
+        "--db",
+        type=str,
+        help="Database file to import into (default: AUTO_DAILY_DB_PATH)",
+    )
+
+    # Search subcommand
+    search_parser = subparsers.add_parser(
+        "search",
+        help="Search OCR text, window titles and speech transcripts",
+    )
+    search_parser.add_argument(
+        "query",
+        nargs="+",
+        help="Search terms (all must match)",
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum number of hits (default: 20)",
+    )
+    search_parser.add_argument(
+        "--app",
+        type=str,
+        help="Only search entries of this application",
+    )
+    search_parser.add_argument(
+        "--since",
+        type=str,
+        help="Only search entries on or after this date (YYYY-MM-DD format)",
+    )
+    search_parser.add_argument(
+        "--until",
+        type=str,
+        help="Only search entries on or before this date (YYYY-MM-DD format)",
+    )
+
+    # Stats subcommand
+    stats_parser = subparsers.add_parser(
+        "stats",
+        help="Show the time spent per application, window and Slack channel",
+    )
+    stats_parser.add_argument(
+        "--date",
+        type=str,
+        help="Date to show (YYYY-MM-DD format, default: today)",
+    )
+    stats_parser.add_argument(
+        "--since",
+        type=str,
+        help="First date of a range (YYYY-MM-DD format)",
+    )
+    stats_parser.add_argument(
+        "--until",
+        type=str,
+        help="Last date of a range (YYYY-MM-DD format, default: today)",
+    )
+    stats_parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum rows per table (default: 10)",
+    )
+
+    # Compact subcommand
+    compact_parser = subparsers.add_parser(
+        "compact",
+        help="Compress closed hourly logs",
+    )
+    compact_parser.add_argument(
+        "--log-dir",
+        type=str,
+        help="Log directory to compact (default: AUTO_DAILY_LOG_DIR)",
+    )
+    compact_parser.add_argument(
+        "--method",
+        type=str,
+        choices=["gzip", "zstd"],
+        help="Compression method (default: AUTO_DAILY_LOG_COMPRESSION)",
+    )
+    compact_parser.add_argument(
+        "--train-dictionary",
+        action="store_true",
+        help="Train a zstd dictionary on recent logs before compressing",
+    )
 
     return parser
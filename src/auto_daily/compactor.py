@@ -0,0 +1,348 @@
+"""Background compression of closed hourly logs.
+
+Once an hour is over, its ``activity_HH.jsonl`` is never appended to again.
+``LogCompactor`` periodically rewrites such files as ``activity_HH.jsonl.gz``
+(stdlib gzip) or ``activity_HH.jsonl.zst`` (optional zstandard package) and
+removes the plain file. Repetitive OCR text compresses by an order of
+magnitude; zstd can do better still with a shared dictionary trained on the
+logs themselves (``auto-daily compact --train-dictionary``). Readers go
+through ``auto_daily.log_files`` and decompress transparently.
+
+A file counts as closed once both its hour ended and it was last modified
+more than a grace period ago, so late batches of the log writer (or a
+writer still holding the previous hour open) are not lost. Compression is
+off by default, because it replaces the plain ``activity_HH.jsonl`` files
+that external tools may read.
+"""
+
+import gzip
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from auto_daily.config import get_log_compression
+from auto_daily.log_files import (
+    COMPRESSED_SUFFIXES,
+    DICTIONARY_DIR,
+    DICTIONARY_SUFFIX,
+    compressed_path,
+    iter_hourly_logs,
+    load_zstd,
+    log_segments,
+    open_log,
+)
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_METHODS = ("off", "gzip", "zstd")
+
+METHOD_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+# How long after the end of its hour and its last write a file is left
+# alone (15 minutes)
+DEFAULT_GRACE = 15 * 60.0
+
+# Seconds between compaction passes while monitoring (10 minutes)
+DEFAULT_INTERVAL = 10 * 60.0
+
+DEFAULT_GZIP_LEVEL = 9
+
+# Compaction runs in the background, so a slow, strong level is affordable
+DEFAULT_ZSTD_LEVEL = 19
+
+# zstd's recommended dictionary size
+DEFAULT_DICTIONARY_SIZE = 112 * 1024
+
+# Log lines sampled for dictionary training
+DEFAULT_MAX_TRAINING_BYTES = 16 * 1024 * 1024
+
+
+@dataclass
+class CompactionStats:
+    """Result of a compaction pass.
+
+    Attributes:
+        files: Logs compressed.
+        bytes_in: Uncompressed bytes read.
+        bytes_out: Compressed bytes written.
+        failed: Logs that could not be compressed.
+    """
+
+    files: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    failed: int = 0
+
+
+def is_closed(path: Path, now: datetime, grace: float = DEFAULT_GRACE) -> bool:
+    """Return True if an hourly log will not be written to anymore.
+
+    Args:
+        path: Plain log path (log_base/YYYY-MM-DD/activity_HH.jsonl).
+        now: Current time.
+        grace: Seconds the hour must be over and the file left unmodified.
+
+    Returns:
+        True if the hour ended and the file was last modified at least
+        grace seconds ago.
+    """
+    try:
+        day = datetime.strptime(path.parent.name, "%Y-%m-%d")
+        hour = int(path.name.removeprefix("activity_")[:2])
+        modified = datetime.fromtimestamp(path.stat().st_mtime)
+    except (ValueError, OSError):
+        return False
+    hour_end = day + timedelta(hours=hour + 1)
+    settled = timedelta(seconds=grace)
+    return now >= hour_end + settled and now >= modified + settled
+
+
+def latest_dictionary(log_base: Path) -> Path | None:
+    """Return the most recently trained zstd dictionary, if any."""
+    dictionaries = sorted(
+        (log_base / DICTIONARY_DIR).glob(f"*{DICTIONARY_SUFFIX}"),
+        key=lambda p: p.stat().st_mtime,
+    )
+    return dictionaries[-1] if dictionaries else None
+
+
+def train_dictionary(
+    log_base: Path,
+    size: int = DEFAULT_DICTIONARY_SIZE,
+    max_bytes: int = DEFAULT_MAX_TRAINING_BYTES,
+) -> Path:
+    """Train a zstd dictionary on the most recent log lines.
+
+    Every JSONL line is one sample, so the dictionary learns the entry
+    structure and the recurring window titles and OCR text.
+
+    Args:
+        log_base: Base directory for logs.
+        size: Dictionary size in bytes.
+        max_bytes: Maximum bytes of log lines to sample.
+
+    Returns:
+        Path of the written dictionary (log_base/dictionaries/<id>.zdict).
+
+    Raises:
+        ImportError: If zstandard is not installed.
+        ValueError: If there are too few log lines to train on.
+    """
+    zstandard = load_zstd()
+    samples: list[bytes] = []
+    total = 0
+    for path in reversed(list(iter_hourly_logs(log_base))):
+        with open_log(path) as f:
+            for line in f:
+                samples.append(line)
+                total += len(line)
+        if total >= max_bytes:
+            break
+
+    try:
+        dictionary = zstandard.train_dictionary(size, samples)
+    except zstandard.ZstdError as e:
+        raise ValueError(
+            f"Not enough log data to train a dictionary ({len(samples)} lines)"
+        ) from e
+
+    dict_dir = log_base / DICTIONARY_DIR
+    dict_dir.mkdir(parents=True, exist_ok=True)
+    dict_file = dict_dir / f"{dictionary.dict_id()}{DICTIONARY_SUFFIX}"
+    dict_file.write_bytes(dictionary.as_bytes())
+    return dict_file
+
+
+def compress_data(
+    data: bytes, method: str, level: int | None = None, dictionary: Any = None
+) -> bytes:
+    """Compress a whole log as one gzip member or zstd frame.
+
+    Both formats record the uncompressed size, which lets incremental
+    importers skip unchanged logs without decompressing them.
+
+    Args:
+        data: Uncompressed JSONL content.
+        method: "gzip" or "zstd".
+        level: Compression level. Uses the method's default if not specified.
+        dictionary: zstandard.ZstdCompressionDict for zstd, or None.
+
+    Returns:
+        Compressed bytes.
+    """
+    if method == "gzip":
+        return gzip.compress(
+            data,
+            compresslevel=level if level is not None else DEFAULT_GZIP_LEVEL,
+            mtime=0,
+        )
+    zstandard = load_zstd()
+    compressor = zstandard.ZstdCompressor(
+        level=level if level is not None else DEFAULT_ZSTD_LEVEL,
+        dict_data=dictionary,
+    )
+    return compressor.compress(data)
+
+
+def compact_file(
+    path: Path,
+    method: str,
+    level: int | None = None,
+    dictionary: Any = None,
+) -> tuple[int, int]:
+    """Compress a log and remove its plain file.
+
+    Lines appended after an earlier compaction are merged into the existing
+    segment, which keeps its format. The new segment is written to a
+    temporary file and renamed into place, so it is never seen half-written.
+    Only the plain file is removed afterwards.
+
+    Args:
+        path: Plain log path.
+        method: "gzip" or "zstd" for logs without a compressed segment.
+        level: Compression level. Uses the method's default if not specified.
+        dictionary: zstandard.ZstdCompressionDict for zstd, or None.
+
+    Returns:
+        Tuple of (uncompressed bytes, compressed bytes).
+    """
+    existing = [s for s in log_segments(path) if s.suffix in COMPRESSED_SUFFIXES]
+    if existing:
+        target = existing[0]
+        method = "gzip" if target.suffix == ".gz" else "zstd"
+    else:
+        target = compressed_path(path, METHOD_SUFFIXES[method])
+    if method == "gzip":
+        dictionary = None
+
+    # Hourly logs are a few MB at most
+    with open_log(path) as f:
+        data = f.read()
+    compressed = compress_data(data, method, level, dictionary)
+
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        tmp.write_bytes(compressed)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    path.unlink()
+    return len(data), len(compressed)
+
+
+class LogCompactor:
+    """Compress closed hourly logs from a background thread."""
+
+    def __init__(
+        self,
+        log_base: Path,
+        method: str | None = None,
+        grace: float = DEFAULT_GRACE,
+        interval: float = DEFAULT_INTERVAL,
+        level: int | None = None,
+    ) -> None:
+        """Initialize the compactor.
+
+        Args:
+            log_base: Base directory for logs.
+            method: Compression method ("off", "gzip", "zstd"). Uses
+                   AUTO_DAILY_LOG_COMPRESSION env var or default if not
+                   specified.
+            grace: Seconds after the end of its hour and its last
+                  modification before a file is compressed.
+            interval: Seconds between compaction passes.
+            level: Compression level. Uses the method's default if not
+                  specified.
+
+        Raises:
+            ValueError: If the method is not supported.
+            ImportError: If zstd is selected but zstandard is not installed.
+        """
+        self.log_base = log_base
+        self.method = method if method is not None else get_log_compression()
+        if self.method not in COMPRESSION_METHODS:
+            raise ValueError(f"Unknown compression method: {self.method}")
+        if self.method == "zstd":
+            load_zstd()
+        self._grace = grace
+        self._interval = interval
+        self._level = level
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self.stats = CompactionStats()
+
+    def _load_dictionary(self) -> Any:
+        """Load the newest trained dictionary for zstd, if any."""
+        if self.method != "zstd":
+            return None
+        dict_file = latest_dictionary(self.log_base)
+        if dict_file is None:
+            return None
+        return load_zstd().ZstdCompressionDict(dict_file.read_bytes())
+
+    def compact_once(self, now: datetime | None = None) -> CompactionStats:
+        """Compress every closed log that still has a plain file.
+
+        Args:
+            now: Current time. Uses datetime.now() if not specified.
+
+        Returns:
+            Counters of this pass; they are also added to self.stats.
+        """
+        stats = CompactionStats()
+        if self.method == "off":
+            return stats
+        now = now if now is not None else datetime.now()
+        dictionary = self._load_dictionary()
+
+        for path in iter_hourly_logs(self.log_base):
+            if not path.exists() or not is_closed(path, now, self._grace):
+                continue
+            try:
+                bytes_in, bytes_out = compact_file(
+                    path, self.method, self._level, dictionary
+                )
+            except Exception:
+                # A failing file must not stop the compaction of the others
+                logger.exception("Failed to compress log %s", path)
+                stats.failed += 1
+                continue
+            stats.files += 1
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+
+        self.stats.files += stats.files
+        self.stats.bytes_in += stats.bytes_in
+        self.stats.bytes_out += stats.bytes_out
+        self.stats.failed += stats.failed
+        return stats
+
+    def _compact_loop(self) -> None:
+        """Background loop running a compaction pass every interval."""
+        while self._running:
+            self.compact_once()
+            if self._stop_event.wait(self._interval):
+                break
+
+    def start(self) -> None:
+        """Start the compactor thread."""
+        if self._running or self.method == "off":
+            return
+
+        self._running = True
+        self._thread = threading.Thread(target=self._compact_loop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the compactor thread."""
+        self._running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
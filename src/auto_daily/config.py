@@ -10,14 +10,54 @@ ENV_LOG_DIR = "AUTO_DAILY_LOG_DIR"
 DEFAULT_LOG_DIR = Path.home() / ".auto-daily" / "logs"
 DEFAULT_REPORTS_DIR = Path.home() / ".auto-daily" / "reports"
 DEFAULT_SUMMARIES_DIR = Path.home() / ".auto-daily" / "summaries"
+DEFAULT_DB_PATH = Path.home() / ".auto-daily" / "activity.db"
+DEFAULT_SEARCH_DB_PATH = Path.home() / ".auto-daily" / "search.db"
 
 # Ollama settings
 DEFAULT_OLLAMA_BASE_URL = "http://localhost:11434"
 DEFAULT_OLLAMA_MODEL = "llama3.2"
 DEFAULT_CAPTURE_INTERVAL = 30
+DEFAULT_CAPTURE_MODE = "file"
+DEFAULT_WINDOW_SETTLE_MS = 1000
+DEFAULT_WINDOW_SOURCE = "helper"
+
+# Capture pipeline settings
+DEFAULT_OCR_WORKERS = 2
+DEFAULT_PIPELINE_QUEUE_SIZE = 16
+DEFAULT_PIPELINE_BACKPRESSURE = "coalesce"
+
+# Log writer settings
+DEFAULT_LOG_WRITER = "buffered"
+DEFAULT_LOG_FLUSH_INTERVAL_MS = 1000
+DEFAULT_LOG_FSYNC = "rotate"
+DEFAULT_OCR_BLOBS = False
+DEFAULT_LOG_COMPRESSION = "off"
+
+# Storage backend settings
+DEFAULT_STORAGE = "jsonl"
+DEFAULT_SEARCH_INDEX = False
+DEFAULT_JSON_BACKEND = "auto"
+
+# Screen deduplication settings
+DEFAULT_DEDUP_MODE = "reuse"
+DEFAULT_DEDUP_THRESHOLD = 4
 
 # LLM backend settings
 DEFAULT_AI_BACKEND = "ollama"
+DEFAULT_SUMMARY_CONCURRENCY = 4
+DEFAULT_SUMMARY_TOKEN_BUDGET = 3000
+DEFAULT_REPORT_TOKEN_BUDGET = 6000
+DEFAULT_ROLLING_SUMMARY_MINUTES = 0
+DEFAULT_SESSION_GAP_MINUTES = 5
+
+# Calendar settings
+DEFAULT_CALENDAR_TIMEOUT = 10.0
+
+# LLM response cache settings
+DEFAULT_LLM_CACHE = False
+DEFAULT_LLM_CACHE_PATH = Path.home() / ".auto-daily" / "llm_cache.db"
+DEFAULT_LLM_CACHE_MAX_MB = 64
+DEFAULT_LLM_CACHE_TTL_DAYS = 30
 
 # OpenAI settings
 DEFAULT_OPENAI_MODEL = "gpt-4o-mini"
@@ -30,6 +70,15 @@ DEFAULT_LM_STUDIO_MODEL = "default"
 DEFAULT_OCR_BACKEND = "apple"
 DEFAULT_OCR_MODEL = "gpt-4o-mini"
 DEFAULT_OCR_FILTER_NOISE = True
+DEFAULT_OCR_INCREMENTAL = False
+DEFAULT_OCR_BANDS = 12
+
+# OCR image preprocessing settings
+DEFAULT_OCR_CROP_WINDOW = False
+DEFAULT_OCR_GRAYSCALE = False
+DEFAULT_OCR_MAX_EDGE = 0
+DEFAULT_OCR_IMAGE_FORMAT = "png"
+DEFAULT_OCR_IMAGE_QUALITY = 85
 
 # Summary prompt template
 DEFAULT_SUMMARY_PROMPT_TEMPLATE = """以下の1時間分のアクティビティログを、精度重視で要約してください。
@@ -246,6 +295,270 @@ def get_capture_interval() -> int:
     return int(interval_str)
 
 
+def get_window_settle_ms() -> int:
+    """Get how long a window must stay frontmost before it is captured.
+
+    Reads from AUTO_DAILY_WINDOW_SETTLE_MS environment variable.
+    Falls back to default (1000 ms) if not set.
+
+    Returns:
+        Settle time in milliseconds (0 disables debouncing).
+    """
+    value = os.environ.get("AUTO_DAILY_WINDOW_SETTLE_MS")
+    if value is None:
+        return DEFAULT_WINDOW_SETTLE_MS
+    return max(0, int(value))
+
+
+def get_window_source_name() -> str:
+    """Get how the active window is queried.
+
+    Reads from AUTO_DAILY_WINDOW_SOURCE environment variable.
+    Falls back to default ("helper") if not set.
+
+    Returns:
+        Window source name ("helper" keeps one osascript process running,
+        "applescript" spawns osascript for every query).
+    """
+    return os.environ.get("AUTO_DAILY_WINDOW_SOURCE", DEFAULT_WINDOW_SOURCE)
+
+
+def get_capture_mode() -> str:
+    """Get how captured screens are handed to the OCR stage.
+
+    Reads from AUTO_DAILY_CAPTURE_MODE environment variable.
+    Falls back to default ("file") if not set.
+
+    Returns:
+        Capture mode name ("file" writes a temporary PNG, "memory" keeps the
+        encoded image in memory).
+    """
+    return os.environ.get("AUTO_DAILY_CAPTURE_MODE", DEFAULT_CAPTURE_MODE)
+
+
+def get_ocr_workers() -> int:
+    """Get the number of OCR worker threads in the capture pipeline.
+
+    Reads from AUTO_DAILY_OCR_WORKERS environment variable.
+    Falls back to default (2) if not set.
+
+    Returns:
+        Number of OCR worker threads (at least 1).
+    """
+    workers_str = os.environ.get("AUTO_DAILY_OCR_WORKERS")
+    if workers_str is None:
+        return DEFAULT_OCR_WORKERS
+    return max(1, int(workers_str))
+
+
+def get_pipeline_queue_size() -> int:
+    """Get the maximum number of pending events per capture pipeline queue.
+
+    Reads from AUTO_DAILY_PIPELINE_QUEUE_SIZE environment variable.
+    Falls back to default (16) if not set.
+
+    Returns:
+        Queue size (at least 1).
+    """
+    size_str = os.environ.get("AUTO_DAILY_PIPELINE_QUEUE_SIZE")
+    if size_str is None:
+        return DEFAULT_PIPELINE_QUEUE_SIZE
+    return max(1, int(size_str))
+
+
+def get_pipeline_backpressure() -> str:
+    """Get the backpressure policy of the capture pipeline.
+
+    Reads from AUTO_DAILY_PIPELINE_BACKPRESSURE environment variable.
+    Falls back to default ("coalesce") if not set.
+
+    Returns:
+        Backpressure policy name ("drop_oldest", "coalesce", "block").
+    """
+    return os.environ.get(
+        "AUTO_DAILY_PIPELINE_BACKPRESSURE", DEFAULT_PIPELINE_BACKPRESSURE
+    )
+
+
+def get_log_writer_mode() -> str:
+    """Get how activity log entries are written.
+
+    Reads from AUTO_DAILY_LOG_WRITER environment variable.
+    Falls back to default ("buffered") if not set.
+
+    Returns:
+        Log writer mode ("buffered" writes batches from a single writer
+        thread, "direct" opens the hourly file for every entry).
+    """
+    return os.environ.get("AUTO_DAILY_LOG_WRITER", DEFAULT_LOG_WRITER)
+
+
+def get_log_flush_interval_ms() -> int:
+    """Get how long the buffered log writer collects entries per batch.
+
+    Reads from AUTO_DAILY_LOG_FLUSH_INTERVAL_MS environment variable.
+    Falls back to default (1000 ms) if not set.
+
+    Returns:
+        Flush interval in milliseconds.
+    """
+    value = os.environ.get("AUTO_DAILY_LOG_FLUSH_INTERVAL_MS")
+    if value is None:
+        return DEFAULT_LOG_FLUSH_INTERVAL_MS
+    return max(0, int(value))
+
+
+def get_log_fsync() -> str:
+    """Get when the buffered log writer calls fsync.
+
+    Reads from AUTO_DAILY_LOG_FSYNC environment variable.
+    Falls back to default ("rotate") if not set.
+
+    Returns:
+        fsync policy ("off", "rotate" when an hourly file is closed,
+        "batch" after every written batch).
+    """
+    return os.environ.get("AUTO_DAILY_LOG_FSYNC", DEFAULT_LOG_FSYNC)
+
+
+def get_ocr_blobs() -> bool:
+    """Get whether long OCR texts are stored in the content-addressed blob store.
+
+    Reads from AUTO_DAILY_OCR_BLOBS environment variable.
+    Falls back to False (OCR text inline in each entry) if not set.
+
+    Accepts:
+    - "true" or "1" for enabled
+    - "false" or "0" for disabled
+
+    Returns:
+        True if log entries reference OCR text by hash, False otherwise.
+    """
+    value = os.environ.get("AUTO_DAILY_OCR_BLOBS")
+
+    if value is None:
+        return DEFAULT_OCR_BLOBS
+
+    return value.lower() in ("true", "1")
+
+
+def get_log_compression() -> str:
+    """Get how closed hourly logs are compressed.
+
+    Reads from AUTO_DAILY_LOG_COMPRESSION environment variable.
+    Falls back to default ("off") if not set.
+
+    Returns:
+        Compression method ("off", "gzip", "zstd").
+    """
+    return os.environ.get("AUTO_DAILY_LOG_COMPRESSION", DEFAULT_LOG_COMPRESSION)
+
+
+def get_storage_backend() -> str:
+    """Get where reports and summaries read activity entries from.
+
+    Reads from AUTO_DAILY_STORAGE environment variable.
+    Falls back to default ("jsonl") if not set.
+
+    Returns:
+        Storage backend name ("jsonl" reads the hourly JSONL files,
+        "sqlite" also writes entries to the activity database and reads
+        time ranges from it).
+    """
+    return os.environ.get("AUTO_DAILY_STORAGE", DEFAULT_STORAGE)
+
+
+def get_json_backend() -> str:
+    """Get the JSON library used to decode log lines.
+
+    Reads from AUTO_DAILY_JSON_BACKEND environment variable.
+    Falls back to default ("auto") if not set.
+
+    Returns:
+        Backend name ("auto" uses orjson or msgspec when installed and the
+        standard json module otherwise, "orjson", "msgspec", "json").
+    """
+    return os.environ.get("AUTO_DAILY_JSON_BACKEND", DEFAULT_JSON_BACKEND)
+
+
+def get_db_path() -> Path:
+    """Get the activity database path.
+
+    Reads from AUTO_DAILY_DB_PATH environment variable.
+    Falls back to ~/.auto-daily/activity.db if not set.
+
+    Returns:
+        Path to the SQLite database file.
+    """
+    env_value = os.environ.get("AUTO_DAILY_DB_PATH")
+    if env_value:
+        return Path(os.path.expanduser(env_value))
+    return DEFAULT_DB_PATH
+
+
+def get_search_index_enabled() -> bool:
+    """Get whether the search index is updated while monitoring.
+
+    Reads from AUTO_DAILY_SEARCH_INDEX environment variable.
+    Falls back to False if not set.
+
+    Accepts:
+    - "true" or "1" for enabled
+    - "false" or "0" for disabled
+
+    Returns:
+        True if written log entries are also added to the search index.
+    """
+    value = os.environ.get("AUTO_DAILY_SEARCH_INDEX")
+
+    if value is None:
+        return DEFAULT_SEARCH_INDEX
+
+    return value.lower() in ("true", "1")
+
+
+def get_search_db_path() -> Path:
+    """Get the search index database path.
+
+    Reads from AUTO_DAILY_SEARCH_DB_PATH environment variable.
+    Falls back to ~/.auto-daily/search.db if not set.
+
+    Returns:
+        Path to the SQLite search index.
+    """
+    env_value = os.environ.get("AUTO_DAILY_SEARCH_DB_PATH")
+    if env_value:
+        return Path(os.path.expanduser(env_value))
+    return DEFAULT_SEARCH_DB_PATH
+
+
+def get_dedup_mode() -> str:
+    """Get how unchanged screens are handled by the capture pipeline.
+
+    Reads from AUTO_DAILY_DEDUP_MODE environment variable.
+    Falls back to default ("reuse") if not set.
+
+    Returns:
+        Dedup mode ("reuse", "marker", "off").
+    """
+    return os.environ.get("AUTO_DAILY_DEDUP_MODE", DEFAULT_DEDUP_MODE)
+
+
+def get_dedup_threshold() -> int:
+    """Get the maximum perceptual-hash distance treated as an unchanged screen.
+
+    Reads from AUTO_DAILY_DEDUP_THRESHOLD environment variable.
+    Falls back to default (4) if not set.
+
+    Returns:
+        Hamming distance threshold.
+    """
+    threshold_str = os.environ.get("AUTO_DAILY_DEDUP_THRESHOLD")
+    if threshold_str is None:
+        return DEFAULT_DEDUP_THRESHOLD
+    return int(threshold_str)
+
+
 def get_ai_backend() -> str:
     """Get the AI backend to use.
 
@@ -258,6 +571,162 @@ def get_ai_backend() -> str:
     return os.environ.get("AI_BACKEND", DEFAULT_AI_BACKEND)
 
 
+def get_summary_concurrency() -> int:
+    """Get how many hourly summaries are generated at the same time.
+
+    Reads from AUTO_DAILY_SUMMARY_CONCURRENCY environment variable.
+    Falls back to OLLAMA_NUM_PARALLEL (the requests an Ollama server handles
+    in parallel) and then to default (4) if not set.
+
+    Returns:
+        Maximum concurrent summary requests (at least 1).
+    """
+    value = os.environ.get("AUTO_DAILY_SUMMARY_CONCURRENCY") or os.environ.get(
+        "OLLAMA_NUM_PARALLEL"
+    )
+    if value is None:
+        return DEFAULT_SUMMARY_CONCURRENCY
+    return max(1, int(value))
+
+
+def get_summary_token_budget() -> int:
+    """Get the token budget of the log text in an hourly summary prompt.
+
+    Reads from AUTO_DAILY_SUMMARY_TOKEN_BUDGET environment variable.
+    Falls back to default (3000) if not set.
+
+    Returns:
+        Maximum estimated tokens of the log text (0 for no limit).
+    """
+    value = os.environ.get("AUTO_DAILY_SUMMARY_TOKEN_BUDGET")
+    if value is None:
+        return DEFAULT_SUMMARY_TOKEN_BUDGET
+    return max(0, int(value))
+
+
+def get_report_token_budget() -> int:
+    """Get the token budget of the summaries in a daily report prompt.
+
+    Reads from AUTO_DAILY_REPORT_TOKEN_BUDGET environment variable.
+    Falls back to default (6000) if not set.
+
+    Returns:
+        Maximum estimated tokens of the hourly summaries (0 for no limit).
+    """
+    value = os.environ.get("AUTO_DAILY_REPORT_TOKEN_BUDGET")
+    if value is None:
+        return DEFAULT_REPORT_TOKEN_BUDGET
+    return max(0, int(value))
+
+
+def get_rolling_summary_interval() -> float:
+    """Get how often the running summary of the current hour is updated.
+
+    Reads from AUTO_DAILY_ROLLING_SUMMARY_MINUTES environment variable.
+    Falls back to default (0, disabled) if not set.
+
+    Returns:
+        Interval in seconds (0 disables rolling summaries).
+    """
+    value = os.environ.get("AUTO_DAILY_ROLLING_SUMMARY_MINUTES")
+    minutes = float(value) if value is not None else DEFAULT_ROLLING_SUMMARY_MINUTES
+    return max(0.0, minutes * 60)
+
+
+def get_session_gap() -> float:
+    """Get the longest pause between two log entries of one activity session.
+
+    Reads from AUTO_DAILY_SESSION_GAP_MINUTES environment variable.
+    Falls back to default (5 minutes) if not set.
+
+    Returns:
+        Gap in seconds; a longer pause (e.g., a locked screen) starts a new
+        session.
+    """
+    value = os.environ.get("AUTO_DAILY_SESSION_GAP_MINUTES")
+    minutes = float(value) if value is not None else DEFAULT_SESSION_GAP_MINUTES
+    return max(0.0, minutes * 60)
+
+
+def get_calendar_timeout() -> float:
+    """Get how long to wait for each iCal calendar.
+
+    Reads from AUTO_DAILY_CALENDAR_TIMEOUT environment variable.
+    Falls back to default (10 seconds) if not set.
+
+    Returns:
+        Timeout in seconds for fetching and parsing one calendar.
+    """
+    value = os.environ.get("AUTO_DAILY_CALENDAR_TIMEOUT")
+    if value is None:
+        return DEFAULT_CALENDAR_TIMEOUT
+    return max(0.1, float(value))
+
+
+def get_llm_cache_enabled() -> bool:
+    """Get whether LLM responses are cached.
+
+    Reads from AUTO_DAILY_LLM_CACHE environment variable.
+    Falls back to False if not set.
+
+    Accepts:
+    - "true" or "1" for enabled
+    - "false" or "0" for disabled
+
+    Returns:
+        True if repeated prompts are answered from the cache.
+    """
+    value = os.environ.get("AUTO_DAILY_LLM_CACHE")
+
+    if value is None:
+        return DEFAULT_LLM_CACHE
+
+    return value.lower() in ("true", "1")
+
+
+def get_llm_cache_path() -> Path:
+    """Get the LLM response cache database path.
+
+    Reads from AUTO_DAILY_LLM_CACHE_PATH environment variable.
+    Falls back to ~/.auto-daily/llm_cache.db if not set.
+
+    Returns:
+        Path to the SQLite response cache.
+    """
+    env_value = os.environ.get("AUTO_DAILY_LLM_CACHE_PATH")
+    if env_value:
+        return Path(os.path.expanduser(env_value))
+    return DEFAULT_LLM_CACHE_PATH
+
+
+def get_llm_cache_max_bytes() -> int:
+    """Get the size limit of the LLM response cache.
+
+    Reads from AUTO_DAILY_LLM_CACHE_MAX_MB environment variable.
+    Falls back to default (64 MB) if not set.
+
+    Returns:
+        Maximum total size of the cached responses in bytes.
+    """
+    value = os.environ.get("AUTO_DAILY_LLM_CACHE_MAX_MB")
+    megabytes = float(value) if value is not None else DEFAULT_LLM_CACHE_MAX_MB
+    return max(0, int(megabytes * 1024 * 1024))
+
+
+def get_llm_cache_ttl() -> float:
+    """Get how long cached LLM responses stay valid.
+
+    Reads from AUTO_DAILY_LLM_CACHE_TTL_DAYS environment variable.
+    Falls back to default (30 days) if not set.
+
+    Returns:
+        TTL in seconds (0 keeps responses until they are evicted).
+    """
+    value = os.environ.get("AUTO_DAILY_LLM_CACHE_TTL_DAYS")
+    days = float(value) if value is not None else DEFAULT_LLM_CACHE_TTL_DAYS
+    return max(0.0, days * 24 * 60 * 60)
+
+
 def get_openai_api_key() -> str | None:
     """Get the OpenAI API key.
 
@@ -387,3 +856,123 @@ def get_ocr_filter_noise() -> bool:
         return DEFAULT_OCR_FILTER_NOISE
 
     return value.lower() in ("true", "1")
+
+
+def get_ocr_incremental() -> bool:
+    """Get whether incremental OCR of changed screen regions is enabled.
+
+    Reads from OCR_INCREMENTAL environment variable.
+    Falls back to False (disabled) if not set.
+
+    Accepts:
+    - "true" or "1" for enabled
+    - "false" or "0" for disabled
+
+    Returns:
+        True if incremental OCR is enabled, False otherwise.
+    """
+    value = os.environ.get("OCR_INCREMENTAL")
+
+    if value is None:
+        return DEFAULT_OCR_INCREMENTAL
+
+    return value.lower() in ("true", "1")
+
+
+def get_ocr_bands() -> int:
+    """Get the number of horizontal bands compared by incremental OCR.
+
+    Reads from OCR_BANDS environment variable.
+    Falls back to default (12) if not set.
+
+    Returns:
+        Number of full-width bands (at least 1).
+    """
+    bands_str = os.environ.get("OCR_BANDS")
+    if bands_str is None:
+        return DEFAULT_OCR_BANDS
+    return max(1, int(bands_str))
+
+
+def get_ocr_crop_window() -> bool:
+    """Get whether captures are cropped to the active window.
+
+    Reads from OCR_CROP_WINDOW environment variable.
+    Falls back to False (full screen) if not set.
+
+    Accepts:
+    - "true" or "1" for enabled
+    - "false" or "0" for disabled
+
+    Returns:
+        True if captures are cropped to the active window, False otherwise.
+    """
+    value = os.environ.get("OCR_CROP_WINDOW")
+
+    if value is None:
+        return DEFAULT_OCR_CROP_WINDOW
+
+    return value.lower() in ("true", "1")
+
+
+def get_ocr_grayscale() -> bool:
+    """Get whether captures are converted to grayscale before OCR.
+
+    Reads from OCR_GRAYSCALE environment variable.
+    Falls back to False (keep colors) if not set.
+
+    Accepts:
+    - "true" or "1" for enabled
+    - "false" or "0" for disabled
+
+    Returns:
+        True if captures are converted to grayscale, False otherwise.
+    """
+    value = os.environ.get("OCR_GRAYSCALE")
+
+    if value is None:
+        return DEFAULT_OCR_GRAYSCALE
+
+    return value.lower() in ("true", "1")
+
+
+def get_ocr_max_edge() -> int:
+    """Get the maximum long-edge length of images sent to OCR.
+
+    Reads from OCR_MAX_EDGE environment variable.
+    Falls back to default (0, no downscaling) if not set.
+
+    Returns:
+        Maximum long edge in pixels, or 0 to keep the original size.
+    """
+    value = os.environ.get("OCR_MAX_EDGE")
+    if value is None:
+        return DEFAULT_OCR_MAX_EDGE
+    return max(0, int(value))
+
+
+def get_ocr_image_format() -> str:
+    """Get the image format captures are re-encoded to before OCR.
+
+    Reads from OCR_IMAGE_FORMAT environment variable.
+    Falls back to default ("png") if not set.
+
+    Returns:
+        Image format name ("png", "jpeg", "webp").
+    """
+    return os.environ.get("OCR_IMAGE_FORMAT", DEFAULT_OCR_IMAGE_FORMAT).lower()
+
+
+def get_ocr_image_quality() -> int:
+    """Get the JPEG/WebP quality used when re-encoding captures.
+
+    Reads from OCR_IMAGE_QUALITY environment variable.
+    Falls back to default (85) if not set.
+
+    Returns:
+        Encoder quality between 1 and 100.
+    """
+    value = os.environ.get("OCR_IMAGE_QUALITY")
+    if value is None:
+        return DEFAULT_OCR_IMAGE_QUALITY
+    return min(100, max(1, int(value)))
@@ -0,0 +1,184 @@
+"""Bounded event queue with explicit backpressure policies."""
+
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Literal
+
+type BackpressurePolicy = Literal["drop_oldest", "coalesce", "block"]
+
+BACKPRESSURE_POLICIES: tuple[BackpressurePolicy, ...] = (
+    "drop_oldest",
+    "coalesce",
+    "block",
+)
+
+
+@dataclass
+class QueueStats:
+    """Counters describing what happened to items offered to a queue.
+
+    Attributes:
+        queued: Items accepted into the queue.
+        dropped: Items discarded to make room for newer ones.
+        coalesced: Items replaced in place by a newer item with the same key.
+    """
+
+    queued: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+
+
+class BoundedEventQueue[T]:
+    """Thread-safe bounded FIFO queue with a configurable backpressure policy.
+
+    Policies applied when an item is offered:
+    - drop_oldest: When full, the oldest pending item is discarded.
+    - coalesce: A pending item with the same key is replaced in place;
+      otherwise behaves like drop_oldest.
+    - block: The producer waits until there is room (or the timeout expires).
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: BackpressurePolicy = "drop_oldest",
+        key: Callable[[T], Hashable] | None = None,
+        on_discard: Callable[[T], None] | None = None,
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            maxsize: Maximum number of pending items (must be positive).
+            policy: Backpressure policy ("drop_oldest", "coalesce", "block").
+            key: Function returning the coalescing key of an item.
+                 Required when policy is "coalesce".
+            on_discard: Called with each item that is dropped or coalesced,
+                        e.g. to release resources held by the item.
+
+        Raises:
+            ValueError: If maxsize or policy is invalid.
+        """
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive: {maxsize}")
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        if policy == "coalesce" and key is None:
+            raise ValueError("coalesce policy requires a key function")
+
+        self._maxsize = maxsize
+        self._policy = policy
+        self._key = key
+        self._on_discard = on_discard
+        self._items: deque[T] = deque()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self.stats = QueueStats()
+
+    def put(self, item: T, timeout: float | None = None) -> bool:
+        """Offer an item to the queue according to the backpressure policy.
+
+        Args:
+            item: Item to enqueue.
+            timeout: Maximum seconds to wait under the "block" policy.
+                     None waits indefinitely.
+
+        Returns:
+            True if the item was accepted, False if the queue is closed or
+            the blocking put timed out.
+        """
+        discarded: T | None = None
+        with self._lock:
+            if self._closed:
+                return False
+
+            if self._policy == "coalesce":
+                discarded = self._replace_same_key(item)
+                if discarded is not None:
+                    self.stats.coalesced += 1
+                    self.stats.queued += 1
+                    self._not_empty.notify()
+
+            if discarded is None:
+                if len(self._items) >= self._maxsize:
+                    if self._policy == "block":
+                        if not self._not_full.wait_for(
+                            lambda: self._closed or len(self._items) < self._maxsize,
+                            timeout=timeout,
+                        ):
+                            return False
+                        if self._closed:
+                            return False
+                    else:
+                        discarded = self._items.popleft()
+                        self.stats.dropped += 1
+
+                self._items.append(item)
+                self.stats.queued += 1
+                self._not_empty.notify()
+
+        if discarded is not None and self._on_discard is not None:
+            self._on_discard(discarded)
+        return True
+
+    def _replace_same_key(self, item: T) -> T | None:
+        """Replace a pending item that shares the key of the given item.
+
+        Must be called with the lock held.
+
+        Returns:
+            The replaced item, or None if no pending item shares the key.
+        """
+        assert self._key is not None
+        item_key = self._key(item)
+        for i, pending in enumerate(self._items):
+            if self._key(pending) == item_key:
+                self._items[i] = item
+                return pending
+        return None
+
+    def get(self, timeout: float | None = None) -> T | None:
+        """Remove and return the oldest pending item.
+
+        Args:
+            timeout: Maximum seconds to wait for an item. None waits until an
+                     item arrives or the queue is closed.
+
+        Returns:
+            The next item, or None on timeout or when the queue is closed
+            and fully drained.
+        """
+        with self._lock:
+            if not self._not_empty.wait_for(
+                lambda: self._items or self._closed, timeout=timeout
+            ):
+                return None
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def close(self) -> None:
+        """Close the queue.
+
+        Pending items can still be consumed; new items are rejected and
+        blocked producers and consumers are woken up.
+        """
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the queue has been closed."""
+        return self._closed
+
+    def __len__(self) -> int:
+        """Return the number of pending items."""
+        with self._lock:
+            return len(self._items)
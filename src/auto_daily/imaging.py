@@ -0,0 +1,115 @@
+"""Image helpers shared by the capture pipeline stages.
+
+Besides opening captures from a path or an in-memory buffer, this module
+implements the optional preprocessing stage that shrinks captures before
+they are sent to an OCR backend: grayscale conversion, downscaling to a
+maximum long edge and re-encoding as PNG, JPEG or WebP. Vision models
+downscale large images anyway, so a full-screen Retina PNG mostly inflates
+the request payload.
+"""
+
+import io
+from dataclasses import dataclass
+
+from PIL import Image
+
+from auto_daily.config import (
+    get_ocr_grayscale,
+    get_ocr_image_format,
+    get_ocr_image_quality,
+    get_ocr_max_edge,
+)
+
+type ImageBuffer = bytes | bytearray | memoryview
+type ImageSource = str | ImageBuffer
+
+IMAGE_FORMATS = ("png", "jpeg", "webp")
+
+
+def open_image(source: ImageSource) -> Image.Image:
+    """Open an image from a file path or an in-memory buffer.
+
+    Args:
+        source: Path to an image file, or encoded image bytes.
+
+    Returns:
+        Lazily loaded PIL image; use it as a context manager to close it.
+    """
+    if isinstance(source, str):
+        return Image.open(source)
+    return Image.open(io.BytesIO(source))
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    """Settings of the image preprocessing stage.
+
+    Attributes:
+        grayscale: Convert the image to grayscale.
+        max_edge: Maximum length of the long edge in pixels (0 keeps the size).
+        image_format: Output encoding ("png", "jpeg", "webp").
+        quality: Encoder quality for JPEG and WebP (1-100).
+    """
+
+    grayscale: bool = False
+    max_edge: int = 0
+    image_format: str = "png"
+    quality: int = 85
+
+    def __post_init__(self) -> None:
+        """Validate the output format.
+
+        Raises:
+            ValueError: If the image format is not supported.
+        """
+        if self.image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format: {self.image_format}")
+
+    @classmethod
+    def from_config(cls) -> "PreprocessOptions":
+        """Build options from the OCR_GRAYSCALE, OCR_MAX_EDGE,
+        OCR_IMAGE_FORMAT and OCR_IMAGE_QUALITY environment variables."""
+        return cls(
+            grayscale=get_ocr_grayscale(),
+            max_edge=get_ocr_max_edge(),
+            image_format=get_ocr_image_format(),
+            quality=get_ocr_image_quality(),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether preprocessing changes the capture at all."""
+        return self.grayscale or self.max_edge > 0 or self.image_format != "png"
+
+
+def preprocess_image(source: ImageSource, options: PreprocessOptions) -> bytes:
+    """Shrink an image for OCR and re-encode it in memory.
+
+    Args:
+        source: Path to an image file, or encoded image bytes.
+        options: Preprocessing settings.
+
+    Returns:
+        The encoded image bytes.
+    """
+    with open_image(source) as opened:
+        if options.max_edge > 0:
+            # draft() lets JPEG decoders skip work when downscaling a lot
+            opened.draft(None, (options.max_edge, options.max_edge))
+        image = opened.convert("L" if options.grayscale else "RGB")
+
+    if options.max_edge > 0 and max(image.size) > options.max_edge:
+        image.thumbnail(
+            (options.max_edge, options.max_edge),
+            Image.Resampling.LANCZOS,
+            reducing_gap=3.0,
+        )
+
+    buffer = io.BytesIO()
+    if options.image_format == "png":
+        image.save(buffer, format="PNG", optimize=False)
+    elif options.image_format == "jpeg":
+        image.save(buffer, format="JPEG", quality=options.quality)
+    else:
+        image.save(buffer, format="WEBP", quality=options.quality, method=4)
+    return buffer.getvalue()
@@ -4,12 +4,15 @@ This module provides a unified interface for interacting with different LLM back
 """
 
 from auto_daily.config import get_ai_backend
+from auto_daily.llm.cache import CachedLLMClient, LLMCache
 from auto_daily.llm.lm_studio import LMStudioClient
 from auto_daily.llm.ollama import OllamaClient
 from auto_daily.llm.openai import OpenAIClient
 from auto_daily.llm.protocol import LLMClient
 
 __all__ = [
+    "CachedLLMClient",
+    "LLMCache",
     "LLMClient",
     "LMStudioClient",
     "OllamaClient",
@@ -0,0 +1,304 @@
+"""Persistent cache of LLM responses.
+
+Rerunning ``auto-daily report`` or ``summarize`` for the same date sends
+the same prompts again. ``CachedLLMClient`` wraps any LLM client and keeps
+the responses in a SQLite database (``~/.auto-daily/llm_cache.db`` by
+default), keyed by a hash of the backend, model, prompt and generation
+options, so unchanged inputs are answered without calling the model.
+
+The cache is bounded: entries older than the TTL are ignored and deleted,
+and once the stored responses exceed the size limit the least recently
+used ones are evicted.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from auto_daily.config import (
+    get_llm_cache_enabled,
+    get_llm_cache_max_bytes,
+    get_llm_cache_path,
+    get_llm_cache_ttl,
+)
+from auto_daily.llm.protocol import LLMClient
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+def cache_key(
+    backend: str, model: str, prompt: str, options: dict[str, Any] | None = None
+) -> str:
+    """Return the cache key of a generation request.
+
+    Args:
+        backend: Name identifying the backend (and its server).
+        model: Name of the model.
+        prompt: The prompt.
+        options: Generation options that change the response.
+
+    Returns:
+        Hex digest of the request.
+    """
+    request = json.dumps(
+        [backend, model, prompt, options or {}], ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters of a cache since it was opened.
+
+    Attributes:
+        hits: Requests answered from the cache.
+        misses: Requests sent to the model.
+        evictions: Responses removed to stay within the size limit.
+        expired: Responses removed because they were older than the TTL.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expired: int = 0
+
+    def format(self) -> str:
+        """Return a one-line summary for the CLI."""
+        line = f"LLM cache: {self.hits} hits, {self.misses} misses"
+        if self.evictions:
+            line += f", {self.evictions} evicted"
+        return line
+
+
+class LLMCache:
+    """Responses in a SQLite table with LRU eviction and a TTL.
+
+    Thread-safe; several clients may share one instance.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Open (and create if needed) the cache.
+
+        Args:
+            path: Database file.
+            max_bytes: Maximum total size of the stored responses.
+                      Uses AUTO_DAILY_LLM_CACHE_MAX_MB env var or default if
+                      not specified.
+            ttl: Seconds a response stays valid; 0 keeps responses until
+                they are evicted. Uses AUTO_DAILY_LLM_CACHE_TTL_DAYS env var
+                or default if not specified.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else get_llm_cache_max_bytes()
+        )
+        self.ttl = ttl if ttl is not None else get_llm_cache_ttl()
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "LLMCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def get(self, key: str, now: float | None = None) -> str | None:
+        """Return the cached response of a request, or None on a miss.
+
+        Args:
+            key: Cache key of the request.
+            now: Current time. Uses time.time() if not specified.
+
+        Returns:
+            The response, or None if it is not cached or has expired.
+        """
+        now = now if now is not None else time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl > 0 and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.stats.expired += 1
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.stats.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, now: float | None = None) -> None:
+        """Store a response and evict the least recently used ones if needed.
+
+        Args:
+            key: Cache key of the request.
+            response: The response text.
+            now: Current time. Uses time.time() if not specified.
+        """
+        now = now if now is not None else time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used responses over the size limit.
+
+        The lock must be held.
+        """
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        evicted: list[tuple[str]] = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.stats.evictions += len(evicted)
+
+    def size(self) -> tuple[int, int]:
+        """Return the number of responses and their total size in bytes."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return count, total
+
+
+class CachedLLMClient:
+    """LLM client answering repeated requests from an LLMCache.
+
+    Implements the LLMClient protocol around another client.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        cache: LLMCache,
+        backend: str | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            client: Client to send cache misses to.
+            cache: Cache of the responses.
+            backend: Name identifying the backend in cache keys. Uses the
+                    client's class name and base URL if not specified.
+            options: Generation options of the client, part of cache keys.
+        """
+        self._client = client
+        self.cache = cache
+        if backend is None:
+            backend = type(client).__name__
+            base_url = getattr(client, "base_url", None)
+            if isinstance(base_url, str):
+                backend += f"@{base_url}"
+        self._backend = backend
+        self._options = options or {}
+
+    def _key(self, prompt: str, model: str) -> str:
+        return cache_key(self._backend, model, prompt, self._options)
+
+    async def generate(self, prompt: str, model: str) -> str:
+        """Return the cached response or generate and cache it.
+
+        Args:
+            prompt: The prompt to send to the model.
+            model: Name of the model to use.
+
+        Returns:
+            Generated text response.
+        """
+        key = self._key(prompt, model)
+        response = self.cache.get(key)
+        if response is None:
+            response = await self._client.generate(prompt=prompt, model=model)
+            self.cache.put(key, response)
+        return response
+
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        """Yield the cached response at once, or stream and cache it.
+
+        A response is cached only once it was streamed completely.
+
+        Args:
+            prompt: The prompt to send to the model.
+            model: Name of the model to use.
+
+        Yields:
+            Chunks of the response in order.
+        """
+        key = self._key(prompt, model)
+        response = self.cache.get(key)
+        if response is not None:
+            yield response
+            return
+
+        chunks: list[str] = []
+        if hasattr(type(self._client), "generate_stream"):
+            async for chunk in self._client.generate_stream(prompt=prompt, model=model):
+                chunks.append(chunk)
+                yield chunk
+        else:
+            chunk = await self._client.generate(prompt=prompt, model=model)
+            chunks.append(chunk)
+            yield chunk
+        self.cache.put(key, "".join(chunks))
+
+
+def open_llm_cache() -> LLMCache | None:
+    """Open the configured LLM cache.
+
+    Returns:
+        The cache at AUTO_DAILY_LLM_CACHE_PATH, or None if
+        AUTO_DAILY_LLM_CACHE is disabled.
+    """
+    if not get_llm_cache_enabled():
+        return None
+    return LLMCache(get_llm_cache_path())
@@ -1,5 +1,7 @@
 """LM Studio LLM client implementation."""
 
+from collections.abc import AsyncIterator
+
 from openai import AsyncOpenAI
 
 
@@ -45,3 +47,22 @@ class LMStudioClient:
         )
         content = response.choices[0].message.content
         return content if content is not None else ""
+
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        """Generate text using the LM Studio API, yielding it as it is produced.
+
+        Args:
+            prompt: The prompt to send to the model.
+            model: Name of the model to use.
+
+        Yields:
+            Chunks of the response in order.
+        """
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -1,5 +1,8 @@
 """Ollama LLM client implementation."""
 
+import json
+from collections.abc import AsyncIterator
+
 import httpx
 
 from auto_daily.config import get_ollama_base_url
@@ -60,3 +63,43 @@ class OllamaClient:
             )
             response.raise_for_status()
             return response.json()["response"]
+
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        """Generate text using the Ollama API, yielding it as it is produced.
+
+        The timeout applies to each read, so long responses do not time out
+        as long as tokens keep arriving.
+
+        Args:
+            prompt: The prompt to send to the model.
+            model: Name of the model to use.
+
+        Yields:
+            Chunks of the response in order.
+
+        Raises:
+            RuntimeError: If Ollama reports an error mid-stream.
+        """
+        async with (
+            httpx.AsyncClient() as client,
+            client.stream(
+                "POST",
+                f"{self.base_url}/api/generate",
+                json={
+                    "model": model,
+                    "prompt": prompt,
+                    "stream": True,
+                },
+                timeout=120.0,
+            ) as response,
+        ):
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if "error" in data:
+                    raise RuntimeError(f"Ollama error: {data['error']}")
+                yield data.get("response", "")
+                if data.get("done"):
+                    break
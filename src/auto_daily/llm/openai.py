@@ -1,5 +1,7 @@
 """OpenAI LLM client implementation."""
 
+from collections.abc import AsyncIterator
+
 from openai import AsyncOpenAI
 
 from auto_daily.config import get_openai_api_key, get_openai_model
@@ -40,3 +42,22 @@ class OpenAIClient:
         )
         content = response.choices[0].message.content
         return content if content is not None else ""
+
+    async def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        """Generate text using the OpenAI API, yielding it as it is produced.
+
+        Args:
+            prompt: The prompt to send to the model.
+            model: Name of the model to use.
+
+        Yields:
+            Chunks of the response in order.
+        """
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -1,5 +1,6 @@
 """Protocol definition for LLM clients."""
 
+from collections.abc import AsyncIterator
 from typing import Protocol, runtime_checkable
 
 
@@ -22,3 +23,15 @@ class LLMClient(Protocol):
             Generated text response.
         """
         ...
+
+    def generate_stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        """Generate text using the LLM, yielding it as it is produced.
+
+        Args:
+            prompt: The prompt to send to the model.
+            model: Name of the model to use.
+
+        Yields:
+            Chunks of the response (about one token each) in order.
+        """
+        ...
@@ -0,0 +1,123 @@
+"""Streaming generation into files.
+
+A daily report can take a minute or more to generate. Instead of waiting
+for the whole completion, ``generate_to_file`` writes each streamed chunk to
+a hidden ``.<name>.partial`` file next to the target as it arrives (it can
+be followed with ``tail -f``) and renames it into place once the response is
+complete, so the target is never left half-written. The time to the first
+token and the generation speed are measured along the way.
+"""
+
+import os
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from auto_daily.llm.protocol import LLMClient
+
+type ChunkCallback = Callable[[str], None]
+
+
+@dataclass
+class GenerationStats:
+    """Timing of a streamed generation.
+
+    Attributes:
+        time_to_first_token: Seconds until the first chunk arrived, or None
+            if the response was empty.
+        tokens: Chunks received; backends stream about one token per chunk.
+        elapsed: Seconds until the response was complete.
+    """
+
+    time_to_first_token: float | None = None
+    tokens: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Generation speed after the first token."""
+        if self.time_to_first_token is None:
+            return 0.0
+        duration = self.elapsed - self.time_to_first_token
+        return self.tokens / duration if duration > 0 else 0.0
+
+    def format(self) -> str:
+        """Return a one-line summary for the CLI."""
+        if self.time_to_first_token is None:
+            return f"Empty response after {self.elapsed:.1f} s"
+        return (
+            f"First token after {self.time_to_first_token:.1f} s, "
+            f"{self.tokens} tokens in {self.elapsed:.1f} s "
+            f"({self.tokens_per_second:.1f} tokens/s)"
+        )
+
+
+async def stream_text(client: LLMClient, prompt: str, model: str) -> AsyncIterator[str]:
+    """Yield the response of a client chunk by chunk.
+
+    Clients without a generate_stream method yield their whole response as
+    a single chunk.
+
+    Args:
+        client: LLM client.
+        prompt: The prompt to send to the model.
+        model: Name of the model to use.
+
+    Yields:
+        Text chunks in order.
+    """
+    if hasattr(type(client), "generate_stream"):
+        async for chunk in client.generate_stream(prompt=prompt, model=model):
+            yield chunk
+    else:
+        yield await client.generate(model=model, prompt=prompt)
+
+
+def partial_path(path: Path) -> Path:
+    """Return the file a response is streamed into before it is complete."""
+    return path.with_name(f".{path.name}.partial")
+
+
+async def generate_to_file(
+    client: LLMClient,
+    prompt: str,
+    model: str,
+    path: Path,
+    on_chunk: ChunkCallback | None = None,
+) -> tuple[str, GenerationStats]:
+    """Stream a response into a file, replacing it atomically when complete.
+
+    Args:
+        client: LLM client.
+        prompt: The prompt to send to the model.
+        model: Name of the model to use.
+        path: File to write the response to.
+        on_chunk: Called with every chunk (e.g., to echo it to the terminal).
+
+    Returns:
+        Tuple of (full response, timing).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = partial_path(path)
+    stats = GenerationStats()
+    chunks: list[str] = []
+    started = time.perf_counter()
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            async for chunk in stream_text(client, prompt, model):
+                if not chunk:
+                    continue
+                if stats.time_to_first_token is None:
+                    stats.time_to_first_token = time.perf_counter() - started
+                stats.tokens += 1
+                chunks.append(chunk)
+                f.write(chunk)
+                f.flush()
+                if on_chunk is not None:
+                    on_chunk(chunk)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    stats.elapsed = time.perf_counter() - started
+    return "".join(chunks), stats
@@ -0,0 +1,256 @@
+"""Decoding of JSONL log lines into compact records.
+
+Reading weeks of logs as dictionaries keeps a dict per entry, another one
+for its ``window_info`` and a copy of the same app names and window titles
+for every capture. ``LogDecoder`` turns each line into a ``LogRecord``
+with ``__slots__`` instead: the app name and window title are interned
+per decoder, so all entries of a window share one string, and the
+timestamp stays a string until ``parsed_timestamp`` is used.
+
+Lines are decoded from bytes with orjson or msgspec when one of them is
+installed (``uv sync --extra fast-json``) and with the standard json
+module otherwise; the records are the same whichever backend is used.
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from auto_daily.calendar import LogEntry
+from auto_daily.config import get_json_backend
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+# Keys stored in LogRecord slots rather than in LogRecord.extra
+_SLOT_KEYS = frozenset({"timestamp", "window_info", "ocr_text"})
+
+type JSONLoads = Callable[[bytes], Any]
+
+
+def _import_loads(name: str) -> JSONLoads:
+    """Return the loads function of a JSON backend.
+
+    Raises:
+        ImportError: If the backend's package is not installed.
+        ValueError: If the backend is not supported.
+    """
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads
+    if name == "msgspec":
+        import msgspec
+
+        decoder = msgspec.json.Decoder()
+
+        def loads(data: bytes) -> Any:
+            try:
+                return decoder.decode(data)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+        return loads
+    if name == "json":
+        import json
+
+        return json.loads
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+def load_json_backend(name: str | None = None) -> tuple[str, JSONLoads]:
+    """Select the JSON library used to decode log lines.
+
+    Args:
+        name: Backend ("auto", "orjson", "msgspec", "json").
+              Uses AUTO_DAILY_JSON_BACKEND env var or default if not
+              specified.
+
+    Returns:
+        Tuple of (backend name, function decoding one line from bytes).
+
+    Raises:
+        ImportError: If a backend that is not installed is requested.
+        ValueError: If the backend is not supported.
+    """
+    name = name if name is not None else get_json_backend()
+    if name != "auto":
+        try:
+            return name, _import_loads(name)
+        except ImportError as e:
+            raise ImportError(
+                f"The {name} JSON backend requires the {name} package "
+                "(install with: uv sync --extra fast-json)"
+            ) from e
+    for candidate in JSON_BACKENDS:
+        try:
+            return candidate, _import_loads(candidate)
+        except ImportError:
+            continue
+    raise AssertionError("the json module is always available")
+
+
+class LogRecord:
+    """A log entry decoded from a log line.
+
+    Attributes:
+        timestamp: ISO 8601 timestamp as written in the log.
+        app_name: Application name ("" for entries without window_info).
+        window_title: Window title ("" for entries without window_info).
+        ocr_text: OCR text, with text from the blob store resolved.
+        extra: The other keys of the entry (type, slack_context, speech
+              fields), or None if there are none.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "app_name",
+        "window_title",
+        "ocr_text",
+        "extra",
+        "_has_window",
+        "_parsed",
+    )
+
+    def __init__(
+        self,
+        timestamp: str,
+        app_name: str = "",
+        window_title: str = "",
+        ocr_text: str = "",
+        extra: dict[str, Any] | None = None,
+        has_window: bool = True,
+    ) -> None:
+        self.timestamp = timestamp
+        self.app_name = app_name
+        self.window_title = window_title
+        self.ocr_text = ocr_text
+        self.extra = extra
+        self._has_window = has_window
+        self._parsed: datetime | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"LogRecord({self.timestamp!r}, {self.app_name!r}, {self.window_title!r})"
+        )
+
+    @classmethod
+    def from_entry(
+        cls, entry: dict[str, Any], strings: dict[str, str] | None = None
+    ) -> "LogRecord":
+        """Build a record from a log entry dictionary.
+
+        Args:
+            entry: The entry, with blob references already resolved.
+            strings: Intern table shared by the records of a read; app names
+                    and window titles are replaced by the table's copy.
+
+        Returns:
+            The record.
+        """
+        window_info = entry.get("window_info")
+        has_window = isinstance(window_info, dict)
+        app_name = window_info.get("app_name", "") if has_window else ""
+        window_title = window_info.get("window_title", "") if has_window else ""
+        if strings is not None:
+            app_name = strings.setdefault(app_name, app_name)
+            window_title = strings.setdefault(window_title, window_title)
+        extra = {key: value for key, value in entry.items() if key not in _SLOT_KEYS}
+        return cls(
+            str(entry.get("timestamp", "")),
+            app_name,
+            window_title,
+            entry.get("ocr_text") or "",
+            extra or None,
+            has_window,
+        )
+
+    @property
+    def parsed_timestamp(self) -> datetime:
+        """The timestamp as a datetime, parsed on first access.
+
+        Raises:
+            ValueError: If the timestamp is not in ISO 8601 format.
+        """
+        if self._parsed is None:
+            self._parsed = datetime.fromisoformat(self.timestamp)
+        return self._parsed
+
+    @property
+    def type(self) -> str:
+        """Entry type ("activity" or "speech")."""
+        return (self.extra or {}).get("type", "activity")
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """The entry as a dictionary in the JSONL log format."""
+        entry: dict[str, Any] = {"timestamp": self.timestamp}
+        if self._has_window:
+            entry["window_info"] = {
+                "app_name": self.app_name,
+                "window_title": self.window_title,
+            }
+        if self._has_window or self.ocr_text:
+            entry["ocr_text"] = self.ocr_text
+        if self.extra:
+            entry.update(self.extra)
+        return entry
+
+    def to_log_entry(self) -> LogEntry:
+        """Convert the record to a LogEntry for calendar matching."""
+        return LogEntry(
+            timestamp=self.parsed_timestamp,
+            app_name=self.app_name,
+            window_title=self.window_title,
+            ocr_text=self.ocr_text,
+        )
+
+
+class LogDecoder:
+    """Decode log lines into LogRecord, sharing strings between records."""
+
+    def __init__(self, backend: str | None = None) -> None:
+        """Initialize the decoder.
+
+        Args:
+            backend: JSON backend ("auto", "orjson", "msgspec", "json").
+                    Uses AUTO_DAILY_JSON_BACKEND env var or default if not
+                    specified.
+        """
+        self.backend, self._loads = load_json_backend(backend)
+        self._strings: dict[str, str] = {}
+
+    def decode_entry(self, line: bytes | str) -> dict[str, Any] | None:
+        """Decode one line into an entry dictionary.
+
+        Args:
+            line: A line of the JSONL log.
+
+        Returns:
+            The entry, or None for empty, unparsable and non-object lines.
+        """
+        line = line.strip()
+        if not line:
+            return None
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        try:
+            entry = self._loads(line)
+        except ValueError:
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def record(self, entry: dict[str, Any]) -> LogRecord:
+        """Build a record from an entry, interning its window strings."""
+        return LogRecord.from_entry(entry, self._strings)
+
+    def decode(self, line: bytes | str) -> LogRecord | None:
+        """Decode one line into a record.
+
+        Args:
+            line: A line of the JSONL log.
+
+        Returns:
+            The record, or None for empty, unparsable and non-object lines.
+        """
+        entry = self.decode_entry(line)
+        return self.record(entry) if entry is not None else None
@@ -0,0 +1,258 @@
+"""Transparent access to hourly log files, compressed or not.
+
+A closed hour may be stored as ``activity_HH.jsonl.gz`` or
+``activity_HH.jsonl.zst`` instead of ``activity_HH.jsonl`` (see
+``auto_daily.compactor``). Readers address logs by their plain path and use
+``open_log``, which streams the decompressed content. If an entry was
+appended after compaction, the plain file exists next to the compressed
+segment and its lines follow the segment's. zstd segments may reference a
+shared dictionary stored in ``log_base/dictionaries/<dict_id>.zdict``.
+"""
+
+import gzip
+import io
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+DICTIONARY_DIR = "dictionaries"
+DICTIONARY_SUFFIX = ".zdict"
+
+HOURLY_LOG_PATTERN = re.compile(r"activity_(\d{2})\.jsonl(?:\.gz|\.zst)?")
+
+READ_CHUNK_SIZE = 1 << 16
+
+# Enough bytes to parse any zstd frame header
+ZSTD_FRAME_HEADER_SIZE_MAX = 18
+
+
+def compressed_path(path: Path, suffix: str) -> Path:
+    """Return the path of the compressed segment of a plain log path."""
+    return path.with_name(path.name + suffix)
+
+
+def plain_path(path: Path) -> Path:
+    """Return the plain log path of a (possibly compressed) log file."""
+    if path.suffix in COMPRESSED_SUFFIXES:
+        return path.with_suffix("")
+    return path
+
+
+def log_segments(path: Path) -> list[Path]:
+    """Return the existing files holding a log, in reading order.
+
+    Args:
+        path: Plain log path (e.g., logs/2024-12-24/activity_10.jsonl).
+
+    Returns:
+        The compressed segment (if any) followed by the plain file (if any).
+    """
+    segments = [
+        compressed
+        for suffix in COMPRESSED_SUFFIXES
+        if (compressed := compressed_path(path, suffix)).exists()
+    ]
+    if path.exists():
+        segments.append(path)
+    return segments
+
+
+def log_exists(path: Path) -> bool:
+    """Return True if a log exists in plain or compressed form."""
+    return bool(log_segments(path))
+
+
+def load_zstd() -> Any:
+    """Import the optional zstandard module.
+
+    Raises:
+        ImportError: If zstandard is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compression requires the zstandard package "
+            "(install with: uv sync --extra zstd)"
+        ) from e
+    return zstandard
+
+
+def dictionary_dir(path: Path) -> Path:
+    """Return the dictionary directory for a log file in log_base/YYYY-MM-DD/."""
+    return path.parent.parent / DICTIONARY_DIR
+
+
+def _open_zstd(path: Path) -> IO[bytes]:
+    """Open a zstd segment, loading the dictionary its frame references."""
+    zstandard = load_zstd()
+    f = open(path, "rb")
+    header = f.read(ZSTD_FRAME_HEADER_SIZE_MAX)
+    f.seek(0)
+    dict_id = zstandard.get_frame_parameters(header).dict_id
+    if dict_id:
+        dict_file = dictionary_dir(path) / f"{dict_id}{DICTIONARY_SUFFIX}"
+        dictionary = zstandard.ZstdCompressionDict(dict_file.read_bytes())
+        decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+    else:
+        decompressor = zstandard.ZstdDecompressor()
+    reader = decompressor.stream_reader(f, closefd=True, read_across_frames=True)
+    return io.BufferedReader(reader)
+
+
+def _open_segment(path: Path) -> IO[bytes]:
+    """Open one plain or compressed file as a binary stream of JSONL."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    if path.suffix == ".zst":
+        return _open_zstd(path)
+    return open(path, "rb")
+
+
+class _ChainedReader(io.RawIOBase):
+    """Read several binary streams one after another."""
+
+    def __init__(self, paths: list[Path]) -> None:
+        self._paths = list(paths)
+        self._current: IO[bytes] | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while True:
+            if self._current is None:
+                if not self._paths:
+                    return 0
+                self._current = _open_segment(self._paths.pop(0))
+            data = self._current.read(len(buffer))
+            if data:
+                buffer[: len(data)] = data
+                return len(data)
+            self._current.close()
+            self._current = None
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        super().close()
+
+
+def open_log(path: Path) -> IO[bytes]:
+    """Open a log for streaming, decompressing transparently.
+
+    Args:
+        path: Plain log path.
+
+    Returns:
+        Binary stream of the JSONL content.
+
+    Raises:
+        FileNotFoundError: If the log exists in no form.
+    """
+    segments = log_segments(path)
+    if not segments:
+        raise FileNotFoundError(path)
+    if len(segments) == 1:
+        return _open_segment(segments[0])
+    return io.BufferedReader(_ChainedReader(segments))
+
+
+def _segment_size(path: Path) -> int | None:
+    """Return the decompressed size of one file, if cheaply known."""
+    if path.suffix == ".gz":
+        # ISIZE trailer: uncompressed size modulo 2**32 of the last member
+        with open(path, "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return int.from_bytes(f.read(4), "little")
+    if path.suffix == ".zst":
+        zstandard = load_zstd()
+        with open(path, "rb") as f:
+            header = f.read(ZSTD_FRAME_HEADER_SIZE_MAX)
+        size = zstandard.get_frame_parameters(header).content_size
+        return None if size == zstandard.CONTENTSIZE_UNKNOWN else size
+    return path.stat().st_size
+
+
+def log_size(path: Path) -> int | None:
+    """Return the decompressed size of a log without decompressing it.
+
+    Compressed segments written by the compactor record their size in the
+    gzip trailer or the zstd frame header.
+
+    Args:
+        path: Plain log path.
+
+    Returns:
+        Size in bytes, or None if it cannot be determined cheaply.
+    """
+    total = 0
+    for segment in log_segments(path):
+        size = _segment_size(segment)
+        if size is None:
+            return None
+        total += size
+    return total
+
+
+def skip_bytes(f: IO[bytes], count: int) -> None:
+    """Advance a stream opened by open_log by count bytes."""
+    if f.seekable():
+        f.seek(count)
+        return
+    while count > 0:
+        chunk = f.read(min(count, READ_CHUNK_SIZE))
+        if not chunk:
+            return
+        count -= len(chunk)
+
+
+def open_log_text(path: Path) -> IO[str]:
+    """Open a log as UTF-8 text, decompressing transparently."""
+    return io.TextIOWrapper(open_log(path), encoding="utf-8")
+
+
+def read_log_text(path: Path) -> str:
+    """Read the whole JSONL content of a log."""
+    with open_log_text(path) as f:
+        return f.read()
+
+
+def iter_hourly_logs(log_base: Path) -> Iterator[Path]:
+    """Yield the plain paths of all hourly logs under a log directory.
+
+    Args:
+        log_base: Base directory containing YYYY-MM-DD/ directories.
+
+    Yields:
+        Plain log paths in chronological order, once per hour even if both
+        a compressed and a plain file exist.
+    """
+    for date_dir in sorted(log_base.glob("????-??-??")):
+        yield from (
+            date_dir / f"activity_{hour:02d}.jsonl" for hour in log_hours(date_dir)
+        )
+
+
+def log_hours(date_dir: Path) -> list[int]:
+    """Return the hours that have a log in a date directory.
+
+    Args:
+        date_dir: Directory like logs/2024-12-24/.
+
+    Returns:
+        Sorted hours (0-23), plain or compressed.
+    """
+    if not date_dir.is_dir():
+        return []
+    hours = {
+        int(match.group(1))
+        for log_file in date_dir.glob("activity_*.jsonl*")
+        if (match := HOURLY_LOG_PATTERN.fullmatch(log_file.name))
+    }
+    return sorted(hours)
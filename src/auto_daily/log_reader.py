@@ -0,0 +1,164 @@
+"""Streaming reader of the log entries of a day or a time range.
+
+Logs of a day are spread over ``log_base/YYYY-MM-DD/activity_HH.jsonl``
+(plain or compressed), and older installations wrote a single daily file,
+``activity_YYYY-MM-DD.jsonl``, either in log_base or in the date directory.
+``iter_day_records`` and ``iter_records`` read all of them as one stream of
+``LogRecord`` in timestamp order. Files are opened one at a time and lines
+are parsed as they are reached, so memory is bounded by one hourly file
+(needed to put its entries in order) instead of growing with the day.
+Lines are decoded by ``auto_daily.log_decoder``.
+"""
+
+import heapq
+import itertools
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any
+
+from auto_daily.blob_store import REF_KEY, BlobStore, find_blob_store, resolve_entry
+from auto_daily.calendar import LogEntry
+from auto_daily.log_decoder import LogDecoder, LogRecord
+from auto_daily.log_files import log_exists, log_hours, open_log
+from auto_daily.logger import get_hourly_log_path, get_log_filename
+
+
+def _legacy_files(log_base: Path, target_date: date) -> list[Path]:
+    """Return the existing legacy daily files of a date."""
+    filename = get_log_filename(datetime.combine(target_date, time()))
+    candidates = [log_base / filename, log_base / target_date.isoformat() / filename]
+    return [path for path in candidates if log_exists(path)]
+
+
+def day_log_files(log_base: Path, target_date: date) -> list[Path]:
+    """Return the plain paths of all logs of a date.
+
+    Args:
+        log_base: Base directory for logs.
+        target_date: The date.
+
+    Returns:
+        Hourly logs in hour order, followed by legacy daily files.
+    """
+    date_dir = log_base / target_date.isoformat()
+    hourly = [date_dir / f"activity_{hour:02d}.jsonl" for hour in log_hours(date_dir)]
+    return hourly + _legacy_files(log_base, target_date)
+
+
+def iter_file_records(
+    log_file: Path, decoder: LogDecoder | None = None
+) -> Iterator[LogRecord]:
+    """Yield the entries of one log file in written order.
+
+    Empty and unparsable lines are skipped. The blob store is only looked
+    up once an entry references it.
+
+    Args:
+        log_file: Plain path of the log (compressed segments are read too).
+        decoder: Decoder to share interned strings with other files.
+                A new one is used if not specified.
+
+    Yields:
+        Records in the order they were written.
+    """
+    decoder = decoder if decoder is not None else LogDecoder()
+    store: BlobStore | None = None
+    store_found = False
+    with open_log(log_file) as f:
+        for line in f:
+            entry = decoder.decode_entry(line)
+            if entry is None:
+                continue
+            if REF_KEY in entry:
+                if not store_found:
+                    store = find_blob_store(log_file)
+                    store_found = True
+                entry = resolve_entry(entry, store)
+            yield decoder.record(entry)
+
+
+def _sorted_records(log_file: Path, decoder: LogDecoder) -> Iterator[LogRecord]:
+    """Yield the entries of an hourly log in timestamp order.
+
+    Captures finish out of order by a few seconds, so the (small) hour is
+    sorted as a whole.
+    """
+    records = iter_file_records(log_file, decoder)
+    yield from sorted(records, key=lambda r: r.timestamp)
+
+
+def _in_range(
+    records: Iterable[LogRecord], start: datetime, end: datetime
+) -> Iterator[LogRecord]:
+    """Yield the records with start <= timestamp < end."""
+    for record in records:
+        try:
+            if start <= record.parsed_timestamp < end:
+                yield record
+        except (TypeError, ValueError):
+            continue
+
+
+def iter_records(log_base: Path, start: datetime, end: datetime) -> Iterator[LogRecord]:
+    """Yield the entries between two times from all log files.
+
+    Args:
+        log_base: Base directory for logs.
+        start: First time to include.
+        end: First time to exclude.
+
+    Yields:
+        Records in timestamp order.
+    """
+    decoder = LogDecoder()
+    day = start.date()
+    while datetime.combine(day, time()) < end:
+        day_start = datetime.combine(day, time())
+        hourly: list[Iterator[LogRecord]] = []
+        for hour in log_hours(log_base / day.isoformat()):
+            hour_start = day_start + timedelta(hours=hour)
+            hour_end = hour_start + timedelta(hours=1)
+            if hour_end <= start or hour_start >= end:
+                continue
+            records = _sorted_records(
+                get_hourly_log_path(log_base, hour_start), decoder
+            )
+            if hour_start < start or hour_end > end:
+                records = _in_range(records, start, end)
+            hourly.append(records)
+
+        # A legacy daily file belongs to its date whatever its timestamps say
+        whole_day = start <= day_start and day_start + timedelta(days=1) <= end
+        streams: list[Iterable[LogRecord]] = [itertools.chain(*hourly)]
+        for legacy in _legacy_files(log_base, day):
+            records = iter_file_records(legacy, decoder)
+            streams.append(records if whole_day else _in_range(records, start, end))
+        yield from heapq.merge(*streams, key=lambda r: r.timestamp)
+        day += timedelta(days=1)
+
+
+def iter_day_records(log_base: Path, target_date: date) -> Iterator[LogRecord]:
+    """Yield the entries of a date from all its log files.
+
+    Args:
+        log_base: Base directory for logs.
+        target_date: The date.
+
+    Yields:
+        Records in timestamp order.
+    """
+    start = datetime.combine(target_date, time())
+    yield from iter_records(log_base, start, start + timedelta(days=1))
+
+
+def iter_day_entries(log_base: Path, target_date: date) -> Iterator[dict[str, Any]]:
+    """Yield the entry dictionaries of a date (see iter_day_records)."""
+    for record in iter_day_records(log_base, target_date):
+        yield record.data
+
+
+def iter_day_log_entries(log_base: Path, target_date: date) -> Iterator[LogEntry]:
+    """Yield the entries of a date as LogEntry (see iter_day_records)."""
+    for record in iter_day_records(log_base, target_date):
+        yield record.to_log_entry()
@@ -0,0 +1,333 @@
+"""Single-writer buffered JSONL log writer.
+
+``append_log_hourly`` opens, appends to and closes the hourly file for every
+entry, and several threads may do so at the same time. ``LogWriter`` instead
+owns the open hourly file on a dedicated thread. Producers enqueue entries;
+the writer collects them for up to the flush interval and writes each batch
+with a single write call (group commit), so lines can never interleave. When
+the hour changes, the previous file is flushed, optionally fsynced and closed
+before the first line is written to the next one. Each batch is also handed
+to the attached ``EntrySink`` objects (the SQLite activity store, the search
+index), which insert it in one transaction. With OCR blobs enabled, the long
+OCR texts of a batch are moved into the blob store in one transaction too;
+sinks still receive the full text.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Protocol, runtime_checkable
+
+from auto_daily.blob_store import BlobStore, externalize_entries, open_blob_store
+from auto_daily.config import get_log_flush_interval_ms, get_log_fsync, get_ocr_blobs
+from auto_daily.event_queue import BoundedEventQueue
+from auto_daily.logger import (
+    build_activity_entry,
+    build_speech_entry,
+    get_hourly_log_path,
+)
+
+logger = logging.getLogger(__name__)
+
+# "off": leave durability to the OS, "rotate": fsync when an hourly file is
+# closed, "batch": fsync after every written batch
+FSYNC_POLICIES = ("off", "rotate", "batch")
+
+# Maximum entries written in one batch
+DEFAULT_MAX_BATCH = 256
+
+# Maximum pending entries before producers block
+DEFAULT_QUEUE_SIZE = 4096
+
+
+@runtime_checkable
+class EntrySink(Protocol):
+    """Protocol for components receiving every batch of written log entries."""
+
+    def add_many(self, entries: list[dict[str, Any]]) -> int:
+        """Insert entries; returns the number of entries added."""
+        ...
+
+
+@dataclass
+class _PendingEntry:
+    """An entry waiting to be written to its hourly file."""
+
+    path: Path
+    entry: dict[str, Any]
+
+
+@dataclass
+class _FlushRequest:
+    """Marker asking the writer to write everything queued before it."""
+
+    done: threading.Event
+
+
+@dataclass
+class LogWriterStats:
+    """Counters of the log writer.
+
+    Attributes:
+        entries: Entries written.
+        batches: Batches (write calls per file) written.
+        fsyncs: fsync calls made.
+        rotations: Times the writer switched to another hourly file.
+        failed: Entries that could not be written.
+    """
+
+    entries: int = 0
+    batches: int = 0
+    fsyncs: int = 0
+    rotations: int = 0
+    failed: int = 0
+
+
+class LogWriter:
+    """Write hourly JSONL logs from a single background thread."""
+
+    def __init__(
+        self,
+        log_base: Path,
+        flush_interval_ms: float | None = None,
+        fsync: str | None = None,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        sinks: Sequence[EntrySink] = (),
+        ocr_blobs: bool | None = None,
+    ) -> None:
+        """Initialize the log writer.
+
+        Args:
+            log_base: Base directory for logs.
+            flush_interval_ms: How long entries are collected before a batch
+                              is written. Uses AUTO_DAILY_LOG_FLUSH_INTERVAL_MS
+                              env var or default if not specified.
+            fsync: fsync policy ("off", "rotate", "batch"). Uses
+                  AUTO_DAILY_LOG_FSYNC env var or default if not specified.
+            max_batch: Maximum entries per batch.
+            queue_size: Maximum pending entries; producers block when full.
+            sinks: Components that also receive every batch (e.g.,
+                  ActivityStore, SearchIndex).
+            ocr_blobs: Store long OCR text in the blob store and log only its
+                      hash. Uses AUTO_DAILY_OCR_BLOBS env var or default if
+                      not specified.
+
+        Raises:
+            ValueError: If the fsync policy is not supported.
+        """
+        self.log_base = log_base
+        interval_ms = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else get_log_flush_interval_ms()
+        )
+        self._flush_interval = interval_ms / 1000
+        self._fsync = fsync if fsync is not None else get_log_fsync()
+        if self._fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {self._fsync}")
+        self._max_batch = max_batch
+        self._sinks = list(sinks)
+        use_blobs = ocr_blobs if ocr_blobs is not None else get_ocr_blobs()
+        self._blob_store: BlobStore | None = (
+            open_blob_store(log_base) if use_blobs else None
+        )
+
+        self._queue: BoundedEventQueue[_PendingEntry | _FlushRequest] = (
+            BoundedEventQueue(queue_size, "block")
+        )
+        self._file: IO[str] | None = None
+        self._file_path: Path | None = None
+        self._created_dirs: set[Path] = set()
+        self._thread: threading.Thread | None = None
+        self.stats = LogWriterStats()
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write all pending entries, close the current file and stop."""
+        self._queue.close()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def write(self, timestamp: datetime, entry: dict[str, Any]) -> Path | None:
+        """Enqueue an entry for its hourly file.
+
+        Args:
+            timestamp: Time of the entry; selects the hourly file.
+            entry: JSON-serializable entry.
+
+        Returns:
+            Path of the hourly file the entry goes to, or None if the writer
+            is stopped.
+        """
+        path = get_hourly_log_path(self.log_base, timestamp)
+        if not self._queue.put(_PendingEntry(path, entry)):
+            return None
+        return path
+
+    def append_activity(
+        self,
+        window_info: dict[str, str],
+        ocr_text: str,
+        *,
+        slack_context: Any = None,
+        timestamp: datetime | None = None,
+        unchanged: bool = False,
+    ) -> Path | None:
+        """Enqueue an activity entry; same arguments as append_log_hourly."""
+        now, entry = build_activity_entry(
+            window_info,
+            ocr_text,
+            slack_context=slack_context,
+            timestamp=timestamp,
+            unchanged=unchanged,
+        )
+        return self.write(now, entry)
+
+    def append_speech(
+        self,
+        transcript: str,
+        confidence: float,
+        is_final: bool,
+        language: str = "ja-JP",
+    ) -> Path | None:
+        """Enqueue a speech entry; same arguments as append_log_speech."""
+        now, entry = build_speech_entry(transcript, confidence, is_final, language)
+        return self.write(now, entry)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every entry enqueued so far has been written.
+
+        Args:
+            timeout: Maximum seconds to wait. None waits indefinitely.
+
+        Returns:
+            True if the entries were written, False on timeout or if the
+            writer is stopped.
+        """
+        request = _FlushRequest(threading.Event())
+        if not self._queue.put(request):
+            return False
+        return request.done.wait(timeout)
+
+    def _run(self) -> None:
+        """Writer loop: collect batches and write them."""
+        while (item := self._queue.get()) is not None:
+            batch = [item]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._max_batch and not isinstance(
+                batch[-1], _FlushRequest
+            ):
+                remaining = max(0.0, deadline - time.monotonic())
+                next_item = self._queue.get(timeout=remaining)
+                if next_item is None:
+                    break
+                batch.append(next_item)
+            self._write_batch(batch)
+        self._close_file()
+
+    def _write_batch(self, batch: list[_PendingEntry | _FlushRequest]) -> None:
+        """Write a batch, grouping consecutive entries for the same file."""
+        if self._sinks:
+            self._send_to_sinks(batch)
+        lines: list[str] = []
+        path: Path | None = None
+        encoded = iter(self._encode(batch))
+        for item in batch:
+            if isinstance(item, _FlushRequest):
+                self._write_lines(path, lines)
+                lines, path = [], None
+                item.done.set()
+                continue
+            if item.path != path:
+                self._write_lines(path, lines)
+                lines, path = [], item.path
+            lines.append(next(encoded))
+        self._write_lines(path, lines)
+
+    def _encode(self, batch: list[_PendingEntry | _FlushRequest]) -> list[str]:
+        """Serialize the entries of a batch, moving OCR text to blobs if enabled."""
+        entries = [item.entry for item in batch if isinstance(item, _PendingEntry)]
+        if self._blob_store is not None:
+            try:
+                entries = externalize_entries(entries, self._blob_store)
+            except sqlite3.Error:
+                logger.exception("Failed to store OCR blobs; logging text inline")
+        return [json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries]
+
+    def _send_to_sinks(self, batch: list[_PendingEntry | _FlushRequest]) -> None:
+        """Hand the entries of a batch to every sink."""
+        entries = [item.entry for item in batch if isinstance(item, _PendingEntry)]
+        if not entries:
+            return
+        for sink in self._sinks:
+            try:
+                sink.add_many(entries)
+            except Exception:
+                # A failing sink must not stop the JSONL log
+                logger.exception(
+                    "Failed to add %d log entries to %s",
+                    len(entries),
+                    type(sink).__name__,
+                )
+
+    def _write_lines(self, path: Path | None, lines: list[str]) -> None:
+        """Append lines to a file with one write call."""
+        if path is None or not lines:
+            return
+        try:
+            f = self._open(path)
+            f.write("".join(lines))
+            f.flush()
+            if self._fsync == "batch":
+                os.fsync(f.fileno())
+                self.stats.fsyncs += 1
+        except OSError:
+            logger.exception("Failed to write %d log entries to %s", len(lines), path)
+            self.stats.failed += len(lines)
+            self._close_file()
+            return
+        self.stats.entries += len(lines)
+        self.stats.batches += 1
+
+    def _open(self, path: Path) -> IO[str]:
+        """Return the handle for path, closing the previous hourly file."""
+        if self._file is not None and self._file_path == path:
+            return self._file
+        if self._file is not None:
+            self._close_file()
+            self.stats.rotations += 1
+        if path.parent not in self._created_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(path.parent)
+        self._file = open(path, "a", encoding="utf-8")
+        self._file_path = path
+        return self._file
+
+    def _close_file(self) -> None:
+        """Flush, optionally fsync, and close the current file."""
+        f, self._file, self._file_path = self._file, None, None
+        if f is None:
+            return
+        try:
+            f.flush()
+            if self._fsync in ("rotate", "batch"):
+                os.fsync(f.fileno())
+                self.stats.fsyncs += 1
+            f.close()
+        except OSError:
+            logger.exception("Failed to close log file %s", f.name)
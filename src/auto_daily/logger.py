@@ -1,10 +1,14 @@
 """JSONL logging module for activity tracking."""
 
 import json
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from auto_daily.blob_store import externalize_entries, open_blob_store
+from auto_daily.config import get_ocr_blobs
+
 
 def get_log_dir_for_date(log_base: Path, dt: datetime | None = None) -> Path:
     """Get or create a date-specific log directory.
@@ -51,41 +55,136 @@ def get_log_filename(date: datetime | None = None) -> str:
     return f"activity_{date.strftime('%Y-%m-%d')}.jsonl"
 
 
+def get_hourly_log_path(log_base: Path, dt: datetime) -> Path:
+    """Return the hourly log file path for a datetime without creating it.
+
+    Args:
+        log_base: Base directory for logs.
+        dt: Datetime of the entry.
+
+    Returns:
+        Path like logs/2025-12-25/activity_14.jsonl.
+    """
+    return log_base / dt.strftime("%Y-%m-%d") / get_hourly_log_filename(dt)
+
+
+def build_activity_entry(
+    window_info: dict[str, str],
+    ocr_text: str,
+    *,
+    slack_context: Any = None,
+    timestamp: datetime | None = None,
+    unchanged: bool = False,
+) -> tuple[datetime, dict[str, Any]]:
+    """Build an activity log entry.
+
+    Args:
+        window_info: Dictionary with app_name and window_title.
+        ocr_text: OCR extracted text from the screen.
+        slack_context: Optional Slack context with channel, workspace, dm_user, is_thread.
+        timestamp: When the activity happened. Defaults to now.
+        unchanged: Whether OCR was skipped for an unchanged screen.
+
+    Returns:
+        Tuple of (timestamp, entry).
+    """
+    now = timestamp if timestamp is not None else datetime.now()
+    entry: dict[str, Any] = {
+        "timestamp": now.isoformat(),
+        "window_info": window_info,
+        "ocr_text": ocr_text,
+        "slack_context": slack_context,
+    }
+    if unchanged:
+        entry["unchanged"] = True
+    return now, entry
+
+
+def build_speech_entry(
+    transcript: str,
+    confidence: float,
+    is_final: bool,
+    language: str = "ja-JP",
+) -> tuple[datetime, dict[str, Any]]:
+    """Build a speech recognition log entry stamped with the current time.
+
+    Args:
+        transcript: Transcribed text from speech recognition.
+        confidence: Confidence score (0.0-1.0) of the recognition.
+        is_final: Whether this is a final result or interim.
+        language: Language code for the speech (default: ja-JP).
+
+    Returns:
+        Tuple of (timestamp, entry).
+    """
+    now = datetime.now()
+    entry: dict[str, Any] = {
+        "timestamp": now.isoformat(),
+        "type": "speech",
+        "transcript": transcript,
+        "confidence": confidence,
+        "is_final": is_final,
+        "language": language,
+    }
+    return now, entry
+
+
+def _append_entry(
+    log_base: Path, now: datetime, entry: dict[str, Any], ocr_blobs: bool = False
+) -> Path:
+    """Append a single entry to its hourly file, opening and closing it."""
+    if ocr_blobs:
+        (entry,) = externalize_entries([entry], open_blob_store(log_base))
+    date_dir = get_log_dir_for_date(log_base, now)
+    log_path = date_dir / get_hourly_log_filename(now)
+    with open(log_path, "a") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return log_path
+
+
 def append_log_hourly(
     log_base: Path,
     window_info: dict[str, str],
     ocr_text: str,
     *,
     slack_context: Any = None,
+    timestamp: datetime | None = None,
+    unchanged: bool = False,
+    ocr_blobs: bool | None = None,
 ) -> Path | None:
     """Append an activity log entry to the hourly JSONL file.
 
+    Opens and closes the file for every entry; long-running processes should
+    prefer auto_daily.log_writer.LogWriter.
+
     Args:
         log_base: Base directory for logs.
         window_info: Dictionary with app_name and window_title.
         ocr_text: OCR extracted text from the screen.
         slack_context: Optional Slack context with channel, workspace, dm_user, is_thread.
+        timestamp: When the activity happened. Defaults to now. Used by the
+                   asynchronous pipeline, which logs entries after OCR finishes.
+        unchanged: Whether the screen was identical to the previous capture of
+                   the same window and OCR was skipped.
+        ocr_blobs: Store long OCR text in the blob store and log only its
+                  hash (see auto_daily.blob_store). Uses AUTO_DAILY_OCR_BLOBS
+                  env var or default if not specified.
 
     Returns:
         Path to the log file, or None if logging failed.
     """
     try:
-        now = datetime.now()
-        date_dir = get_log_dir_for_date(log_base, now)
-        log_path = date_dir / get_hourly_log_filename(now)
-
-        entry: dict[str, Any] = {
-            "timestamp": now.isoformat(),
-            "window_info": window_info,
-            "ocr_text": ocr_text,
-            "slack_context": slack_context,
-        }
-
-        with open(log_path, "a") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-
-        return log_path
-    except OSError:
+        now, entry = build_activity_entry(
+            window_info,
+            ocr_text,
+            slack_context=slack_context,
+            timestamp=timestamp,
+            unchanged=unchanged,
+        )
+        if ocr_blobs is None:
+            ocr_blobs = get_ocr_blobs()
+        return _append_entry(log_base, now, entry, ocr_blobs)
+    except (OSError, sqlite3.Error):
         return None
 
 
@@ -109,22 +208,7 @@ def append_log_speech(
         Path to the log file, or None if logging failed.
     """
     try:
-        now = datetime.now()
-        date_dir = get_log_dir_for_date(log_base, now)
-        log_path = date_dir / get_hourly_log_filename(now)
-
-        entry: dict[str, Any] = {
-            "timestamp": now.isoformat(),
-            "type": "speech",
-            "transcript": transcript,
-            "confidence": confidence,
-            "is_final": is_final,
-            "language": language,
-        }
-
-        with open(log_path, "a") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-
-        return log_path
+        now, entry = build_speech_entry(transcript, confidence, is_final, language)
+        return _append_entry(log_base, now, entry)
     except OSError:
         return None
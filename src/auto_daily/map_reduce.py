@@ -0,0 +1,276 @@
+"""Map-reduce summarization of hours and days too large for one prompt.
+
+A busy hour can produce more log text than fits the model's context, and
+a long day more hourly summaries than fit the report prompt; models then
+truncate the input silently. ``MapReduceSummarizer`` splits such input
+into chunks within a token budget, summarizes the chunks concurrently
+(map) and merges neighbouring summaries until the result fits (reduce):
+
+    entries -> compact log -> chunk 1 .. chunk N -> partial summaries
+            -> merged summaries -> final prompt
+
+The last step is left to the caller: ``build_hour_prompt`` returns the
+prompt for the hourly summary and ``condense_summaries`` the summaries for
+the daily report prompt, so the final response can still be streamed into
+its file. Input within the budget goes through unchanged, with a single
+LLM call as before.
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from auto_daily.config import (
+    get_report_token_budget,
+    get_summary_concurrency,
+    get_summary_prompt_template,
+    get_summary_token_budget,
+)
+from auto_daily.llm.protocol import LLMClient
+from auto_daily.prompt_builder import CompactLog, build_compact_log, estimate_tokens
+
+# Chunks an hour may be split into; beyond that the least novel OCR lines
+# of the hour are dropped (see auto_daily.prompt_builder)
+MAX_CHUNKS_PER_HOUR = 8
+
+HOUR_REDUCE_PROMPT_TEMPLATE = """以下は 1 時間分の作業ログを分割し、部分ごとに要約したものです。
+これらを統合して、この 1 時間の作業の要約を作成してください。
+重複する内容はまとめ、作業の流れが時系列でわかるようにしてください。
+
+{summaries}"""
+
+PERIOD_REDUCE_PROMPT_TEMPLATE = """以下は {start:02d}:00-{end:02d}:00 の作業の時間帯ごとの要約です。
+これらを統合して、この時間帯の作業の要約を作成してください。
+重要な作業・成果・課題は残し、重複する内容はまとめてください。
+
+{summaries}"""
+
+
+@dataclass
+class HourPrompt:
+    """Prompt for the summary of an hour.
+
+    Attributes:
+        prompt: Prompt of the final LLM call.
+        compact: Compact log of the whole hour.
+        chunks: Chunks the log was split into (1 if it fit the budget).
+    """
+
+    prompt: str
+    compact: CompactLog
+    chunks: int = 1
+
+    def format(self) -> str:
+        """Return a one-line summary for the CLI."""
+        line = self.compact.format()
+        if self.chunks > 1:
+            line += f", summarized in {self.chunks} chunks"
+        return line
+
+
+@dataclass
+class _Section:
+    """Summary of a span: chunk indices of an hour or hours of a day."""
+
+    start: int
+    end: int
+    text: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text) + 1
+
+
+def _pack(sections: list[_Section], token_budget: int) -> list[list[_Section]]:
+    """Group consecutive sections whose combined size fits the budget.
+
+    If no two neighbours fit together, sections are paired anyway so every
+    reduce round shrinks the input.
+    """
+    groups: list[list[_Section]] = []
+    tokens = 0
+    for section in sections:
+        if groups and tokens + section.tokens <= token_budget:
+            groups[-1].append(section)
+            tokens += section.tokens
+        else:
+            groups.append([section])
+            tokens = section.tokens
+    if len(groups) == len(sections):
+        groups = [sections[i : i + 2] for i in range(0, len(sections), 2)]
+    return groups
+
+
+type _PromptBuilder = Callable[[list[_Section]], str]
+
+
+def _format_parts(sections: list[_Section]) -> str:
+    """Format partial summaries of an hour for the reduce prompt."""
+    return "\n\n".join(
+        f"## パート {i}\n{section.text}" for i, section in enumerate(sections, 1)
+    )
+
+
+def _format_hours(sections: list[_Section]) -> str:
+    """Format summaries of hours for the reduce prompt."""
+    return "\n\n".join(
+        f"## {section.start:02d}:00-{section.end:02d}:00\n{section.text}"
+        for section in sections
+    )
+
+
+def _hour_reduce_prompt(sections: list[_Section]) -> str:
+    return HOUR_REDUCE_PROMPT_TEMPLATE.format(summaries=_format_parts(sections))
+
+
+def _period_reduce_prompt(sections: list[_Section]) -> str:
+    return PERIOD_REDUCE_PROMPT_TEMPLATE.format(
+        start=sections[0].start,
+        end=sections[-1].end,
+        summaries=_format_hours(sections),
+    )
+
+
+class MapReduceSummarizer:
+    """Summarize input of any size with concurrent LLM calls."""
+
+    def __init__(
+        self,
+        client: LLMClient,
+        model: str,
+        token_budget: int | None = None,
+        report_token_budget: int | None = None,
+        concurrency: int | None = None,
+    ) -> None:
+        """Initialize the summarizer.
+
+        Args:
+            client: LLM client.
+            model: Name of the model to use.
+            token_budget: Maximum estimated tokens of log text per prompt.
+                         Uses AUTO_DAILY_SUMMARY_TOKEN_BUDGET env var or
+                         default if not specified.
+            report_token_budget: Maximum estimated tokens of the summaries in
+                                the daily report prompt. Uses
+                                AUTO_DAILY_REPORT_TOKEN_BUDGET env var or
+                                default if not specified.
+            concurrency: Maximum concurrent LLM calls, shared by every hour
+                        summarized with this instance. Uses
+                        AUTO_DAILY_SUMMARY_CONCURRENCY env var or default if
+                        not specified.
+        """
+        self._client = client
+        self._model = model
+        self.token_budget = (
+            token_budget if token_budget is not None else get_summary_token_budget()
+        )
+        self.report_token_budget = (
+            report_token_budget
+            if report_token_budget is not None
+            else get_report_token_budget()
+        )
+        limit = concurrency if concurrency is not None else get_summary_concurrency()
+        self._semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def generate(self, prompt: str) -> str:
+        """Send one prompt, waiting for a free slot.
+
+        Args:
+            prompt: The prompt to send to the model.
+
+        Returns:
+            The response text.
+        """
+        async with self._semaphore:
+            return await self._client.generate(model=self._model, prompt=prompt)
+
+    async def _merge(
+        self, group: list[_Section], prompt_for: _PromptBuilder
+    ) -> _Section:
+        """Reduce a group of sections into one."""
+        if len(group) == 1:
+            return group[0]
+        text = await self.generate(prompt_for(group))
+        return _Section(group[0].start, group[-1].end, text)
+
+    async def _reduce(
+        self, sections: list[_Section], token_budget: int, prompt_for: _PromptBuilder
+    ) -> list[_Section]:
+        """Merge neighbouring sections until they fit the budget together."""
+        while (
+            token_budget > 0
+            and len(sections) > 1
+            and sum(section.tokens for section in sections) > token_budget
+        ):
+            groups = _pack(sections, token_budget)
+            sections = list(
+                await asyncio.gather(
+                    *(self._merge(group, prompt_for) for group in groups)
+                )
+            )
+        return sections
+
+    async def build_hour_prompt(self, entries: list[dict[str, Any]]) -> HourPrompt:
+        """Build the prompt for the summary of an hour.
+
+        Logs within the budget give the usual summary prompt. Larger logs
+        are summarized chunk by chunk and the prompt asks to merge the
+        partial summaries.
+
+        Args:
+            entries: Log entries of the hour in time order.
+
+        Returns:
+            The prompt of the final summary call.
+        """
+        budget = self.token_budget
+        compact = build_compact_log(
+            entries, token_budget=budget * MAX_CHUNKS_PER_HOUR if budget else 0
+        )
+        chunks = compact.split(budget)
+        template = get_summary_prompt_template()
+        if len(chunks) == 1:
+            return HourPrompt(template.format(log_content=compact.text), compact)
+
+        partials = await asyncio.gather(
+            *(self.generate(template.format(log_content=chunk)) for chunk in chunks)
+        )
+        sections = [_Section(i, i + 1, text) for i, text in enumerate(partials)]
+        sections = await self._reduce(sections, budget, _hour_reduce_prompt)
+        return HourPrompt(_hour_reduce_prompt(sections), compact, len(chunks))
+
+    async def summarize_hour(self, entries: list[dict[str, Any]]) -> str:
+        """Summarize the log entries of an hour.
+
+        Args:
+            entries: Log entries of the hour in time order.
+
+        Returns:
+            The summary text.
+        """
+        hour_prompt = await self.build_hour_prompt(entries)
+        return await self.generate(hour_prompt.prompt)
+
+    async def condense_summaries(
+        self, summaries: dict[int, str]
+    ) -> tuple[dict[int, str], dict[int, int]]:
+        """Merge hourly summaries of a day until they fit the report budget.
+
+        Args:
+            summaries: Dictionary mapping hour (0-23) to summary content.
+
+        Returns:
+            Tuple of (summaries keyed by their first hour, end hour of each
+            summary). Summaries within the budget are returned unchanged.
+        """
+        sections = [
+            _Section(hour, hour + 1, summaries[hour]) for hour in sorted(summaries)
+        ]
+        sections = await self._reduce(
+            sections, self.report_token_budget, _period_reduce_prompt
+        )
+        return (
+            {section.start: section.text for section in sections},
+            {section.start: section.end for section in sections},
+        )
@@ -1,30 +1,50 @@
 """Window monitoring and scheduling for auto-daily."""
 
 import asyncio
+import functools
 import signal
 import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+from auto_daily.compactor import LogCompactor
 from auto_daily.config import (
     get_log_dir,
+    get_log_writer_mode,
     get_ollama_base_url,
     get_ollama_model,
+    get_rolling_summary_interval,
+    get_search_db_path,
+    get_search_index_enabled,
     get_summaries_dir,
+    get_window_settle_ms,
 )
 from auto_daily.llm.ollama import check_ollama_connection
+from auto_daily.log_writer import EntrySink, LogWriter
+from auto_daily.map_reduce import MapReduceSummarizer
 from auto_daily.ollama import OllamaClient
 from auto_daily.permissions import check_all_permissions
-from auto_daily.processor import process_window_change
-from auto_daily.report import generate_summary_prompt
-from auto_daily.scheduler import (
-    HourlySummaryScheduler,
-    PeriodicCapture,
-    process_periodic_capture,
+from auto_daily.report import read_hour_entries
+from auto_daily.rolling_summary import (
+    RollingSummarizer,
+    get_checkpoint_path,
+    load_checkpoint,
 )
+from auto_daily.scheduler import HourlySummaryScheduler, PeriodicCapture
+from auto_daily.search import SearchIndex
+from auto_daily.store import ActivityStore, open_activity_store
 from auto_daily.summarize import save_summary
+from auto_daily.trace import TraceRecorder
 from auto_daily.window_monitor import WindowMonitor
+from auto_daily.window_source import (
+    HelperWindowSource,
+    QuartzSystemStateSource,
+    SystemStateSource,
+    WindowSource,
+    get_window_source,
+)
 
 # Default interval for periodic capture (30 seconds)
 PERIODIC_CAPTURE_INTERVAL = 30.0
@@ -32,27 +52,48 @@ PERIODIC_CAPTURE_INTERVAL = 30.0
 # Default interval for hourly summary check (60 seconds)
 HOURLY_SUMMARY_CHECK_INTERVAL = 60.0
 
-
-def on_periodic_capture(log_dir: Path) -> None:
-    """Callback for periodic capture events."""
-    success = process_periodic_capture(log_dir)
-    if success:
-        print("⏱ Periodic capture: ✓ Captured, OCR'd, and logged")
-    else:
-        print("⏱ Periodic capture: ✗ Processing failed")
+# Longest wait for the log writer to write buffered entries (seconds)
+LOG_FLUSH_TIMEOUT = 10.0
 
 
-def on_hourly_summary(log_dir: Path, summaries_dir: Path) -> None:
+def on_hourly_summary(
+    log_dir: Path,
+    summaries_dir: Path,
+    store: ActivityStore | None = None,
+    log_writer: LogWriter | None = None,
+) -> None:
     """Callback for hourly summary generation.
 
     Summarizes the previous hour's logs if not already summarized.
+    Hours with a running summary only have their last entries merged.
+    Reads the hour from the activity store if one is given. Entries still
+    buffered by the log writer are written first, so none are left out.
     """
-    from auto_daily.logger import get_hourly_log_filename, get_log_dir_for_date
-
+    if log_writer is not None:
+        log_writer.flush(LOG_FLUSH_TIMEOUT)
     now = datetime.now()
     # Summarize the previous hour
     prev_hour = (now.hour - 1) % 24
     target_date = now.date() if now.hour > 0 else (now - timedelta(days=1)).date()
+    target_datetime = datetime.combine(target_date, datetime.min.time()).replace(
+        hour=prev_hour
+    )
+    summarizer = MapReduceSummarizer(OllamaClient(), get_ollama_model())
+    rolling = RollingSummarizer(summarizer, log_dir, summaries_dir)
+
+    if rolling.has_checkpoint(target_datetime):
+        if not check_ollama_connection():
+            print(f"⚠️ Cannot summarize hour {prev_hour:02d}: Ollama not available")
+            return
+        print(
+            f"📝 Finalizing summary for {target_date.isoformat()} {prev_hour:02d}:00..."
+        )
+        try:
+            summary_path = asyncio.run(rolling.finalize(target_datetime))
+            print(f"  ✓ Summary saved: {summary_path}")
+        except Exception as e:
+            print(f"  ✗ Summary failed: {e}")
+        return
 
     # Check if summary already exists
     summary_date_dir = summaries_dir / target_date.isoformat()
@@ -61,14 +102,10 @@ def on_hourly_summary(log_dir: Path, summaries_dir: Path) -> None:
     if summary_file.exists():
         return  # Already summarized
 
-    # Check if log file exists for this hour
-    target_datetime = datetime.combine(target_date, datetime.min.time()).replace(
-        hour=prev_hour
-    )
-    date_log_dir = get_log_dir_for_date(log_dir, target_datetime)
-    log_file = date_log_dir / get_hourly_log_filename(target_datetime)
+    # Check if logs exist for this hour
+    entries = read_hour_entries(log_dir, target_datetime, store)
 
-    if not log_file.exists():
+    if entries is None:
         return  # No log to summarize
 
     # Check Ollama connection
@@ -78,25 +115,50 @@ def on_hourly_summary(log_dir: Path, summaries_dir: Path) -> None:
 
     # Generate summary
     print(f"📝 Generating summary for {target_date.isoformat()} {prev_hour:02d}:00...")
-    log_content = log_file.read_text()
-    prompt = generate_summary_prompt(log_content)
-
-    client = OllamaClient()
-    model = get_ollama_model()
 
     try:
-        summary = asyncio.run(client.generate(model=model, prompt=prompt))
+        summary = asyncio.run(summarizer.summarize_hour(entries))
         save_summary(summaries_dir, target_date, prev_hour, summary)
         print(f"  ✓ Summary saved: {summary_file}")
     except Exception as e:
         print(f"  ✗ Summary failed: {e}")
 
 
-def start_monitoring(version: str) -> None:
+def on_rolling_summary(
+    log_dir: Path, summaries_dir: Path, log_writer: LogWriter | None = None
+) -> None:
+    """Callback updating the running summary of the current hour.
+
+    Only the entries logged since the last update are sent to the LLM.
+    """
+    if log_writer is not None:
+        log_writer.flush(LOG_FLUSH_TIMEOUT)
+    now = datetime.now()
+    if not check_ollama_connection():
+        return  # Retried at the next interval
+
+    summarizer = MapReduceSummarizer(OllamaClient(), get_ollama_model())
+    rolling = RollingSummarizer(summarizer, log_dir, summaries_dir)
+    try:
+        before = load_checkpoint(get_checkpoint_path(summaries_dir, now))
+        checkpoint = asyncio.run(rolling.update(now))
+    except Exception as e:
+        print(f"  ✗ Running summary failed: {e}")
+        return
+    if checkpoint.updates > before.updates:
+        print(
+            f"📝 Running summary of {now.hour:02d}:00 updated "
+            f"(+{checkpoint.entries - before.entries} entries)"
+        )
+
+
+def start_monitoring(version: str, record_trace: str | None = None) -> None:
     """Start window monitoring with periodic capture and hourly summary.
 
     Args:
         version: Version string for display.
+        record_trace: Path of a trace file recording window and lock events
+                     for offline replay (see auto_daily.trace).
     """
     print(f"auto-daily v{version} - Starting window monitor...")
 
@@ -130,16 +192,83 @@ def start_monitoring(version: str) -> None:
     print(f"Logging to: {log_dir}")
     print(f"Summaries to: {summaries_dir}")
 
-    def on_window_change(old_window: dict, new_window: dict) -> None:
-        print(f"Window changed: {old_window['app_name']} -> {new_window['app_name']}")
-        success = process_window_change(old_window, new_window, log_dir)
+    def on_capture_complete(context: CaptureContext, success: bool) -> None:
+        app_name = context.window_info.get("app_name", "")
         if success:
-            print("  ✓ Captured, OCR'd, and logged")
+            print(f"  ✓ Captured, OCR'd, and logged: {app_name}")
         else:
-            print("  ✗ Processing failed")
+            print(f"  ✗ Processing failed: {app_name}")
+
+    # Optional SQLite store and search index; both receive entries through
+    # the log writer
+    sinks: list[EntrySink] = []
+    store = open_activity_store()
+    if store is not None:
+        sinks.append(store)
+        print(f"Activity database: {store.path}")
+    search_index: SearchIndex | None = None
+    if get_search_index_enabled():
+        search_index = SearchIndex(get_search_db_path())
+        sinks.append(search_index)
+
+    # A single writer thread owns the hourly log file
+    log_writer: LogWriter | None = None
+    if get_log_writer_mode() == "buffered" or sinks:
+        log_writer = LogWriter(log_dir, sinks=sinks)
+        log_writer.start()
+
+    # One long-lived source shared by the window monitor, periodic capture
+    # and window cropping; the helper's snapshot saves an osascript call per
+    # cropped capture
+    base_source = get_window_source()
+    window_source: WindowSource = base_source
+    system_state: SystemStateSource = QuartzSystemStateSource()
+    recorder: TraceRecorder | None = None
+    if record_trace is not None:
+        recorder = TraceRecorder(Path(record_trace).expanduser())
+        window_source = recorder.wrap_window_source(window_source)
+        system_state = recorder.wrap_system_state(system_state)
+        print(f"Recording trace to: {record_trace}")
+
+    # Start capture pipeline; monitors only enqueue events from here on
+    pipeline = AsyncCapturePipeline(
+        on_complete=on_capture_complete,
+        log_writer=log_writer,
+        window_bounds=(
+            base_source.get_active_window_bounds
+            if isinstance(base_source, HelperWindowSource)
+            else None
+        ),
+    )
+    pipeline.start()
+
+    def on_window_change(old_window: dict, new_window: dict) -> None:
+        print(f"Window changed: {old_window['app_name']} -> {new_window['app_name']}")
+        pipeline.submit(
+            CaptureContext(
+                window_info=new_window,
+                log_dir=log_dir,
+                extract_slack_context=True,
+                # Log when the window became frontmost, not when it settled
+                timestamp=monitor.current_window_since,
+            )
+        )
+
+    def on_periodic_capture(log_dir: Path) -> None:
+        pipeline.submit(
+            CaptureContext(
+                window_info=window_source.get_active_window(), log_dir=log_dir
+            )
+        )
 
-    # Start window change monitor
-    monitor = WindowMonitor(on_window_change)
+    # Start window change monitor; switches shorter than the settle time
+    # are suppressed instead of captured
+    monitor = WindowMonitor(
+        on_window_change,
+        settle_ms=get_window_settle_ms(),
+        source=window_source,
+        system_state=system_state,
+    )
     monitor.start()
 
     # Start periodic capture scheduler (every 30 seconds)
@@ -147,19 +276,37 @@ def start_monitoring(version: str) -> None:
         callback=on_periodic_capture,
         log_dir=log_dir,
         interval=PERIODIC_CAPTURE_INTERVAL,
+        system_state=system_state,
     )
     periodic.start()
     print(f"Periodic capture: every {PERIODIC_CAPTURE_INTERVAL:.0f} seconds")
 
     # Start hourly summary scheduler
+    rolling_interval = get_rolling_summary_interval()
     hourly_summary = HourlySummaryScheduler(
-        callback=on_hourly_summary,
+        callback=functools.partial(
+            on_hourly_summary, store=store, log_writer=log_writer
+        ),
         log_dir=log_dir,
         summaries_dir=summaries_dir,
         check_interval=HOURLY_SUMMARY_CHECK_INTERVAL,
+        rolling_callback=functools.partial(on_rolling_summary, log_writer=log_writer),
+        rolling_interval=rolling_interval,
     )
     hourly_summary.start()
     print("Hourly summary: enabled (auto-summarize every hour)")
+    if rolling_interval > 0:
+        print(f"Rolling summary: every {rolling_interval / 60:.0f} minutes")
+
+    # Compress hourly logs once they are closed
+    compactor: LogCompactor | None = None
+    try:
+        compactor = LogCompactor(log_dir)
+    except ImportError as e:
+        print(f"⚠️ Warning: {e}. Logs will not be compressed.")
+    if compactor is not None and compactor.method != "off":
+        compactor.start()
+        print(f"Log compression: {compactor.method}")
 
     # Handle graceful shutdown
     def signal_handler(sig: int, frame: object) -> None:
@@ -167,6 +314,24 @@ def start_monitoring(version: str) -> None:
         monitor.stop()
         periodic.stop()
         hourly_summary.stop()
+        if compactor is not None:
+            compactor.stop()
+        pipeline.stop()
+        if log_writer is not None:
+            log_writer.stop()
+        for sink in (store, search_index):
+            if sink is not None:
+                sink.close()
+        window_source.close()
+        if recorder is not None:
+            recorder.close()
+        stats = pipeline.stats
+        print(
+            f"Capture pipeline: {stats.processed} processed, {stats.failed} failed, "
+            f"{stats.dropped} dropped, {stats.coalesced} coalesced, "
+            f"{stats.unchanged} unchanged (OCR skipped)"
+        )
+        print(f"Window switches suppressed: {monitor.suppressed_count}")
         raise SystemExit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
@@ -3,21 +3,40 @@
 This module provides a unified interface for interacting with different OCR backends.
 """
 
+from typing import Any
+
 from auto_daily.config import get_ocr_backend_name, get_ocr_filter_noise
-from auto_daily.ocr.apple_vision import AppleVisionOCR, validate_ocr_result
 from auto_daily.ocr.filters import OCRFilter
-from auto_daily.ocr.protocol import OCRBackend
+from auto_daily.ocr.incremental import IncrementalOCR
+from auto_daily.ocr.protocol import ImageBuffer, OCRBackend
 
 __all__ = [
     "AppleVisionOCR",
+    "ImageBuffer",
+    "IncrementalOCR",
     "OCRBackend",
     "OCRFilter",
+    "apply_ocr_filter",
     "get_ocr_backend",
     "perform_ocr",
+    "perform_ocr_buffer",
     "validate_ocr_result",
 ]
 
 
+def __getattr__(name: str) -> Any:
+    """Import the Apple Vision backend lazily.
+
+    It requires PyObjC, so importing it only on use keeps the rest of the
+    OCR package usable off macOS.
+    """
+    if name in ("AppleVisionOCR", "validate_ocr_result"):
+        from auto_daily.ocr import apple_vision
+
+        return getattr(apple_vision, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_ocr_backend() -> OCRBackend:
     """Get the OCR backend based on the OCR_BACKEND environment variable.
 
@@ -32,6 +51,8 @@ def get_ocr_backend() -> OCRBackend:
     backend_name = get_ocr_backend_name()
 
     if backend_name == "apple":
+        from auto_daily.ocr.apple_vision import AppleVisionOCR
+
         return AppleVisionOCR()
 
     if backend_name == "openai":
@@ -62,8 +83,37 @@ def perform_ocr(image_path: str) -> str:
     """
     backend = get_ocr_backend()
     text = backend.perform_ocr(image_path)
+    return apply_ocr_filter(text)
 
-    # Apply noise filtering if enabled
+
+def perform_ocr_buffer(image_data: ImageBuffer) -> str:
+    """Perform OCR on an in-memory encoded image using the configured backend.
+
+    Same as perform_ocr, but takes image bytes instead of a file path so
+    captures never have to touch the disk.
+
+    Args:
+        image_data: Encoded image bytes (PNG, JPEG, ...).
+
+    Returns:
+        Recognized text from the image, optionally filtered.
+    """
+    backend = get_ocr_backend()
+    text = backend.perform_ocr_buffer(image_data)
+    return apply_ocr_filter(text)
+
+
+def apply_ocr_filter(text: str) -> str:
+    """Apply noise filtering to raw OCR text if enabled.
+
+    Set OCR_FILTER_NOISE=false to disable filtering.
+
+    Args:
+        text: Raw OCR text returned by a backend.
+
+    Returns:
+        Filtered text, or the input unchanged when filtering is disabled.
+    """
     if get_ocr_filter_noise():
         ocr_filter = OCRFilter()
         text = ocr_filter.filter(text)
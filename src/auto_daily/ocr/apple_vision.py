@@ -1,7 +1,9 @@
 """Apple Vision Framework OCR implementation."""
 
 import Vision  # type: ignore[import-untyped]
-from Foundation import NSURL  # type: ignore[import-untyped]
+from Foundation import NSURL, NSData  # type: ignore[import-untyped]
+
+from auto_daily.ocr.protocol import ImageBuffer
 
 
 class AppleVisionOCR:
@@ -23,12 +25,37 @@ class AppleVisionOCR:
         handler = Vision.VNImageRequestHandler.alloc().initWithURL_options_(  # type: ignore[attr-defined]
             image_url, None
         )
+        return self._recognize_text(handler)
+
+    def perform_ocr_buffer(self, image_data: ImageBuffer) -> str:
+        """Perform OCR on an in-memory encoded image using Vision Framework.
+
+        Args:
+            image_data: Encoded image bytes (PNG, JPEG, ...).
+
+        Returns:
+            Recognized text from the image.
+        """
+        data = NSData.dataWithBytes_length_(image_data, len(image_data))
+        handler = Vision.VNImageRequestHandler.alloc().initWithData_options_(  # type: ignore[attr-defined]
+            data, None
+        )
+        return self._recognize_text(handler)
 
+    def _recognize_text(self, handler: object) -> str:
+        """Run a text recognition request on a Vision image request handler.
+
+        Args:
+            handler: VNImageRequestHandler for the image.
+
+        Returns:
+            Recognized text, one observation per line.
+        """
         request = Vision.VNRecognizeTextRequest.alloc().init()  # type: ignore[attr-defined]
         request.setRecognitionLevel_(Vision.VNRequestTextRecognitionLevelAccurate)  # type: ignore[attr-defined]
         request.setRecognitionLanguages_(["ja-JP", "en-US"])
 
-        success, error = handler.performRequests_error_([request], None)
+        success, error = handler.performRequests_error_([request], None)  # type: ignore[attr-defined]
 
         if not success or error:
             return ""
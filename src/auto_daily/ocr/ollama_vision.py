@@ -5,6 +5,7 @@ import base64
 import httpx
 
 from auto_daily.config import get_ocr_model, get_ollama_base_url
+from auto_daily.ocr.protocol import ImageBuffer
 
 
 class OllamaVisionOCR:
@@ -35,9 +36,20 @@ class OllamaVisionOCR:
         Returns:
             Recognized text from the image.
         """
-        # Read and encode the image
         with open(image_path, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
+            return self.perform_ocr_buffer(f.read())
+
+    def perform_ocr_buffer(self, image_data: ImageBuffer) -> str:
+        """Perform OCR on an in-memory encoded image using Ollama Vision API.
+
+        Args:
+            image_data: Encoded image bytes (PNG, JPEG, ...).
+
+        Returns:
+            Recognized text from the image.
+        """
+        # Encode the image
+        encoded = base64.b64encode(image_data).decode("ascii")
 
         # Call Ollama Vision API
         response = httpx.post(
@@ -45,7 +57,7 @@ class OllamaVisionOCR:
             json={
                 "model": self.model,
                 "prompt": "この画像に含まれるすべてのテキストを抽出してください。テキストのみを出力し、説明は不要です。",
-                "images": [image_data],
+                "images": [encoded],
                 "stream": False,
             },
             timeout=120.0,
@@ -5,6 +5,7 @@ import base64
 from openai import OpenAI
 
 from auto_daily.config import get_ocr_model, get_openai_api_key
+from auto_daily.ocr.protocol import ImageBuffer
 
 
 class OpenAIVisionOCR:
@@ -53,6 +54,30 @@ class OpenAIVisionOCR:
         else:
             media_type = "image/png"  # Default to PNG
 
+        return self._request_ocr(image_data, media_type)
+
+    def perform_ocr_buffer(self, image_data: ImageBuffer) -> str:
+        """Perform OCR on an in-memory encoded image using OpenAI Vision API.
+
+        Args:
+            image_data: Encoded image bytes (PNG, JPEG, GIF or WebP).
+
+        Returns:
+            Recognized text from the image.
+        """
+        encoded = base64.b64encode(image_data).decode("ascii")
+        return self._request_ocr(encoded, detect_media_type(image_data))
+
+    def _request_ocr(self, encoded_image: str, media_type: str) -> str:
+        """Send a Base64-encoded image to the OpenAI Vision API.
+
+        Args:
+            encoded_image: Base64-encoded image data.
+            media_type: MIME type of the image.
+
+        Returns:
+            Recognized text from the image.
+        """
         # Call OpenAI Vision API
         response = self.client.chat.completions.create(
             model=self.model,
@@ -67,7 +92,7 @@ class OpenAIVisionOCR:
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:{media_type};base64,{image_data}"
+                                "url": f"data:{media_type};base64,{encoded_image}"
                             },
                         },
                     ],
@@ -77,3 +102,22 @@ class OpenAIVisionOCR:
 
         content = response.choices[0].message.content
         return content if content is not None else ""
+
+
+def detect_media_type(image_data: ImageBuffer) -> str:
+    """Detect the MIME type of encoded image bytes from their signature.
+
+    Args:
+        image_data: Encoded image bytes.
+
+    Returns:
+        MIME type; defaults to "image/png" for unknown signatures.
+    """
+    header = bytes(image_data[:12])
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
@@ -2,6 +2,8 @@
 
 from typing import Protocol, runtime_checkable
 
+from auto_daily.imaging import ImageBuffer
+
 
 @runtime_checkable
 class OCRBackend(Protocol):
@@ -21,3 +23,15 @@ class OCRBackend(Protocol):
             Recognized text from the image.
         """
         ...
+
+    def perform_ocr_buffer(self, image_data: ImageBuffer) -> str:
+        """Perform OCR on an in-memory encoded image (PNG, JPEG, ...).
+
+        Args:
+            image_data: Encoded image bytes. A memoryview is accepted so
+                        callers can pass slices without copying.
+
+        Returns:
+            Recognized text from the image.
+        """
+        ...
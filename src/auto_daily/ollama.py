@@ -7,7 +7,7 @@ re-exported here for backward compatibility.
 
 from __future__ import annotations
 
-import json
+from collections.abc import Iterable
 from datetime import date
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -16,62 +16,87 @@ from auto_daily.config import get_prompt_template
 
 # Re-export OllamaClient for backward compatibility
 from auto_daily.llm.ollama import OllamaClient
+from auto_daily.log_reader import iter_file_records
+from auto_daily.sessions import SPEECH, Session, sessionize_entries
 
 if TYPE_CHECKING:
-    from auto_daily.calendar import MatchResult
+    from auto_daily.calendar import LogEntry, MatchResult
 
 __all__ = [
     "OllamaClient",
     "generate_daily_report_prompt",
+    "generate_daily_report_prompt_from_entries",
+    "generate_daily_report_prompt_from_sessions",
     "generate_daily_report_prompt_with_calendar",
+    "generate_daily_report_prompt_with_calendar_from_entries",
+    "generate_daily_report_prompt_with_calendar_from_sessions",
+    "get_daily_report_path",
     "save_daily_report",
 ]
 
+# Characters of a session's OCR text quoted in the report prompt
+SESSION_TEXT_LIMIT = 300
+
 
 def _load_log_entries(log_file: Path) -> list[dict]:
     """Load and parse log entries from a JSONL file.
 
+    Compressed logs and OCR text stored in the blob store are read
+    transparently.
+
     Args:
         log_file: Path to the JSONL log file.
 
     Returns:
         List of parsed log entry dictionaries.
     """
-    entries = []
-    with open(log_file) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                entries.append(json.loads(line))
-    return entries
+    return [record.data for record in iter_file_records(log_file)]
 
 
-def _format_activities(entries: list[dict]) -> str:
-    """Format log entries into activity lines for prompts.
+def _format_activities(sessions: Iterable[Session]) -> str:
+    """Format activity sessions into activity lines for prompts.
 
     Args:
-        entries: List of log entry dictionaries.
+        sessions: Activity sessions; an iterator is consumed once.
 
     Returns:
-        Formatted activity text.
+        Formatted activity text, one line per session.
     """
     activity_lines = []
-    for entry in entries:
-        timestamp = entry.get("timestamp", "不明")
-        window_info = entry.get("window_info", {})
-        app_name = window_info.get("app_name", "不明")
-        window_title = window_info.get("window_title", "")
-        ocr_text = entry.get("ocr_text", "")
-
+    for session in sessions:
+        start = session.start.strftime("%H:%M")
+        if session.kind == SPEECH:
+            activity_lines.append(f"- {start}: 音声: {session.transcript}")
+            continue
+
+        minutes = round(session.dwell.total_seconds() / 60)
+        app_name = session.app_name or "不明"
+        text = " / ".join(session.ocr_lines)
+        if len(text) > SESSION_TEXT_LIMIT:
+            text = text[:SESSION_TEXT_LIMIT] + "..."
         activity_lines.append(
-            f"- {timestamp}: {app_name} ({window_title})\n  内容: {ocr_text[:100]}..."
-            if len(ocr_text) > 100
-            else f"- {timestamp}: {app_name} ({window_title})\n  内容: {ocr_text}"
+            f"- {start}-{session.until:%H:%M}（{minutes}分）: "
+            f"{app_name} ({session.window_title})\n  内容: {text}"
         )
 
     return "\n".join(activity_lines)
 
 
+def _format_log(log: LogEntry | Session) -> str:
+    """Format a log entry or session outside the schedule."""
+    if isinstance(log, Session):
+        start = log.start.strftime("%H:%M")
+        if log.kind == SPEECH:
+            return f"- {start}: 音声: {log.transcript}"
+        return f"- {start}-{log.until:%H:%M}: {log.app_name} - {log.window_title}"
+    return f"- {log.timestamp:%H:%M}: {log.app_name} - {log.window_title}"
+
+
+def _count_entries(logs: list[LogEntry | Session]) -> int:
+    """Return the number of log entries behind entries or sessions."""
+    return sum(log.entries if isinstance(log, Session) else 1 for log in logs)
+
+
 def generate_daily_report_prompt(log_file: Path) -> str:
     """Generate a prompt for daily report from JSONL log file.
 
@@ -81,8 +106,38 @@ def generate_daily_report_prompt(log_file: Path) -> str:
     Returns:
         Formatted prompt for LLM to generate daily report.
     """
-    entries = _load_log_entries(log_file)
-    activities = _format_activities(entries)
+    return generate_daily_report_prompt_from_entries(_load_log_entries(log_file))
+
+
+def generate_daily_report_prompt_from_entries(entries: Iterable[dict]) -> str:
+    """Generate a prompt for daily report from loaded log entries.
+
+    Args:
+        entries: Log entry dictionaries (e.g., from ActivityStore or streamed
+                 by auto_daily.log_reader).
+
+    Returns:
+        Formatted prompt for LLM to generate daily report.
+    """
+    return generate_daily_report_prompt_from_sessions(sessionize_entries(entries))
+
+
+def generate_daily_report_prompt_from_sessions(
+    sessions: Iterable[Session], time_table: str = ""
+) -> str:
+    """Generate a prompt for daily report from activity sessions.
+
+    Args:
+        sessions: Activity sessions (see auto_daily.sessions).
+        time_table: Measured time per app (see auto_daily.time_accounting),
+                    given to the LLM with the activities. Omitted if empty.
+
+    Returns:
+        Formatted prompt for LLM to generate daily report.
+    """
+    activities = _format_activities(sessions)
+    if time_table:
+        activities += "\n\n" + time_table
 
     template = get_prompt_template()
     return template.format(activities=activities)
@@ -100,8 +155,47 @@ def generate_daily_report_prompt_with_calendar(
     Returns:
         Formatted prompt for LLM with calendar and activity information.
     """
-    entries = _load_log_entries(log_file)
-    activities = _format_activities(entries)
+    return generate_daily_report_prompt_with_calendar_from_entries(
+        _load_log_entries(log_file), match_result
+    )
+
+
+def generate_daily_report_prompt_with_calendar_from_entries(
+    entries: Iterable[dict], match_result: MatchResult
+) -> str:
+    """Generate a prompt for daily report with calendar from loaded log entries.
+
+    Args:
+        entries: Log entry dictionaries (e.g., from ActivityStore or streamed
+                 by auto_daily.log_reader).
+        match_result: Result from matching calendar events with logs.
+
+    Returns:
+        Formatted prompt for LLM with calendar and activity information.
+    """
+    return generate_daily_report_prompt_with_calendar_from_sessions(
+        sessionize_entries(entries), match_result
+    )
+
+
+def generate_daily_report_prompt_with_calendar_from_sessions(
+    sessions: Iterable[Session], match_result: MatchResult, time_table: str = ""
+) -> str:
+    """Generate a prompt for daily report with calendar from activity sessions.
+
+    Args:
+        sessions: Activity sessions (see auto_daily.sessions).
+        match_result: Result from matching calendar events with logs or
+                      sessions.
+        time_table: Measured time per app (see auto_daily.time_accounting),
+                    given to the LLM with the activities. Omitted if empty.
+
+    Returns:
+        Formatted prompt for LLM with calendar and activity information.
+    """
+    activities = _format_activities(sessions)
+    if time_table:
+        activities += "\n\n" + time_table
 
     # Format calendar sections
     schedule_lines = []
@@ -115,7 +209,8 @@ def generate_daily_report_prompt_with_calendar(
         end_time = event.end.strftime("%H:%M")
         schedule_lines.append(f"- {start_time}-{end_time}: {event.summary}")
         completed_lines.append(
-            f"- {start_time}-{end_time}: {event.summary}（ログ {len(logs)} 件）"
+            f"- {start_time}-{end_time}: {event.summary}"
+            f"（ログ {_count_entries(logs)} 件）"
         )
 
     # Unstarted events
@@ -129,8 +224,7 @@ def generate_daily_report_prompt_with_calendar(
 
     # Unplanned work
     for log in match_result.unplanned:
-        log_time = log.timestamp.strftime("%H:%M")
-        unplanned_lines.append(f"- {log_time}: {log.app_name} - {log.window_title}")
+        unplanned_lines.append(_format_log(log))
 
     # Build prompt with calendar context
     schedule_section = "\n".join(schedule_lines) if schedule_lines else "予定なし"
@@ -168,6 +262,19 @@ def generate_daily_report_prompt_with_calendar(
     return prompt
 
 
+def get_daily_report_path(output_dir: Path, report_date: date) -> Path:
+    """Get the Markdown file path of a daily report.
+
+    Args:
+        output_dir: Directory of the reports.
+        report_date: Date of the report.
+
+    Returns:
+        Path like reports/daily_report_YYYY-MM-DD.md.
+    """
+    return output_dir / f"daily_report_{report_date.isoformat()}.md"
+
+
 def save_daily_report(output_dir: Path, content: str, report_date: date) -> Path:
     """Save the daily report to a Markdown file.
 
@@ -181,8 +288,7 @@ def save_daily_report(output_dir: Path, content: str, report_date: date) -> Path
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    filename = f"daily_report_{report_date.isoformat()}.md"
-    file_path = output_dir / filename
+    file_path = get_daily_report_path(output_dir, report_date)
 
     file_path.write_text(content)
 
@@ -0,0 +1,253 @@
+"""Compact, token-budgeted log text for summary prompts.
+
+The raw JSONL of an hour repeats the JSON syntax, the same ``window_info``
+for every capture of a window, ``"slack_context": null`` and the full OCR
+dump of screens that barely changed. ``build_compact_log`` turns the
+entries into one header line per activity session (see
+auto_daily.sessions), followed by the OCR lines not seen earlier in the
+hour:
+
+    10:05-10:12 Code - main.py
+      def summarize(entries):
+      return build_prompt(entries)
+    10:12 音声: 午後のレビューについて
+
+If the text exceeds the token budget, the least novel OCR lines are dropped
+first: lines made of words that appear all over the hour (menus, sidebars,
+tab titles) go before lines whose words occur only once. Headers and
+speech are always kept.
+
+Token counts are estimated, not computed with the model's tokenizer: CJK
+and other non-ASCII characters count as one token each, ASCII text as one
+token per four characters, which is close for the Llama and GPT tokenizers
+on mixed Japanese and English screen text.
+"""
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from auto_daily.config import get_summary_token_budget
+from auto_daily.sessions import SPEECH, Session, sessionize_entries
+
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_WIDE_RUN = re.compile(r"[^\x00-\x7f]+")
+
+_DROPPED_NOTE = "（重複の多い OCR テキスト {count} 行を省略）"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text.
+
+    Args:
+        text: Any text.
+
+    Returns:
+        Non-ASCII characters plus a quarter of the ASCII characters.
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (len(text) - ascii_chars) + (ascii_chars + 3) // 4
+
+
+def _shingles(line: str) -> set[str]:
+    """Return the words and CJK bigrams of a line."""
+    shingles = {word.lower() for word in _WORD.findall(line)}
+    for run in _WIDE_RUN.findall(line):
+        if len(run) == 1:
+            shingles.add(run)
+        shingles.update(run[i : i + 2] for i in range(len(run) - 1))
+    return shingles
+
+
+@dataclass
+class _Line:
+    """An OCR line in a block."""
+
+    text: str
+    order: int
+    novelty: float = 1.0
+    kept: bool = True
+
+
+@dataclass
+class _Block:
+    """Consecutive entries in the same window, or one speech entry."""
+
+    header: str
+    start: str
+    end: str
+    lines: list[_Line] = field(default_factory=list)
+
+    def render(self) -> str:
+        span = self.start if self.start == self.end else f"{self.start}-{self.end}"
+        parts = [f"{span} {self.header}"]
+        parts.extend(f"  {line.text}" for line in self.lines if line.kept)
+        return "\n".join(parts)
+
+
+@dataclass
+class CompactLog:
+    """Result of building the compact log text.
+
+    Attributes:
+        text: Compact log text for the prompt.
+        tokens: Estimated tokens of text.
+        original_tokens: Estimated tokens of the entries as JSONL.
+        dropped_lines: OCR lines dropped to fit the budget.
+    """
+
+    text: str
+    tokens: int
+    original_tokens: int
+    dropped_lines: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        """Estimated tokens saved compared with the raw JSONL."""
+        return max(0, self.original_tokens - self.tokens)
+
+    def split(self, token_budget: int) -> list[str]:
+        """Split the text into chunks within a token budget.
+
+        Chunks end between lines. A block continued in the next chunk has
+        its header repeated there, so every chunk reads on its own.
+
+        Args:
+            token_budget: Maximum estimated tokens of a chunk; 0 returns the
+                         whole text as one chunk.
+
+        Returns:
+            Chunks of the text in order.
+        """
+        if token_budget <= 0:
+            return [self.text]
+        chunks: list[str] = []
+        rows: list[str] = []
+        tokens = 0
+        header: str | None = None
+        for row in self.text.split("\n"):
+            cost = estimate_tokens(row) + 1
+            if rows and tokens + cost > token_budget:
+                chunks.append("\n".join(rows))
+                rows, tokens = [], 0
+                if row.startswith("  ") and header is not None:
+                    rows.append(header)
+                    tokens = estimate_tokens(header) + 1
+            if not row.startswith("  "):
+                header = row
+            rows.append(row)
+            tokens += cost
+        if rows:
+            chunks.append("\n".join(rows))
+        return chunks
+
+    def format(self) -> str:
+        """Return a one-line summary for the CLI."""
+        line = (
+            f"Log: ~{self.tokens:,} tokens "
+            f"(raw ~{self.original_tokens:,}, saved ~{self.saved_tokens:,})"
+        )
+        if self.dropped_lines:
+            line += f", {self.dropped_lines} low-novelty lines dropped"
+        return line
+
+
+def _session_header(session: Session) -> str:
+    """Return the header describing the window of an activity session."""
+    header = session.app_name
+    if session.window_title:
+        header += f" - {session.window_title}"
+    slack = session.slack_context or {}
+    if slack.get("dm_user"):
+        header += f" [Slack DM: {slack['dm_user']}]"
+    elif slack.get("channel"):
+        thread = " thread" if slack.get("is_thread") else ""
+        header += f" [Slack #{slack['channel']}{thread}]"
+    return header
+
+
+def _build_blocks(entries: list[dict[str, Any]]) -> list[_Block]:
+    """Turn the sessions of the entries into blocks of novel OCR lines."""
+    blocks: list[_Block] = []
+    order = 0
+    for session in sessionize_entries(entries):
+        start = session.start.strftime("%H:%M")
+        end = session.end.strftime("%H:%M")
+        if session.kind == SPEECH:
+            blocks.append(_Block(f"音声: {session.transcript}", start, end))
+            continue
+        block = _Block(_session_header(session), start, end)
+        for text in session.ocr_lines:
+            block.lines.append(_Line(text, order))
+            order += 1
+        blocks.append(block)
+    return blocks
+
+
+def _score_novelty(lines: list[_Line], entries: list[dict[str, Any]]) -> None:
+    """Score lines by how rare their words are within the hour.
+
+    Words are counted over every OCR line of the hour, repeats included,
+    so text that stays on screen across captures and windows scores low.
+    """
+    frequency: Counter[str] = Counter()
+    for entry in entries:
+        for raw in (entry.get("ocr_text") or "").splitlines():
+            frequency.update(_shingles(raw))
+    for line in lines:
+        shingles = _shingles(line.text)
+        if shingles:
+            line.novelty = sum(1 / frequency[s] for s in shingles) / len(shingles)
+
+
+def build_compact_log(
+    entries: list[dict[str, Any]], token_budget: int | None = None
+) -> CompactLog:
+    """Build the compact log text of entries within a token budget.
+
+    Args:
+        entries: Log entries in time order, in the JSONL log format.
+        token_budget: Maximum estimated tokens of the text; 0 disables
+                     trimming. Uses AUTO_DAILY_SUMMARY_TOKEN_BUDGET env var
+                     or default if not specified.
+
+    Returns:
+        The compact text with token estimates.
+    """
+    budget = token_budget if token_budget is not None else get_summary_token_budget()
+    original_tokens = sum(
+        estimate_tokens(json.dumps(entry, ensure_ascii=False)) + 1 for entry in entries
+    )
+
+    blocks = _build_blocks(entries)
+    lines = [line for block in blocks for line in block.lines]
+    # Per-line estimates round up, so their sum never undercounts the text
+    tokens = sum(
+        estimate_tokens(row) + 1
+        for block in blocks
+        for row in block.render().split("\n")
+    )
+
+    dropped = 0
+    if budget > 0 and tokens > budget:
+        # Leave room for the note about the dropped lines
+        budget -= estimate_tokens(_DROPPED_NOTE.format(count=len(lines))) + 1
+        _score_novelty(lines, entries)
+        for line in sorted(lines, key=lambda line: (line.novelty, -line.order)):
+            if tokens <= budget:
+                break
+            line.kept = False
+            tokens -= estimate_tokens(f"  {line.text}") + 1
+            dropped += 1
+
+    text = "\n".join(block.render() for block in blocks)
+    if dropped:
+        text += "\n" + _DROPPED_NOTE.format(count=dropped)
+    return CompactLog(
+        text=text,
+        tokens=estimate_tokens(text),
+        original_tokens=original_tokens,
+        dropped_lines=dropped,
+    )
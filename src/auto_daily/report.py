@@ -1,88 +1,170 @@
 """Report and summarize command implementations for auto-daily."""
 
 import asyncio
-import json
 import sys
-from datetime import date, datetime
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 from auto_daily.calendar import (
-    LogEntry,
     get_all_events,
-    match_events_with_logs,
+    match_events_with_sessions,
 )
+from auto_daily.compactor import LogCompactor, train_dictionary
 from auto_daily.config import (
+    get_db_path,
     get_log_dir,
     get_ollama_base_url,
     get_ollama_model,
     get_reports_dir,
+    get_search_db_path,
     get_summaries_dir,
-    get_summary_prompt_template,
 )
+from auto_daily.llm.cache import CachedLLMClient, LLMCache, open_llm_cache
 from auto_daily.llm.ollama import check_ollama_connection
-from auto_daily.logger import get_log_filename
+from auto_daily.llm.protocol import LLMClient
+from auto_daily.llm.streaming import generate_to_file, partial_path
+from auto_daily.log_reader import (
+    day_log_files,
+    iter_day_records,
+    iter_records,
+)
+from auto_daily.logger import get_hourly_log_path
+from auto_daily.map_reduce import MapReduceSummarizer
 from auto_daily.ollama import (
     OllamaClient,
-    generate_daily_report_prompt,
-    generate_daily_report_prompt_with_calendar,
-    save_daily_report,
+    generate_daily_report_prompt_from_sessions,
+    generate_daily_report_prompt_with_calendar_from_sessions,
+    get_daily_report_path,
+)
+from auto_daily.rolling_summary import RollingSummarizer, get_checkpoint_hours
+from auto_daily.search import SearchIndex
+from auto_daily.sessions import Session, sessionize, sessionize_entries
+from auto_daily.store import (
+    ActivityStore,
+    open_activity_store,
 )
 from auto_daily.summarize import (
     generate_daily_report_prompt_from_summaries,
     get_missing_summary_hours,
     get_summaries_for_date,
+    get_summary_dir_for_date,
+    get_summary_filename,
     save_summary,
 )
+from auto_daily.time_accounting import (
+    compute_time_stats,
+    day_time_stats,
+    format_report_section,
+    load_range,
+)
 
 
-def _load_logs_as_entries(log_file: Path) -> list[LogEntry]:
-    """Load JSONL log file and convert to LogEntry objects.
+def read_hour_entries(
+    log_dir: Path, target_datetime: datetime, store: ActivityStore | None = None
+) -> list[dict] | None:
+    """Read one hour of log entries.
 
     Args:
-        log_file: Path to the JSONL log file.
+        log_dir: Base directory for logs.
+        target_datetime: Any time within the hour to read.
+        store: Activity store to read the hour from instead of log_dir.
 
     Returns:
-        List of LogEntry objects.
+        Entries of the hour in time order, or None if there are no logs.
     """
-    entries = []
-    with open(log_file) as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                data = json.loads(line)
-                timestamp_str = data.get("timestamp", "")
-                window_info = data.get("window_info", {})
-                entries.append(
-                    LogEntry(
-                        timestamp=datetime.fromisoformat(timestamp_str),
-                        app_name=window_info.get("app_name", ""),
-                        window_title=window_info.get("window_title", ""),
-                        ocr_text=data.get("ocr_text", ""),
-                    )
-                )
-    return entries
+    if store is not None:
+        return store.query_hour(target_datetime) or None
 
+    hour_start = target_datetime.replace(minute=0, second=0, microsecond=0)
+    records = iter_records(log_dir, hour_start, hour_start + timedelta(hours=1))
+    return [record.data for record in records] or None
 
-def generate_summary_prompt(log_content: str) -> str:
-    """Generate a prompt for hourly log summarization.
 
-    Reads template from summary_prompt.txt in project root.
-    Falls back to default template if file doesn't exist.
+def _open_llm_client(use_cache: bool) -> tuple[LLMClient, LLMCache | None]:
+    """Return the LLM client for reports, answering from the cache if enabled.
 
     Args:
-        log_content: The log content to summarize.
+        use_cache: If False, the cache is bypassed even if it is enabled.
 
     Returns:
-        A prompt for the LLM with {log_content} replaced.
+        Tuple of (client, cache to report statistics of and close).
     """
-    template = get_summary_prompt_template()
-    return template.format(log_content=log_content)
+    client: LLMClient = OllamaClient()
+    cache = open_llm_cache() if use_cache else None
+    if cache is None:
+        return client, None
+    return CachedLLMClient(client, cache), cache
+
+
+async def generate_missing_summaries(
+    log_dir: Path,
+    summaries_dir: Path,
+    target_date: date,
+    hours: list[int],
+    store: ActivityStore | None = None,
+    concurrency: int | None = None,
+    client: LLMClient | None = None,
+) -> list[int]:
+    """Summarize several hours of a day concurrently.
+
+    At most ``concurrency`` requests are sent to the LLM at a time, counting
+    the chunks of hours too large for one prompt. Each summary is saved as
+    soon as it is generated, so a failed hour does not lose the others.
+
+    Args:
+        log_dir: Base directory for logs.
+        summaries_dir: Base directory for summaries.
+        target_date: Day of the hours.
+        hours: Hours (0-23) to summarize.
+        store: Activity store to read the hours from instead of log_dir.
+        concurrency: Maximum concurrent requests.
+                    Uses AUTO_DAILY_SUMMARY_CONCURRENCY env var or default if
+                    not specified.
+        client: LLM client to use. Uses OllamaClient if not specified.
+
+    Returns:
+        Hours whose summary could not be generated.
+    """
+    summarizer = MapReduceSummarizer(
+        client if client is not None else OllamaClient(),
+        get_ollama_model(),
+        concurrency=concurrency,
+    )
+    rolling = RollingSummarizer(summarizer, log_dir, summaries_dir)
+    done = 0
+
+    async def summarize_hour(hour: int) -> bool:
+        nonlocal done
+        target_datetime = datetime.combine(target_date, datetime.min.time()).replace(
+            hour=hour
+        )
+        try:
+            if rolling.has_checkpoint(target_datetime):
+                # Only the entries since the last update are left to merge
+                await rolling.save(target_datetime)
+            elif entries := read_hour_entries(log_dir, target_datetime, store):
+                summary = await summarizer.summarize_hour(entries)
+                save_summary(summaries_dir, target_date, hour, summary)
+        except Exception as e:
+            # Keep going; the other hours are still worth summarizing
+            done += 1
+            print(f"  Failed hour {hour:02d} ({done}/{len(hours)}): {e}")
+            return False
+        done += 1
+        print(f"  Generated summary for hour {hour:02d} ({done}/{len(hours)})")
+        return True
+
+    results = await asyncio.gather(*(summarize_hour(hour) for hour in hours))
+    return [hour for hour, ok in zip(hours, results, strict=True) if not ok]
 
 
 async def report_command(
     date_str: str | None = None,
     with_calendar: bool = False,
     auto_summarize: bool = False,
+    concurrency: int | None = None,
+    use_cache: bool = True,
 ) -> None:
     """Generate a daily report from summaries or logs.
 
@@ -91,9 +173,10 @@ async def report_command(
                   If None, uses today's date.
         with_calendar: If True, include calendar events in report.
         auto_summarize: If True, automatically generate missing summaries.
+        concurrency: Maximum summaries generated at the same time.
+                    Uses AUTO_DAILY_SUMMARY_CONCURRENCY if None.
+        use_cache: If False, bypass the LLM response cache.
     """
-    from auto_daily.logger import get_hourly_log_filename, get_log_dir_for_date
-
     # Check Ollama connection before proceeding
     if not check_ollama_connection():
         ollama_url = get_ollama_base_url()
@@ -111,29 +194,84 @@ async def report_command(
 
     log_dir = get_log_dir()
     summaries_dir = get_summaries_dir()
-
+    client, cache = _open_llm_client(use_cache)
+
+    try:
+        store = open_activity_store()
+        try:
+            prompt = await _build_report_prompt(
+                log_dir,
+                summaries_dir,
+                target_date,
+                with_calendar,
+                auto_summarize,
+                store,
+                concurrency,
+                client,
+            )
+        finally:
+            if store is not None:
+                store.close()
+
+        # Stream the report into its file as it is generated
+        model = get_ollama_model()
+        report_path = get_daily_report_path(get_reports_dir(), target_date)
+        print(f"Writing report: {partial_path(report_path)}")
+        _, stats = await generate_to_file(client, prompt, model, report_path)
+
+        print(f"Report saved: {report_path}")
+        print(stats.format())
+        if cache is not None:
+            print(cache.stats.format())
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+async def _build_report_prompt(
+    log_dir: Path,
+    summaries_dir: Path,
+    target_date: date,
+    with_calendar: bool,
+    auto_summarize: bool,
+    store: ActivityStore | None,
+    concurrency: int | None = None,
+    client: LLMClient | None = None,
+) -> str:
+    """Build the daily report prompt from summaries, the store or log files.
+
+    Exits the process if there are no logs for the date.
+    """
     # Auto-summarize if requested
     if auto_summarize:
-        missing_hours = get_missing_summary_hours(log_dir, summaries_dir, target_date)
+        # Hours with a running summary are brought up to date as well
+        missing_hours = sorted(
+            set(
+                get_missing_summary_hours(
+                    log_dir, summaries_dir, target_date, store=store
+                )
+            )
+            | set(get_checkpoint_hours(summaries_dir, target_date))
+        )
         if missing_hours:
             print(f"Generating summaries for hours: {missing_hours}...")
-            client = OllamaClient()
-            model = get_ollama_model()
-
-            for hour in missing_hours:
-                # Read log file for this hour
-                target_datetime = datetime.combine(
-                    target_date, datetime.min.time()
-                ).replace(hour=hour)
-                date_log_dir = get_log_dir_for_date(log_dir, target_datetime)
-                log_file = date_log_dir / get_hourly_log_filename(target_datetime)
-
-                if log_file.exists():
-                    log_content = log_file.read_text()
-                    prompt = generate_summary_prompt(log_content)
-                    summary = await client.generate(model=model, prompt=prompt)
-                    save_summary(summaries_dir, target_date, hour, summary)
-                    print(f"  Generated summary for hour {hour:02d}")
+            failed = await generate_missing_summaries(
+                log_dir,
+                summaries_dir,
+                target_date,
+                missing_hours,
+                store,
+                concurrency,
+                client,
+            )
+            if failed:
+                hours = ", ".join(f"{hour:02d}" for hour in failed)
+                print(f"Warning: Report will not include hours: {hours}")
+
+    # Measured time per app and window goes in with the activities, so the
+    # LLM need not guess it
+    time_stats = day_time_stats(log_dir, target_date, store)
+    time_table = format_report_section(time_stats) if time_stats.entries else ""
 
     # Try to use summary files first
     summaries = get_summaries_for_date(summaries_dir, target_date)
@@ -141,42 +279,80 @@ async def report_command(
     if summaries:
         # Use summaries for report generation
         print(f"Generating report for {target_date.isoformat()} from summaries...")
-        prompt = generate_daily_report_prompt_from_summaries(summaries)
-    else:
-        # Fall back to log file
-        target_datetime = datetime.combine(target_date, datetime.min.time())
-        log_file = log_dir / get_log_filename(target_datetime)
+        summarizer = MapReduceSummarizer(
+            client if client is not None else OllamaClient(),
+            get_ollama_model(),
+            concurrency=concurrency,
+        )
+        condensed, end_hours = await summarizer.condense_summaries(summaries)
+        if len(condensed) < len(summaries):
+            print(
+                f"Merged {len(summaries)} hourly summaries into {len(condensed)} "
+                "to fit the report prompt"
+            )
+        return generate_daily_report_prompt_from_summaries(
+            condensed, end_hours, time_table
+        )
 
-        if not log_file.exists():
-            print(f"Error: No log file found for {target_date.isoformat()}")
-            print(f"Expected: {log_file}")
+    if store is not None:
+        # Fall back to the day's entries in the activity store
+        entries = store.query_date(target_date)
+        if not entries:
+            print(f"Error: No log entries found for {target_date.isoformat()}")
+            print(f"Database: {store.path}")
             sys.exit(1)
 
-        # Generate report using Ollama
         print(f"Generating report for {target_date.isoformat()}...")
+        return await _report_prompt_from_sessions(
+            list(sessionize_entries(entries)), target_date, with_calendar, time_table
+        )
 
-        if with_calendar:
-            # Fetch calendar events and match with logs
-            events = await get_all_events(target_date)
-            log_entries = _load_logs_as_entries(log_file)
-            match_result = match_events_with_logs(events, log_entries)
-            prompt = generate_daily_report_prompt_with_calendar(log_file, match_result)
-        else:
-            prompt = generate_daily_report_prompt(log_file)
+    # Fall back to the log files of the day, streamed hour by hour
+    if not day_log_files(log_dir, target_date):
+        print(f"Error: No log files found for {target_date.isoformat()}")
+        print(f"Expected: {log_dir / target_date.isoformat()}/activity_HH.jsonl")
+        sys.exit(1)
 
-    client = OllamaClient()
-    model = get_ollama_model()
-    content = await client.generate(model=model, prompt=prompt)
+    # Generate report using Ollama
+    print(f"Generating report for {target_date.isoformat()}...")
+    sessions = list(sessionize(iter_day_records(log_dir, target_date)))
+    return await _report_prompt_from_sessions(
+        sessions, target_date, with_calendar, time_table
+    )
+
+
+async def _report_prompt_from_sessions(
+    sessions: list[Session],
+    target_date: date,
+    with_calendar: bool,
+    time_table: str = "",
+) -> str:
+    """Build the report prompt from the activity sessions of a day.
 
-    # Save report
-    reports_dir = get_reports_dir()
-    report_path = save_daily_report(reports_dir, content, target_date)
+    Args:
+        sessions: Activity sessions of the day.
+        target_date: The date of the report.
+        with_calendar: If True, match the sessions with calendar events.
+        time_table: Measured time table included with the activities.
 
-    print(f"Report saved: {report_path}")
+    Returns:
+        The prompt for the daily report.
+    """
+    print(f"Activity: {len(sessions)} sessions")
+    if with_calendar:
+        # Fetch calendar events and match with the sessions
+        events = await get_all_events(
+            target_date, on_fetch=lambda fetch: print(fetch.format())
+        )
+        match_result = match_events_with_sessions(events, sessions)
+        return generate_daily_report_prompt_with_calendar_from_sessions(
+            sessions, match_result, time_table
+        )
+    return generate_daily_report_prompt_from_sessions(sessions, time_table)
 
 
 async def summarize_command(
-    date_str: str | None = None, hour: int | None = None
+    date_str: str | None = None, hour: int | None = None, use_cache: bool = True
 ) -> None:
     """Generate a summary for an hour's worth of logs.
 
@@ -185,8 +361,8 @@ async def summarize_command(
                   If None, uses today's date.
         hour: Optional hour (0-23) to summarize.
               If None, uses the current hour.
+        use_cache: If False, bypass the LLM response cache.
     """
-    from auto_daily.logger import get_log_dir_for_date
 
     # Check Ollama connection before proceeding
     if not check_ollama_connection():
@@ -214,36 +390,62 @@ async def summarize_command(
     target_datetime = datetime.combine(
         target_date, datetime.min.time().replace(hour=target_hour)
     )
-    date_log_dir = get_log_dir_for_date(log_dir, target_datetime)
-    log_file = date_log_dir / get_log_filename(target_datetime)
 
-    if not log_file.exists():
-        print(f"No log file found for {target_date.isoformat()} hour {target_hour:02d}")
-        print(f"Expected: {log_file}")
-        return
-
-    # Read log content
-    log_content = log_file.read_text()
+    store = open_activity_store()
+    if store is not None:
+        # Read the hour from the activity store
+        with store:
+            entries = read_hour_entries(log_dir, target_datetime, store)
+        if entries is None:
+            print(
+                f"No log entries found for {target_date.isoformat()} "
+                f"hour {target_hour:02d}"
+            )
+            print(f"Database: {store.path}")
+            return
+    else:
+        entries = read_hour_entries(log_dir, target_datetime)
+        if entries is None:
+            print(
+                f"No log file found for {target_date.isoformat()} "
+                f"hour {target_hour:02d}"
+            )
+            print(f"Expected: {get_hourly_log_path(log_dir, target_datetime)}")
+            return
 
     # Generate summary using Ollama
     print(f"Generating summary for {target_date.isoformat()} {target_hour:02d}:00...")
 
-    prompt = generate_summary_prompt(log_content)
-    client = OllamaClient()
+    client, cache = _open_llm_client(use_cache)
     model = get_ollama_model()
-    summary = await client.generate(model=model, prompt=prompt)
-
-    # Save summary
-    summaries_dir = get_summaries_dir()
-    summary_path = save_summary(summaries_dir, target_date, target_hour, summary)
+    try:
+        summarizer = MapReduceSummarizer(client, model)
+        hour_prompt = await summarizer.build_hour_prompt(entries)
+        print(hour_prompt.format())
+
+        # Stream the summary into its file as it is generated
+        summary_path = get_summary_dir_for_date(
+            get_summaries_dir(), target_date
+        ) / get_summary_filename(target_hour)
+        _, stats = await generate_to_file(
+            client, hour_prompt.prompt, model, summary_path
+        )
 
-    print(f"Summary saved: {summary_path}")
+        print(f"Summary saved: {summary_path}")
+        print(stats.format())
+        if cache is not None:
+            print(cache.stats.format())
+    finally:
+        if cache is not None:
+            cache.close()
 
 
 def run_report_command(
     date_str: str | None = None,
     with_calendar: bool = False,
     auto_summarize: bool = False,
+    concurrency: int | None = None,
+    use_cache: bool = True,
 ) -> None:
     """Run report command synchronously (wrapper for CLI).
 
@@ -251,15 +453,171 @@ def run_report_command(
         date_str: Optional date string in YYYY-MM-DD format.
         with_calendar: If True, include calendar events in report.
         auto_summarize: If True, automatically generate missing summaries.
+        concurrency: Maximum summaries generated at the same time.
+        use_cache: If False, bypass the LLM response cache.
     """
-    asyncio.run(report_command(date_str, with_calendar, auto_summarize))
+    asyncio.run(
+        report_command(date_str, with_calendar, auto_summarize, concurrency, use_cache)
+    )
 
 
-def run_summarize_command(date_str: str | None = None, hour: int | None = None) -> None:
+def run_summarize_command(
+    date_str: str | None = None, hour: int | None = None, use_cache: bool = True
+) -> None:
     """Run summarize command synchronously (wrapper for CLI).
 
     Args:
         date_str: Optional date string in YYYY-MM-DD format.
         hour: Optional hour (0-23) to summarize.
+        use_cache: If False, bypass the LLM response cache.
+    """
+    asyncio.run(summarize_command(date_str, hour, use_cache))
+
+
+def run_import_command(log_dir: str | None = None, db_path: str | None = None) -> None:
+    """Import hourly JSONL logs into the activity database.
+
+    Only lines appended since the previous import are added, so the command
+    can be run repeatedly.
+
+    Args:
+        log_dir: Log directory to import. Uses AUTO_DAILY_LOG_DIR if None.
+        db_path: Database file. Uses AUTO_DAILY_DB_PATH if None.
     """
-    asyncio.run(summarize_command(date_str, hour))
+    source = Path(log_dir).expanduser() if log_dir else get_log_dir()
+    target = Path(db_path).expanduser() if db_path else get_db_path()
+
+    print(f"Importing {source} into {target}...")
+    with ActivityStore(target) as store:
+        stats = store.import_jsonl_tree(source)
+
+    print(f"Imported {stats.entries} entries from {stats.files} files")
+    if stats.skipped:
+        print(f"Skipped {stats.skipped} unreadable lines")
+
+
+def run_search_command(
+    query: str,
+    limit: int = 20,
+    app_name: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+) -> None:
+    """Search the logs and print ranked hits.
+
+    Lines appended to the JSONL logs since the last search (or not indexed
+    while monitoring) are indexed first.
+
+    Args:
+        query: Search terms; all must match.
+        limit: Maximum number of hits.
+        app_name: Only search entries of this application.
+        since: Optional first date in YYYY-MM-DD format.
+        until: Optional last date (inclusive) in YYYY-MM-DD format.
+    """
+    start = datetime.fromisoformat(since) if since else None
+    end = datetime.fromisoformat(until) + timedelta(days=1) if until else None
+
+    with SearchIndex(get_search_db_path()) as index:
+        stats = index.index_jsonl_tree(get_log_dir())
+        if stats.entries:
+            print(f"Indexed {stats.entries} new entries")
+
+        started = time.perf_counter()
+        hits = index.search(query, limit, app_name, start, end)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        print(
+            f"{hit.timestamp:%Y-%m-%d %H:%M:%S}  {hit.app_name}"
+            + (f" - {hit.window_title}" if hit.window_title else "")
+        )
+        if hit.snippet:
+            print(f"    {hit.snippet}")
+    print(f"{len(hits)} hits ({elapsed_ms:.0f} ms)")
+
+
+def run_stats_command(
+    date_str: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    limit: int = 10,
+) -> None:
+    """Print the time spent per application, window and Slack channel.
+
+    Args:
+        date_str: Optional date in YYYY-MM-DD format. If None (and no range
+                  is given), uses today's date.
+        since: Optional first date of a range in YYYY-MM-DD format.
+        until: Optional last date (inclusive) of a range in YYYY-MM-DD
+               format. Defaults to today when since is given.
+        limit: Maximum rows per table.
+    """
+    if since:
+        first = date.fromisoformat(since)
+        last = date.fromisoformat(until) if until else date.today()
+    else:
+        first = last = date.fromisoformat(date_str) if date_str else date.today()
+    start = datetime.combine(first, datetime.min.time())
+    end = datetime.combine(last + timedelta(days=1), datetime.min.time())
+
+    started = time.perf_counter()
+    store = open_activity_store()
+    try:
+        activity = load_range(get_log_dir(), start, end, store)
+    finally:
+        if store is not None:
+            store.close()
+    loaded = time.perf_counter()
+    stats = compute_time_stats(activity)
+    computed = time.perf_counter()
+
+    period = first.isoformat() if first == last else f"{first} - {last}"
+    if not stats.entries:
+        print(f"No activity logged for {period}")
+        return
+    print(f"Time spent: {period}")
+    print()
+    print(stats.format_table(limit))
+    print()
+    print(
+        f"Loaded {stats.entries} entries in {(loaded - started) * 1000:.0f} ms, "
+        f"computed in {(computed - loaded) * 1000:.1f} ms"
+    )
+
+
+def run_compact_command(
+    log_dir: str | None = None,
+    method: str | None = None,
+    train: bool = False,
+) -> None:
+    """Compress closed hourly logs now instead of waiting for the monitor.
+
+    Args:
+        log_dir: Log directory to compact. Uses AUTO_DAILY_LOG_DIR if None.
+        method: Compression method ("gzip", "zstd"). Uses
+               AUTO_DAILY_LOG_COMPRESSION if None.
+        train: Train a zstd dictionary on recent logs first.
+    """
+    source = Path(log_dir).expanduser() if log_dir else get_log_dir()
+    compactor = LogCompactor(source, method)
+    if compactor.method == "off":
+        print(
+            "Log compression is off; pass --method gzip or set "
+            "AUTO_DAILY_LOG_COMPRESSION"
+        )
+        return
+
+    if train:
+        if compactor.method != "zstd":
+            print("Error: dictionaries are only used with zstd compression")
+            sys.exit(1)
+        dict_file = train_dictionary(source)
+        print(f"Dictionary saved: {dict_file}")
+
+    stats = compactor.compact_once()
+    print(
+        f"Compressed {stats.files} files ({stats.bytes_in:,} -> {stats.bytes_out:,} bytes)"
+    )
+    if stats.failed:
+        print(f"Failed to compress {stats.failed} files")
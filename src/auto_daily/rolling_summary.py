@@ -0,0 +1,254 @@
+"""Rolling summaries updated while an hour is in progress.
+
+Summarizing a whole hour after it has passed sends all of its log to the
+LLM at once and makes the report wait for it. ``RollingSummarizer`` instead
+summarizes the entries appended to ``activity_HH.jsonl`` since the last
+checkpoint and merges them into a running summary of the hour. The
+checkpoint (byte offset and running summary) is kept in a hidden
+``.rolling_HH.json`` next to the summaries:
+
+    summaries/2024-12-24/.rolling_10.json   # while 10:00-11:00 is running
+    summaries/2024-12-24/summary_10.md      # written by finalize()
+
+When the hour is over, ``finalize`` merges the last few minutes and saves
+the summary, so only a small delta is left for the end of the hour.
+Offsets count decompressed bytes and stay valid after the log is
+compressed (see auto_daily.store.read_appended_entries).
+"""
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from auto_daily.log_files import log_exists
+from auto_daily.logger import get_hourly_log_path
+from auto_daily.map_reduce import MapReduceSummarizer
+from auto_daily.prompt_builder import build_compact_log
+from auto_daily.store import read_appended_entries
+from auto_daily.summarize import save_summary
+
+CHECKPOINT_PATTERN = re.compile(r"\.rolling_(\d{2})\.json")
+
+ROLLING_MERGE_PROMPT_TEMPLATE = """以下は、ある 1 時間の作業のここまでの要約と、その後に記録された作業ログです。
+新しいログの内容を反映して、この 1 時間の作業の要約を更新してください。
+これまでの要約の内容は残し、重複する内容はまとめてください。
+
+## これまでの要約
+{summary}
+
+## 新しいログ
+{log_content}"""
+
+
+@dataclass
+class Checkpoint:
+    """Progress of the rolling summary of an hour.
+
+    Attributes:
+        offset: Bytes of the hourly log already summarized.
+        summary: Running summary of the entries before offset.
+        entries: Entries summarized so far.
+        updates: LLM updates of the running summary so far.
+    """
+
+    offset: int = 0
+    summary: str = ""
+    entries: int = 0
+    updates: int = 0
+
+
+def get_checkpoint_path(summaries_base: Path, target_datetime: datetime) -> Path:
+    """Return the checkpoint file of an hour without creating it.
+
+    Args:
+        summaries_base: Base directory for summaries.
+        target_datetime: Any time within the hour.
+
+    Returns:
+        Path like summaries/2024-12-24/.rolling_10.json.
+    """
+    return (
+        summaries_base
+        / target_datetime.strftime("%Y-%m-%d")
+        / f".rolling_{target_datetime.hour:02d}.json"
+    )
+
+
+def get_checkpoint_hours(summaries_base: Path, target_date: date) -> list[int]:
+    """Return the hours of a date that have a running summary.
+
+    Args:
+        summaries_base: Base directory for summaries.
+        target_date: The date to check.
+
+    Returns:
+        Sorted hours (0-23) with a checkpoint file.
+    """
+    date_dir = summaries_base / target_date.strftime("%Y-%m-%d")
+    return sorted(
+        int(match.group(1))
+        for path in date_dir.glob(".rolling_*.json")
+        if (match := CHECKPOINT_PATTERN.fullmatch(path.name))
+    )
+
+
+def load_checkpoint(path: Path) -> Checkpoint:
+    """Load a checkpoint, starting over if it is missing or unreadable."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return Checkpoint(**data)
+    except (OSError, ValueError, TypeError):
+        return Checkpoint()
+
+
+def save_checkpoint(path: Path, checkpoint: Checkpoint) -> None:
+    """Write a checkpoint atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(asdict(checkpoint), ensure_ascii=False), "utf-8")
+    os.replace(tmp, path)
+
+
+def is_hour_over(target_datetime: datetime, now: datetime | None = None) -> bool:
+    """Return True if the hour of target_datetime has ended."""
+    now = now if now is not None else datetime.now()
+    hour_start = target_datetime.replace(minute=0, second=0, microsecond=0)
+    return now >= hour_start + timedelta(hours=1)
+
+
+class RollingSummarizer:
+    """Keep a running summary of an hour from its appended log entries."""
+
+    def __init__(
+        self, summarizer: MapReduceSummarizer, log_dir: Path, summaries_dir: Path
+    ) -> None:
+        """Initialize the rolling summarizer.
+
+        Args:
+            summarizer: Summarizer sending the LLM calls.
+            log_dir: Base directory for logs.
+            summaries_dir: Base directory for summaries and checkpoints.
+        """
+        self._summarizer = summarizer
+        self._log_dir = log_dir
+        self._summaries_dir = summaries_dir
+
+    def has_checkpoint(self, target_datetime: datetime) -> bool:
+        """Return True if the hour has a running summary."""
+        return get_checkpoint_path(self._summaries_dir, target_datetime).exists()
+
+    async def _merge(self, summary: str, entries: list[dict]) -> str:
+        """Merge new entries into a running summary."""
+        compact = build_compact_log(entries, token_budget=0)
+        budget = self._summarizer.token_budget
+        if budget and compact.tokens > budget:
+            # A large delta is summarized on its own (map-reduce) first
+            log_content = await self._summarizer.summarize_hour(entries)
+        else:
+            log_content = compact.text
+        return await self._summarizer.generate(
+            ROLLING_MERGE_PROMPT_TEMPLATE.format(
+                summary=summary, log_content=log_content
+            )
+        )
+
+    async def update(self, target_datetime: datetime) -> Checkpoint:
+        """Summarize the entries appended since the last checkpoint.
+
+        The checkpoint is only saved once the running summary is updated, so
+        a failed LLM call is retried with the same entries next time.
+
+        Args:
+            target_datetime: Any time within the hour.
+
+        Returns:
+            The checkpoint after the update (unchanged if nothing was new).
+        """
+        path = get_checkpoint_path(self._summaries_dir, target_datetime)
+        checkpoint = load_checkpoint(path)
+        log_file = get_hourly_log_path(self._log_dir, target_datetime)
+        if not log_exists(log_file):
+            return checkpoint
+
+        entries, offset, _ = read_appended_entries(log_file, checkpoint.offset)
+        if not entries:
+            return checkpoint
+
+        if checkpoint.summary:
+            summary = await self._merge(checkpoint.summary, entries)
+        else:
+            summary = await self._summarizer.summarize_hour(entries)
+        checkpoint = Checkpoint(
+            offset=offset,
+            summary=summary,
+            entries=checkpoint.entries + len(entries),
+            updates=checkpoint.updates + 1,
+        )
+        save_checkpoint(path, checkpoint)
+        return checkpoint
+
+    async def finalize(self, target_datetime: datetime) -> Path | None:
+        """Merge the last entries of an hour and save its summary.
+
+        Hours without a checkpoint are summarized in one go, as before.
+
+        Args:
+            target_datetime: Any time within the hour.
+
+        Returns:
+            Path to the saved summary file, or None if the hour has no log.
+        """
+        checkpoint = await self.update(target_datetime)
+        if not checkpoint.summary:
+            return None
+        summary_file = save_summary(
+            self._summaries_dir,
+            target_datetime.date(),
+            target_datetime.hour,
+            checkpoint.summary,
+        )
+        get_checkpoint_path(self._summaries_dir, target_datetime).unlink(
+            missing_ok=True
+        )
+        return summary_file
+
+    async def save_progress(self, target_datetime: datetime) -> Path | None:
+        """Update the running summary and save it as the hour's summary.
+
+        Unlike finalize, the checkpoint is kept, so an hour still in
+        progress goes on being updated after a report includes it.
+
+        Args:
+            target_datetime: Any time within the hour.
+
+        Returns:
+            Path to the saved summary file, or None if the hour has no log.
+        """
+        checkpoint = await self.update(target_datetime)
+        if not checkpoint.summary:
+            return None
+        return save_summary(
+            self._summaries_dir,
+            target_datetime.date(),
+            target_datetime.hour,
+            checkpoint.summary,
+        )
+
+    async def save(
+        self, target_datetime: datetime, now: datetime | None = None
+    ) -> Path | None:
+        """Finalize a past hour or save the progress of the current one.
+
+        Args:
+            target_datetime: Any time within the hour.
+            now: Current time. Uses datetime.now() if not specified.
+
+        Returns:
+            Path to the saved summary file, or None if the hour has no log.
+        """
+        if is_hour_over(target_datetime, now):
+            return await self.finalize(target_datetime)
+        return await self.save_progress(target_datetime)
@@ -1,31 +1,44 @@
 """Periodic capture scheduler module."""
 
 import threading
+import time
 from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from auto_daily.capture_pipeline import CaptureContext, execute_capture_pipeline
 from auto_daily.config import get_capture_interval
 from auto_daily.system import is_system_active
 from auto_daily.window_monitor import get_active_window
 
+if TYPE_CHECKING:
+    from auto_daily.window_source import SystemStateSource, WindowSource
+
 type CaptureCallback = Callable[[Path], None]
 type SummaryCallback = Callable[[Path, Path], None]
 
 
-def process_periodic_capture(log_dir: Path) -> bool:
+def process_periodic_capture(
+    log_dir: Path, window_source: "WindowSource | None" = None
+) -> bool:
     """Process a periodic capture event.
 
     Captures the screen, performs OCR, and logs the activity.
 
     Args:
         log_dir: Directory for storing logs and temporary captures.
+        window_source: Where the active window is read from. Uses a one-shot
+                      AppleScript (get_active_window) if not specified.
 
     Returns:
         True if processing completed successfully, False otherwise.
     """
-    window_info = get_active_window()
+    window_info = (
+        window_source.get_active_window()
+        if window_source is not None
+        else get_active_window()
+    )
     context = CaptureContext(
         window_info=window_info,
         log_dir=log_dir,
@@ -42,6 +55,7 @@ class PeriodicCapture:
         callback: CaptureCallback,
         log_dir: Path,
         interval: float | None = None,
+        system_state: "SystemStateSource | None" = None,
     ) -> None:
         """Initialize the periodic capture scheduler.
 
@@ -50,12 +64,15 @@ class PeriodicCapture:
             log_dir: Directory for storing logs.
             interval: Time in seconds between captures.
                      Uses AUTO_DAILY_CAPTURE_INTERVAL env var or default if not specified.
+            system_state: Whether the user session is active. Uses Quartz
+                         (is_system_active) if not specified.
         """
         self._callback = callback
         self._log_dir = log_dir
         self._interval = (
             interval if interval is not None else float(get_capture_interval())
         )
+        self._system_state = system_state
         self._running = False
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
@@ -63,7 +80,12 @@ class PeriodicCapture:
     def _capture_loop(self) -> None:
         """Background loop that triggers captures at regular intervals."""
         while self._running:
-            if is_system_active():
+            active = (
+                self._system_state.is_system_active()
+                if self._system_state is not None
+                else is_system_active()
+            )
+            if active:
                 self._callback(self._log_dir)
             # Wait for interval or stop signal
             if self._stop_event.wait(self._interval):
@@ -92,7 +114,8 @@ class HourlySummaryScheduler:
     """Schedule hourly log summarization.
 
     This scheduler triggers a callback at the top of each hour to summarize
-    the previous hour's logs.
+    the previous hour's logs, and optionally a rolling callback every
+    rolling_interval seconds to update the summary of the current hour.
     """
 
     def __init__(
@@ -101,6 +124,8 @@ class HourlySummaryScheduler:
         log_dir: Path,
         summaries_dir: Path,
         check_interval: float = 60.0,
+        rolling_callback: SummaryCallback | None = None,
+        rolling_interval: float = 0.0,
     ) -> None:
         """Initialize the hourly summary scheduler.
 
@@ -110,11 +135,18 @@ class HourlySummaryScheduler:
             log_dir: Directory containing activity logs.
             summaries_dir: Directory for storing summaries.
             check_interval: How often to check if summarization is needed (seconds).
+            rolling_callback: Function updating the running summary of the
+                             current hour. Receives the same arguments.
+            rolling_interval: Seconds between rolling updates (0 disables
+                             them).
         """
         self._callback = callback
         self._log_dir = log_dir
         self._summaries_dir = summaries_dir
         self._check_interval = check_interval
+        self._rolling_callback = rolling_callback
+        self._rolling_interval = rolling_interval
+        self._next_rolling = 0.0
         self._running = False
         self._thread: threading.Thread | None = None
         self._trigger_event = threading.Event()
@@ -137,6 +169,18 @@ class HourlySummaryScheduler:
                 if now.minute < 5 and self._last_triggered_hour != current_hour:
                     self._last_triggered_hour = current_hour
                     self._callback(self._log_dir, self._summaries_dir)
+                elif self._rolling_due():
+                    self._rolling_callback(self._log_dir, self._summaries_dir)
+
+    def _rolling_due(self) -> bool:
+        """Return True (and schedule the next one) if a rolling update is due."""
+        if self._rolling_callback is None or self._rolling_interval <= 0:
+            return False
+        now = time.monotonic()
+        if now < self._next_rolling:
+            return False
+        self._next_rolling = now + self._rolling_interval
+        return True
 
     def start(self) -> None:
         """Start the hourly summary scheduler."""
@@ -144,6 +188,7 @@ class HourlySummaryScheduler:
             return
 
         self._running = True
+        self._next_rolling = time.monotonic() + self._rolling_interval
         self._thread = threading.Thread(target=self._summary_loop)
         self._thread.daemon = True
         self._thread.start()
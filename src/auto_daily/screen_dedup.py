@@ -0,0 +1,159 @@
+"""Perceptual-hash screen deduplication.
+
+Periodic captures of a window whose content has not changed produce the
+same OCR text again and again. This module computes a difference hash
+(dHash) of a downsampled grayscale capture and compares it with the last
+capture of the same window, so the pipeline can skip OCR for unchanged
+screens.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+
+from PIL import Image
+
+from auto_daily.config import get_dedup_mode, get_dedup_threshold
+from auto_daily.imaging import ImageSource, open_image
+
+logger = logging.getLogger(__name__)
+
+# 16x16 gradients = 256-bit hash; fine enough to notice a few changed lines
+DEFAULT_HASH_SIZE = 16
+
+DEDUP_MODES = ("reuse", "marker", "off")
+
+
+def compute_dhash(image: ImageSource, hash_size: int = DEFAULT_HASH_SIZE) -> int | None:
+    """Compute the difference hash (dHash) of an image.
+
+    The image is converted to grayscale and downsampled to
+    (hash_size + 1) x hash_size pixels. Each bit records whether a pixel is
+    brighter than its right neighbour.
+
+    Args:
+        image: Path to the image file or encoded image bytes.
+        hash_size: Number of gradient bits per row and number of rows.
+
+    Returns:
+        The hash as an integer of hash_size * hash_size bits, or None if the
+        image could not be read.
+    """
+    try:
+        with open_image(image) as opened:
+            small = opened.convert("L").resize(
+                (hash_size + 1, hash_size),
+                Image.Resampling.BILINEAR,
+                reducing_gap=2.0,
+            )
+    except OSError as e:
+        logger.debug("Cannot hash image: %s", e)
+        return None
+
+    pixels = small.tobytes()
+    width = hash_size + 1
+    bits = 0
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Return the number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class _WindowFingerprint:
+    """Last known hash and OCR text of a window."""
+
+    image_hash: int
+    ocr_text: str
+
+
+class ScreenDeduplicator:
+    """Remember the last capture of each window and detect unchanged screens.
+
+    Thread-safe; shared by all OCR workers of the capture pipeline.
+    """
+
+    def __init__(
+        self,
+        threshold: int | None = None,
+        mode: str | None = None,
+        hash_size: int = DEFAULT_HASH_SIZE,
+    ) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            threshold: Maximum Hamming distance considered "unchanged".
+                      Uses AUTO_DAILY_DEDUP_THRESHOLD env var or default if not specified.
+            mode: What to log for unchanged screens: "reuse" logs the previous
+                  OCR text, "marker" logs an empty entry flagged as unchanged.
+                  Uses AUTO_DAILY_DEDUP_MODE env var or default if not specified.
+            hash_size: dHash size (see compute_dhash).
+
+        Raises:
+            ValueError: If the mode is not supported.
+        """
+        self.threshold = threshold if threshold is not None else get_dedup_threshold()
+        self.mode = mode if mode is not None else get_dedup_mode()
+        if self.mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode: {self.mode}")
+        self.hash_size = hash_size
+        self._last: dict[tuple[str, str], _WindowFingerprint] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether deduplication is active."""
+        return self.mode != "off"
+
+    def hash_image(self, image: ImageSource) -> int | None:
+        """Hash an image file or buffer with this deduplicator's hash size."""
+        return compute_dhash(image, self.hash_size)
+
+    def find_unchanged(
+        self, window_key: tuple[str, str], image_hash: int | None
+    ) -> str | None:
+        """Look up the previous OCR text if the window looks unchanged.
+
+        Args:
+            window_key: (app_name, window_title) of the capture.
+            image_hash: Hash of the new capture, or None if hashing failed.
+
+        Returns:
+            The OCR text of the previous capture if its hash is within the
+            threshold, otherwise None.
+        """
+        if image_hash is None:
+            return None
+        with self._lock:
+            previous = self._last.get(window_key)
+            if (
+                previous is not None
+                and hamming_distance(previous.image_hash, image_hash) <= self.threshold
+            ):
+                self.hits += 1
+                return previous.ocr_text
+            self.misses += 1
+            return None
+
+    def remember(
+        self, window_key: tuple[str, str], image_hash: int | None, ocr_text: str
+    ) -> None:
+        """Record the hash and OCR text of a freshly recognized capture.
+
+        Args:
+            window_key: (app_name, window_title) of the capture.
+            image_hash: Hash of the capture, or None if hashing failed.
+            ocr_text: OCR text that was logged for the capture.
+        """
+        if image_hash is None:
+            return
+        with self._lock:
+            self._last[window_key] = _WindowFingerprint(image_hash, ocr_text)
@@ -0,0 +1,346 @@
+"""Full-text search over activity logs.
+
+Entries are indexed in a SQLite FTS5 table: the window title and app name,
+and the OCR text or speech transcript. FTS5's unicode61 tokenizer only
+splits on whitespace and punctuation, which would leave a Japanese sentence
+as one huge token. Text is therefore pre-tokenized here: runs of CJK
+characters become overlapping bigrams, everything else is passed through to
+unicode61. Queries are tokenized the same way and matched as phrases, so
+"会議室" finds "第二会議室で" and "ABC-123" finds "see ABC-123.".
+
+The index is updated incrementally: the log writer hands it every batch
+while monitoring, and ``index_jsonl_tree`` catches up with lines appended
+to the hourly JSONL files since the last run. Entries are keyed by a hash
+of their content, so both paths can feed the same index without duplicates.
+"""
+
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from auto_daily.log_files import iter_hourly_logs
+from auto_daily.store import ImportStats, entry_key, read_appended_entries
+
+# Hiragana, Katakana, CJK ideographs, halfwidth Katakana and Hangul
+_CJK_RUN = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f\uac00-\ud7af]+"
+)
+
+# The FTS table is contentless; the text itself lives in documents
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    app_name TEXT NOT NULL DEFAULT '',
+    window_title TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_documents_timestamp ON documents (timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, content='', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS indexed_files (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+"""
+
+# bm25 column weights: a hit in the window title counts more than in OCR text
+TITLE_WEIGHT = 2.0
+BODY_WEIGHT = 1.0
+
+DEFAULT_SNIPPET_WIDTH = 80
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result.
+
+    Attributes:
+        timestamp: When the entry was logged.
+        type: "activity" or "speech".
+        app_name: Application of the entry.
+        window_title: Window title of the entry.
+        snippet: Excerpt of the text around the first match.
+        score: bm25 rank (lower is better).
+    """
+
+    timestamp: datetime
+    type: str
+    app_name: str
+    window_title: str
+    snippet: str
+    score: float
+
+
+def tokenize(text: str) -> str:
+    """Split CJK runs into overlapping bigrams.
+
+    Args:
+        text: Text to index or search for.
+
+    Returns:
+        Space-separated tokens for the unicode61 tokenizer.
+    """
+    parts: list[str] = []
+    pos = 0
+    for match in _CJK_RUN.finditer(text):
+        parts.append(text[pos : match.start()])
+        run = match.group()
+        if len(run) == 1:
+            parts.append(run)
+        else:
+            parts.extend(run[i : i + 2] for i in range(len(run) - 1))
+        pos = match.end()
+    parts.append(text[pos:])
+    return " ".join(stripped for part in parts if (stripped := part.strip()))
+
+
+def build_match_query(query: str) -> str:
+    """Convert a user query into an FTS5 MATCH expression.
+
+    Every whitespace-separated term becomes a phrase of its tokens and all
+    terms must match. A term ending in a single CJK character matches it as
+    a prefix, since indexed CJK text only contains bigrams.
+
+    Args:
+        query: Search terms as typed by the user.
+
+    Returns:
+        MATCH expression, or an empty string if the query has no terms.
+    """
+    phrases = []
+    for term in query.split():
+        if not any(ch.isalnum() for ch in term):
+            continue
+        tokens = tokenize(term).split()
+        phrase = '"' + " ".join(tokens).replace('"', '""') + '"'
+        last = tokens[-1]
+        if len(last) == 1 and _CJK_RUN.fullmatch(last):
+            phrase += " *"
+        phrases.append(phrase)
+    return " AND ".join(phrases)
+
+
+def make_snippet(text: str, query: str, width: int = DEFAULT_SNIPPET_WIDTH) -> str:
+    """Return an excerpt of text around the first occurrence of a query term.
+
+    Args:
+        text: Full text of the hit.
+        query: Search terms as typed by the user.
+        width: Maximum snippet length in characters.
+
+    Returns:
+        Single-line excerpt, with "..." where text was cut.
+    """
+    flat = " ".join(text.split())
+    lowered = flat.lower()
+    positions = [
+        pos for term in query.split() if (pos := lowered.find(term.lower())) >= 0
+    ]
+    start = max(0, min(positions) - width // 4) if positions else 0
+    snippet = flat[start : start + width]
+    if start > 0:
+        snippet = "..." + snippet
+    if start + width < len(flat):
+        snippet += "..."
+    return snippet
+
+
+def _document(entry: dict[str, Any]) -> tuple[str, str, str, str, str, str]:
+    """Convert a log entry to a documents row."""
+    key = entry_key(entry)
+    window_info = entry.get("window_info") or {}
+    entry_type = entry.get("type", "activity")
+    text = entry.get("transcript" if entry_type == "speech" else "ocr_text") or ""
+    return (
+        key,
+        entry.get("timestamp", ""),
+        entry_type,
+        window_info.get("app_name", ""),
+        window_info.get("window_title", ""),
+        text,
+    )
+
+
+class SearchIndex:
+    """Incremental full-text index of log entries.
+
+    Thread-safe; the log writer adds batches from its own thread.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (and create if needed) the index.
+
+        Args:
+            path: Database file. ":memory:" is accepted for tests.
+        """
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def add_many(self, entries: Iterable[dict[str, Any]]) -> int:
+        """Index log entries in one transaction, skipping known entries.
+
+        Args:
+            entries: Entries in the JSONL log format.
+
+        Returns:
+            Number of entries newly indexed.
+        """
+        documents = [_document(entry) for entry in entries]
+        added = 0
+        with self._lock, self._conn:
+            for document in documents:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO documents"
+                    " (key, timestamp, type, app_name, window_title, text)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    document,
+                )
+                if cursor.rowcount == 0:
+                    continue
+                _, _, _, app_name, window_title, text = document
+                self._conn.execute(
+                    "INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)",
+                    (
+                        cursor.lastrowid,
+                        tokenize(f"{app_name} {window_title}"),
+                        tokenize(text),
+                    ),
+                )
+                added += 1
+        return added
+
+    def index_jsonl_file(self, path: Path) -> ImportStats:
+        """Index the lines of a JSONL log appended since the last run.
+
+        Args:
+            path: JSONL log file.
+
+        Returns:
+            Counters for this file; entries counts newly indexed entries.
+        """
+        key = str(path.resolve())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT offset FROM indexed_files WHERE path = ?", (key,)
+            ).fetchone()
+        offset = row[0] if row else 0
+
+        entries, new_offset, skipped = read_appended_entries(path, offset)
+        if new_offset == offset:
+            return ImportStats()
+
+        added = self.add_many(entries)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO indexed_files (path, offset) VALUES (?, ?)",
+                (key, new_offset),
+            )
+        return ImportStats(files=1, entries=added, skipped=skipped)
+
+    def index_jsonl_tree(self, log_base: Path) -> ImportStats:
+        """Index new lines of all hourly JSONL logs under a log directory.
+
+        Args:
+            log_base: Base directory containing YYYY-MM-DD/activity_HH.jsonl,
+                     plain or compressed.
+
+        Returns:
+            Summed counters.
+        """
+        total = ImportStats()
+        for path in iter_hourly_logs(log_base):
+            stats = self.index_jsonl_file(path)
+            total.files += stats.files
+            total.entries += stats.entries
+            total.skipped += stats.skipped
+        return total
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        app_name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[SearchHit]:
+        """Return the best matching entries.
+
+        Args:
+            query: Search terms; all must match.
+            limit: Maximum number of hits.
+            app_name: Only return entries of this application.
+            since: Only return entries at or after this time.
+            until: Only return entries before this time.
+
+        Returns:
+            Hits ordered by relevance, then by recency.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT d.timestamp, d.type, d.app_name, d.window_title, d.text,"
+            " bm25(documents_fts, ?, ?) AS score"
+            " FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+            " WHERE documents_fts MATCH ?"
+        )
+        params: list[Any] = [TITLE_WEIGHT, BODY_WEIGHT, match]
+        if app_name is not None:
+            sql += " AND d.app_name = ?"
+            params.append(app_name)
+        if since is not None:
+            sql += " AND d.timestamp >= ?"
+            params.append(since.isoformat())
+        if until is not None:
+            sql += " AND d.timestamp < ?"
+            params.append(until.isoformat())
+        sql += " ORDER BY score, d.timestamp DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            SearchHit(
+                timestamp=datetime.fromisoformat(timestamp),
+                type=entry_type,
+                app_name=app,
+                window_title=title,
+                snippet=make_snippet(text or title, query),
+                score=score,
+            )
+            for timestamp, entry_type, app, title, text, score in rows
+        ]
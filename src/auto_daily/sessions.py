@@ -0,0 +1,198 @@
+"""Activity sessions built from raw log entries.
+
+``PeriodicCapture`` logs the active window every 30 seconds, so most
+entries of an hour repeat the same (app_name, window_title) with an OCR
+dump that barely changed. ``sessionize`` merges consecutive entries of a
+window into one ``Session`` in a single streaming pass:
+
+    10:00 Code - main.py  ┐
+    10:00:30 ...          ├─> Session(Code, main.py, 10:00-10:12, 12 min,
+    10:12 Code - main.py  ┘            OCR lines not seen earlier)
+    10:12 Slack - dev     ──> Session(Slack, dev, ...)
+
+A gap longer than the session gap (screen locked, away from the desk)
+ends a session even if the window did not change. Final speech
+transcripts become sessions of their own. Report prompts, compact summary
+logs and calendar matching work from sessions instead of raw entries.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from auto_daily.config import get_session_gap
+from auto_daily.log_decoder import LogRecord
+
+# OCR lines shorter than this are noise (icons, single letters)
+MIN_LINE_LENGTH = 3
+
+SPEECH = "speech"
+
+
+@dataclass
+class Session:
+    """Consecutive entries in the same window, or one speech transcript.
+
+    Attributes:
+        app_name: Application name ("" for speech).
+        window_title: Window title ("" for speech).
+        start: Time of the first entry.
+        end: Time of the last entry.
+        until: Time the window was left (the next entry within the session
+              gap), or end.
+        entries: Log entries merged into the session.
+        ocr_lines: OCR lines of the session not seen earlier in the stream.
+        kind: "activity" or "speech".
+        transcript: Speech transcript (speech sessions only).
+        slack_context: Slack context of the first entry, if any.
+    """
+
+    app_name: str
+    window_title: str
+    start: datetime
+    end: datetime
+    until: datetime
+    entries: int = 1
+    ocr_lines: list[str] = field(default_factory=list)
+    kind: str = "activity"
+    transcript: str = ""
+    slack_context: dict[str, Any] | None = None
+
+    @property
+    def timestamp(self) -> datetime:
+        """Start of the session (for code that expects a LogEntry)."""
+        return self.start
+
+    @property
+    def dwell(self) -> timedelta:
+        """Time spent in the window."""
+        return self.until - self.start
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.app_name, self.window_title)
+
+
+def _normalize(raw: str) -> str:
+    return " ".join(raw.split())
+
+
+class Sessionizer:
+    """Merge a stream of log records into sessions.
+
+    Feed records in time order with ``add`` and call ``flush`` at the end;
+    both return the sessions completed by the call.
+    """
+
+    def __init__(self, gap: float | None = None) -> None:
+        """Initialize the sessionizer.
+
+        Args:
+            gap: Longest time in seconds between two entries of one session.
+                Uses AUTO_DAILY_SESSION_GAP_MINUTES env var or default if
+                not specified.
+        """
+        self.gap = timedelta(seconds=gap if gap is not None else get_session_gap())
+        self._current: Session | None = None
+        self._seen: set[str] = set()
+
+    def _novel_lines(self, ocr_text: str) -> Iterator[str]:
+        """Yield the OCR lines not seen earlier in the stream."""
+        for raw in ocr_text.splitlines():
+            text = _normalize(raw)
+            if len(text) < MIN_LINE_LENGTH or text in self._seen:
+                continue
+            self._seen.add(text)
+            yield text
+
+    def _close(self, at: datetime | None) -> list[Session]:
+        """End the current session, left at time at if within the gap."""
+        session = self._current
+        if session is None:
+            return []
+        self._current = None
+        if at is not None and at - session.end <= self.gap:
+            session.until = max(session.end, at)
+        return [session]
+
+    def add(self, record: LogRecord) -> list[Session]:
+        """Add the next record.
+
+        Records with an unparsable timestamp and partial speech are skipped.
+
+        Args:
+            record: Log record, not earlier than the previous one.
+
+        Returns:
+            Sessions completed by the record (empty, one or two).
+        """
+        try:
+            at = record.parsed_timestamp
+        except (TypeError, ValueError):
+            return []
+
+        if record.type == SPEECH:
+            extra = record.extra or {}
+            transcript = _normalize(extra.get("transcript") or "")
+            if extra.get("is_final") is False or not transcript:
+                return []
+            done = self._close(at)
+            speech = Session("", "", at, at, at, kind=SPEECH, transcript=transcript)
+            return [*done, speech]
+
+        current = self._current
+        if (
+            current is not None
+            and current.key == (record.app_name, record.window_title)
+            and at - current.end <= self.gap
+        ):
+            current.end = current.until = max(current.end, at)
+            current.entries += 1
+            current.ocr_lines.extend(self._novel_lines(record.ocr_text))
+            return []
+
+        done = self._close(at)
+        self._current = Session(
+            record.app_name,
+            record.window_title,
+            at,
+            at,
+            at,
+            ocr_lines=list(self._novel_lines(record.ocr_text)),
+            slack_context=(record.extra or {}).get("slack_context"),
+        )
+        return done
+
+    def flush(self) -> list[Session]:
+        """End the stream and return the last session, if any."""
+        return self._close(None)
+
+
+def sessionize(
+    records: Iterable[LogRecord], gap: float | None = None
+) -> Iterator[Session]:
+    """Merge log records into sessions in one pass.
+
+    Args:
+        records: Log records in time order (e.g., from auto_daily.log_reader).
+        gap: Longest time in seconds between two entries of one session.
+            Uses AUTO_DAILY_SESSION_GAP_MINUTES env var or default if not
+            specified.
+
+    Yields:
+        Sessions in time order.
+    """
+    sessionizer = Sessionizer(gap)
+    for record in records:
+        yield from sessionizer.add(record)
+    yield from sessionizer.flush()
+
+
+def sessionize_entries(
+    entries: Iterable[dict[str, Any]], gap: float | None = None
+) -> Iterator[Session]:
+    """Merge log entry dictionaries into sessions (see sessionize)."""
+    strings: dict[str, str] = {}
+    records = (LogRecord.from_entry(entry, strings) for entry in entries)
+    yield from sessionize(records, gap)
@@ -0,0 +1,345 @@
+"""SQLite-backed activity store.
+
+Hourly JSONL files are cheap to append to, but every report rescans and
+reparses whole files, and a time-range query means globbing directories.
+``ActivityStore`` keeps the same entries in a local SQLite database in WAL
+mode with indexes on the timestamp and the app name, so reports and
+summaries load an exact time range with an index range scan. Existing
+``logs/YYYY-MM-DD/activity_HH.jsonl`` trees are imported incrementally with
+``import_jsonl_tree`` (``auto-daily import``). Entries are keyed by a hash
+of their content, so entries the monitor already inserted through the log
+writer are not imported a second time.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from auto_daily.blob_store import resolve_entries
+from auto_daily.config import get_db_path, get_storage_backend
+from auto_daily.log_files import iter_hourly_logs, log_size, open_log, skip_bytes
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKENDS = ("jsonl", "sqlite")
+
+# Timestamps are stored as naive ISO 8601 strings, which sort chronologically
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    key TEXT,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    app_name TEXT NOT NULL DEFAULT '',
+    window_title TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries (timestamp);
+CREATE INDEX IF NOT EXISTS idx_entries_app_name ON entries (app_name, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_key ON entries (key);
+CREATE TABLE IF NOT EXISTS imported_files (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class ImportStats:
+    """Result of importing JSONL logs.
+
+    Attributes:
+        files: Files that had new lines.
+        entries: Entries imported.
+        skipped: Lines that could not be parsed.
+    """
+
+    files: int = 0
+    entries: int = 0
+    skipped: int = 0
+
+
+def read_appended_entries(
+    path: Path, offset: int
+) -> tuple[list[dict[str, Any]], int, int]:
+    """Parse the complete JSONL lines of a log after a byte offset.
+
+    A trailing line without a newline is still being written and is left
+    for the next call. Offsets count decompressed bytes, so they stay valid
+    when the compactor compresses the log. OCR text stored in the blob store
+    is resolved.
+
+    Args:
+        path: Plain path of the JSONL log file.
+        offset: Byte offset already consumed.
+
+    Returns:
+        Tuple of (entries, new offset, number of unparsable lines).
+    """
+    if log_size(path) == offset:
+        # Nothing new; avoids decompressing closed logs on every import
+        return [], offset, 0
+    with open_log(path) as f:
+        skip_bytes(f, offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+
+    entries: list[dict[str, Any]] = []
+    skipped = 0
+    for line in data[:end].decode("utf-8", errors="replace").splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            skipped += 1
+            continue
+        if isinstance(entry, dict):
+            entries.append(entry)
+        else:
+            skipped += 1
+    return resolve_entries(entries, path), offset + end, skipped
+
+
+def entry_key(entry: dict[str, Any]) -> str:
+    """Return a hash identifying a log entry by its content."""
+    return hashlib.sha1(
+        json.dumps(entry, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def _entry_row(entry: dict[str, Any]) -> tuple[str, str, str, str, str, str]:
+    """Convert a log entry to an entries table row."""
+    window_info = entry.get("window_info") or {}
+    return (
+        entry_key(entry),
+        entry.get("timestamp", ""),
+        entry.get("type", "activity"),
+        window_info.get("app_name", ""),
+        window_info.get("window_title", ""),
+        json.dumps(entry, ensure_ascii=False),
+    )
+
+
+class ActivityStore:
+    """Activity log entries in a SQLite database.
+
+    Thread-safe; the log writer inserts from its own thread while other
+    threads read.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (and create if needed) the database.
+
+        Args:
+            path: Database file. ":memory:" is accepted for tests.
+        """
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._conn.executescript(SCHEMA)
+
+    def _migrate(self) -> None:
+        """Add content keys to a database created before they existed.
+
+        Duplicate entries (e.g., inserted by the monitor and imported again)
+        are removed, keeping the first.
+        """
+        columns = [
+            name for _, name, *_ in self._conn.execute("PRAGMA table_info(entries)")
+        ]
+        if not columns or "key" in columns:
+            return
+        logger.info("Adding content keys to %s", self.path)
+        with self._conn:
+            self._conn.execute("ALTER TABLE entries ADD COLUMN key TEXT")
+            seen: set[str] = set()
+            duplicates: list[tuple[int]] = []
+            keys: list[tuple[str, int]] = []
+            for row_id, data in self._conn.execute(
+                "SELECT id, data FROM entries ORDER BY id"
+            ).fetchall():
+                key = entry_key(json.loads(data))
+                if key in seen:
+                    duplicates.append((row_id,))
+                else:
+                    seen.add(key)
+                    keys.append((key, row_id))
+            self._conn.executemany("DELETE FROM entries WHERE id = ?", duplicates)
+            self._conn.executemany("UPDATE entries SET key = ? WHERE id = ?", keys)
+
+    def __enter__(self) -> "ActivityStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Insert a single log entry."""
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[dict[str, Any]]) -> int:
+        """Insert log entries in one transaction, skipping known entries.
+
+        Args:
+            entries: Entries in the JSONL log format.
+
+        Returns:
+            Number of entries newly inserted.
+        """
+        with self._lock, self._conn:
+            return self._insert(entries)
+
+    def _insert(self, entries: Iterable[dict[str, Any]]) -> int:
+        """Insert entries not stored yet; the caller holds the lock."""
+        before = self._conn.total_changes
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO entries"
+            " (key, timestamp, type, app_name, window_title, data)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [_entry_row(entry) for entry in entries],
+        )
+        return self._conn.total_changes - before
+
+    def query(
+        self,
+        start: datetime,
+        end: datetime,
+        app_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return entries with start <= timestamp < end in time order.
+
+        Args:
+            start: Inclusive start of the range.
+            end: Exclusive end of the range.
+            app_name: Only return entries of this application.
+
+        Returns:
+            Entries in the JSONL log format.
+        """
+        sql = "SELECT data FROM entries WHERE timestamp >= ? AND timestamp < ?"
+        params: list[str] = [start.isoformat(), end.isoformat()]
+        if app_name is not None:
+            sql += " AND app_name = ?"
+            params.append(app_name)
+        sql += " ORDER BY timestamp, id"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def query_hour(self, dt: datetime) -> list[dict[str, Any]]:
+        """Return the entries of the hour containing dt."""
+        start = dt.replace(minute=0, second=0, microsecond=0)
+        return self.query(start, start + timedelta(hours=1))
+
+    def query_date(self, target_date: date) -> list[dict[str, Any]]:
+        """Return the entries of a day."""
+        start = datetime.combine(target_date, time.min)
+        return self.query(start, start + timedelta(days=1))
+
+    def get_hours(self, target_date: date) -> list[int]:
+        """Return the hours (0-23) of a day that have entries."""
+        start = datetime.combine(target_date, time.min)
+        end = start + timedelta(days=1)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT substr(timestamp, 12, 2) FROM entries"
+                " WHERE timestamp >= ? AND timestamp < ?",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return sorted(int(hour) for (hour,) in rows)
+
+    def import_jsonl_file(self, path: Path) -> ImportStats:
+        """Import the lines of a JSONL log appended since the last import.
+
+        The byte offset reached is remembered per file, so re-importing a
+        file that is still being written only adds the new lines. A trailing
+        line without a newline is left for the next import. Entries already
+        in the store (e.g., inserted by the monitor) are skipped.
+
+        Args:
+            path: JSONL log file.
+
+        Returns:
+            Import counters for this file; entries counts new entries only.
+        """
+        key = str(path.resolve())
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT offset FROM imported_files WHERE path = ?", (key,)
+            ).fetchone()
+        offset = row[0] if row else 0
+
+        entries, new_offset, skipped = read_appended_entries(path, offset)
+        if new_offset == offset:
+            return ImportStats()
+
+        with self._lock, self._conn:
+            added = self._insert(entries)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imported_files (path, offset) VALUES (?, ?)",
+                (key, new_offset),
+            )
+        return ImportStats(files=1, entries=added, skipped=skipped)
+
+    def import_jsonl_tree(self, log_base: Path) -> ImportStats:
+        """Import all hourly JSONL logs under a log directory.
+
+        Args:
+            log_base: Base directory containing YYYY-MM-DD/activity_HH.jsonl,
+                     plain or compressed.
+
+        Returns:
+            Summed import counters.
+        """
+        total = ImportStats()
+        for path in iter_hourly_logs(log_base):
+            stats = self.import_jsonl_file(path)
+            total.files += stats.files
+            total.entries += stats.entries
+            total.skipped += stats.skipped
+        return total
+
+
+def open_activity_store(backend: str | None = None) -> ActivityStore | None:
+    """Open the activity store if the SQLite backend is configured.
+
+    Args:
+        backend: Storage backend ("jsonl", "sqlite").
+                 Uses AUTO_DAILY_STORAGE env var or default if not specified.
+
+    Returns:
+        The store at AUTO_DAILY_DB_PATH, or None for the JSONL backend.
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    name = backend if backend is not None else get_storage_backend()
+    if name == "jsonl":
+        return None
+    if name == "sqlite":
+        return ActivityStore(get_db_path())
+    raise ValueError(f"Unknown storage backend: {name}")
@@ -4,6 +4,9 @@ import re
 from datetime import date
 from pathlib import Path
 
+from auto_daily.log_files import log_hours
+from auto_daily.store import ActivityStore
+
 
 def get_log_hours_for_date(log_base: Path, target_date: date) -> list[int]:
     """Get all hours that have log files for a specific date.
@@ -13,26 +16,16 @@ def get_log_hours_for_date(log_base: Path, target_date: date) -> list[int]:
         target_date: The date for which to get log hours.
 
     Returns:
-        List of hours (0-23) that have log files.
+        List of hours (0-23) that have log files, plain or compressed.
     """
-    date_dir = log_base / target_date.strftime("%Y-%m-%d")
-
-    if not date_dir.exists():
-        return []
-
-    hours: list[int] = []
-    pattern = re.compile(r"activity_(\d{2})\.jsonl")
-
-    for log_file in date_dir.glob("activity_*.jsonl"):
-        match = pattern.match(log_file.name)
-        if match:
-            hours.append(int(match.group(1)))
-
-    return sorted(hours)
+    return log_hours(log_base / target_date.strftime("%Y-%m-%d"))
 
 
 def get_missing_summary_hours(
-    log_base: Path, summaries_base: Path, target_date: date
+    log_base: Path,
+    summaries_base: Path,
+    target_date: date,
+    store: ActivityStore | None = None,
 ) -> list[int]:
     """Get hours that have logs but no summaries.
 
@@ -40,11 +33,15 @@ def get_missing_summary_hours(
         log_base: Base directory for logs.
         summaries_base: Base directory for summaries.
         target_date: The date to check.
+        store: Activity store to read log hours from instead of log_base.
 
     Returns:
         List of hours that have logs but no corresponding summaries.
     """
-    log_hours = set(get_log_hours_for_date(log_base, target_date))
+    if store is not None:
+        log_hours = set(store.get_hours(target_date))
+    else:
+        log_hours = set(get_log_hours_for_date(log_base, target_date))
     summaries = get_summaries_for_date(summaries_base, target_date)
     summary_hours = set(summaries.keys())
 
@@ -79,11 +76,19 @@ def get_summaries_for_date(summaries_base: Path, target_date: date) -> dict[int,
     return summaries
 
 
-def generate_daily_report_prompt_from_summaries(summaries: dict[int, str]) -> str:
+def generate_daily_report_prompt_from_summaries(
+    summaries: dict[int, str],
+    end_hours: dict[int, int] | None = None,
+    time_table: str = "",
+) -> str:
     """Generate a prompt for daily report from hourly summaries.
 
     Args:
         summaries: Dictionary mapping hour (0-23) to summary content.
+        end_hours: End hour of summaries covering more than one hour (e.g.,
+                   merged by auto_daily.map_reduce), keyed like summaries.
+        time_table: Measured time per app (see auto_daily.time_accounting),
+                    given to the LLM with the summaries. Omitted if empty.
 
     Returns:
         A prompt for the LLM to generate a daily report.
@@ -97,8 +102,11 @@ def generate_daily_report_prompt_from_summaries(summaries: dict[int, str]) -> st
     summary_sections = []
     for hour in sorted_hours:
         content = summaries[hour]
-        summary_sections.append(f"## {hour:02d}:00-{hour + 1:02d}:00\n{content}")
+        end = (end_hours or {}).get(hour, hour + 1)
+        summary_sections.append(f"## {hour:02d}:00-{end:02d}:00\n{content}")
 
+    if time_table:
+        summary_sections.append(time_table)
     combined_summaries = "\n\n".join(summary_sections)
 
     return f"""以下は今日の作業の時間帯ごとの要約です。
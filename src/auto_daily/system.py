@@ -1,9 +1,13 @@
 """Module for detecting macOS system state (sleep, lock, idle)."""
 
-# ty: ignore - PyObjC dynamically exports this from CoreGraphics
-from Quartz.CoreGraphics import (
-    CGSessionCopyCurrentDictionary,  # type: ignore[attr-defined]
-)
+try:
+    # ty: ignore - PyObjC dynamically exports this from CoreGraphics
+    from Quartz.CoreGraphics import (
+        CGSessionCopyCurrentDictionary,  # type: ignore[attr-defined]
+    )
+except ImportError:
+    # Off macOS (e.g., replaying traces on Linux CI) the session is never locked
+    CGSessionCopyCurrentDictionary = None
 
 
 def is_screen_locked() -> bool:
@@ -14,6 +18,8 @@ def is_screen_locked() -> bool:
     """
     # CGSessionCopyCurrentDictionary returns information about the current session.
     # If the session is locked, it contains the 'CGSSessionScreenIsLocked' key.
+    if CGSessionCopyCurrentDictionary is None:
+        return False
     session_info = CGSessionCopyCurrentDictionary()
     if session_info:
         # The value is typically 1 (True) or missing/None
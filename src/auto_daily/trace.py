@@ -0,0 +1,382 @@
+"""Record and replay window/lock event traces.
+
+A trace is a JSONL file: a header line with the wall-clock start time,
+followed by one line per window change or lock-state change, stamped with
+seconds since the start. ``TraceRecorder`` wraps the live window and system
+state sources to write such a file while monitoring. ``TraceReplayer``
+implements the same source protocols over a recorded trace, and
+``replay_trace`` drives the real ``WindowMonitor`` and capture pipeline
+with it at 1x or accelerated virtual time, so throughput can be measured
+deterministically without macOS.
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Literal
+
+from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+from auto_daily.window_monitor import WindowInfo, WindowMonitor
+from auto_daily.window_source import SystemStateSource, WindowSource
+
+TRACE_VERSION = 1
+
+type TraceEventKind = Literal["window", "system"]
+
+
+@dataclass
+class TraceEvent:
+    """A single recorded event.
+
+    Attributes:
+        t: Seconds since the start of the trace.
+        kind: "window" for a frontmost window change, "system" for a
+              lock-state change.
+        window: New frontmost window (window events only).
+        active: New system activity state (system events only).
+    """
+
+    t: float
+    kind: TraceEventKind
+    window: WindowInfo | None = None
+    active: bool | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the JSON object stored in the trace file."""
+        if self.kind == "window":
+            return {"t": round(self.t, 3), "type": "window", **(self.window or {})}
+        return {"t": round(self.t, 3), "type": "system", "active": self.active}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TraceEvent":
+        """Create an event from a JSON object of the trace file.
+
+        Raises:
+            ValueError: If the event type is unknown.
+        """
+        kind = data.get("type")
+        if kind == "window":
+            return cls(
+                t=float(data["t"]),
+                kind="window",
+                window={
+                    "app_name": data.get("app_name", ""),
+                    "window_title": data.get("window_title", ""),
+                },
+            )
+        if kind == "system":
+            return cls(t=float(data["t"]), kind="system", active=bool(data["active"]))
+        raise ValueError(f"Unknown trace event type: {kind}")
+
+
+@dataclass
+class Trace:
+    """A loaded trace.
+
+    Attributes:
+        started_at: Wall-clock time of the start of the recording.
+        events: Events ordered by time.
+    """
+
+    started_at: datetime
+    events: list[TraceEvent] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Seconds from the start to the last event."""
+        return self.events[-1].t if self.events else 0.0
+
+
+def load_trace(path: Path) -> Trace:
+    """Load a trace file.
+
+    Args:
+        path: Path to the JSONL trace.
+
+    Returns:
+        The trace with events sorted by time.
+
+    Raises:
+        ValueError: If the header is missing or has an unsupported version.
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        raise ValueError(f"Empty trace file: {path}")
+
+    header = json.loads(lines[0])
+    if header.get("type") != "meta" or header.get("version") != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace header in {path}: {header}")
+
+    events = [TraceEvent.from_dict(json.loads(line)) for line in lines[1:]]
+    events.sort(key=lambda event: event.t)
+    return Trace(datetime.fromisoformat(header["started_at"]), events)
+
+
+class TraceRecorder:
+    """Append window and lock-state changes to a trace file.
+
+    Only changes are written, so a trace of a full day stays small. Thread-safe;
+    the window monitor and periodic capture record through the same recorder.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the recorder and write the trace header.
+
+        Args:
+            path: Trace file to create (overwritten if it exists).
+            clock: Monotonic clock in seconds, replaceable in tests.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8", buffering=1)
+        self._clock = clock
+        self._start = clock()
+        self._lock = threading.Lock()
+        self._last_window: WindowInfo | None = None
+        self._last_active: bool | None = None
+        self._write(
+            {
+                "type": "meta",
+                "version": TRACE_VERSION,
+                "started_at": datetime.now().isoformat(),
+            }
+        )
+
+    def _write(self, data: dict[str, Any]) -> None:
+        self._file.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+    def record_window(self, window: WindowInfo) -> None:
+        """Record the frontmost window if it changed."""
+        with self._lock:
+            if window == self._last_window or self._file.closed:
+                return
+            self._last_window = dict(window)
+            event = TraceEvent(self._clock() - self._start, "window", window=window)
+            self._write(event.to_dict())
+
+    def record_system(self, active: bool) -> None:
+        """Record the system activity state if it changed."""
+        with self._lock:
+            if active == self._last_active or self._file.closed:
+                return
+            self._last_active = active
+            event = TraceEvent(self._clock() - self._start, "system", active=active)
+            self._write(event.to_dict())
+
+    def wrap_window_source(self, source: WindowSource) -> "RecordingWindowSource":
+        """Return a window source that records what the given source reports."""
+        return RecordingWindowSource(source, self)
+
+    def wrap_system_state(
+        self, state: SystemStateSource
+    ) -> "RecordingSystemStateSource":
+        """Return a system state source that records what the given source reports."""
+        return RecordingSystemStateSource(state, self)
+
+    def close(self) -> None:
+        """Close the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+class RecordingWindowSource:
+    """Window source decorator recording every reported change."""
+
+    def __init__(self, source: WindowSource, recorder: TraceRecorder) -> None:
+        self._source = source
+        self._recorder = recorder
+
+    def get_active_window(self) -> WindowInfo:
+        """Return and record the active window of the wrapped source."""
+        window = self._source.get_active_window()
+        self._recorder.record_window(window)
+        return window
+
+    def close(self) -> None:
+        """Close the wrapped source."""
+        self._source.close()
+
+
+class RecordingSystemStateSource:
+    """System state source decorator recording every reported change."""
+
+    def __init__(self, state: SystemStateSource, recorder: TraceRecorder) -> None:
+        self._state = state
+        self._recorder = recorder
+
+    def is_system_active(self) -> bool:
+        """Return and record the activity state of the wrapped source."""
+        active = self._state.is_system_active()
+        self._recorder.record_system(active)
+        return active
+
+
+class TraceReplayer:
+    """Window and system state source answering from a trace at virtual time.
+
+    Set the virtual time with ``set_time``; ``clock`` can be handed to
+    ``WindowMonitor`` so its settle time also runs in virtual time.
+    """
+
+    def __init__(self, trace: Trace) -> None:
+        """Initialize the replayer.
+
+        Args:
+            trace: Loaded trace to replay.
+        """
+        self.trace = trace
+        self._now = 0.0
+        windows = [e for e in trace.events if e.kind == "window"]
+        states = [e for e in trace.events if e.kind == "system"]
+        self._window_times = [e.t for e in windows]
+        self._windows = [e.window or {} for e in windows]
+        self._state_times = [e.t for e in states]
+        self._states = [bool(e.active) for e in states]
+
+    def set_time(self, t: float) -> None:
+        """Move the virtual clock to t seconds since the start of the trace."""
+        self._now = t
+
+    def clock(self) -> float:
+        """Return the current virtual time in seconds."""
+        return self._now
+
+    def now(self) -> datetime:
+        """Return the wall-clock time the current virtual time corresponds to."""
+        return self.trace.started_at + timedelta(seconds=self._now)
+
+    def _window_index(self) -> int:
+        return bisect.bisect_right(self._window_times, self._now) - 1
+
+    def get_active_window(self) -> WindowInfo:
+        """Return the window that was frontmost at the current virtual time."""
+        index = self._window_index()
+        if index < 0:
+            return {"app_name": "", "window_title": ""}
+        return dict(self._windows[index])
+
+    def window_since(self) -> datetime:
+        """Return when the current window became frontmost."""
+        index = self._window_index()
+        t = self._window_times[index] if index >= 0 else 0.0
+        return self.trace.started_at + timedelta(seconds=t)
+
+    def is_system_active(self) -> bool:
+        """Return whether the system was active at the current virtual time."""
+        index = bisect.bisect_right(self._state_times, self._now) - 1
+        return self._states[index] if index >= 0 else True
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+@dataclass
+class ReplayStats:
+    """Counters of a trace replay.
+
+    Attributes:
+        virtual_seconds: Trace time covered by the replay, including the
+                         settle time after the last event.
+        wall_seconds: Real time the replay took.
+        window_changes: Window changes submitted to the pipeline.
+        periodic_captures: Periodic captures submitted to the pipeline.
+        suppressed: Window switches suppressed by the settle time.
+    """
+
+    virtual_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    window_changes: int = 0
+    periodic_captures: int = 0
+    suppressed: int = 0
+
+
+def replay_trace(
+    trace: Trace,
+    pipeline: AsyncCapturePipeline,
+    log_dir: Path,
+    speed: float = 1.0,
+    poll_interval: float = 1.0,
+    capture_interval: float = 30.0,
+    settle_ms: float = 0,
+) -> ReplayStats:
+    """Feed a trace through the window monitor into a running capture pipeline.
+
+    Mirrors the monitor command: the window monitor polls every poll_interval
+    and submits settled window changes, and a periodic capture is submitted
+    every capture_interval while the system is active. All times are virtual
+    trace seconds.
+
+    Args:
+        trace: Loaded trace to replay.
+        pipeline: Started capture pipeline receiving the events.
+        log_dir: Log directory put into each capture context.
+        speed: Virtual seconds per real second (e.g., 1000 for 1000x);
+               0 replays as fast as possible.
+        poll_interval: Window monitor polling interval in virtual seconds.
+        capture_interval: Periodic capture interval in virtual seconds.
+        settle_ms: Window settle time in virtual milliseconds.
+
+    Returns:
+        Replay counters.
+    """
+    replayer = TraceReplayer(trace)
+    stats = ReplayStats()
+
+    def on_window_change(old_window: WindowInfo, new_window: WindowInfo) -> None:
+        stats.window_changes += 1
+        pipeline.submit(
+            CaptureContext(
+                window_info=new_window,
+                log_dir=log_dir,
+                extract_slack_context=True,
+                timestamp=replayer.window_since(),
+            )
+        )
+
+    monitor = WindowMonitor(
+        on_window_change,
+        settle_ms=settle_ms,
+        clock=replayer.clock,
+        source=replayer,
+        system_state=replayer,
+    )
+
+    # Run past the last event long enough for its window to settle
+    end = trace.duration + settle_ms / 1000
+    start = time.monotonic()
+    step = 0
+    next_capture = 0.0
+    while (t := step * poll_interval) <= end:
+        replayer.set_time(t)
+        monitor.poll_once()
+        if t >= next_capture:
+            if replayer.is_system_active():
+                stats.periodic_captures += 1
+                pipeline.submit(
+                    CaptureContext(
+                        window_info=replayer.get_active_window(),
+                        log_dir=log_dir,
+                        timestamp=replayer.now(),
+                    )
+                )
+            next_capture += capture_interval
+
+        step += 1
+        if speed > 0:
+            delay = start + step * poll_interval / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    stats.virtual_seconds = end
+    stats.wall_seconds = time.monotonic() - start
+    stats.suppressed = monitor.suppressed_count
+    return stats
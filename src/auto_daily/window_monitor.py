@@ -4,10 +4,16 @@ import subprocess
 import threading
 import time
 from collections.abc import Callable
+from datetime import datetime
+from typing import TYPE_CHECKING
 
 from auto_daily.system import is_system_active
 
+if TYPE_CHECKING:
+    from auto_daily.window_source import SystemStateSource, WindowSource
+
 type WindowInfo = dict[str, str]
+type WindowBounds = tuple[int, int, int, int]
 type WindowChangeCallback = Callable[[WindowInfo, WindowInfo], None]
 
 
@@ -50,30 +56,125 @@ def get_active_window() -> dict[str, str]:
     }
 
 
+def get_active_window_bounds() -> WindowBounds | None:
+    """Get the frontmost window's position and size using AppleScript.
+
+    Returns:
+        (x, y, width, height) in screen points, or None if the frontmost
+        application has no window or the query failed.
+    """
+    script = """
+    tell application "System Events"
+        set frontApp to first application process whose frontmost is true
+        try
+            set {x, y} to position of first window of frontApp
+            set {w, h} to size of first window of frontApp
+        on error
+            return ""
+        end try
+    end tell
+    return (x as text) & "," & (y as text) & "," & (w as text) & "," & (h as text)
+    """
+
+    try:
+        result = subprocess.run(
+            ["osascript", "-e", script],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        return None
+
+    try:
+        x, y, width, height = (int(float(v)) for v in result.stdout.strip().split(","))
+    except ValueError:
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return (x, y, width, height)
+
+
 class WindowMonitor:
-    """Monitor window changes and trigger callbacks when the active window changes."""
+    """Monitor window changes and trigger callbacks when the active window changes.
 
-    def __init__(self, on_window_change: WindowChangeCallback) -> None:
+    With a settle time, a window change is only reported once the new window
+    has stayed frontmost for that long. Windows that were only passed through
+    (alt-tab storms, quick peeks, A→B→A) are suppressed and counted instead
+    of triggering a capture each.
+    """
+
+    def __init__(
+        self,
+        on_window_change: WindowChangeCallback,
+        settle_ms: float = 0,
+        clock: Callable[[], float] = time.monotonic,
+        source: "WindowSource | None" = None,
+        system_state: "SystemStateSource | None" = None,
+    ) -> None:
         """Initialize the window monitor.
 
         Args:
             on_window_change: Callback function called when window changes.
                               Receives (old_window, new_window) as arguments.
+            settle_ms: Time in milliseconds a new window must stay frontmost
+                      before the change is reported. 0 reports immediately.
+            clock: Monotonic clock in seconds, replaceable in tests.
+            source: Where the active window is read from. Uses a one-shot
+                   AppleScript (get_active_window) if not specified.
+            system_state: Whether the user session is active. Uses Quartz
+                         (is_system_active) if not specified.
         """
         self._on_window_change = on_window_change
+        self._settle = settle_ms / 1000
+        self._clock = clock
+        self._source = source
+        self._system_state = system_state
         self._current_window: WindowInfo | None = None
+        self._current_since: datetime | None = None
+        self._pending_window: WindowInfo | None = None
+        self._pending_since = 0.0
+        self._pending_since_wall: datetime | None = None
+        self.suppressed_count = 0
         self._running = False
         self._thread: threading.Thread | None = None
 
+    @property
+    def current_window_since(self) -> datetime | None:
+        """When the current window became frontmost (before any settle delay)."""
+        return self._current_since
+
     def _check_window_change(self, new_window: WindowInfo) -> None:
         """Check if window has changed and trigger callback if so.
 
         Args:
             new_window: The new window information to compare against current.
         """
-        if self._current_window is not None and self._current_window != new_window:
-            self._on_window_change(self._current_window, new_window)
-        self._current_window = new_window
+        if self._current_window is None:
+            self._current_window = new_window
+            self._current_since = datetime.now()
+            return
+
+        if new_window == self._current_window:
+            if self._pending_window is not None:
+                # A→B→A: B never settled, nothing to report
+                self.suppressed_count += 1
+                self._pending_window = None
+            return
+
+        if new_window != self._pending_window:
+            if self._pending_window is not None:
+                self.suppressed_count += 1
+            self._pending_window = new_window
+            self._pending_since = self._clock()
+            self._pending_since_wall = datetime.now()
+
+        if self._clock() - self._pending_since >= self._settle:
+            old_window = self._current_window
+            self._current_window = new_window
+            self._current_since = self._pending_since_wall
+            self._pending_window = None
+            self._on_window_change(old_window, new_window)
 
     def _monitor_loop(self, interval: float) -> None:
         """Background monitoring loop.
@@ -82,11 +183,28 @@ class WindowMonitor:
             interval: Time in seconds between window checks.
         """
         while self._running:
-            if is_system_active():
-                new_window = get_active_window()
-                self._check_window_change(new_window)
+            self.poll_once()
             time.sleep(interval)
 
+    def poll_once(self) -> None:
+        """Read the active window once and report a change if it settled.
+
+        Skipped while the system is inactive (e.g., screen locked).
+        """
+        active = (
+            self._system_state.is_system_active()
+            if self._system_state is not None
+            else is_system_active()
+        )
+        if not active:
+            return
+        new_window = (
+            self._source.get_active_window()
+            if self._source is not None
+            else get_active_window()
+        )
+        self._check_window_change(new_window)
+
     def start(self, interval: float = 1.0) -> None:
         """Start background monitoring.
 
@@ -0,0 +1,375 @@
+"""Sources of active window and system state information.
+
+``get_active_window`` spawns osascript and compiles an AppleScript on every
+call, which costs a fork/exec per poll. ``HelperWindowSource`` instead keeps
+a single JXA (JavaScript for Automation) loop running that streams one
+JSON record ``[app, title, [x, y, width, height]]`` per line over a pipe
+whenever the frontmost window changes, moves or is resized, and restarts it
+automatically if it dies. The bounds let the capture pipeline crop to the active window without
+running osascript per capture. Both implementations sit behind
+the ``WindowSource`` protocol, so the helper can be replaced by any process
+that speaks the same line protocol (e.g., a fake helper in tests).
+``SystemStateSource`` does the same for the screen-lock state, so traces can
+be recorded and replayed without macOS (see ``auto_daily.trace``).
+"""
+
+import json
+import logging
+import subprocess
+import threading
+from collections.abc import Callable, Sequence
+from typing import Protocol, runtime_checkable
+
+from auto_daily.config import get_window_source_name
+from auto_daily.system import is_system_active
+from auto_daily.window_monitor import (
+    WindowBounds,
+    WindowInfo,
+    get_active_window,
+    get_active_window_bounds,
+)
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SOURCES = ("applescript", "helper")
+
+# Seconds between frontmost-window checks inside the helper
+DEFAULT_HELPER_INTERVAL = 0.5
+
+# Seconds to wait for the helper's first line before falling back
+DEFAULT_STARTUP_TIMEOUT = 2.0
+
+# Restart backoff after the helper exits (seconds)
+DEFAULT_RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+
+# JXA loop emitting [app, title, [x, y, width, height]] as one JSON line
+# whenever the frontmost window changes, moves or is resized (bounds are null
+# without a window). JSON escapes newlines in window titles, so a record is
+# always a single line. console.log writes to stderr in osascript, so stdout
+# is written directly.
+HELPER_SCRIPT = """
+ObjC.import("Foundation");
+const systemEvents = Application("System Events");
+const stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+let last = null;
+while (true) {
+    let appName = "";
+    let windowTitle = "";
+    let bounds = null;
+    try {
+        const frontApp = systemEvents.applicationProcesses.whose({frontmost: true})[0];
+        appName = frontApp.name();
+        try {
+            const frontWindow = frontApp.windows[0];
+            windowTitle = frontWindow.name() || "";
+            bounds = frontWindow.position().concat(frontWindow.size());
+        } catch (e) {}
+    } catch (e) {}
+    const line = JSON.stringify([appName, windowTitle, bounds]);
+    if (line !== last) {
+        stdout.writeData($(line + "\\n").dataUsingEncoding($.NSUTF8StringEncoding));
+        last = line;
+    }
+    delay(%(interval)s);
+}
+"""
+
+
+def _decode_record(line: str) -> list:
+    """Decode a JSON record written by the window helper.
+
+    Raises:
+        ValueError: If the line is not an ``[app, title, ...]`` record.
+    """
+    record = json.loads(line)
+    if not isinstance(record, list) or len(record) < 2:
+        raise ValueError(f"Not a window record: {line!r}")
+    return record
+
+
+def parse_window_line(line: str) -> WindowInfo:
+    """Parse a JSON ``[app, title, bounds]`` line into window information.
+
+    Args:
+        line: Line produced by the window helper.
+
+    Returns:
+        dict with 'app_name' and 'window_title' keys.
+
+    Raises:
+        ValueError: If the line is not a window record.
+    """
+    record = _decode_record(line)
+    return {
+        "app_name": str(record[0] or ""),
+        "window_title": str(record[1] or ""),
+    }
+
+
+def parse_window_bounds(line: str) -> WindowBounds | None:
+    """Parse the ``[x, y, width, height]`` field of a helper line.
+
+    Args:
+        line: Line produced by the window helper.
+
+    Returns:
+        (x, y, width, height) in screen points, or None if the record has
+        no usable bounds.
+
+    Raises:
+        ValueError: If the line is not a window record.
+    """
+    record = _decode_record(line)
+    bounds = record[2] if len(record) > 2 else None
+    if not isinstance(bounds, list) or len(bounds) != 4:
+        return None
+    try:
+        x, y, width, height = (int(v) for v in bounds)
+    except (TypeError, ValueError):
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return (x, y, width, height)
+
+
+@runtime_checkable
+class WindowSource(Protocol):
+    """Protocol for components reporting the frontmost window."""
+
+    def get_active_window(self) -> WindowInfo:
+        """Return the currently active window.
+
+        Returns:
+            dict with 'app_name' and 'window_title' keys.
+        """
+        ...
+
+    def close(self) -> None:
+        """Release any resources (processes, threads) held by the source."""
+        ...
+
+
+@runtime_checkable
+class SystemStateSource(Protocol):
+    """Protocol for components reporting whether the user session is active."""
+
+    def is_system_active(self) -> bool:
+        """Return True if the system is active (not locked, etc.)."""
+        ...
+
+
+class QuartzSystemStateSource:
+    """System state source reading the session lock state from Quartz."""
+
+    def is_system_active(self) -> bool:
+        """Return True if the screen is not locked."""
+        return is_system_active()
+
+
+class AppleScriptWindowSource:
+    """Window source running a one-shot AppleScript per query."""
+
+    def get_active_window(self) -> WindowInfo:
+        """Return the currently active window via osascript."""
+        return get_active_window()
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class HelperWindowSource:
+    """Window source backed by a long-lived helper process.
+
+    The helper writes one JSON ``[app, title, bounds]`` line per window
+    change to stdout. A reader thread keeps the latest line, so queries (including the
+    window bounds used for cropping) never spawn a process.
+    If the helper exits it is restarted with exponential backoff; its last
+    line is forgotten, and until the restarted helper has produced a line,
+    queries use the fallback.
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str] | None = None,
+        interval: float = DEFAULT_HELPER_INTERVAL,
+        fallback: Callable[[], WindowInfo] | None = get_active_window,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
+        restart_delay: float = DEFAULT_RESTART_DELAY,
+        bounds_fallback: Callable[[], WindowBounds | None] | None = (
+            get_active_window_bounds
+        ),
+    ) -> None:
+        """Initialize the helper window source.
+
+        Args:
+            command: Helper command line. Defaults to the JXA loop run by
+                    ``osascript -l JavaScript``.
+            interval: Seconds between checks inside the default helper.
+            fallback: Called when the helper has not produced a line yet.
+                     None returns an empty window instead.
+            startup_timeout: Seconds to wait for the first line.
+            restart_delay: Initial delay before restarting a dead helper.
+            bounds_fallback: Called for the window bounds when the helper has
+                            not produced a line yet. None returns None.
+        """
+        if command is None:
+            command = [
+                "osascript",
+                "-l",
+                "JavaScript",
+                "-e",
+                HELPER_SCRIPT % {"interval": interval},
+            ]
+        self._command = list(command)
+        self._fallback = fallback
+        self._startup_timeout = startup_timeout
+        self._restart_delay = restart_delay
+        self._bounds_fallback = bounds_fallback
+
+        self._lock = threading.Lock()
+        self._latest: WindowInfo | None = None
+        self._latest_bounds: WindowBounds | None = None
+        self._ready = threading.Event()
+        self._startup_waited = False
+        self._closed = threading.Event()
+        self._process: subprocess.Popen[str] | None = None
+        self._thread: threading.Thread | None = None
+        self.restarts = 0
+
+    def start(self) -> None:
+        """Start the helper process and its reader thread."""
+        with self._lock:
+            if self._thread is not None or self._closed.is_set():
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _spawn(self) -> subprocess.Popen[str] | None:
+        """Start one helper process, or return None if it cannot be run."""
+        try:
+            process = subprocess.Popen(
+                self._command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1,
+            )
+        except OSError as e:
+            logger.debug("Cannot start window helper: %s", e)
+            return None
+        with self._lock:
+            self._process = process
+        if self._closed.is_set():
+            # close() ran while the process was starting
+            process.terminate()
+        return process
+
+    def _run(self) -> None:
+        """Reader loop: consume helper output and restart it when it exits."""
+        delay = self._restart_delay
+        while not self._closed.is_set():
+            process = self._spawn()
+            if process is not None and process.stdout is not None:
+                for line in process.stdout:
+                    try:
+                        window = parse_window_line(line)
+                        bounds = parse_window_bounds(line)
+                    except ValueError:
+                        logger.warning("Ignoring window helper output: %r", line)
+                        continue
+                    with self._lock:
+                        self._latest = window
+                        self._latest_bounds = bounds
+                    self._ready.set()
+                    delay = self._restart_delay
+                process.wait()
+            with self._lock:
+                # The window may change while no helper is watching
+                self._latest = None
+                self._latest_bounds = None
+
+            if self._closed.is_set():
+                break
+            self.restarts += 1
+            logger.debug("Window helper exited; restarting in %.1fs", delay)
+            if self._closed.wait(delay):
+                break
+            delay = min(delay * 2, MAX_RESTART_DELAY)
+
+    def get_active_window(self) -> WindowInfo:
+        """Return the latest window reported by the helper.
+
+        Starts the helper on first use and waits briefly for its first line;
+        later queries never block.
+        """
+        self.start()
+        if not self._startup_waited:
+            self._ready.wait(self._startup_timeout)
+            self._startup_waited = True
+        with self._lock:
+            latest = self._latest
+        if latest is not None:
+            return dict(latest)
+        if self._fallback is not None:
+            return self._fallback()
+        return {"app_name": "", "window_title": ""}
+
+    def get_active_window_bounds(self) -> WindowBounds | None:
+        """Return the bounds of the latest window reported by the helper.
+
+        Like get_active_window, the bounds fallback is only used until the
+        helper has reported a window.
+
+        Returns:
+            (x, y, width, height) in screen points, or None if the window
+            has no usable bounds.
+        """
+        self.start()
+        with self._lock:
+            reported = self._latest is not None
+            bounds = self._latest_bounds
+        if reported:
+            return bounds
+        if self._bounds_fallback is not None:
+            return self._bounds_fallback()
+        return None
+
+    def close(self) -> None:
+        """Stop the helper process and the reader thread."""
+        self._closed.set()
+        with self._lock:
+            process, self._process = self._process, None
+            thread, self._thread = self._thread, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if thread is not None:
+            thread.join(timeout=1.0)
+
+
+def get_window_source(name: str | None = None) -> WindowSource:
+    """Get the window source based on the AUTO_DAILY_WINDOW_SOURCE env var.
+
+    Args:
+        name: Source name ("applescript", "helper").
+              Uses AUTO_DAILY_WINDOW_SOURCE env var or default if not specified.
+
+    Returns:
+        A window source implementing the WindowSource protocol.
+
+    Raises:
+        ValueError: If the source is not supported.
+    """
+    source_name = name if name is not None else get_window_source_name()
+
+    if source_name == "applescript":
+        return AppleScriptWindowSource()
+
+    if source_name == "helper":
+        return HelperWindowSource()
+
+    raise ValueError(f"Unknown window source: {source_name}")
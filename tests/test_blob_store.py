@@ -0,0 +1,161 @@
+"""Tests for the content-addressed OCR blob store."""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from auto_daily.blob_store import (
+    BLOB_DB_NAME,
+    BlobStore,
+    blob_key,
+    externalize_entries,
+    resolve_entry,
+)
+from auto_daily.logger import append_log_hourly
+
+SCREEN_TEXT = "日報を作成します。\n" + "def main():\n    return 0\n" * 20
+
+
+def test_put_get_roundtrip(tmp_path: Path) -> None:
+    """Test that texts are stored once and read back by key.
+
+    The BlobStore should:
+    1. Return the same key for the same text
+    2. Store each distinct text once
+    3. Read texts back after reopening (not only from the cache)
+    """
+    store = BlobStore(tmp_path / BLOB_DB_NAME, cache_size=1)
+    key = store.put(SCREEN_TEXT)
+    keys = store.put_many([SCREEN_TEXT, "other text", SCREEN_TEXT])
+    count = store._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    store.close()
+
+    reopened = BlobStore(tmp_path / BLOB_DB_NAME)
+    assert keys == [key, blob_key("other text"), key]
+    assert count == 2
+    assert reopened.get(key) == SCREEN_TEXT
+    assert reopened.get("0" * 32) is None
+    reopened.close()
+
+
+def test_failed_put_is_not_cached(tmp_path: Path) -> None:
+    """Test that a text whose insert failed is stored by the next put."""
+    store = BlobStore(tmp_path / BLOB_DB_NAME)
+    store._conn.execute(
+        "CREATE TRIGGER fail BEFORE INSERT ON blobs"
+        " BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+    )
+    with pytest.raises(sqlite3.Error):
+        store.put(SCREEN_TEXT)
+    store._conn.execute("DROP TRIGGER fail")
+
+    key = store.put(SCREEN_TEXT)
+    store.close()
+
+    reopened = BlobStore(tmp_path / BLOB_DB_NAME)
+    assert reopened.get(key) == SCREEN_TEXT
+    reopened.close()
+
+
+def test_externalize_and_resolve(tmp_path: Path) -> None:
+    """Test that entries round-trip through the blob store.
+
+    The functions should:
+    1. Replace long ocr_text with ocr_ref and keep short text inline
+    2. Restore the original entry, including key order
+    3. Resolve unknown references to an empty text
+    """
+    store = BlobStore(tmp_path / BLOB_DB_NAME)
+    long_entry = {
+        "timestamp": "2024-12-24T10:00:00",
+        "window_info": {"app_name": "Code", "window_title": "main.py"},
+        "ocr_text": SCREEN_TEXT,
+        "slack_context": None,
+    }
+    short_entry = dict(long_entry, ocr_text="short")
+
+    stored = externalize_entries([long_entry, short_entry], store)
+
+    assert "ocr_text" not in stored[0]
+    assert stored[0]["ocr_ref"] == blob_key(SCREEN_TEXT)
+    assert stored[1] is short_entry
+    resolved = resolve_entry(stored[0], store)
+    assert json.dumps(resolved) == json.dumps(long_entry)
+    assert resolve_entry(stored[0], None)["ocr_text"] == ""
+    store.close()
+
+
+def test_append_log_hourly_with_blobs(log_base: Path) -> None:
+    """Test that logs reference repeated OCR text and readers resolve it.
+
+    With ocr_blobs enabled:
+    1. The JSONL entries only carry the hash reference
+    2. The log is several times smaller than with inline text
+    3. ollama._load_log_entries, log_reader.iter_file_records and
+       log_reader.iter_records return the original text
+    """
+    from auto_daily.log_reader import iter_file_records, iter_records
+    from auto_daily.ollama import _load_log_entries
+
+    timestamp = datetime(2024, 12, 24, 10, 0, 0)
+    window_info = {"app_name": "Code", "window_title": "main.py"}
+    inline_base = log_base / "inline"
+    for i in range(20):
+        at = timestamp.replace(second=i)
+        log_path = append_log_hourly(
+            log_base, window_info, SCREEN_TEXT, timestamp=at, ocr_blobs=True
+        )
+        inline_path = append_log_hourly(
+            inline_base, window_info, SCREEN_TEXT, timestamp=at, ocr_blobs=False
+        )
+
+    assert log_path is not None and inline_path is not None
+    raw = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert all("ocr_text" not in entry for entry in raw)
+    assert (log_base / BLOB_DB_NAME).exists()
+    assert inline_path.stat().st_size > 3 * log_path.stat().st_size
+
+    assert all(e["ocr_text"] == SCREEN_TEXT for e in _load_log_entries(log_path))
+    assert next(iter_file_records(log_path)).ocr_text == SCREEN_TEXT
+    hour = iter_records(log_base, timestamp, timestamp + timedelta(hours=1))
+    assert [record.data for record in hour] == [
+        json.loads(line) for line in inline_path.read_text().splitlines()
+    ]
+
+
+def test_log_writer_with_blobs(log_base: Path) -> None:
+    """Test that the log writer stores OCR blobs per batch.
+
+    The LogWriter should:
+    1. Log references instead of long OCR text
+    2. Still hand the full text to sinks
+    """
+    from auto_daily.log_writer import LogWriter
+
+    class ListSink:
+        def __init__(self) -> None:
+            self.entries: list[dict] = []
+
+        def add_many(self, entries: list[dict]) -> int:
+            self.entries.extend(entries)
+            return len(entries)
+
+    sink = ListSink()
+    writer = LogWriter(
+        log_base, flush_interval_ms=0, fsync="off", sinks=[sink], ocr_blobs=True
+    )
+    writer.start()
+    log_path = writer.append_activity(
+        {"app_name": "Code", "window_title": "main.py"},
+        SCREEN_TEXT,
+        timestamp=datetime(2024, 12, 24, 11, 0, 0),
+    )
+    writer.stop()
+
+    assert log_path is not None
+    entry = json.loads(log_path.read_text())
+    assert entry["ocr_ref"] == blob_key(SCREEN_TEXT)
+    assert sink.entries[0]["ocr_text"] == SCREEN_TEXT
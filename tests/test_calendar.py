@@ -1,7 +1,10 @@
 """Tests for calendar module (PBI-031, PBI-032)."""
 
 import os
+import threading
+import time
 from datetime import UTC, date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
@@ -326,6 +329,107 @@ END:VCALENDAR"""
         finally:
             os.chdir(original_cwd)
 
+    @pytest.mark.asyncio
+    async def test_fetch_calendars_concurrently(self, tmp_path: Path) -> None:
+        """Test fetching calendars from a local HTTP server.
+
+        fetch_calendars should:
+        1. Fetch all calendars concurrently through one client
+        2. Give up on a calendar slower than the timeout without failing the others
+        3. Record each calendar's latency and failure
+        """
+        from auto_daily.calendar import fetch_calendars, get_all_events
+
+        ics_dir = tmp_path / "ics"
+        ics_dir.mkdir()
+        for name, hour in [("work", 9), ("team", 11)]:
+            (ics_dir / f"{name}.ics").write_bytes(
+                f"""BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+DTSTART:20251225T{hour:02d}0000Z
+DTEND:20251225T{hour:02d}3000Z
+SUMMARY:{name.title()} Meeting
+UID:{name}-1@test.com
+END:VEVENT
+END:VCALENDAR""".encode()
+            )
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                name = self.path.strip("/")
+                if name.startswith("slow-"):
+                    time.sleep(1.0)
+                    name = name.removeprefix("slow-")
+                path = ics_dir / name
+                if not path.exists():
+                    self.send_error(404)
+                    return
+                body = path.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/calendar")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        (tmp_path / "calendar_config.yaml").write_text(
+            f"""calendars:
+  - name: "Work"
+    ical_url: "{base}/work.ics"
+  - name: "Slow"
+    ical_url: "{base}/slow-work.ics"
+  - name: "Team"
+    ical_url: "{base}/team.ics"
+  - name: "Missing"
+    ical_url: "{base}/missing.ics"
+"""
+        )
+
+        original_cwd = os.getcwd()
+        try:
+            os.chdir(tmp_path)
+            target_date = date(2025, 12, 25)
+
+            started = time.perf_counter()
+            fetches = await fetch_calendars(target_date, timeout=0.3)
+            elapsed = time.perf_counter() - started
+
+            assert [f.name for f in fetches] == ["Work", "Slow", "Team", "Missing"]
+            work, slow, team, missing = fetches
+            assert [e.summary for e in work.events] == ["Work Meeting"]
+            assert [e.summary for e in team.events] == ["Team Meeting"]
+            assert work.error is None and team.error is None
+            assert slow.events == [] and "timed out" in (slow.error or "")
+            assert 0.3 <= slow.seconds < 1.0
+            assert missing.error is not None and "404" in missing.error
+            assert elapsed < 1.0
+            assert work.format().startswith("Calendar Work: 1 events in ")
+            assert "failed after" in slow.format()
+
+            reported: list[str] = []
+            events = await get_all_events(
+                target_date,
+                timeout=2.0,
+                on_fetch=lambda fetch: reported.append(fetch.name),
+            )
+            assert [e.summary for e in events] == [
+                "Work Meeting",
+                "Work Meeting",
+                "Team Meeting",
+            ]
+            assert reported == ["Work", "Slow", "Team", "Missing"]
+        finally:
+            os.chdir(original_cwd)
+            server.shutdown()
+            server.server_close()
+
 
 class TestMatchEventsWithLogs:
     """Tests for matching calendar events with activity logs (PBI-032)."""
@@ -473,6 +577,66 @@ class TestMatchEventsWithLogs:
         assert result.unplanned[0].app_name == "Code"
         assert result.unplanned[1].app_name == "Slack"
 
+    def test_match_same_as_scan(self) -> None:
+        """Test that the indexed matcher gives the result of a full scan.
+
+        The matcher should, for overlapping events, a tolerance, logs out of
+        order and naive timestamps (taken as UTC):
+        1. Match each event with its logs in the order they were given
+        2. Leave the same events unstarted and logs unplanned
+        """
+        import random
+        from datetime import timedelta, timezone
+
+        from auto_daily.calendar import (
+            CalendarEvent,
+            LogEntry,
+            MatchResult,
+            match_events_with_logs,
+        )
+
+        rng = random.Random(0)
+        base = datetime(2025, 12, 25, 8, 0, tzinfo=UTC)
+        jst = timezone(timedelta(hours=9))
+        logs = []
+        for i in range(500):
+            timestamp = base + timedelta(minutes=rng.randrange(600))
+            if i % 3 == 0:
+                timestamp = timestamp.replace(tzinfo=None)
+            elif i % 3 == 1:
+                timestamp = timestamp.astimezone(jst)
+            logs.append(LogEntry(timestamp, f"App{i}", ""))
+        events = []
+        for i in range(40):
+            start = base + timedelta(minutes=rng.randrange(-60, 660))
+            end = start + timedelta(minutes=rng.choice([0, 15, 30, 90]))
+            events.append(CalendarEvent(f"Event {i}", start, end, "Work"))
+
+        for tolerance in (0, 5):
+            # Reference: every log against every event
+            expected = MatchResult()
+            matched: set[int] = set()
+            window = timedelta(minutes=tolerance)
+            for event in events:
+                hits = []
+                for i, log in enumerate(logs):
+                    ts = log.timestamp
+                    if ts.tzinfo is None:
+                        ts = ts.replace(tzinfo=UTC)
+                    if event.start - window <= ts <= event.end + window:
+                        hits.append(log)
+                        matched.add(i)
+                if hits:
+                    expected.matched.append((event, hits))
+                else:
+                    expected.unstarted.append(event)
+            expected.unplanned = [log for i, log in enumerate(logs) if i not in matched]
+
+            result = match_events_with_logs(events, logs, tolerance)
+
+            assert result == expected
+            assert result.unstarted and result.unplanned
+
 
 class TestCalendarInReportPrompt:
     """Tests for calendar information in report prompt (PBI-032)."""
@@ -50,3 +50,51 @@ def test_image_cleanup(tmp_path: Path) -> None:
     # Try to cleanup non-existent file
     result2 = cleanup_image(image_path)
     assert result2 is False
+
+
+def test_capture_screen_to_buffer_reads_pipe() -> None:
+    """Test that capture_screen_to_buffer returns the PNG written to stdout.
+
+    The function should:
+    1. Ask screencapture to write the PNG to /dev/stdout
+    2. Return the bytes read from the pipe
+    3. Return None if screencapture fails or produces no data
+    """
+    import subprocess
+    from unittest.mock import MagicMock, patch
+
+    from auto_daily.capture import capture_screen_to_buffer
+
+    completed = MagicMock(stdout=b"\x89PNG\r\n\x1a\nfake")
+    with patch("auto_daily.capture.subprocess.run", return_value=completed) as mock_run:
+        assert capture_screen_to_buffer() == b"\x89PNG\r\n\x1a\nfake"
+    assert mock_run.call_args.args[0][-1] == "/dev/stdout"
+
+    with patch("auto_daily.capture.subprocess.run", return_value=MagicMock(stdout=b"")):
+        assert capture_screen_to_buffer() is None
+
+    with patch(
+        "auto_daily.capture.subprocess.run",
+        side_effect=subprocess.CalledProcessError(1, "screencapture", stderr=b"denied"),
+    ):
+        assert capture_screen_to_buffer() is None
+
+
+def test_capture_region_is_passed_to_screencapture(tmp_path: Path) -> None:
+    """Test that a capture region limits screencapture to a rectangle.
+
+    The function should:
+    1. Pass the region as -Rx,y,w,h for both file and buffer capture
+    """
+    from unittest.mock import MagicMock, patch
+
+    from auto_daily.capture import capture_screen_to_buffer
+
+    with patch(
+        "auto_daily.capture.subprocess.run", return_value=MagicMock(stdout=b"png")
+    ) as mock_run:
+        capture_screen(tmp_path, region=(10, 20, 300, 200))
+        capture_screen_to_buffer(region=(10, 20, 300, 200))
+
+    for call in mock_run.call_args_list:
+        assert "-R10,20,300,200" in call.args[0]
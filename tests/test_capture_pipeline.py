@@ -134,3 +134,391 @@ class TestExecuteCapturePipeline:
                     call_kwargs = mock_log.call_args
                     slack_context = call_kwargs.kwargs.get("slack_context")
                     assert slack_context is None
+
+
+class TestAsyncCapturePipeline:
+    """Test AsyncCapturePipeline staged execution."""
+
+    def test_pipeline_processes_submitted_events(self, tmp_path: Path) -> None:
+        """Verify events are captured, OCR'd, filtered and logged off-thread."""
+        from unittest.mock import MagicMock
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr.return_value = "raw text"
+        completed = []
+
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=2,
+            queue_size=4,
+            backpressure="block",
+            ocr_backend=backend,
+            on_complete=lambda context, success: completed.append(success),
+        )
+
+        with (
+            patch(
+                "auto_daily.capture_pipeline.capture_screen",
+                return_value=str(tmp_path / "test.png"),
+            ),
+            patch("auto_daily.capture_pipeline.cleanup_image") as mock_cleanup,
+            patch(
+                "auto_daily.capture_pipeline.apply_ocr_filter",
+                side_effect=lambda text: text.upper(),
+            ),
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            mock_log.return_value = tmp_path / "log.jsonl"
+            pipeline.start()
+            for i in range(3):
+                pipeline.submit(
+                    CaptureContext(
+                        window_info={"app_name": f"App{i}", "window_title": ""},
+                        log_dir=tmp_path,
+                    )
+                )
+            pipeline.stop()
+
+        assert completed == [True, True, True]
+        assert mock_cleanup.call_count == 3
+        assert mock_log.call_count == 3
+        # Filter stage runs between OCR and log
+        assert mock_log.call_args.args[2] == "RAW TEXT"
+        # Events are stamped at submit time
+        assert mock_log.call_args.kwargs["timestamp"] is not None
+
+        stats = pipeline.stats
+        assert stats.queued == 3
+        assert stats.processed == 3
+        assert stats.failed == 0
+
+    def test_slow_ocr_coalesces_per_window(self, tmp_path: Path) -> None:
+        """Verify a slow OCR backend coalesces frames instead of blocking submit."""
+        import threading
+        import time
+        from unittest.mock import MagicMock
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        release = threading.Event()
+        backend = MagicMock()
+        backend.perform_ocr.side_effect = lambda path: release.wait(2.0) and "text"
+
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1,
+            queue_size=2,
+            backpressure="coalesce",
+            ocr_backend=backend,
+        )
+
+        with (
+            patch(
+                "auto_daily.capture_pipeline.capture_screen",
+                return_value=str(tmp_path / "test.png"),
+            ),
+            patch("auto_daily.capture_pipeline.cleanup_image"),
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            mock_log.return_value = tmp_path / "log.jsonl"
+            pipeline.start()
+
+            start = time.monotonic()
+            for _ in range(6):
+                pipeline.submit(
+                    CaptureContext(
+                        window_info={"app_name": "Editor", "window_title": "a.py"},
+                        log_dir=tmp_path,
+                    )
+                )
+                time.sleep(0.02)
+            elapsed = time.monotonic() - start
+
+            release.set()
+            pipeline.stop()
+
+        # submit() never waited for the blocked OCR worker
+        assert elapsed < 1.0
+        stats = pipeline.stats
+        assert stats.queued == 6
+        assert stats.coalesced >= 1
+        assert stats.processed + stats.failed + stats.coalesced + stats.dropped == 6
+
+    def test_ocr_failure_is_counted(self, tmp_path: Path) -> None:
+        """Verify OCR exceptions are counted as failures and images cleaned up."""
+        from unittest.mock import MagicMock
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr.side_effect = RuntimeError("backend down")
+
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1, queue_size=2, backpressure="block", ocr_backend=backend
+        )
+
+        with (
+            patch(
+                "auto_daily.capture_pipeline.capture_screen",
+                return_value=str(tmp_path / "test.png"),
+            ),
+            patch("auto_daily.capture_pipeline.cleanup_image") as mock_cleanup,
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            pipeline.start()
+            pipeline.submit(
+                CaptureContext(
+                    window_info={"app_name": "App", "window_title": ""},
+                    log_dir=tmp_path,
+                )
+            )
+            pipeline.stop()
+
+        mock_cleanup.assert_called_once()
+        mock_log.assert_not_called()
+        assert pipeline.stats.failed == 1
+
+    def test_stage_errors_do_not_stop_the_pipeline(self, tmp_path: Path) -> None:
+        """Verify an exception in one event is counted and later events run.
+
+        The pipeline should survive failures of:
+        1. The capture step
+        2. The log write
+        3. The completion callback
+        """
+        from unittest.mock import MagicMock
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr.return_value = "text"
+        completed: list[tuple[str, bool]] = []
+
+        def on_complete(context: CaptureContext, success: bool) -> None:
+            completed.append((context.window_info["app_name"], success))
+            if context.window_info["app_name"] == "Callback":
+                raise RuntimeError("callback failed")
+
+        def capture(context: CaptureContext) -> str:
+            if context.window_info["app_name"] == "Capture":
+                raise RuntimeError("no display")
+            return str(tmp_path / "test.png")
+
+        def append_log(log_dir, window_info, ocr_text, **kwargs) -> Path:
+            if window_info["app_name"] == "Log":
+                raise OSError("disk full")
+            return tmp_path / "log.jsonl"
+
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1,
+            queue_size=8,
+            backpressure="block",
+            ocr_backend=backend,
+            on_complete=on_complete,
+            capture=capture,
+        )
+
+        with (
+            patch("auto_daily.capture_pipeline.cleanup_image"),
+            patch(
+                "auto_daily.capture_pipeline.append_log_hourly", side_effect=append_log
+            ),
+        ):
+            pipeline.start()
+            for app_name in ["Capture", "Log", "Callback", "Editor"]:
+                pipeline.submit(
+                    CaptureContext(
+                        window_info={"app_name": app_name, "window_title": ""},
+                        log_dir=tmp_path,
+                    )
+                )
+            pipeline.stop()
+
+        assert sorted(completed) == [
+            ("Callback", True),
+            ("Capture", False),
+            ("Editor", True),
+            ("Log", False),
+        ]
+        assert pipeline.stats.processed == 2
+        assert pipeline.stats.failed == 2
+
+    def test_memory_capture_mode_skips_disk(self, tmp_path: Path) -> None:
+        """Verify "memory" mode hands encoded bytes to the OCR backend."""
+        from unittest.mock import MagicMock
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr_buffer.return_value = "buffer text"
+
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1,
+            queue_size=2,
+            backpressure="block",
+            ocr_backend=backend,
+            capture_mode="memory",
+        )
+
+        with (
+            patch("auto_daily.capture_pipeline.capture_screen") as mock_capture,
+            patch(
+                "auto_daily.capture_pipeline.capture_screen_to_buffer",
+                return_value=b"png bytes",
+            ),
+            patch("auto_daily.capture_pipeline.cleanup_image") as mock_cleanup,
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            mock_log.return_value = tmp_path / "log.jsonl"
+            pipeline.start()
+            pipeline.submit(
+                CaptureContext(
+                    window_info={"app_name": "App", "window_title": ""},
+                    log_dir=tmp_path,
+                )
+            )
+            pipeline.stop()
+
+        mock_capture.assert_not_called()
+        mock_cleanup.assert_not_called()
+        backend.perform_ocr.assert_not_called()
+        backend.perform_ocr_buffer.assert_called_once_with(b"png bytes")
+        assert mock_log.call_args.args[2] == "buffer text"
+        assert pipeline.stats.processed == 1
+
+    def test_invalid_capture_mode(self) -> None:
+        """Verify unknown capture modes are rejected."""
+        import pytest
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline
+
+        with pytest.raises(ValueError):
+            AsyncCapturePipeline(capture_mode="pipe")
+
+    def test_preprocess_crops_and_shrinks_before_ocr(self, tmp_path: Path) -> None:
+        """Verify the window is cropped at capture and the image shrunk for OCR."""
+        import io
+        from unittest.mock import MagicMock
+
+        from PIL import Image
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+        from auto_daily.imaging import PreprocessOptions
+
+        capture = io.BytesIO()
+        Image.new("RGB", (1600, 1000), "white").save(capture, format="PNG")
+        backend = MagicMock()
+        backend.perform_ocr_buffer.return_value = "text"
+
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1,
+            queue_size=2,
+            backpressure="block",
+            ocr_backend=backend,
+            capture_mode="memory",
+            crop_window=True,
+            preprocess=PreprocessOptions(max_edge=800, image_format="jpeg"),
+        )
+
+        with (
+            patch(
+                "auto_daily.capture_pipeline.get_active_window_bounds",
+                return_value=(0, 25, 800, 500),
+            ),
+            patch(
+                "auto_daily.capture_pipeline.capture_screen_to_buffer",
+                return_value=capture.getvalue(),
+            ) as mock_capture,
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            mock_log.return_value = tmp_path / "log.jsonl"
+            pipeline.start()
+            pipeline.submit(
+                CaptureContext(
+                    window_info={"app_name": "App", "window_title": ""},
+                    log_dir=tmp_path,
+                )
+            )
+            pipeline.stop()
+
+        mock_capture.assert_called_once_with(region=(0, 25, 800, 500))
+        sent = backend.perform_ocr_buffer.call_args.args[0]
+        with Image.open(io.BytesIO(sent)) as image:
+            assert image.format == "JPEG"
+            assert image.size == (800, 500)
+
+    def test_crop_uses_window_bounds_provider(self, tmp_path: Path) -> None:
+        """Verify crop bounds come from the given provider, not osascript."""
+        from unittest.mock import MagicMock
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr_buffer.return_value = "text"
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1,
+            queue_size=2,
+            backpressure="block",
+            ocr_backend=backend,
+            capture_mode="memory",
+            crop_window=True,
+            window_bounds=lambda: (10, 25, 1280, 800),
+        )
+
+        with (
+            patch(
+                "auto_daily.capture_pipeline.get_active_window_bounds"
+            ) as mock_bounds,
+            patch(
+                "auto_daily.capture_pipeline.capture_screen_to_buffer",
+                return_value=b"png bytes",
+            ) as mock_capture,
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            mock_log.return_value = tmp_path / "log.jsonl"
+            pipeline.start()
+            pipeline.submit(
+                CaptureContext(
+                    window_info={"app_name": "App", "window_title": ""},
+                    log_dir=tmp_path,
+                )
+            )
+            pipeline.stop()
+
+        mock_capture.assert_called_once_with(region=(10, 25, 1280, 800))
+        mock_bounds.assert_not_called()
+
+    def test_log_writer_receives_entries(self, tmp_path: Path) -> None:
+        """Verify entries go to the log writer instead of append_log_hourly."""
+        from unittest.mock import MagicMock
+
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr.return_value = "text"
+        log_writer = MagicMock()
+        log_writer.append_activity.return_value = tmp_path / "log.jsonl"
+
+        pipeline = AsyncCapturePipeline(ocr_backend=backend, log_writer=log_writer)
+
+        with (
+            patch(
+                "auto_daily.capture_pipeline.capture_screen",
+                return_value=str(tmp_path / "test.png"),
+            ),
+            patch("auto_daily.capture_pipeline.cleanup_image"),
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            pipeline.start()
+            pipeline.submit(
+                CaptureContext(
+                    window_info={"app_name": "Code", "window_title": "main.py"},
+                    log_dir=tmp_path,
+                )
+            )
+            pipeline.stop()
+
+        mock_log.assert_not_called()
+        log_writer.append_activity.assert_called_once()
+        assert log_writer.append_activity.call_args.args[1] == "text"
+        assert pipeline.stats.processed == 1
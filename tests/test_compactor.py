@@ -0,0 +1,159 @@
+"""Tests for the compaction of closed hourly logs."""
+
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from auto_daily.compactor import LogCompactor, compact_file, train_dictionary
+from auto_daily.log_files import log_exists, log_size, read_log_text
+from auto_daily.log_reader import iter_records
+from auto_daily.ollama import _load_log_entries
+from auto_daily.store import ActivityStore
+from auto_daily.summarize import get_log_hours_for_date
+
+SCREEN_TEXT = "日報を作成します。\n" + "def main():\n    return 0\n" * 20
+
+
+def _write_hour(log_base: Path, hour: int, count: int = 50, first: int = 0) -> Path:
+    """Write an hourly log of repetitive entries, starting at minute first.
+
+    The file is marked as last modified at the end of its hour.
+    """
+    path = log_base / "2024-12-24" / f"activity_{hour:02d}.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for i in range(first, first + count):
+            entry = {
+                "timestamp": f"2024-12-24T{hour:02d}:{i % 60:02d}:00",
+                "window_info": {"app_name": "Code", "window_title": f"file{i % 3}.py"},
+                "ocr_text": SCREEN_TEXT,
+                "slack_context": None,
+            }
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    modified = (datetime(2024, 12, 24, hour) + timedelta(hours=1)).timestamp()
+    os.utime(path, (modified, modified))
+    return path
+
+
+def test_compact_closed_logs(log_base: Path) -> None:
+    """Test that only closed hourly logs are compressed.
+
+    The LogCompactor should:
+    1. Replace closed logs with .gz files of the same content
+    2. Leave logs of the current hour and of an hour that ended within the
+       grace period alone
+    3. Leave logs modified within the grace period alone (a late write)
+    4. Shrink repetitive logs by an order of magnitude
+    """
+    hour_09 = _write_hour(log_base, 9)
+    late_write = datetime(2024, 12, 24, 12, 0).timestamp()
+    os.utime(hour_09, (late_write, late_write))
+    hour_10 = _write_hour(log_base, 10)
+    content = hour_10.read_text()
+    hour_11 = _write_hour(log_base, 11)
+    hour_12 = _write_hour(log_base, 12)
+
+    compactor = LogCompactor(log_base, method="gzip", grace=15 * 60)
+    stats = compactor.compact_once(datetime(2024, 12, 24, 12, 10))
+
+    assert stats.files == 1
+    assert not hour_10.exists()
+    assert (log_base / "2024-12-24" / "activity_10.jsonl.gz").exists()
+    assert read_log_text(hour_10) == content
+    assert hour_09.exists()
+    assert hour_11.exists()
+    assert hour_12.exists()
+    assert stats.bytes_in >= 10 * stats.bytes_out
+
+
+def test_readers_decompress_transparently(log_base: Path) -> None:
+    """Test that every reader sees compressed logs like plain ones.
+
+    The readers should:
+    1. List hours of compressed logs
+    2. Load entries, also as a stream of records, from compressed logs
+    3. Append lines written after compaction to the compressed ones, and
+       merge them into the compressed log on the next compaction
+    """
+    hour_10 = _write_hour(log_base, 10, count=3)
+    compact_file(hour_10, "gzip")
+    _write_hour(log_base, 10, count=1)
+    _write_hour(log_base, 11, count=2)
+
+    entries = _load_log_entries(hour_10)
+    records = list(
+        iter_records(log_base, datetime(2024, 12, 24, 10), datetime(2024, 12, 24, 11))
+    )
+
+    assert get_log_hours_for_date(log_base, date(2024, 12, 24)) == [10, 11]
+    assert log_exists(hour_10)
+    assert len(entries) == 4
+    assert entries[0]["ocr_text"] == SCREEN_TEXT
+    assert len(records) == 4
+    assert records[-1].ocr_text == SCREEN_TEXT
+
+    compact_file(hour_10, "gzip")
+    assert not hour_10.exists()
+    assert len(_load_log_entries(hour_10)) == 4
+
+
+def test_incremental_import_across_compaction(tmp_path: Path, log_base: Path) -> None:
+    """Test that import offsets stay valid when a log is compressed.
+
+    The ActivityStore should:
+    1. Not re-import lines of a log compressed after the import
+    2. Import lines appended after compaction
+    3. Know the size of compressed logs without decompressing them
+    """
+    hour_10 = _write_hour(log_base, 10, count=3)
+    with ActivityStore(tmp_path / "activity.db") as store:
+        first = store.import_jsonl_tree(log_base)
+        size = log_size(hour_10)
+        compact_file(hour_10, "gzip")
+        unchanged = store.import_jsonl_tree(log_base)
+        _write_hour(log_base, 10, count=2, first=3)
+        second = store.import_jsonl_tree(log_base)
+        count = len(store.query_date(date(2024, 12, 24)))
+
+    assert log_size(hour_10) is not None
+    assert size is not None and size < log_size(hour_10)
+    assert first.entries == 3
+    assert unchanged.entries == 0
+    assert second.entries == 2
+    assert count == 5
+
+
+def test_zstd_with_dictionary(log_base: Path) -> None:
+    """Test zstd compression with a shared dictionary.
+
+    The compactor should:
+    1. Train a dictionary on the log lines
+    2. Compress with the newest dictionary and read back through it
+    """
+    zstandard = pytest.importorskip("zstandard")
+    for hour in range(0, 10):
+        _write_hour(log_base, hour, count=30)
+    dict_file = train_dictionary(log_base, size=4096)
+
+    compactor = LogCompactor(log_base, method="zstd")
+    stats = compactor.compact_once(datetime(2024, 12, 25, 0, 0))
+
+    segment = log_base / "2024-12-24" / "activity_03.jsonl.zst"
+    header = zstandard.get_frame_parameters(segment.read_bytes()[:18])
+    assert stats.files == 10
+    assert dict_file.stem == str(header.dict_id)
+    assert len(_load_log_entries(log_base / "2024-12-24" / "activity_03.jsonl")) == 30
+
+
+def test_unknown_compression_method(log_base: Path) -> None:
+    """Test that an unsupported method is rejected and "off" does nothing."""
+    with pytest.raises(ValueError, match="Unknown compression method"):
+        LogCompactor(log_base, method="lz4")
+
+    hour_10 = _write_hour(log_base, 10)
+    stats = LogCompactor(log_base, method="off").compact_once(datetime(2025, 1, 1))
+    assert stats.files == 0
+    assert hour_10.exists()
@@ -877,3 +877,385 @@ def test_ocr_filter_noise_from_env() -> None:
     with patch.dict(os.environ, {"OCR_FILTER_NOISE": "0"}):
         result = get_ocr_filter_noise()
         assert result is False
+
+
+# ============================================================
+# 非同期キャプチャパイプライン設定
+# ============================================================
+
+
+def test_capture_pipeline_settings_from_env() -> None:
+    """Test that capture pipeline settings are read from environment variables.
+
+    The config should:
+    1. Return defaults ("helper", 1000 ms settle, "file", 2 workers,
+       queue size 16, "coalesce") when unset
+    2. Read AUTO_DAILY_WINDOW_SOURCE, AUTO_DAILY_WINDOW_SETTLE_MS,
+       AUTO_DAILY_CAPTURE_MODE,
+       AUTO_DAILY_OCR_WORKERS, AUTO_DAILY_PIPELINE_QUEUE_SIZE and
+       AUTO_DAILY_PIPELINE_BACKPRESSURE when set
+    """
+    from auto_daily.config import (
+        get_capture_mode,
+        get_ocr_workers,
+        get_pipeline_backpressure,
+        get_pipeline_queue_size,
+        get_window_settle_ms,
+        get_window_source_name,
+    )
+
+    names = (
+        "AUTO_DAILY_WINDOW_SOURCE",
+        "AUTO_DAILY_WINDOW_SETTLE_MS",
+        "AUTO_DAILY_CAPTURE_MODE",
+        "AUTO_DAILY_OCR_WORKERS",
+        "AUTO_DAILY_PIPELINE_QUEUE_SIZE",
+        "AUTO_DAILY_PIPELINE_BACKPRESSURE",
+    )
+    env_without_vars = {k: v for k, v in os.environ.items() if k not in names}
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_window_source_name() == "helper"
+        assert get_window_settle_ms() == 1000
+        assert get_capture_mode() == "file"
+        assert get_ocr_workers() == 2
+        assert get_pipeline_queue_size() == 16
+        assert get_pipeline_backpressure() == "coalesce"
+
+    with patch.dict(
+        os.environ,
+        {
+            "AUTO_DAILY_WINDOW_SOURCE": "applescript",
+            "AUTO_DAILY_WINDOW_SETTLE_MS": "300",
+            "AUTO_DAILY_CAPTURE_MODE": "memory",
+            "AUTO_DAILY_OCR_WORKERS": "4",
+            "AUTO_DAILY_PIPELINE_QUEUE_SIZE": "32",
+            "AUTO_DAILY_PIPELINE_BACKPRESSURE": "drop_oldest",
+        },
+    ):
+        assert get_window_source_name() == "applescript"
+        assert get_window_settle_ms() == 300
+        assert get_capture_mode() == "memory"
+        assert get_ocr_workers() == 4
+        assert get_pipeline_queue_size() == 32
+        assert get_pipeline_backpressure() == "drop_oldest"
+
+
+# ============================================================
+# OCR 画像前処理設定
+# ============================================================
+
+
+def test_ocr_preprocess_settings_from_env() -> None:
+    """Test that OCR preprocessing settings are read from environment variables.
+
+    The config should:
+    1. Disable cropping, grayscale and downscaling and keep PNG by default
+    2. Read OCR_CROP_WINDOW, OCR_GRAYSCALE, OCR_MAX_EDGE, OCR_IMAGE_FORMAT
+       and OCR_IMAGE_QUALITY when set
+    """
+    from auto_daily.config import (
+        get_ocr_crop_window,
+        get_ocr_grayscale,
+        get_ocr_image_format,
+        get_ocr_image_quality,
+        get_ocr_max_edge,
+    )
+
+    names = (
+        "OCR_CROP_WINDOW",
+        "OCR_GRAYSCALE",
+        "OCR_MAX_EDGE",
+        "OCR_IMAGE_FORMAT",
+        "OCR_IMAGE_QUALITY",
+    )
+    env_without_vars = {k: v for k, v in os.environ.items() if k not in names}
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_ocr_crop_window() is False
+        assert get_ocr_grayscale() is False
+        assert get_ocr_max_edge() == 0
+        assert get_ocr_image_format() == "png"
+        assert get_ocr_image_quality() == 85
+
+    with patch.dict(
+        os.environ,
+        {
+            "OCR_CROP_WINDOW": "true",
+            "OCR_GRAYSCALE": "1",
+            "OCR_MAX_EDGE": "1568",
+            "OCR_IMAGE_FORMAT": "WebP",
+            "OCR_IMAGE_QUALITY": "70",
+        },
+    ):
+        assert get_ocr_crop_window() is True
+        assert get_ocr_grayscale() is True
+        assert get_ocr_max_edge() == 1568
+        assert get_ocr_image_format() == "webp"
+        assert get_ocr_image_quality() == 70
+
+
+# ============================================================
+# ログ書き込み設定
+# ============================================================
+
+
+def test_log_writer_settings_from_env() -> None:
+    """Test that log writer settings are read from environment variables.
+
+    The config should:
+    1. Return defaults ("buffered", 1000 ms, "rotate", no blobs, "off")
+       when unset
+    2. Read AUTO_DAILY_LOG_WRITER, AUTO_DAILY_LOG_FLUSH_INTERVAL_MS,
+       AUTO_DAILY_LOG_FSYNC, AUTO_DAILY_OCR_BLOBS and
+       AUTO_DAILY_LOG_COMPRESSION when set
+    """
+    from auto_daily.config import (
+        get_log_compression,
+        get_log_flush_interval_ms,
+        get_log_fsync,
+        get_log_writer_mode,
+        get_ocr_blobs,
+    )
+
+    names = (
+        "AUTO_DAILY_LOG_WRITER",
+        "AUTO_DAILY_LOG_FLUSH_INTERVAL_MS",
+        "AUTO_DAILY_LOG_FSYNC",
+        "AUTO_DAILY_OCR_BLOBS",
+        "AUTO_DAILY_LOG_COMPRESSION",
+    )
+    env_without_vars = {k: v for k, v in os.environ.items() if k not in names}
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_log_writer_mode() == "buffered"
+        assert get_log_flush_interval_ms() == 1000
+        assert get_log_fsync() == "rotate"
+        assert get_ocr_blobs() is False
+        assert get_log_compression() == "off"
+
+    with patch.dict(
+        os.environ,
+        {
+            "AUTO_DAILY_LOG_WRITER": "direct",
+            "AUTO_DAILY_LOG_FLUSH_INTERVAL_MS": "250",
+            "AUTO_DAILY_LOG_FSYNC": "batch",
+            "AUTO_DAILY_OCR_BLOBS": "true",
+            "AUTO_DAILY_LOG_COMPRESSION": "zstd",
+        },
+    ):
+        assert get_log_writer_mode() == "direct"
+        assert get_log_flush_interval_ms() == 250
+        assert get_log_fsync() == "batch"
+        assert get_ocr_blobs() is True
+        assert get_log_compression() == "zstd"
+
+
+def test_storage_settings_from_env() -> None:
+    """Test that storage settings are read from environment variables.
+
+    The config should:
+    1. Return "jsonl" and ~/.auto-daily/activity.db when unset
+    2. Read AUTO_DAILY_STORAGE and AUTO_DAILY_DB_PATH (expanding ~) when set
+    """
+    from auto_daily.config import get_db_path, get_storage_backend
+
+    names = ("AUTO_DAILY_STORAGE", "AUTO_DAILY_DB_PATH")
+    env_without_vars = {k: v for k, v in os.environ.items() if k not in names}
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_storage_backend() == "jsonl"
+        assert get_db_path() == Path.home() / ".auto-daily" / "activity.db"
+
+    with patch.dict(
+        os.environ,
+        {"AUTO_DAILY_STORAGE": "sqlite", "AUTO_DAILY_DB_PATH": "~/data/auto.db"},
+    ):
+        assert get_storage_backend() == "sqlite"
+        assert get_db_path() == Path.home() / "data" / "auto.db"
+
+
+def test_json_backend_from_env() -> None:
+    """Test that the JSON backend is read from AUTO_DAILY_JSON_BACKEND.
+
+    The config should:
+    1. Return "auto" when unset
+    2. Return the configured backend when set
+    """
+    from auto_daily.config import get_json_backend
+
+    env_without_var = {
+        k: v for k, v in os.environ.items() if k != "AUTO_DAILY_JSON_BACKEND"
+    }
+    with patch.dict(os.environ, env_without_var, clear=True):
+        assert get_json_backend() == "auto"
+
+    with patch.dict(os.environ, {"AUTO_DAILY_JSON_BACKEND": "json"}):
+        assert get_json_backend() == "json"
+
+
+def test_search_settings_from_env() -> None:
+    """Test that search index settings are read from environment variables.
+
+    The config should:
+    1. Disable live indexing (index at ~/.auto-daily/search.db) when unset
+    2. Read AUTO_DAILY_SEARCH_INDEX and AUTO_DAILY_SEARCH_DB_PATH when set
+    """
+    from auto_daily.config import get_search_db_path, get_search_index_enabled
+
+    names = ("AUTO_DAILY_SEARCH_INDEX", "AUTO_DAILY_SEARCH_DB_PATH")
+    env_without_vars = {k: v for k, v in os.environ.items() if k not in names}
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_search_index_enabled() is False
+        assert get_search_db_path() == Path.home() / ".auto-daily" / "search.db"
+
+    with patch.dict(
+        os.environ,
+        {
+            "AUTO_DAILY_SEARCH_INDEX": "true",
+            "AUTO_DAILY_SEARCH_DB_PATH": "~/data/search.db",
+        },
+    ):
+        assert get_search_index_enabled() is True
+        assert get_search_db_path() == Path.home() / "data" / "search.db"
+
+
+def test_summary_concurrency_from_env() -> None:
+    """Test that the summary concurrency is read from environment variables.
+
+    The config should:
+    1. Return the default (4) when unset
+    2. Fall back to OLLAMA_NUM_PARALLEL
+    3. Prefer AUTO_DAILY_SUMMARY_CONCURRENCY and never return less than 1
+    """
+    from auto_daily.config import get_summary_concurrency
+
+    names = ("AUTO_DAILY_SUMMARY_CONCURRENCY", "OLLAMA_NUM_PARALLEL")
+    env_without_vars = {k: v for k, v in os.environ.items() if k not in names}
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_summary_concurrency() == 4
+
+        with patch.dict(os.environ, {"OLLAMA_NUM_PARALLEL": "2"}):
+            assert get_summary_concurrency() == 2
+
+        with patch.dict(
+            os.environ,
+            {"OLLAMA_NUM_PARALLEL": "2", "AUTO_DAILY_SUMMARY_CONCURRENCY": "8"},
+        ):
+            assert get_summary_concurrency() == 8
+
+        with patch.dict(os.environ, {"AUTO_DAILY_SUMMARY_CONCURRENCY": "0"}):
+            assert get_summary_concurrency() == 1
+
+
+def test_summary_token_budget_from_env() -> None:
+    """Test that the summary token budget is read from the environment.
+
+    The config should:
+    1. Return the default (3000) when unset
+    2. Use AUTO_DAILY_SUMMARY_TOKEN_BUDGET and never return less than 0
+    """
+    from auto_daily.config import get_summary_token_budget
+
+    env_without_var = {
+        k: v for k, v in os.environ.items() if k != "AUTO_DAILY_SUMMARY_TOKEN_BUDGET"
+    }
+    with patch.dict(os.environ, env_without_var, clear=True):
+        assert get_summary_token_budget() == 3000
+
+        with patch.dict(os.environ, {"AUTO_DAILY_SUMMARY_TOKEN_BUDGET": "500"}):
+            assert get_summary_token_budget() == 500
+
+        with patch.dict(os.environ, {"AUTO_DAILY_SUMMARY_TOKEN_BUDGET": "-1"}):
+            assert get_summary_token_budget() == 0
+
+
+def test_report_token_budget_from_env() -> None:
+    """Test that the report token budget defaults to 6000 and is configurable."""
+    from auto_daily.config import get_report_token_budget
+
+    env_without_var = {
+        k: v for k, v in os.environ.items() if k != "AUTO_DAILY_REPORT_TOKEN_BUDGET"
+    }
+    with patch.dict(os.environ, env_without_var, clear=True):
+        assert get_report_token_budget() == 6000
+
+        with patch.dict(os.environ, {"AUTO_DAILY_REPORT_TOKEN_BUDGET": "1000"}):
+            assert get_report_token_budget() == 1000
+
+
+def test_llm_cache_settings_from_env() -> None:
+    """Test that the LLM cache settings are read from environment variables.
+
+    The config should:
+    1. Disable the cache, with a 64 MB limit and 30-day TTL, by default
+    2. Read AUTO_DAILY_LLM_CACHE, AUTO_DAILY_LLM_CACHE_PATH,
+       AUTO_DAILY_LLM_CACHE_MAX_MB and AUTO_DAILY_LLM_CACHE_TTL_DAYS
+    """
+    from auto_daily.config import (
+        get_llm_cache_enabled,
+        get_llm_cache_max_bytes,
+        get_llm_cache_path,
+        get_llm_cache_ttl,
+    )
+
+    env_without_vars = {
+        k: v for k, v in os.environ.items() if not k.startswith("AUTO_DAILY_LLM_CACHE")
+    }
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_llm_cache_enabled() is False
+        assert get_llm_cache_path() == Path.home() / ".auto-daily" / "llm_cache.db"
+        assert get_llm_cache_max_bytes() == 64 * 1024 * 1024
+        assert get_llm_cache_ttl() == 30 * 24 * 60 * 60
+
+        with patch.dict(
+            os.environ,
+            {
+                "AUTO_DAILY_LLM_CACHE": "true",
+                "AUTO_DAILY_LLM_CACHE_PATH": "/tmp/cache.db",
+                "AUTO_DAILY_LLM_CACHE_MAX_MB": "0.5",
+                "AUTO_DAILY_LLM_CACHE_TTL_DAYS": "0",
+            },
+        ):
+            assert get_llm_cache_enabled() is True
+            assert get_llm_cache_path() == Path("/tmp/cache.db")
+            assert get_llm_cache_max_bytes() == 512 * 1024
+            assert get_llm_cache_ttl() == 0
+
+
+def test_rolling_summary_interval_from_env() -> None:
+    """Test that the rolling summary interval is read in minutes."""
+    from auto_daily.config import get_rolling_summary_interval
+
+    env_without_var = {
+        k: v for k, v in os.environ.items() if k != "AUTO_DAILY_ROLLING_SUMMARY_MINUTES"
+    }
+    with patch.dict(os.environ, env_without_var, clear=True):
+        assert get_rolling_summary_interval() == 0
+
+        with patch.dict(os.environ, {"AUTO_DAILY_ROLLING_SUMMARY_MINUTES": "10"}):
+            assert get_rolling_summary_interval() == 600
+
+
+def test_session_gap_from_env() -> None:
+    """Test that the session gap is read in minutes."""
+    from auto_daily.config import get_session_gap
+
+    env_without_var = {
+        k: v for k, v in os.environ.items() if k != "AUTO_DAILY_SESSION_GAP_MINUTES"
+    }
+    with patch.dict(os.environ, env_without_var, clear=True):
+        assert get_session_gap() == 300
+
+        with patch.dict(os.environ, {"AUTO_DAILY_SESSION_GAP_MINUTES": "1.5"}):
+            assert get_session_gap() == 90
+
+
+def test_calendar_timeout_from_env() -> None:
+    """Test that the per-calendar timeout is read in seconds."""
+    from auto_daily.config import DEFAULT_CALENDAR_TIMEOUT, get_calendar_timeout
+
+    env_without_var = {
+        k: v for k, v in os.environ.items() if k != "AUTO_DAILY_CALENDAR_TIMEOUT"
+    }
+    with patch.dict(os.environ, env_without_var, clear=True):
+        assert get_calendar_timeout() == DEFAULT_CALENDAR_TIMEOUT
+
+        with patch.dict(os.environ, {"AUTO_DAILY_CALENDAR_TIMEOUT": "2.5"}):
+            assert get_calendar_timeout() == 2.5
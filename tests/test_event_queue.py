@@ -0,0 +1,108 @@
+"""Tests for bounded event queue module."""
+
+import threading
+import time
+
+import pytest
+
+from auto_daily.event_queue import BoundedEventQueue
+
+
+class TestBoundedEventQueue:
+    """Test BoundedEventQueue backpressure policies."""
+
+    def test_fifo_order(self) -> None:
+        """Verify items are returned in the order they were put."""
+        queue: BoundedEventQueue[int] = BoundedEventQueue(4)
+        for i in range(3):
+            queue.put(i)
+
+        assert [queue.get(timeout=0), queue.get(timeout=0), queue.get(timeout=0)] == [
+            0,
+            1,
+            2,
+        ]
+        assert queue.get(timeout=0) is None
+
+    def test_drop_oldest_when_full(self) -> None:
+        """Verify the oldest item is discarded when the queue is full."""
+        discarded: list[int] = []
+        queue: BoundedEventQueue[int] = BoundedEventQueue(
+            2, "drop_oldest", on_discard=discarded.append
+        )
+
+        for i in range(4):
+            assert queue.put(i) is True
+
+        assert len(queue) == 2
+        assert queue.get(timeout=0) == 2
+        assert queue.get(timeout=0) == 3
+        assert discarded == [0, 1]
+        assert queue.stats.queued == 4
+        assert queue.stats.dropped == 2
+
+    def test_coalesce_replaces_same_key(self) -> None:
+        """Verify a pending item with the same key is replaced in place."""
+        queue: BoundedEventQueue[tuple[str, int]] = BoundedEventQueue(
+            4, "coalesce", key=lambda item: item[0]
+        )
+
+        queue.put(("A", 1))
+        queue.put(("B", 1))
+        queue.put(("A", 2))
+
+        assert len(queue) == 2
+        assert queue.get(timeout=0) == ("A", 2)
+        assert queue.get(timeout=0) == ("B", 1)
+        assert queue.stats.coalesced == 1
+        assert queue.stats.dropped == 0
+
+    def test_coalesce_drops_oldest_when_full(self) -> None:
+        """Verify coalesce falls back to dropping the oldest distinct item."""
+        queue: BoundedEventQueue[str] = BoundedEventQueue(
+            2, "coalesce", key=lambda item: item
+        )
+
+        queue.put("A")
+        queue.put("B")
+        queue.put("C")
+
+        assert queue.get(timeout=0) == "B"
+        assert queue.get(timeout=0) == "C"
+        assert queue.stats.dropped == 1
+
+    def test_block_waits_for_room(self) -> None:
+        """Verify the block policy waits until a consumer frees a slot."""
+        queue: BoundedEventQueue[int] = BoundedEventQueue(1, "block")
+        queue.put(0)
+
+        assert queue.put(1, timeout=0.05) is False
+
+        def consume() -> None:
+            time.sleep(0.05)
+            queue.get()
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        assert queue.put(1, timeout=1.0) is True
+        consumer.join()
+
+        assert queue.get(timeout=0) == 1
+        assert queue.stats.dropped == 0
+
+    def test_close_drains_then_returns_none(self) -> None:
+        """Verify pending items are still returned after close."""
+        queue: BoundedEventQueue[int] = BoundedEventQueue(2)
+        queue.put(1)
+        queue.close()
+
+        assert queue.put(2) is False
+        assert queue.get() == 1
+        assert queue.get() is None
+
+    def test_invalid_policy(self) -> None:
+        """Verify unknown policies and missing coalesce keys are rejected."""
+        with pytest.raises(ValueError):
+            BoundedEventQueue(1, "unknown")  # type: ignore[arg-type]
+        with pytest.raises(ValueError):
+            BoundedEventQueue(1, "coalesce")
@@ -0,0 +1,76 @@
+"""Tests for image helpers and the OCR preprocessing stage."""
+
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from auto_daily.imaging import PreprocessOptions, open_image, preprocess_image
+
+
+def _make_capture(path: Path, size: tuple[int, int] = (2880, 1800)) -> str:
+    """Create a synthetic colored capture."""
+    Image.new("RGB", size, (200, 120, 40)).save(path)
+    return str(path)
+
+
+def test_open_image_from_path_and_buffer(tmp_path: Path) -> None:
+    """Test that open_image accepts both file paths and encoded bytes.
+
+    The function should:
+    1. Open an image from a path
+    2. Open the same image from bytes and from a memoryview
+    """
+    path = _make_capture(tmp_path / "capture.png", (40, 30))
+    data = Path(path).read_bytes()
+
+    for source in (path, data, memoryview(data)):
+        with open_image(source) as image:
+            assert image.size == (40, 30)
+
+
+def test_preprocess_downscales_and_reencodes(tmp_path: Path) -> None:
+    """Test that preprocess_image shrinks the capture for OCR.
+
+    The function should:
+    1. Downscale so the long edge fits max_edge, keeping the aspect ratio
+    2. Convert to grayscale when requested
+    3. Re-encode in the requested format, smaller than the original PNG
+    """
+    path = _make_capture(tmp_path / "capture.png")
+    options = PreprocessOptions(
+        grayscale=True, max_edge=1440, image_format="jpeg", quality=70
+    )
+
+    data = preprocess_image(path, options)
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.format == "JPEG"
+        assert image.mode == "L"
+        assert image.size == (1440, 900)
+    assert len(data) < Path(path).stat().st_size
+
+
+def test_preprocess_keeps_small_images(tmp_path: Path) -> None:
+    """Test that images already below max_edge are not upscaled."""
+    path = _make_capture(tmp_path / "capture.png", (800, 600))
+
+    data = preprocess_image(path, PreprocessOptions(max_edge=1440, image_format="webp"))
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (800, 600)
+
+
+def test_preprocess_options() -> None:
+    """Test PreprocessOptions defaults and validation.
+
+    The options should:
+    1. Be disabled by default (PNG, original size, colors kept)
+    2. Reject unknown image formats
+    """
+    assert PreprocessOptions().enabled is False
+    assert PreprocessOptions(max_edge=1024).enabled is True
+    with pytest.raises(ValueError):
+        PreprocessOptions(image_format="bmp")
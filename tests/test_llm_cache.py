@@ -0,0 +1,93 @@
+"""Tests for the persistent LLM response cache."""
+
+import asyncio
+from pathlib import Path
+
+from auto_daily.llm.cache import CachedLLMClient, LLMCache, cache_key
+from auto_daily.llm.streaming import generate_to_file
+
+
+class _CountingClient:
+    """LLM client answering with the number of calls so far."""
+
+    base_url = "http://localhost:11434"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, prompt: str, model: str) -> str:
+        self.calls += 1
+        return f"response {self.calls} to {prompt}"
+
+    async def generate_stream(self, prompt: str, model: str):
+        self.calls += 1
+        for chunk in ["streamed ", str(self.calls)]:
+            yield chunk
+
+
+def test_cache_key_covers_request() -> None:
+    """Test that every part of a request changes the cache key."""
+    key = cache_key("ollama", "llama3.2", "prompt", {"temperature": 0})
+
+    assert key == cache_key("ollama", "llama3.2", "prompt", {"temperature": 0})
+    assert key != cache_key("openai", "llama3.2", "prompt", {"temperature": 0})
+    assert key != cache_key("ollama", "gemma", "prompt", {"temperature": 0})
+    assert key != cache_key("ollama", "llama3.2", "prompt!", {"temperature": 0})
+    assert key != cache_key("ollama", "llama3.2", "prompt", {"temperature": 1})
+
+
+def test_cached_client_reuses_responses(tmp_path: Path) -> None:
+    """Test that repeated prompts are answered without calling the model.
+
+    CachedLLMClient should:
+    1. Call the wrapped client once per distinct prompt and model
+    2. Persist responses across cache instances
+    3. Replay a streamed response as one chunk and count hits and misses
+    """
+    inner = _CountingClient()
+    with LLMCache(tmp_path / "cache.db") as cache:
+        client = CachedLLMClient(inner, cache)
+        first = asyncio.run(client.generate("summarize", "llama3.2"))
+        again = asyncio.run(client.generate("summarize", "llama3.2"))
+        other_model = asyncio.run(client.generate("summarize", "gemma"))
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+
+    assert first == again == "response 1 to summarize"
+    assert other_model == "response 2 to summarize"
+
+    with LLMCache(tmp_path / "cache.db") as cache:
+        client = CachedLLMClient(inner, cache)
+        path = tmp_path / "report.md"
+        asyncio.run(generate_to_file(client, "report", "llama3.2", path))
+        text, stats = asyncio.run(generate_to_file(client, "report", "llama3.2", path))
+        assert asyncio.run(client.generate("summarize", "llama3.2")) == first
+        assert cache.stats.hits == 2
+
+    assert inner.calls == 3
+    assert text == path.read_text() == "streamed 3"
+    assert stats.tokens == 1
+
+
+def test_lru_eviction_and_ttl(tmp_path: Path) -> None:
+    """Test that the cache stays within its size limit and TTL.
+
+    LLMCache should:
+    1. Evict the least recently used responses over the size limit
+    2. Treat responses older than the TTL as misses and delete them
+    """
+    with LLMCache(tmp_path / "cache.db", max_bytes=250, ttl=3600) as cache:
+        for i in range(3):
+            cache.put(f"key{i}", "x" * 100, now=1000.0 + i)
+        assert cache.stats.evictions == 1
+        assert cache.get("key0", now=1010.0) is None
+
+        # Reading key1 makes key2 the least recently used response
+        assert cache.get("key1", now=1011.0) is not None
+        cache.put("key3", "y" * 100, now=1012.0)
+        assert cache.get("key2", now=1013.0) is None
+        assert cache.size() == (2, 200)
+
+        assert cache.get("key3", now=1012.0 + 3601) is None
+        assert cache.stats.expired == 1
+        assert cache.size() == (1, 100)
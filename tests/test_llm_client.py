@@ -1,5 +1,7 @@
 """Tests for LLM client abstraction layer."""
 
+import inspect
+import json
 import os
 from typing import Any
 from unittest.mock import patch
@@ -24,6 +26,7 @@ def test_llm_protocol() -> None:
 
     # Verify Protocol exists and has expected attributes
     assert hasattr(LLMClient, "generate")
+    assert hasattr(LLMClient, "generate_stream")
 
     # Verify it's a Protocol class
     assert issubclass(LLMClient, Protocol)
@@ -45,7 +48,8 @@ def test_client_implements_protocol(
 
     Each client should:
     1. Have an async generate(prompt: str, model: str) -> str method
-    2. Be structurally compatible with LLMClient Protocol
+    2. Have an async generator generate_stream(prompt: str, model: str)
+    3. Be structurally compatible with LLMClient Protocol
     """
     # Create an instance
     client = client_class(**init_kwargs)
@@ -53,6 +57,7 @@ def test_client_implements_protocol(
     # Verify the method signature exists
     assert hasattr(client, "generate")
     assert callable(client.generate)
+    assert inspect.isasyncgenfunction(client.generate_stream)
 
     # Type checking verification (this is for runtime, static checking happens via mypy/ty)
     # The client should be usable where LLMClient is expected
@@ -180,3 +185,123 @@ def test_lm_studio_backend() -> None:
     with patch.dict(os.environ, {"AI_BACKEND": "lm_studio"}):
         client = get_llm_client()
         assert isinstance(client, LMStudioClient)
+
+
+@pytest.mark.asyncio
+async def test_ollama_generate_stream() -> None:
+    """Test that OllamaClient streams the NDJSON response of /api/generate.
+
+    The client should:
+    1. Request a streamed response
+    2. Yield the "response" field of every line until "done"
+    """
+    import httpx
+
+    requests: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        lines = [
+            {"response": "# 日報", "done": False},
+            {"response": "\n\n作業", "done": False},
+            {"response": "", "done": True},
+        ]
+        body = "".join(json.dumps(line) + "\n" for line in lines)
+        return httpx.Response(200, text=body)
+
+    transport = httpx.MockTransport(handler)
+    real_client = httpx.AsyncClient
+    with patch(
+        "auto_daily.llm.ollama.httpx.AsyncClient",
+        lambda: real_client(transport=transport),
+    ):
+        client = OllamaClient(base_url="http://localhost:11434")
+        chunks = [c async for c in client.generate_stream("prompt", "llama3.2")]
+
+    assert requests[0]["stream"] is True
+    assert "".join(chunks) == "# 日報\n\n作業"
+
+
+@pytest.mark.asyncio
+async def test_openai_generate_stream() -> None:
+    """Test that the OpenAI-compatible clients yield streamed deltas.
+
+    The client should:
+    1. Request a streamed chat completion
+    2. Yield non-empty delta contents in order
+    """
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock
+
+    def chunk(content: str | None) -> SimpleNamespace:
+        delta = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def stream():
+        for content in ["Hello", None, ", world"]:
+            yield chunk(content)
+
+    client = OpenAIClient(api_key="test-api-key")
+    create = AsyncMock(return_value=stream())
+    with patch.object(client.client.chat.completions, "create", create):
+        chunks = [c async for c in client.generate_stream("prompt", "gpt-4o-mini")]
+
+    assert create.call_args.kwargs["stream"] is True
+    assert chunks == ["Hello", ", world"]
+
+
+class _ChunkClient:
+    """LLM client streaming fixed chunks, optionally failing midway."""
+
+    def __init__(self, chunks: list[str], path, fail: bool = False) -> None:
+        self.chunks = chunks
+        self.path = path
+        self.fail = fail
+        self.partial_contents: list[str] = []
+
+    async def generate(self, prompt: str, model: str) -> str:
+        return "".join(self.chunks)
+
+    async def generate_stream(self, prompt: str, model: str):
+        from auto_daily.llm.streaming import partial_path
+
+        for chunk in self.chunks:
+            yield chunk
+            self.partial_contents.append(partial_path(self.path).read_text())
+        if self.fail:
+            raise RuntimeError("connection lost")
+
+
+@pytest.mark.asyncio
+async def test_generate_to_file(tmp_path) -> None:
+    """Test that a streamed response is written to its file progressively.
+
+    generate_to_file should:
+    1. Append every chunk to a partial file as it arrives
+    2. Rename the partial file to the target when the response is complete
+    3. Record the time to first token and the number of tokens
+    4. Keep an existing file and remove the partial file on failure
+    """
+    from auto_daily.llm.streaming import generate_to_file, partial_path
+
+    path = tmp_path / "reports" / "daily_report_2024-12-24.md"
+    client = _ChunkClient(["# 日報", "\n", "作業"], path)
+    echoed: list[str] = []
+
+    text, stats = await generate_to_file(client, "prompt", "m", path, echoed.append)
+
+    assert text == "# 日報\n作業"
+    assert path.read_text() == text
+    assert client.partial_contents == ["# 日報", "# 日報\n", "# 日報\n作業"]
+    assert echoed == ["# 日報", "\n", "作業"]
+    assert not partial_path(path).exists()
+    assert stats.tokens == 3
+    assert stats.time_to_first_token is not None
+    assert stats.elapsed >= stats.time_to_first_token
+    assert "tokens/s" in stats.format()
+
+    failing = _ChunkClient(["partial"], path, fail=True)
+    with pytest.raises(RuntimeError):
+        await generate_to_file(failing, "prompt", "m", path)
+    assert path.read_text() == text
+    assert not partial_path(path).exists()
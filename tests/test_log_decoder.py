@@ -0,0 +1,68 @@
+"""Tests for decoding log lines into compact records."""
+
+import json
+import sys
+from datetime import datetime
+
+import pytest
+
+from auto_daily.log_decoder import LogDecoder, load_json_backend
+
+ACTIVITY = {
+    "timestamp": "2024-12-24T10:00:00",
+    "window_info": {"app_name": "Code", "window_title": "main.py"},
+    "ocr_text": "def main():",
+    "slack_context": None,
+}
+SPEECH = {
+    "timestamp": "2024-12-24T10:01:00",
+    "type": "speech",
+    "transcript": "午後のレビューについて",
+    "is_final": True,
+}
+
+
+def test_decode_records() -> None:
+    """LogDecoder should:
+    1. Decode lines into records that convert back to the same entry
+    2. Share one string between records of the same window
+    3. Parse the timestamp only when it is used
+    4. Return None for empty, unparsable and non-object lines
+    """
+    decoder = LogDecoder("json")
+    first = decoder.decode(json.dumps(ACTIVITY).encode())
+    second = decoder.decode(json.dumps(ACTIVITY) + "\n")
+    speech = decoder.decode(json.dumps(SPEECH, ensure_ascii=False))
+
+    assert first is not None and second is not None and speech is not None
+    assert first.data == ACTIVITY
+    assert speech.data == SPEECH
+    assert speech.type == "speech"
+    assert first.window_title is second.window_title
+
+    assert first._parsed is None
+    assert first.parsed_timestamp == datetime(2024, 12, 24, 10, 0)
+    assert first.to_log_entry().app_name == "Code"
+
+    assert decoder.decode(b"\n") is None
+    assert decoder.decode(b"{not json") is None
+    assert decoder.decode(b"[1, 2]") is None
+
+
+def test_load_json_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """load_json_backend should:
+    1. Fall back to the json module when orjson and msgspec are missing
+    2. Raise ImportError for a requested backend that is not installed
+    3. Raise ValueError for an unknown backend
+    """
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    name, loads = load_json_backend("auto")
+    assert name == "json"
+    assert loads(b'{"a": 1}') == {"a": 1}
+
+    with pytest.raises(ImportError, match="fast-json"):
+        load_json_backend("orjson")
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        load_json_backend("yaml")
@@ -0,0 +1,97 @@
+"""Tests for the streaming reader of a day's log files."""
+
+import gzip
+import json
+from datetime import date, datetime
+from pathlib import Path
+
+from auto_daily.log_reader import (
+    day_log_files,
+    iter_day_entries,
+    iter_day_records,
+    iter_records,
+)
+
+DAY = date(2024, 12, 24)
+
+
+def _entry(timestamp: str, title: str) -> dict:
+    return {
+        "timestamp": timestamp,
+        "window_info": {"app_name": "Code", "window_title": title},
+        "ocr_text": f"editing {title}",
+    }
+
+
+def _write(path: Path, *entries: dict, compress: bool = False) -> None:
+    """Write entries as JSONL, gzip-compressed if requested."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = "".join(json.dumps(entry) + "\n" for entry in entries)
+    if compress:
+        path.with_name(path.name + ".gz").write_bytes(gzip.compress(text.encode()))
+    else:
+        path.write_text(text)
+
+
+def test_iter_day_records_in_timestamp_order(tmp_path: Path) -> None:
+    """iter_day_records should:
+    1. Read hourly logs, compressed or not, and the legacy daily file
+    2. Yield every entry of the day in timestamp order
+    3. Skip empty and unparsable lines
+    """
+    log_base = tmp_path / "logs"
+    date_dir = log_base / "2024-12-24"
+    _write(
+        date_dir / "activity_10.jsonl",
+        _entry("2024-12-24T10:05:00", "b.py"),
+        _entry("2024-12-24T10:01:00", "a.py"),
+        compress=True,
+    )
+    _write(date_dir / "activity_11.jsonl", _entry("2024-12-24T11:00:00", "d.py"))
+    with open(date_dir / "activity_11.jsonl", "a") as f:
+        f.write("\n{not json\n")
+    _write(
+        date_dir / "activity_2024-12-24.jsonl", _entry("2024-12-24T10:30:00", "c.py")
+    )
+
+    records = list(iter_day_records(log_base, DAY))
+
+    assert [record.window_title for record in records] == [
+        "a.py",
+        "b.py",
+        "c.py",
+        "d.py",
+    ]
+    assert records[0].parsed_timestamp == datetime(2024, 12, 24, 10, 1)
+    assert records[0].to_log_entry().ocr_text == "editing a.py"
+    assert len(day_log_files(log_base, DAY)) == 3
+    assert [entry["timestamp"] for entry in iter_day_entries(log_base, DAY)][-1] == (
+        "2024-12-24T11:00:00"
+    )
+
+
+def test_iter_records_filters_range(tmp_path: Path) -> None:
+    """iter_records should:
+    1. Only yield entries with start <= timestamp < end
+    2. Span midnight into the next date directory
+    """
+    log_base = tmp_path / "logs"
+    _write(
+        log_base / "2024-12-24" / "activity_23.jsonl",
+        _entry("2024-12-24T23:10:00", "early.py"),
+        _entry("2024-12-24T23:40:00", "late.py"),
+    )
+    _write(
+        log_base / "2024-12-25" / "activity_00.jsonl",
+        _entry("2024-12-25T00:20:00", "midnight.py"),
+    )
+    _write(
+        log_base / "2024-12-25" / "activity_01.jsonl",
+        _entry("2024-12-25T01:00:00", "outside.py"),
+    )
+
+    records = iter_records(
+        log_base, datetime(2024, 12, 24, 23, 30), datetime(2024, 12, 25, 1, 0)
+    )
+
+    assert [record.window_title for record in records] == ["late.py", "midnight.py"]
@@ -0,0 +1,138 @@
+"""Tests for the single-writer buffered log writer."""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from auto_daily.log_writer import LogWriter
+from auto_daily.logger import get_hourly_log_path
+
+
+def _read_entries(path: Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_log_writer_batches_entries(log_base: Path) -> None:
+    """Test that entries enqueued together are written as one batch.
+
+    The LogWriter should:
+    1. Write activity entries in the append_log_hourly format
+    2. Write entries collected within the flush interval with one write
+    3. Make the entries visible after flush()
+    """
+    writer = LogWriter(log_base, flush_interval_ms=50, fsync="off")
+    writer.start()
+    try:
+        timestamp = datetime(2024, 12, 24, 14, 5, 0)
+        paths = {
+            writer.append_activity(
+                {"app_name": "Code", "window_title": f"file{i}.py"},
+                f"text {i}",
+                timestamp=timestamp,
+            )
+            for i in range(10)
+        }
+        assert writer.flush(timeout=5.0)
+    finally:
+        writer.stop()
+
+    assert paths == {get_hourly_log_path(log_base, timestamp)}
+    entries = _read_entries(paths.pop())
+    assert [e["ocr_text"] for e in entries] == [f"text {i}" for i in range(10)]
+    assert entries[0]["timestamp"] == "2024-12-24T14:05:00"
+    assert entries[0]["window_info"]["app_name"] == "Code"
+    assert writer.stats.entries == 10
+    assert writer.stats.batches == 1
+
+
+def test_log_writer_rotates_hourly(log_base: Path) -> None:
+    """Test that the writer switches files at hour boundaries.
+
+    The LogWriter should:
+    1. Write each entry to the file of its own hour
+    2. Close the previous file (with fsync) before writing the next one
+    """
+    writer = LogWriter(log_base, flush_interval_ms=0, fsync="rotate")
+    writer.start()
+    try:
+        first = writer.append_speech("こんにちは", 0.9, True)
+        hour_14 = writer.append_activity(
+            {"app_name": "Slack", "window_title": "general"},
+            "a",
+            timestamp=datetime(2024, 12, 24, 14, 59, 59),
+        )
+        hour_15 = writer.append_activity(
+            {"app_name": "Slack", "window_title": "general"},
+            "b",
+            timestamp=datetime(2024, 12, 24, 15, 0, 0),
+        )
+        assert writer.flush(timeout=5.0)
+    finally:
+        writer.stop()
+
+    assert first is not None and hour_14 is not None and hour_15 is not None
+    assert hour_14 != hour_15
+    assert _read_entries(hour_14)[0]["ocr_text"] == "a"
+    assert _read_entries(hour_15)[0]["ocr_text"] == "b"
+    assert _read_entries(first)[0]["type"] == "speech"
+    assert writer.stats.rotations >= 1
+    assert writer.stats.fsyncs >= 2
+
+
+def test_log_writer_concurrent_producers(log_base: Path) -> None:
+    """Test that concurrent producers never produce interleaved lines.
+
+    The LogWriter should:
+    1. Accept entries from several threads at once
+    2. Write every entry as one complete JSON line
+    3. Write all pending entries on stop()
+    """
+    writer = LogWriter(log_base, flush_interval_ms=5, fsync="off", max_batch=16)
+    writer.start()
+    timestamp = datetime(2024, 12, 24, 10, 0, 0)
+    long_text = "x" * 10_000
+
+    def produce(worker: int) -> None:
+        for i in range(50):
+            writer.append_activity(
+                {"app_name": f"App{worker}", "window_title": str(i)},
+                long_text,
+                timestamp=timestamp,
+            )
+
+    threads = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.stop()
+
+    entries = _read_entries(get_hourly_log_path(log_base, timestamp))
+    assert len(entries) == 200
+    assert all(e["ocr_text"] == long_text for e in entries)
+    assert writer.stats.batches < 200
+
+
+def test_log_writer_rejects_after_stop(log_base: Path) -> None:
+    """Test that a stopped writer refuses new entries.
+
+    The LogWriter should:
+    1. Return None from write methods after stop()
+    2. Return False from flush() after stop()
+    """
+    writer = LogWriter(log_base, flush_interval_ms=0, fsync="off")
+    writer.start()
+    writer.stop()
+
+    assert writer.append_speech("test", 1.0, True) is None
+    assert writer.flush(timeout=1.0) is False
+
+
+def test_log_writer_invalid_fsync(log_base: Path) -> None:
+    """Test that an unknown fsync policy raises ValueError."""
+    with pytest.raises(ValueError, match="Unknown fsync policy"):
+        LogWriter(log_base, fsync="always")
@@ -429,3 +429,19 @@ def test_append_log_speech_coexists_with_window_logs(log_base: Path) -> None:
     # Speech entry has 'type' = 'speech'
     assert speech_entry["type"] == "speech"
     assert speech_entry["transcript"] == "音声テスト"
+
+
+def test_unchanged_entry_is_flagged(log_base: Path) -> None:
+    """Test that entries for unchanged screens carry an "unchanged" flag.
+
+    The flag is only written when set, so regular entries keep their schema.
+    """
+    window_info = {"app_name": "Docs", "window_title": "spec"}
+
+    log_path = append_log_hourly(log_base, window_info, "text")
+    append_log_hourly(log_base, window_info, "text", unchanged=True)
+
+    assert log_path is not None
+    first, second = (json.loads(line) for line in log_path.read_text().splitlines())
+    assert "unchanged" not in first
+    assert second["unchanged"] is True
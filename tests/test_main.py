@@ -144,6 +144,115 @@ def test_report_command(tmp_path, monkeypatch) -> None:
     mock_client.generate.assert_called_once()
 
 
+def test_report_command_streams(tmp_path, monkeypatch, capsys) -> None:
+    """Test that the report is streamed into its file.
+
+    The report command should:
+    1. Use the client's generate_stream when it has one
+    2. Save the concatenated chunks as the report
+    3. Print the time to first token and tokens per second
+    """
+    import json
+    from datetime import date, datetime
+    from unittest.mock import patch
+
+    import auto_daily
+    import auto_daily.report
+    from auto_daily.logger import get_log_filename
+
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    reports_dir = tmp_path / "reports"
+    today = date.today()
+    log_file = log_dir / get_log_filename(datetime.combine(today, datetime.min.time()))
+    log_entry = {
+        "timestamp": "2024-12-25T10:00:00",
+        "window_info": {"app_name": "Code", "window_title": "test.py"},
+        "ocr_text": "test content",
+    }
+    log_file.write_text(json.dumps(log_entry) + "\n")
+    monkeypatch.setenv("AUTO_DAILY_LOG_DIR", str(log_dir))
+
+    class StreamingClient:
+        async def generate(self, prompt: str, model: str) -> str:
+            raise AssertionError("generate_stream should be used")
+
+        async def generate_stream(self, prompt: str, model: str):
+            for chunk in ["# 日報", "\n\n", "今日の作業"]:
+                yield chunk
+
+    with (
+        patch.object(auto_daily.report, "OllamaClient", StreamingClient),
+        patch.object(auto_daily.report, "get_reports_dir", return_value=reports_dir),
+        patch("sys.argv", ["auto-daily", "report"]),
+    ):
+        auto_daily.main()
+
+    report = reports_dir / f"daily_report_{today.isoformat()}.md"
+    assert report.read_text() == "# 日報\n\n今日の作業"
+    assert "First token after" in capsys.readouterr().out
+
+
+def test_report_command_uses_llm_cache(tmp_path, monkeypatch, capsys) -> None:
+    """Test that a repeated report over unchanged logs is answered from cache.
+
+    The report command should:
+    1. Call the LLM on the first run and cache the response
+    2. Reuse the cached response on a second run without calling the LLM
+    3. Call the LLM again with --no-cache, and print the cache statistics
+    """
+    import json
+    from datetime import date, datetime
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    import auto_daily
+    import auto_daily.report
+    from auto_daily.logger import get_log_filename
+
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    reports_dir = tmp_path / "reports"
+    today = date.today()
+    log_file = log_dir / get_log_filename(datetime.combine(today, datetime.min.time()))
+    log_entry = {
+        "timestamp": "2024-12-25T10:00:00",
+        "window_info": {"app_name": "Code", "window_title": "test.py"},
+        "ocr_text": "test content",
+    }
+    log_file.write_text(json.dumps(log_entry) + "\n")
+    monkeypatch.setenv("AUTO_DAILY_LOG_DIR", str(log_dir))
+    monkeypatch.setenv("AUTO_DAILY_LLM_CACHE", "true")
+    monkeypatch.setenv("AUTO_DAILY_LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+
+    mock_client = MagicMock()
+    mock_client.generate = AsyncMock(return_value="# 日報")
+    report = reports_dir / f"daily_report_{today.isoformat()}.md"
+
+    def run(*args: str) -> str:
+        with (
+            patch.object(auto_daily.report, "OllamaClient", return_value=mock_client),
+            patch.object(
+                auto_daily.report, "get_reports_dir", return_value=reports_dir
+            ),
+            patch("sys.argv", ["auto-daily", "report", *args]),
+        ):
+            auto_daily.main()
+        return capsys.readouterr().out
+
+    first = run()
+    report.unlink()
+    second = run()
+
+    assert mock_client.generate.await_count == 1
+    assert "LLM cache: 0 hits, 1 misses" in first
+    assert "LLM cache: 1 hits, 0 misses" in second
+    assert report.read_text() == "# 日報"
+
+    third = run("--no-cache")
+    assert mock_client.generate.await_count == 2
+    assert "LLM cache" not in third
+
+
 def test_report_with_date_option(tmp_path, monkeypatch) -> None:
     """Test that --date option allows generating report for a specific date.
 
@@ -952,6 +1061,59 @@ def test_report_fallback_to_logs(tmp_path, monkeypatch) -> None:
     assert "VS Code" in prompt or "main.py" in prompt or "Hello" in prompt
 
 
+def test_report_fallback_reads_hourly_logs(tmp_path, monkeypatch) -> None:
+    """Test that the log fallback of report reads the hourly log layout.
+
+    The report command should:
+    1. Read every logs/YYYY-MM-DD/activity_HH.jsonl of the date
+    2. Include the entries in the prompt in timestamp order
+    3. Include the time table with the activities, before the output format
+    """
+    import json
+    from datetime import date, datetime
+    from unittest.mock import AsyncMock, patch
+
+    import auto_daily
+    import auto_daily.report
+
+    log_dir = tmp_path / "logs"
+    summaries_dir = tmp_path / "summaries"
+    summaries_dir.mkdir()
+    today = date.today()
+    date_dir = log_dir / today.isoformat()
+    date_dir.mkdir(parents=True)
+    for hour, title in [(14, "review.md"), (9, "main.py")]:
+        entry = {
+            "timestamp": datetime.combine(today, datetime.min.time())
+            .replace(hour=hour)
+            .isoformat(),
+            "window_info": {"app_name": "Code", "window_title": title},
+            "ocr_text": "",
+        }
+        (date_dir / f"activity_{hour:02d}.jsonl").write_text(json.dumps(entry) + "\n")
+
+    monkeypatch.setenv("AUTO_DAILY_LOG_DIR", str(log_dir))
+    monkeypatch.setenv("AUTO_DAILY_SUMMARIES_DIR", str(summaries_dir))
+
+    mock_client = AsyncMock()
+    mock_client.generate.return_value = "# 日報"
+
+    with (
+        patch.object(auto_daily.report, "OllamaClient", return_value=mock_client),
+        patch.object(
+            auto_daily.report, "get_reports_dir", return_value=tmp_path / "reports"
+        ),
+        patch("sys.argv", ["auto-daily", "report"]),
+    ):
+        auto_daily.main()
+
+    prompt = mock_client.generate.call_args.kwargs["prompt"]
+    assert prompt.index("main.py") < prompt.index("review.md")
+    # The time table is input data, so it comes before the output format
+    assert prompt.index("review.md") < prompt.index("作業時間の内訳")
+    assert prompt.index("作業時間の内訳") < prompt.index("## 出力フォーマット")
+
+
 def test_report_auto_summarize(tmp_path, monkeypatch, capsys) -> None:
     """Test that --auto-summarize option generates missing summaries.
 
@@ -1022,6 +1184,83 @@ def test_report_auto_summarize(tmp_path, monkeypatch, capsys) -> None:
     assert mock_client.generate.call_count >= 2
 
 
+def test_report_auto_summarize_concurrent(tmp_path, monkeypatch, capsys) -> None:
+    """Test that missing summaries are generated concurrently.
+
+    The --auto-summarize option should:
+    1. Send at most --concurrency summary requests at a time
+    2. Save the summaries of the other hours when one hour fails
+    3. Report progress per hour and still generate the report
+    """
+    import asyncio
+    import json
+    from datetime import date, datetime
+    from unittest.mock import MagicMock, patch
+
+    import auto_daily
+    import auto_daily.report
+    from auto_daily.logger import get_hourly_log_path
+
+    log_dir = tmp_path / "logs"
+    summaries_dir = tmp_path / "summaries"
+    reports_dir = tmp_path / "reports"
+    today = date.today()
+    for hour in [9, 10, 11, 12]:
+        target_datetime = datetime.combine(today, datetime.min.time()).replace(
+            hour=hour
+        )
+        log_file = get_hourly_log_path(log_dir, target_datetime)
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        log_entry = {
+            "timestamp": target_datetime.isoformat(),
+            "window_info": {"app_name": "VS Code", "window_title": f"task_{hour}.py"},
+            "ocr_text": f"# Hour {hour} work",
+        }
+        log_file.write_text(json.dumps(log_entry) + "\n")
+
+    monkeypatch.setenv("AUTO_DAILY_LOG_DIR", str(log_dir))
+    monkeypatch.setenv("AUTO_DAILY_SUMMARIES_DIR", str(summaries_dir))
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def generate(model: str, prompt: str) -> str:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "task_10.py" in prompt:
+            raise RuntimeError("model unavailable")
+        return "summary"
+
+    mock_client = MagicMock()
+    mock_client.generate = generate
+
+    with (
+        patch.object(auto_daily.report, "OllamaClient", return_value=mock_client),
+        patch.object(auto_daily.report, "get_reports_dir", return_value=reports_dir),
+        patch(
+            "sys.argv",
+            ["auto-daily", "report", "--auto-summarize", "--concurrency", "2"],
+        ),
+    ):
+        auto_daily.main()
+
+    output = capsys.readouterr().out
+    date_summary_dir = summaries_dir / today.isoformat()
+    assert max_in_flight == 2
+    assert sorted(p.name for p in date_summary_dir.iterdir()) == [
+        "summary_09.md",
+        "summary_11.md",
+        "summary_12.md",
+    ]
+    assert "Failed hour 10" in output
+    assert "(4/4)" in output
+    assert "Report will not include hours: 10" in output
+    assert (reports_dir / f"daily_report_{today.isoformat()}.md").exists()
+
+
 # ============================================================
 # PBI-035: 要約プロンプトのカスタマイズ
 # ============================================================
@@ -0,0 +1,97 @@
+"""Tests for map-reduce summarization of oversized hours and days."""
+
+import asyncio
+
+from auto_daily.map_reduce import MapReduceSummarizer
+
+
+class _RecordingClient:
+    """LLM client answering every prompt with a short summary."""
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt: str, model: str) -> str:
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return f"summary {len(self.prompts)}"
+
+
+def _entries(count: int) -> list[dict]:
+    """Return entries of distinct windows with distinct screen text."""
+    return [
+        {
+            "timestamp": f"2024-12-24T10:{i % 60:02d}:00",
+            "window_info": {"app_name": "Code", "window_title": f"module_{i}.py"},
+            "ocr_text": "\n".join(f"def handler_{i}_{j}(): pass" for j in range(5)),
+        }
+        for i in range(count)
+    ]
+
+
+def test_small_hour_is_one_prompt() -> None:
+    """Test that an hour within the budget needs no extra LLM calls."""
+    client = _RecordingClient()
+    summarizer = MapReduceSummarizer(client, "model", token_budget=3000)
+
+    hour_prompt = asyncio.run(summarizer.build_hour_prompt(_entries(3)))
+
+    assert client.prompts == []
+    assert hour_prompt.chunks == 1
+    assert "def handler_2_4(): pass" in hour_prompt.prompt
+
+
+def test_large_hour_is_mapped_and_reduced() -> None:
+    """Test that an oversized hour is summarized chunk by chunk.
+
+    MapReduceSummarizer should:
+    1. Split the log into chunks within the budget
+    2. Summarize the chunks concurrently, within the concurrency limit
+    3. Merge the partial summaries in a final prompt that sees them all
+    """
+    client = _RecordingClient()
+    summarizer = MapReduceSummarizer(client, "model", token_budget=200, concurrency=2)
+
+    summary = asyncio.run(summarizer.summarize_hour(_entries(20)))
+
+    map_prompts = client.prompts[:-1]
+    assert len(map_prompts) > 2
+    assert all("module_0.py" not in p for p in map_prompts[1:])
+    assert any("module_19.py" in p for p in map_prompts)
+    assert client.max_in_flight == 2
+    final_prompt = client.prompts[-1]
+    assert "統合" in final_prompt
+    assert "## パート 1" in final_prompt
+    assert summary == f"summary {len(client.prompts)}"
+
+
+def test_condense_day_summaries() -> None:
+    """Test that a day of summaries is merged until it fits the report.
+
+    condense_summaries should:
+    1. Return summaries within the budget unchanged
+    2. Merge neighbouring hours into periods and report their end hours
+    """
+    client = _RecordingClient()
+    summaries = dict.fromkeys(range(8, 20), "作業内容の要約。" * 20)
+
+    unchanged = MapReduceSummarizer(client, "model", report_token_budget=0)
+    assert asyncio.run(unchanged.condense_summaries(summaries)) == (
+        summaries,
+        {hour: hour + 1 for hour in summaries},
+    )
+    assert client.prompts == []
+
+    summarizer = MapReduceSummarizer(client, "model", report_token_budget=700)
+    condensed, end_hours = asyncio.run(summarizer.condense_summaries(summaries))
+
+    assert 1 < len(condensed) < len(summaries)
+    assert min(condensed) == 8
+    assert max(end_hours.values()) == 20
+    assert "08:00-09:00" in client.prompts[0]
+    assert all(end > start for start, end in end_hours.items())
@@ -209,6 +209,39 @@ def test_openai_vision_image_encoding(tmp_path: Path) -> None:
     assert result == "Extracted text from image"
 
 
+def test_openai_vision_buffer_media_type() -> None:
+    """Test that OpenAIVisionOCR accepts in-memory image buffers.
+
+    The OCR should:
+    1. Encode the buffer without reading any file
+    2. Detect the media type from the image signature
+    """
+    from unittest.mock import MagicMock, patch
+
+    from auto_daily.ocr.openai_vision import OpenAIVisionOCR, detect_media_type
+
+    assert detect_media_type(b"\x89PNG\r\n\x1a\n") == "image/png"
+    assert detect_media_type(b"\xff\xd8\xff\xe0") == "image/jpeg"
+    assert detect_media_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert detect_media_type(memoryview(b"GIF89a")) == "image/gif"
+
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.choices[0].message.content = "Buffered text"
+    mock_client.chat.completions.create.return_value = mock_response
+
+    with patch("auto_daily.ocr.openai_vision.OpenAI", return_value=mock_client):
+        backend = OpenAIVisionOCR(api_key="test-key")
+        result = backend.perform_ocr_buffer(memoryview(b"\xff\xd8\xff\xe0jpeg"))
+
+    content = mock_client.chat.completions.create.call_args.kwargs["messages"][0][
+        "content"
+    ]
+    assert content[1]["image_url"]["url"].startswith("data:image/jpeg;base64,")
+    assert result == "Buffered text"
+
+
 def test_openai_vision_backend() -> None:
     """Test that OCR_BACKEND=openai returns OpenAIVisionOCR.
 
@@ -458,3 +491,226 @@ def test_filtering_enabled_by_default() -> None:
         result = perform_ocr("/fake/path.png")
         assert "10:30 AM" in result
         assert "100%" in result
+
+
+# ============================================================
+# 帯単位のインクリメンタル OCR
+# ============================================================
+
+
+class _LineReadingOCR:
+    """Fake OCR backend that reads horizontal bars as text lines.
+
+    Each run of non-blank rows is one "line", named after its darkest
+    intensity. A bar cut by a crop edge is still read, so a line recognized
+    by two crops shows up twice.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def perform_ocr(self, image_path: str) -> str:
+        with open(image_path, "rb") as f:
+            return self.perform_ocr_buffer(f.read())
+
+    def perform_ocr_buffer(self, image_data) -> str:
+        import io
+
+        import numpy as np
+        from PIL import Image
+
+        self.calls += 1
+        with Image.open(io.BytesIO(bytes(image_data))) as image:
+            pixels = np.asarray(image.convert("L"))
+        lines = []
+        in_line = False
+        for row in pixels:
+            if row.min() < 200 and not in_line:
+                lines.append(f"line-{row.min()}")
+            in_line = row.min() < 200
+        return "\n".join(lines)
+
+
+def _draw_lines(path: Path, lines: dict[int, tuple[int, int]], height: int = 240):
+    """Save a white capture with one gray bar per (intensity -> (top, bottom))."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (400, height), "white")
+    draw = ImageDraw.Draw(image)
+    for intensity, (top, bottom) in lines.items():
+        draw.rectangle((20, top, 380, bottom), fill=(intensity,) * 3)
+    image.save(path)
+    return str(path)
+
+
+def test_changed_bands_detects_modified_region() -> None:
+    """Test that changed_bands flags only the bands whose pixels changed.
+
+    The function should:
+    1. Return one flag per full-width band
+    2. Mark bands containing changed pixels as True
+    3. Handle image heights that are not a multiple of the band count
+    """
+    import numpy as np
+
+    from auto_daily.ocr.incremental import changed_bands
+
+    previous = np.full((101, 203), 255, dtype=np.uint8)
+    current = previous.copy()
+    current[80:90, 150:170] = 0  # last band of 2
+
+    result = changed_bands(previous, current, 2)
+
+    assert result.tolist() == [False, True]
+    assert not changed_bands(previous, previous, 2).any()
+
+
+def test_incremental_ocr_only_recognizes_changed_region(tmp_path: Path) -> None:
+    """Test that IncrementalOCR re-runs the backend only for the changed rows.
+
+    The incremental OCR should:
+    1. Recognize the first capture of a window with one whole-image call
+    2. Reuse the cached text when nothing changed
+    3. Recognize only the changed rows and keep the text in reading order
+    """
+    from auto_daily.ocr.incremental import IncrementalOCR
+
+    lines = {0: (10, 25), 40: (70, 85), 100: (200, 215)}
+    first = _draw_lines(tmp_path / "first.png", {**lines, 60: (130, 145)})
+    second = _draw_lines(tmp_path / "second.png", {**lines, 60: (130, 145)})
+    third = _draw_lines(tmp_path / "third.png", {**lines, 80: (130, 145)})
+
+    backend = _LineReadingOCR()
+    ocr = IncrementalOCR(backend, bands=4)
+    key = ("Slack", "#general")
+
+    expected = "line-0\nline-40\nline-60\nline-100"
+    assert ocr.perform_ocr(first, key) == expected
+    assert backend.calls == 1
+
+    assert ocr.perform_ocr(second, key) == expected
+    assert backend.calls == 1
+
+    assert ocr.perform_ocr(third, key) == "line-0\nline-40\nline-80\nline-100"
+    # The changed band plus the cached region above and below it
+    assert backend.calls == 4
+    assert ocr.stats.rows_total == 720
+    assert ocr.stats.rows_recognized == 480
+    assert ocr.stats.backend_calls == 4
+
+
+def test_incremental_ocr_keeps_lines_on_band_borders_whole(tmp_path: Path) -> None:
+    """Test that a line crossing a band border is recognized exactly once.
+
+    The incremental OCR should:
+    1. Move the edges of the changed region onto blank rows
+    2. Return every line once and in top-to-bottom order
+    """
+    from auto_daily.ocr.incremental import IncrementalOCR
+
+    # Bands are 60 rows high; line-40 crosses the border at row 120
+    lines = {0: (10, 25), 20: (52, 68), 40: (112, 128)}
+    first = _draw_lines(
+        tmp_path / "first.png", {**lines, 60: (135, 150), 100: (200, 215)}
+    )
+    second = _draw_lines(
+        tmp_path / "second.png", {**lines, 60: (135, 150), 80: (200, 215)}
+    )
+    third = _draw_lines(
+        tmp_path / "third.png", {**lines, 90: (135, 150), 80: (200, 215)}
+    )
+
+    backend = _LineReadingOCR()
+    ocr = IncrementalOCR(backend, bands=4)
+    key = ("Editor", "main.py")
+
+    ocr.perform_ocr(first, key)
+    assert ocr.perform_ocr(second, key) == (
+        "line-0\nline-20\nline-40\nline-60\nline-80"
+    )
+    # Only the band of line-60 changed, but its region grows up to the blank
+    # row above line-40 instead of cutting line-40 at the band border
+    assert ocr.perform_ocr(third, key).splitlines() == [
+        "line-0",
+        "line-20",
+        "line-40",
+        "line-90",
+        "line-80",
+    ]
+
+
+def test_incremental_ocr_falls_back_to_whole_image(tmp_path: Path) -> None:
+    """Test that large changes are recognized with a single whole-image call.
+
+    The incremental OCR should:
+    1. Recognize the whole image when the changed bands span most of it
+    2. Recognize the whole image when the window size changed
+    """
+    from auto_daily.ocr.incremental import IncrementalOCR
+
+    first = _draw_lines(tmp_path / "first.png", {0: (10, 25), 100: (200, 215)})
+    scrolled = _draw_lines(tmp_path / "scrolled.png", {20: (40, 55), 80: (180, 195)})
+    resized = _draw_lines(tmp_path / "resized.png", {0: (10, 25)}, height=300)
+
+    backend = _LineReadingOCR()
+    ocr = IncrementalOCR(backend, bands=4)
+    key = ("Safari", "News")
+
+    ocr.perform_ocr(first, key)
+    assert ocr.perform_ocr(scrolled, key) == "line-20\nline-80"
+    assert backend.calls == 2
+    assert ocr.perform_ocr(resized, key) == "line-0"
+    assert backend.calls == 3
+
+
+def test_ocr_bands_from_env() -> None:
+    """Test that OCR_INCREMENTAL and OCR_BANDS are read from the environment."""
+    import os
+    from unittest.mock import patch
+
+    import pytest
+
+    from auto_daily.config import get_ocr_bands, get_ocr_incremental
+
+    env_without_vars = {
+        k: v for k, v in os.environ.items() if k not in ("OCR_INCREMENTAL", "OCR_BANDS")
+    }
+    with patch.dict(os.environ, env_without_vars, clear=True):
+        assert get_ocr_incremental() is False
+        assert get_ocr_bands() == 12
+
+    with patch.dict(os.environ, {"OCR_INCREMENTAL": "1", "OCR_BANDS": "8"}):
+        assert get_ocr_incremental() is True
+        assert get_ocr_bands() == 8
+
+    with patch.dict(os.environ, {"OCR_BANDS": "0"}):
+        assert get_ocr_bands() == 1
+
+    with patch.dict(os.environ, {"OCR_BANDS": "many"}), pytest.raises(ValueError):
+        get_ocr_bands()
+
+
+def test_ollama_vision_buffer() -> None:
+    """Test that OllamaVisionOCR accepts in-memory image buffers.
+
+    The OCR should:
+    1. Base64-encode the given bytes directly
+    2. Send them in the images array like the file-path entry point
+    """
+    import base64
+    from unittest.mock import MagicMock, patch
+
+    from auto_daily.ocr.ollama_vision import OllamaVisionOCR
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"response": "Buffered text"}
+
+    with patch(
+        "auto_daily.ocr.ollama_vision.httpx.post", return_value=mock_response
+    ) as mock_post:
+        backend = OllamaVisionOCR(base_url="http://localhost:11434", model="llava")
+        result = backend.perform_ocr_buffer(memoryview(b"image bytes"))
+
+    json_data = mock_post.call_args.kwargs["json"]
+    assert json_data["images"] == [base64.b64encode(b"image bytes").decode("ascii")]
+    assert result == "Buffered text"
@@ -0,0 +1,120 @@
+"""Tests for the compact, token-budgeted summary prompt log."""
+
+import json
+
+from auto_daily.prompt_builder import build_compact_log, estimate_tokens
+
+SIDEBAR = "Explorer\nOutline\nTimeline\nsrc/auto_daily/report.py"
+
+
+def _activity(minute: int, title: str, ocr_text: str) -> dict:
+    """Return an activity entry at 10:MM."""
+    return {
+        "timestamp": f"2024-12-24T10:{minute:02d}:00",
+        "window_info": {"app_name": "Code", "window_title": title},
+        "ocr_text": ocr_text,
+        "slack_context": None,
+    }
+
+
+def test_estimate_tokens() -> None:
+    """Test that Japanese text counts one token per character."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd" * 10) == 10
+    assert estimate_tokens("日報を作成") == 5
+    assert estimate_tokens("日報 report") == 2 + 2
+
+
+def test_compact_log_merges_windows_and_repeated_lines() -> None:
+    """Test that repeated captures collapse into one block.
+
+    build_compact_log should:
+    1. Merge consecutive entries of the same window under one header
+    2. Keep each OCR line only the first time it appears in the hour
+    3. Include final speech and Slack context, and skip partial speech
+    4. Report far fewer tokens than the raw JSONL
+    """
+    entries = [
+        _activity(i, "main.py", f"{SIDEBAR}\ndef step_{i}(): pass") for i in range(5)
+    ]
+    entries.append(
+        {
+            "timestamp": "2024-12-24T10:06:00",
+            "type": "speech",
+            "transcript": "午後の",
+            "is_final": False,
+        }
+    )
+    entries.append(
+        {
+            "timestamp": "2024-12-24T10:06:30",
+            "type": "speech",
+            "transcript": "午後のレビューについて",
+            "is_final": True,
+        }
+    )
+    slack = _activity(8, "dev-team", SIDEBAR)
+    slack["window_info"]["app_name"] = "Slack"
+    slack["slack_context"] = {"channel": "dev-team", "is_thread": True}
+    entries.append(slack)
+
+    compact = build_compact_log(entries, token_budget=0)
+
+    lines = compact.text.splitlines()
+    assert lines[0] == "10:00-10:04 Code - main.py"
+    assert compact.text.count("Explorer") == 1
+    assert all(f"def step_{i}(): pass" in compact.text for i in range(5))
+    assert "10:06 音声: 午後のレビューについて" in lines
+    assert "午後の\n" not in compact.text
+    assert "10:08 Slack - dev-team [Slack #dev-team thread]" in lines
+    assert compact.dropped_lines == 0
+    assert compact.saved_tokens > compact.tokens
+
+
+def test_token_budget_drops_least_novel_lines() -> None:
+    """Test that trimming to the budget drops the most common text first.
+
+    build_compact_log should:
+    1. Stay within the token budget
+    2. Drop lines whose words recur all over the hour before unique ones
+    3. Keep the headers and note how many lines were dropped
+    """
+    boilerplate = "\n".join(f"File Edit View Go Run menu item {i}" for i in range(30))
+    entries = [
+        _activity(i, f"file{i}.py", f"{boilerplate}\nunique_function_{i}()")
+        for i in range(3)
+    ]
+
+    full = build_compact_log(entries, token_budget=0)
+    compact = build_compact_log(entries, token_budget=full.tokens // 3)
+
+    assert compact.tokens <= full.tokens // 3
+    assert compact.dropped_lines > 0
+    assert all(f"unique_function_{i}()" in compact.text for i in range(3))
+    assert all(f"Code - file{i}.py" in compact.text for i in range(3))
+    assert f"OCR テキスト {compact.dropped_lines} 行を省略" in compact.text
+    assert "dropped" in compact.format()
+    assert compact.original_tokens == sum(
+        estimate_tokens(json.dumps(e, ensure_ascii=False)) + 1 for e in entries
+    )
+
+
+def test_split_repeats_block_headers() -> None:
+    """Test that splitting the compact log keeps every chunk readable.
+
+    CompactLog.split should:
+    1. Keep every chunk within the token budget
+    2. Repeat the header of a block continued in the next chunk
+    3. Lose no line and return the whole text for a budget of 0
+    """
+    ocr_text = "\n".join(f"line {i} of the edited file" for i in range(40))
+    compact = build_compact_log([_activity(0, "main.py", ocr_text)], token_budget=0)
+
+    chunks = compact.split(60)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 60 for chunk in chunks)
+    assert all(chunk.startswith("10:00 Code - main.py\n") for chunk in chunks)
+    body = [row for chunk in chunks for row in chunk.splitlines()[1:]]
+    assert body == compact.text.splitlines()[1:]
+    assert compact.split(0) == [compact.text]
@@ -0,0 +1,152 @@
+"""Tests for rolling summaries updated during the hour."""
+
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from auto_daily.map_reduce import MapReduceSummarizer
+from auto_daily.rolling_summary import (
+    RollingSummarizer,
+    get_checkpoint_hours,
+    get_checkpoint_path,
+    load_checkpoint,
+)
+
+HOUR = datetime(2024, 12, 24, 10, 0)
+
+
+class _RecordingClient:
+    """LLM client answering with the number of calls so far."""
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    async def generate(self, prompt: str, model: str) -> str:
+        self.prompts.append(prompt)
+        return f"running summary {len(self.prompts)}"
+
+
+def _append(log_dir: Path, *titles: str) -> None:
+    """Append one entry per window title to the 10:00 log."""
+    path = log_dir / "2024-12-24" / "activity_10.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for minute, title in enumerate(titles):
+            entry = {
+                "timestamp": f"2024-12-24T10:{minute:02d}:00",
+                "window_info": {"app_name": "Code", "window_title": title},
+                "ocr_text": f"editing {title}",
+            }
+            f.write(json.dumps(entry) + "\n")
+
+
+def _rolling(tmp_path: Path) -> tuple[RollingSummarizer, _RecordingClient]:
+    """Return a rolling summarizer over tmp_path and its LLM client."""
+    client = _RecordingClient()
+    summarizer = MapReduceSummarizer(client, "model", token_budget=3000)
+    rolling = RollingSummarizer(summarizer, tmp_path / "logs", tmp_path / "summaries")
+    return rolling, client
+
+
+def test_update_sends_only_new_entries(tmp_path: Path) -> None:
+    """Test that each update summarizes only the entries since the checkpoint.
+
+    RollingSummarizer.update should:
+    1. Summarize the first entries of the hour with the summary prompt
+    2. Merge only later entries into the running summary
+    3. Not call the LLM when nothing was appended
+    """
+    rolling, client = _rolling(tmp_path)
+    _append(tmp_path / "logs", "first.py", "second.py")
+    first = asyncio.run(rolling.update(HOUR))
+
+    _append(tmp_path / "logs", "third.py")
+    second = asyncio.run(rolling.update(HOUR))
+    unchanged = asyncio.run(rolling.update(HOUR))
+
+    assert "first.py" in client.prompts[0]
+    assert "first.py" not in client.prompts[1]
+    assert "third.py" in client.prompts[1]
+    assert "running summary 1" in client.prompts[1]
+    assert len(client.prompts) == 2
+    assert first.entries == 2
+    assert second.offset > first.offset
+    assert unchanged == second
+    assert load_checkpoint(get_checkpoint_path(tmp_path / "summaries", HOUR)) == (
+        second
+    )
+    assert get_checkpoint_hours(tmp_path / "summaries", date(2024, 12, 24)) == [10]
+
+
+def test_save_keeps_checkpoint_until_the_hour_is_over(tmp_path: Path) -> None:
+    """Test that a running hour keeps being updated after it is saved.
+
+    RollingSummarizer.save should:
+    1. Save the running summary and keep the checkpoint during the hour
+    2. Merge the last entries, save the summary and remove the checkpoint
+       once the hour is over
+    """
+    rolling, client = _rolling(tmp_path)
+    summary_file = tmp_path / "summaries" / "2024-12-24" / "summary_10.md"
+    _append(tmp_path / "logs", "first.py")
+
+    asyncio.run(rolling.save(HOUR, now=datetime(2024, 12, 24, 10, 30)))
+    assert summary_file.read_text() == "running summary 1"
+    assert rolling.has_checkpoint(HOUR)
+
+    _append(tmp_path / "logs", "last.py")
+    path = asyncio.run(rolling.save(HOUR, now=datetime(2024, 12, 24, 11, 1)))
+
+    assert path == summary_file
+    assert summary_file.read_text() == "running summary 2"
+    assert not rolling.has_checkpoint(HOUR)
+    assert len(client.prompts) == 2
+
+
+def test_finalize_includes_entries_buffered_by_the_log_writer(
+    tmp_path: Path,
+) -> None:
+    """Test that the hourly callback flushes the log writer before finalizing.
+
+    on_hourly_summary should write entries still buffered by the log writer
+    before it merges the last entries of the previous hour.
+    """
+    from unittest.mock import patch
+
+    from auto_daily.log_writer import LogWriter
+    from auto_daily.monitor import on_hourly_summary
+
+    log_dir = tmp_path / "logs"
+    summaries_dir = tmp_path / "summaries"
+    previous_hour = (datetime.now() - timedelta(hours=1)).replace(
+        minute=0, second=0, microsecond=0
+    )
+    client = _RecordingClient()
+    summarizer = MapReduceSummarizer(client, "model", token_budget=3000)
+    rolling = RollingSummarizer(summarizer, log_dir, summaries_dir)
+
+    # Large interval: entries stay buffered until flushed
+    writer = LogWriter(log_dir, flush_interval_ms=60_000, fsync="off")
+    writer.start()
+    writer.append_activity(
+        {"app_name": "Code", "window_title": "first.py"}, "a", timestamp=previous_hour
+    )
+    writer.flush()
+    asyncio.run(rolling.update(previous_hour))
+    writer.append_activity(
+        {"app_name": "Code", "window_title": "late.py"},
+        "b",
+        timestamp=previous_hour + timedelta(minutes=59),
+    )
+
+    with (
+        patch("auto_daily.monitor.OllamaClient", return_value=client),
+        patch("auto_daily.monitor.check_ollama_connection", return_value=True),
+    ):
+        on_hourly_summary(log_dir, summaries_dir, log_writer=writer)
+    writer.stop()
+
+    assert len(client.prompts) == 2
+    assert "late.py" in client.prompts[1]
+    assert not rolling.has_checkpoint(previous_hour)
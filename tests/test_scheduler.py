@@ -176,3 +176,36 @@ class TestHourlySummaryScheduler:
 
         # Check callback was called with correct arguments
         mock_callback.assert_called_with(log_dir, summaries_dir)
+
+    def test_rolling_callback_runs_periodically(self, tmp_path: Path) -> None:
+        """Test that the rolling callback runs every rolling_interval.
+
+        The scheduler should:
+        1. Call the rolling callback repeatedly with the directories
+        2. Not call it at all when no interval is configured
+        """
+        rolling_callback = MagicMock()
+        idle_callback = MagicMock()
+        log_dir = tmp_path / "logs"
+        summaries_dir = tmp_path / "summaries"
+
+        schedulers = [
+            HourlySummaryScheduler(
+                callback=MagicMock(),
+                log_dir=log_dir,
+                summaries_dir=summaries_dir,
+                check_interval=0.02,
+                rolling_callback=callback,
+                rolling_interval=interval,
+            )
+            for callback, interval in [(rolling_callback, 0.1), (idle_callback, 0)]
+        ]
+        for scheduler in schedulers:
+            scheduler.start()
+        time.sleep(0.5)
+        for scheduler in schedulers:
+            scheduler.stop()
+
+        assert rolling_callback.call_count >= 2
+        rolling_callback.assert_called_with(log_dir, summaries_dir)
+        idle_callback.assert_not_called()
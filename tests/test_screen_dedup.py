@@ -0,0 +1,173 @@
+"""Tests for perceptual-hash screen deduplication."""
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image, ImageDraw
+
+from auto_daily.screen_dedup import ScreenDeduplicator, compute_dhash, hamming_distance
+
+
+def _make_screen(path: Path, text_rows: int, size: tuple[int, int] = (800, 600)) -> str:
+    """Create a synthetic screen with a number of dark "text" rows."""
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for row in range(text_rows):
+        y = 40 + row * 30
+        draw.rectangle((40, y, 40 + (row * 97) % 600 + 100, y + 12), fill="black")
+    image.save(path)
+    return str(path)
+
+
+def _wait_for_calls(mock: MagicMock, count: int, timeout: float = 2.0) -> None:
+    """Wait until a mock has been called at least count times."""
+    deadline = time.monotonic() + timeout
+    while mock.call_count < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestComputeDhash:
+    """Test dHash computation."""
+
+    def test_identical_images_have_same_hash(self, tmp_path: Path) -> None:
+        """Verify identical captures produce identical hashes."""
+        a = _make_screen(tmp_path / "a.png", text_rows=10)
+        b = _make_screen(tmp_path / "b.png", text_rows=10)
+
+        assert compute_dhash(a) == compute_dhash(b)
+
+    def test_different_screens_are_far_apart(self, tmp_path: Path) -> None:
+        """Verify substantially different screens have a large distance."""
+        a = _make_screen(tmp_path / "a.png", text_rows=2)
+        b = _make_screen(tmp_path / "b.png", text_rows=16)
+
+        hash_a = compute_dhash(a)
+        hash_b = compute_dhash(b)
+        assert hash_a is not None and hash_b is not None
+        assert hamming_distance(hash_a, hash_b) > 8
+
+    def test_unreadable_image_returns_none(self, tmp_path: Path) -> None:
+        """Verify missing or corrupt files do not raise."""
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"not an image")
+
+        assert compute_dhash(str(tmp_path / "missing.png")) is None
+        assert compute_dhash(str(broken)) is None
+
+
+class TestScreenDeduplicator:
+    """Test per-window unchanged-screen detection."""
+
+    def test_reuses_text_for_same_window(self) -> None:
+        """Verify an unchanged hash returns the remembered OCR text."""
+        dedup = ScreenDeduplicator(threshold=2, mode="reuse")
+        key = ("Editor", "main.py")
+
+        assert dedup.find_unchanged(key, 0b1010) is None
+        dedup.remember(key, 0b1010, "def main(): ...")
+
+        assert dedup.find_unchanged(key, 0b1011) == "def main(): ..."
+        assert dedup.find_unchanged(("Editor", "other.py"), 0b1010) is None
+        assert dedup.find_unchanged(key, 0b0101) is None
+        assert dedup.hits == 1
+        assert dedup.misses == 3
+
+    def test_invalid_mode(self) -> None:
+        """Verify unknown modes are rejected."""
+        with pytest.raises(ValueError):
+            ScreenDeduplicator(mode="sometimes")
+
+
+class TestPipelineDedup:
+    """Test deduplication inside the asynchronous capture pipeline."""
+
+    @pytest.mark.parametrize(
+        ("mode", "expected_text"), [("reuse", "screen text"), ("marker", "")]
+    )
+    def test_unchanged_screen_skips_ocr(
+        self, tmp_path: Path, mode: str, expected_text: str
+    ) -> None:
+        """Verify a repeated capture of the same window is not OCR'd again."""
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr.return_value = "screen text"
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1,
+            queue_size=4,
+            backpressure="block",
+            ocr_backend=backend,
+            deduplicator=ScreenDeduplicator(threshold=4, mode=mode),
+        )
+        counter = iter(range(10))
+
+        def capture(log_dir: Path, region: object = None) -> str:
+            return _make_screen(tmp_path / f"capture_{next(counter)}.png", 8)
+
+        with (
+            patch("auto_daily.capture_pipeline.capture_screen", side_effect=capture),
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            mock_log.return_value = tmp_path / "log.jsonl"
+            pipeline.start()
+            for i in range(2):
+                pipeline.submit(
+                    CaptureContext(
+                        window_info={"app_name": "Docs", "window_title": "spec"},
+                        log_dir=tmp_path,
+                    )
+                )
+                # Let each frame be OCR'd and remembered before the next one
+                _wait_for_calls(mock_log, i + 1)
+            pipeline.stop()
+
+        backend.perform_ocr.assert_called_once()
+        assert mock_log.call_count == 2
+        second = mock_log.call_args_list[1]
+        assert second.args[2] == expected_text
+        assert second.kwargs["unchanged"] is True
+        assert pipeline.stats.unchanged == 1
+        # Captured images are cleaned up in both paths
+        assert list(tmp_path.glob("capture_*.png")) == []
+
+    def test_hash_failure_falls_back_to_ocr(self, tmp_path: Path) -> None:
+        """Verify a frame that cannot be hashed is still OCR'd and logged."""
+        from auto_daily.capture_pipeline import AsyncCapturePipeline, CaptureContext
+
+        backend = MagicMock()
+        backend.perform_ocr.return_value = "screen text"
+        dedup = ScreenDeduplicator(threshold=4, mode="reuse")
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=1,
+            queue_size=4,
+            backpressure="block",
+            ocr_backend=backend,
+            deduplicator=dedup,
+        )
+
+        with (
+            patch.object(dedup, "hash_image", side_effect=SyntaxError("bad PNG")),
+            patch(
+                "auto_daily.capture_pipeline.capture_screen",
+                return_value=str(tmp_path / "test.png"),
+            ),
+            patch("auto_daily.capture_pipeline.cleanup_image"),
+            patch("auto_daily.capture_pipeline.append_log_hourly") as mock_log,
+        ):
+            mock_log.return_value = tmp_path / "log.jsonl"
+            pipeline.start()
+            for _ in range(2):
+                pipeline.submit(
+                    CaptureContext(
+                        window_info={"app_name": "Docs", "window_title": "spec"},
+                        log_dir=tmp_path,
+                    )
+                )
+                _wait_for_calls(mock_log, 1)
+            pipeline.stop()
+
+        assert backend.perform_ocr.call_count == 2
+        assert [c.args[2] for c in mock_log.call_args_list] == ["screen text"] * 2
+        assert pipeline.stats.processed == 2
@@ -0,0 +1,147 @@
+"""Tests for the full-text search index."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from auto_daily.search import SearchIndex, build_match_query, make_snippet, tokenize
+
+
+def _activity(timestamp: str, app_name: str, title: str, text: str) -> dict:
+    return {
+        "timestamp": timestamp,
+        "window_info": {"app_name": app_name, "window_title": title},
+        "ocr_text": text,
+        "slack_context": None,
+    }
+
+
+def test_tokenize_cjk_bigrams() -> None:
+    """Test that CJK runs become bigrams and other text is kept.
+
+    The tokenizer should:
+    1. Split runs of Japanese characters into overlapping bigrams
+    2. Keep single CJK characters and non-CJK text as they are
+    """
+    assert tokenize("第二会議室でABC-123") == "第二 二会 会議 議室 室で ABC-123"
+    assert tokenize("a 字 b") == "a 字 b"
+    assert tokenize("   ") == ""
+
+
+def test_build_match_query() -> None:
+    """Test that queries become phrase queries over the same tokens."""
+    assert build_match_query("会議室 ABC-123") == '"会議 議室" AND "ABC-123"'
+    assert build_match_query("会") == '"会" *'
+    assert build_match_query('say "hi"') == '"say" AND """hi"""'
+    assert build_match_query("- ...") == ""
+
+
+def test_search_ranks_japanese_and_ticket_ids(tmp_path: Path) -> None:
+    """Test searching OCR text, titles and transcripts.
+
+    The SearchIndex should:
+    1. Find Japanese words inside longer sentences
+    2. Find ticket IDs regardless of case and punctuation
+    3. Rank title hits above body hits and filter by app and time
+    4. Index speech transcripts
+    """
+    with SearchIndex(tmp_path / "search.db") as index:
+        added = index.add_many(
+            [
+                _activity(
+                    "2024-12-24T10:00:00",
+                    "Slack",
+                    "general",
+                    "明日は第二会議室でABC-123のレビューをします",
+                ),
+                _activity(
+                    "2024-12-24T11:00:00",
+                    "Google Chrome",
+                    "ABC-123 Fix login",
+                    "Jira issue",
+                ),
+                _activity("2024-12-24T12:00:00", "Code", "main.py", "def main()"),
+                {
+                    "timestamp": "2024-12-24T13:00:00",
+                    "type": "speech",
+                    "transcript": "会議室の予約をお願いします",
+                },
+            ]
+        )
+
+        meeting = index.search("会議室")
+        ticket = index.search("abc-123")
+        slack_only = index.search("abc-123", app_name="Slack")
+        morning = index.search("abc-123", until=datetime(2024, 12, 24, 10, 30))
+        missing = index.search("議会")
+
+    assert added == 4
+    assert sorted(hit.type for hit in meeting) == ["activity", "speech"]
+    assert [hit.app_name for hit in ticket] == ["Google Chrome", "Slack"]
+    assert "ABC-123" in ticket[1].snippet
+    assert [hit.app_name for hit in slack_only] == ["Slack"]
+    assert [hit.timestamp.hour for hit in morning] == [10]
+    assert missing == []
+
+
+def test_index_jsonl_tree_without_duplicates(tmp_path: Path, log_base: Path) -> None:
+    """Test catching up with JSONL logs after live indexing.
+
+    The SearchIndex should:
+    1. Index new lines of hourly JSONL files incrementally
+    2. Skip entries that were already indexed through add_many
+    """
+    entry = _activity("2024-12-24T09:00:00", "Code", "main.py", "refactor parser")
+    day_dir = log_base / "2024-12-24"
+    day_dir.mkdir()
+    log_file = day_dir / "activity_09.jsonl"
+    log_file.write_text(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    with SearchIndex(tmp_path / "search.db") as index:
+        index.add_many([entry])
+        first = index.index_jsonl_tree(log_base)
+        with open(log_file, "a") as f:
+            newer = _activity("2024-12-24T09:30:00", "Code", "main.py", "parser tests")
+            f.write(json.dumps(newer) + "\n")
+        second = index.index_jsonl_tree(log_base)
+        hits = index.search("parser")
+
+    assert (first.files, first.entries) == (1, 0)
+    assert (second.files, second.entries) == (1, 1)
+    assert len(hits) == 2
+
+
+def test_make_snippet() -> None:
+    """Test that snippets are cut around the first match."""
+    text = "x" * 100 + " ABC-123 " + "y" * 100
+
+    snippet = make_snippet(text, "abc-123", width=40)
+
+    assert snippet.startswith("...")
+    assert snippet.endswith("...")
+    assert "ABC-123" in snippet
+
+
+def test_search_command(log_base: Path, monkeypatch, capsys) -> None:
+    """Test that 'auto-daily search' indexes the logs and prints hits."""
+    import auto_daily
+
+    day_dir = log_base / "2024-12-24"
+    day_dir.mkdir()
+    (day_dir / "activity_15.jsonl").write_text(
+        json.dumps(
+            _activity("2024-12-24T15:04:05", "Slack", "dev", "ABC-123 をマージ"),
+            ensure_ascii=False,
+        )
+        + "\n"
+    )
+    monkeypatch.setenv("AUTO_DAILY_LOG_DIR", str(log_base))
+    monkeypatch.setenv("AUTO_DAILY_SEARCH_DB_PATH", str(log_base / "search.db"))
+
+    with patch("sys.argv", ["auto-daily", "search", "abc-123", "マージ"]):
+        auto_daily.main()
+
+    output = capsys.readouterr().out
+    assert "2024-12-24 15:04:05  Slack - dev" in output
+    assert "1 hits" in output
@@ -0,0 +1,100 @@
+"""Tests for merging log entries into activity sessions."""
+
+from datetime import UTC, datetime, timedelta
+
+from auto_daily.calendar import CalendarEvent, match_events_with_sessions
+from auto_daily.ollama import generate_daily_report_prompt_from_entries
+from auto_daily.sessions import sessionize_entries
+
+
+def _activity(time: str, title: str, ocr_text: str = "") -> dict:
+    """Return an activity entry in the Code app at 2024-12-24 HH:MM:SS."""
+    return {
+        "timestamp": f"2024-12-24T{time}",
+        "window_info": {"app_name": "Code", "window_title": title},
+        "ocr_text": ocr_text,
+    }
+
+
+def test_sessionize_merges_consecutive_entries() -> None:
+    """sessionize_entries should:
+    1. Merge consecutive entries of a window, keeping only novel OCR lines
+    2. Count the dwell time until the next window
+    3. Start a new session after a gap longer than the session gap
+    4. Turn final speech into its own session and skip partial speech
+    """
+    entries = [
+        _activity(f"10:{minute:02d}:00", "main.py", f"Explorer\ndef step_{minute}():")
+        for minute in range(0, 10)
+    ]
+    entries.append(_activity("10:10:00", "test.py", "Explorer"))
+    entries.append(
+        {
+            "timestamp": "2024-12-24T10:11:00",
+            "type": "speech",
+            "transcript": "午後の",
+            "is_final": False,
+        }
+    )
+    entries.append(
+        {
+            "timestamp": "2024-12-24T10:11:30",
+            "type": "speech",
+            "transcript": "午後の レビュー",
+            "is_final": True,
+        }
+    )
+    entries.append(_activity("10:40:00", "test.py"))
+
+    sessions = list(sessionize_entries(entries, gap=300))
+
+    assert [(s.kind, s.window_title) for s in sessions] == [
+        ("activity", "main.py"),
+        ("activity", "test.py"),
+        ("speech", ""),
+        ("activity", "test.py"),
+    ]
+    main = sessions[0]
+    assert main.entries == 10
+    assert main.ocr_lines[0] == "Explorer"
+    assert len(main.ocr_lines) == 11
+    assert main.end == datetime(2024, 12, 24, 10, 9)
+    assert main.dwell == timedelta(minutes=10)
+    assert sessions[1].ocr_lines == []
+    assert sessions[2].transcript == "午後の レビュー"
+    assert sessions[3].dwell == timedelta(0)
+
+
+def test_report_prompt_and_calendar_use_sessions() -> None:
+    """Sessions should:
+    1. Give one report prompt line per session instead of per entry
+    2. Match every calendar event their time span overlaps
+    """
+    entries = [
+        _activity(f"09:{second // 2:02d}:{second % 2 * 30:02d}", "main.py")
+        for second in range(0, 120)
+    ]
+
+    prompt = generate_daily_report_prompt_from_entries(entries)
+    assert prompt.count("Code (main.py)") == 1
+    assert "09:00-09:59（60分）" in prompt
+
+    sessions = list(sessionize_entries(entries, gap=300))
+    standup = CalendarEvent(
+        summary="Standup",
+        start=datetime(2024, 12, 24, 9, 30, tzinfo=UTC),
+        end=datetime(2024, 12, 24, 9, 45, tzinfo=UTC),
+        calendar_name="Work",
+    )
+    review = CalendarEvent(
+        summary="Review",
+        start=datetime(2024, 12, 24, 11, 0, tzinfo=UTC),
+        end=datetime(2024, 12, 24, 12, 0, tzinfo=UTC),
+        calendar_name="Work",
+    )
+
+    result = match_events_with_sessions([standup, review], sessions)
+
+    assert result.matched == [(standup, sessions)]
+    assert result.unstarted == [review]
+    assert result.unplanned == []
@@ -0,0 +1,251 @@
+"""Tests for the SQLite activity store."""
+
+import json
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from auto_daily.store import ActivityStore, open_activity_store
+
+
+def _entry(timestamp: str, app_name: str, text: str = "") -> dict:
+    return {
+        "timestamp": timestamp,
+        "window_info": {"app_name": app_name, "window_title": f"{app_name} window"},
+        "ocr_text": text,
+        "slack_context": None,
+    }
+
+
+def test_query_time_range(tmp_path: Path) -> None:
+    """Test that entries are returned by exact time range.
+
+    The ActivityStore should:
+    1. Use WAL journal mode
+    2. Return entries with start <= timestamp < end in time order
+    3. Filter by app name and list the hours of a day
+    """
+    with ActivityStore(tmp_path / "activity.db") as store:
+        store.add_many(
+            [
+                _entry("2024-12-24T10:59:59", "Code", "a"),
+                _entry("2024-12-24T11:00:00", "Slack", "b"),
+                _entry("2024-12-24T11:30:00.250000", "Code", "c"),
+                _entry("2024-12-24T12:00:00", "Code", "d"),
+            ]
+        )
+        store.add({"timestamp": "2024-12-24T11:45:00", "type": "speech"})
+
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        hour = store.query_hour(datetime(2024, 12, 24, 11, 20))
+        code = store.query(
+            datetime(2024, 12, 24, 0, 0), datetime(2024, 12, 25, 0, 0), "Code"
+        )
+        hours = store.get_hours(date(2024, 12, 24))
+
+    assert mode == "wal"
+    assert [e.get("ocr_text") for e in hour] == ["b", "c", None]
+    assert hour[2]["type"] == "speech"
+    assert [e["ocr_text"] for e in code] == ["a", "c", "d"]
+    assert hours == [10, 11, 12]
+
+
+def test_import_jsonl_tree_incremental(tmp_path: Path, log_base: Path) -> None:
+    """Test importing an existing hourly JSONL tree.
+
+    The ActivityStore should:
+    1. Import every logs/YYYY-MM-DD/activity_HH.jsonl file
+    2. Skip unparsable lines and leave an unterminated last line for later
+    3. Only import lines appended since the previous import
+    """
+    day_dir = log_base / "2024-12-24"
+    day_dir.mkdir()
+    hour_10 = day_dir / "activity_10.jsonl"
+    hour_10.write_text(
+        json.dumps(_entry("2024-12-24T10:00:00", "Code")) + "\nnot json\n"
+    )
+    hour_11 = day_dir / "activity_11.jsonl"
+    partial = json.dumps(_entry("2024-12-24T11:05:00", "Slack"))
+    hour_11.write_text(json.dumps(_entry("2024-12-24T11:00:00", "Slack")) + "\n")
+    with open(hour_11, "a") as f:
+        f.write(partial)
+
+    with ActivityStore(tmp_path / "activity.db") as store:
+        first = store.import_jsonl_tree(log_base)
+        with open(hour_11, "a") as f:
+            f.write("\n" + json.dumps(_entry("2024-12-24T11:10:00", "Code")) + "\n")
+        second = store.import_jsonl_tree(log_base)
+        third = store.import_jsonl_tree(log_base)
+        entries = store.query_date(date(2024, 12, 24))
+
+    assert (first.files, first.entries, first.skipped) == (2, 2, 1)
+    assert (second.files, second.entries) == (1, 2)
+    assert third.entries == 0
+    assert [e["timestamp"] for e in entries] == [
+        "2024-12-24T10:00:00",
+        "2024-12-24T11:00:00",
+        "2024-12-24T11:05:00",
+        "2024-12-24T11:10:00",
+    ]
+
+
+def test_open_activity_store_from_env(tmp_path: Path, monkeypatch) -> None:
+    """Test that the store is only opened for the sqlite backend."""
+    monkeypatch.setenv("AUTO_DAILY_DB_PATH", str(tmp_path / "db" / "activity.db"))
+
+    monkeypatch.setenv("AUTO_DAILY_STORAGE", "jsonl")
+    assert open_activity_store() is None
+
+    monkeypatch.setenv("AUTO_DAILY_STORAGE", "sqlite")
+    store = open_activity_store()
+    assert store is not None
+    store.close()
+    assert (tmp_path / "db" / "activity.db").exists()
+
+    with pytest.raises(ValueError, match="Unknown storage backend"):
+        open_activity_store("postgres")
+
+
+def test_log_writer_writes_to_store(tmp_path: Path, log_base: Path) -> None:
+    """Test that the log writer inserts every batch into an attached store."""
+    from auto_daily.log_writer import LogWriter
+
+    store = ActivityStore(tmp_path / "activity.db")
+    writer = LogWriter(log_base, flush_interval_ms=0, fsync="off", sinks=[store])
+    writer.start()
+    writer.append_activity(
+        {"app_name": "Code", "window_title": "main.py"},
+        "text",
+        timestamp=datetime(2024, 12, 24, 9, 15),
+    )
+    writer.stop()
+
+    entries = store.query_hour(datetime(2024, 12, 24, 9, 0))
+    store.close()
+    assert [e["ocr_text"] for e in entries] == ["text"]
+    assert (log_base / "2024-12-24" / "activity_09.jsonl").exists()
+
+
+def test_import_after_monitor_does_not_duplicate(
+    tmp_path: Path, log_base: Path
+) -> None:
+    """Test importing the JSONL logs the monitor already wrote to the store.
+
+    The ActivityStore should:
+    1. Skip entries the log writer already inserted
+    2. Still import lines that only exist in the JSONL log
+    """
+    from auto_daily.log_writer import LogWriter
+
+    store = ActivityStore(tmp_path / "activity.db")
+    writer = LogWriter(log_base, flush_interval_ms=0, fsync="off", sinks=[store])
+    writer.start()
+    writer.append_activity(
+        {"app_name": "Code", "window_title": "main.py"},
+        "text",
+        timestamp=datetime(2024, 12, 24, 9, 15),
+    )
+    writer.stop()
+    with open(log_base / "2024-12-24" / "activity_09.jsonl", "a") as f:
+        f.write(json.dumps(_entry("2024-12-24T09:30:00", "Slack")) + "\n")
+
+    stats = store.import_jsonl_tree(log_base)
+    again = store.add_many(store.query_hour(datetime(2024, 12, 24, 9, 0)))
+    entries = store.query_hour(datetime(2024, 12, 24, 9, 0))
+    store.close()
+
+    assert stats.entries == 1
+    assert again == 0
+    assert [e["window_info"]["app_name"] for e in entries] == ["Code", "Slack"]
+
+
+def test_migrate_adds_keys_and_removes_duplicates(tmp_path: Path) -> None:
+    """Test opening a database created before entries had content keys."""
+    import sqlite3
+
+    path = tmp_path / "activity.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE entries (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL,"
+        " type TEXT NOT NULL, app_name TEXT NOT NULL DEFAULT '',"
+        " window_title TEXT NOT NULL DEFAULT '', data TEXT NOT NULL)"
+    )
+    entry = _entry("2024-12-24T10:00:00", "Code")
+    row = ("2024-12-24T10:00:00", "activity", "Code", "", json.dumps(entry))
+    conn.executemany(
+        "INSERT INTO entries (timestamp, type, app_name, window_title, data)"
+        " VALUES (?, ?, ?, ?, ?)",
+        [row, row],
+    )
+    conn.commit()
+    conn.close()
+
+    with ActivityStore(path) as store:
+        added = store.add_many([entry])
+        entries = store.query_date(date(2024, 12, 24))
+
+    assert added == 0
+    assert entries == [entry]
+
+
+def test_report_and_summarize_read_from_store(tmp_path: Path, monkeypatch) -> None:
+    """Test that report and summarize use the store when configured.
+
+    The commands should:
+    1. Summarize an hour from the store without any JSONL file
+    2. Generate the daily report from the day's entries in the store
+    """
+    import auto_daily.report
+    from auto_daily.report import report_command, summarize_command
+
+    db_path = tmp_path / "activity.db"
+    with ActivityStore(db_path) as store:
+        store.add(_entry("2024-12-24T10:15:00", "Code", "def store_test(): pass"))
+
+    monkeypatch.setenv("AUTO_DAILY_STORAGE", "sqlite")
+    monkeypatch.setenv("AUTO_DAILY_DB_PATH", str(db_path))
+    monkeypatch.setenv("AUTO_DAILY_LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setenv("AUTO_DAILY_SUMMARIES_DIR", str(tmp_path / "summaries"))
+
+    mock_client = AsyncMock()
+    mock_client.generate.return_value = "summary"
+
+    with (
+        patch.object(auto_daily.report, "OllamaClient", return_value=mock_client),
+        patch.object(
+            auto_daily.report, "get_reports_dir", return_value=tmp_path / "reports"
+        ),
+    ):
+        import asyncio
+
+        asyncio.run(summarize_command("2024-12-24", 10))
+        summary_prompt = mock_client.generate.call_args.kwargs["prompt"]
+
+        (tmp_path / "summaries" / "2024-12-24" / "summary_10.md").unlink()
+        asyncio.run(report_command("2024-12-24"))
+        report_prompt = mock_client.generate.call_args.kwargs["prompt"]
+
+    assert "def store_test(): pass" in summary_prompt
+    assert "Code (Code window)" in report_prompt
+
+
+def test_import_command(tmp_path: Path, log_base: Path, capsys) -> None:
+    """Test that 'auto-daily import' imports a log tree into the database."""
+    import auto_daily
+
+    day_dir = log_base / "2024-12-24"
+    day_dir.mkdir()
+    (day_dir / "activity_09.jsonl").write_text(
+        json.dumps(_entry("2024-12-24T09:00:00", "Code")) + "\n"
+    )
+    db_path = tmp_path / "activity.db"
+
+    argv = ["auto-daily", "import", "--log-dir", str(log_base), "--db", str(db_path)]
+    with patch("sys.argv", argv):
+        auto_daily.main()
+
+    assert "Imported 1 entries from 1 files" in capsys.readouterr().out
+    with ActivityStore(db_path) as store:
+        assert store.get_hours(date(2024, 12, 24)) == [9]
@@ -105,3 +105,28 @@ def test_summary_file_format(tmp_path) -> None:
     summary_file = summaries_base / "2025-12-25" / "summary_14.md"
     assert summary_file.exists()
     assert summary_file.read_text() == content
+
+
+def test_report_prompt_with_merged_periods() -> None:
+    """Test that merged summaries are labeled with their whole period."""
+    from auto_daily.summarize import generate_daily_report_prompt_from_summaries
+
+    prompt = generate_daily_report_prompt_from_summaries(
+        {9: "午前の作業", 13: "午後の作業"}, end_hours={9: 12}
+    )
+
+    assert "## 09:00-12:00\n午前の作業" in prompt
+    assert "## 13:00-14:00\n午後の作業" in prompt
+
+
+def test_report_prompt_includes_time_table_with_summaries() -> None:
+    """Test that the time table is given with the summaries, not after the format."""
+    from auto_daily.summarize import generate_daily_report_prompt_from_summaries
+
+    table = "## 作業時間の内訳（ログから計測）\n| Code | 60分 |"
+    prompt = generate_daily_report_prompt_from_summaries(
+        {9: "午前の作業"}, time_table=table
+    )
+
+    assert prompt.index("午前の作業") < prompt.index(table)
+    assert prompt.index(table) < prompt.index("## 日報フォーマット")
@@ -0,0 +1,87 @@
+"""Tests for the time spent per application, window and Slack channel."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from auto_daily.log_decoder import LogRecord
+from auto_daily.time_accounting import compute_time_stats, load_activity
+
+
+def _entry(time: str, app_name: str, title: str, channel: str | None = None) -> dict:
+    return {
+        "timestamp": f"2024-12-24T{time}",
+        "window_info": {"app_name": app_name, "window_title": title},
+        "ocr_text": "",
+        "slack_context": {"channel": channel} if channel else None,
+    }
+
+
+ENTRIES = [
+    _entry("10:00:00", "Code", "main.py"),
+    _entry("10:00:30", "Code", "main.py"),
+    _entry("10:01:00", "Slack", "dev", channel="dev"),
+    {"timestamp": "2024-12-24T10:01:10", "type": "speech", "transcript": "はい"},
+    _entry("10:02:00", "Code", "test.py"),
+    # Screen locked for 40 minutes
+    _entry("10:42:00", "Code", "main.py"),
+    _entry("10:43:00", "Chrome", "Docs"),
+]
+
+
+def test_compute_time_stats() -> None:
+    """compute_time_stats should:
+    1. Credit each entry with the time until the next one
+    2. Not count pauses longer than the idle gap
+    3. Sum the time per app, window and Slack channel, longest first
+    4. Skip speech entries and sort entries given out of order
+    """
+    records = [LogRecord.from_entry(entry) for entry in reversed(ENTRIES)]
+    activity = load_activity(records)
+
+    stats = compute_time_stats(activity, idle_gap=300)
+
+    assert stats.entries == 6
+    assert stats.total == 180
+    assert stats.apps == [("Code", 120.0), ("Slack", 60.0)]
+    assert stats.windows[0] == (("Code", "main.py"), 120.0)
+    assert stats.channels == [("#dev", 60.0)]
+    table = stats.format_table(limit=1)
+    assert "合計: 3m（6 件のログ）" in table
+    assert "2m   67%  Code" in table
+    assert "（他 1 件）" in table
+
+
+def test_timezone_timestamps_fall_back_to_datetime() -> None:
+    """load_activity should parse timestamps with offsets and skip bad ones."""
+    entries = [
+        _entry("10:00:00+09:00", "Code", "main.py"),
+        _entry("not a time", "Code", "main.py"),
+        _entry("10:01:00+09:00", "Chrome", "Docs"),
+    ]
+    activity = load_activity(LogRecord.from_entry(entry) for entry in entries)
+
+    assert len(activity) == 2
+    assert compute_time_stats(activity, idle_gap=300).total == 60
+
+
+def test_stats_command(tmp_path: Path, monkeypatch, capsys) -> None:
+    """The stats command should print the time per app for a date."""
+    import auto_daily
+
+    date_dir = tmp_path / "2024-12-24"
+    date_dir.mkdir()
+    (date_dir / "activity_10.jsonl").write_text(
+        "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in ENTRIES)
+    )
+    monkeypatch.setenv("AUTO_DAILY_LOG_DIR", str(tmp_path))
+    monkeypatch.setenv("AUTO_DAILY_SESSION_GAP_MINUTES", "5")
+
+    with patch("sys.argv", ["auto-daily", "stats", "--date", "2024-12-24"]):
+        auto_daily.main()
+
+    output = capsys.readouterr().out
+    assert "Time spent: 2024-12-24" in output
+    assert "Code - main.py" in output
+    assert "#dev" in output
+    assert "Loaded 6 entries" in output
@@ -0,0 +1,154 @@
+"""Tests for trace recording and replay."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from auto_daily.trace import (
+    Trace,
+    TraceEvent,
+    TraceRecorder,
+    TraceReplayer,
+    load_trace,
+    replay_trace,
+)
+
+
+def _window(app_name: str, window_title: str = "") -> dict[str, str]:
+    return {"app_name": app_name, "window_title": window_title}
+
+
+class TestTraceRecorder:
+    """Test recording live sources to a trace file."""
+
+    def test_records_only_changes(self, tmp_path: Path) -> None:
+        """Verify repeated identical readings produce a single event."""
+        now = 100.0
+        path = tmp_path / "trace.jsonl"
+        recorder = TraceRecorder(path, clock=lambda: now)
+        windows = MagicMock()
+        state = MagicMock()
+        source = recorder.wrap_window_source(windows)
+        system = recorder.wrap_system_state(state)
+
+        windows.get_active_window.return_value = _window("Terminal", "zsh")
+        state.is_system_active.return_value = True
+        source.get_active_window()
+        system.is_system_active()
+        now = 101.0
+        source.get_active_window()
+        now = 105.5
+        windows.get_active_window.return_value = _window("Slack", "general")
+        assert source.get_active_window() == _window("Slack", "general")
+        state.is_system_active.return_value = False
+        system.is_system_active()
+        recorder.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert lines[0]["type"] == "meta"
+        assert [line["type"] for line in lines[1:]] == [
+            "window",
+            "system",
+            "window",
+            "system",
+        ]
+
+        trace = load_trace(path)
+        assert trace.duration == 5.5
+        assert trace.events[2] == TraceEvent(
+            5.5, "window", window=_window("Slack", "general")
+        )
+        assert trace.events[3].active is False
+
+    def test_rejects_unknown_header(self, tmp_path: Path) -> None:
+        """Verify files without a trace header are rejected."""
+        path = tmp_path / "trace.jsonl"
+        path.write_text('{"type": "window", "t": 0}\n')
+        with pytest.raises(ValueError):
+            load_trace(path)
+
+
+def _trace() -> Trace:
+    return Trace(
+        datetime(2024, 12, 24, 9, 0, 0),
+        [
+            TraceEvent(0.0, "window", window=_window("Terminal")),
+            TraceEvent(60.0, "window", window=_window("Browser")),
+            TraceEvent(60.3, "window", window=_window("Slack")),
+            TraceEvent(60.6, "window", window=_window("Browser")),
+            TraceEvent(120.0, "system", active=False),
+            TraceEvent(180.0, "system", active=True),
+            TraceEvent(240.0, "window", window=_window("Editor")),
+        ],
+    )
+
+
+class TestTraceReplayer:
+    """Test answering source queries from a trace."""
+
+    def test_state_at_virtual_time(self) -> None:
+        """Verify the replayer reports the window and lock state at a given time."""
+        replayer = TraceReplayer(_trace())
+
+        replayer.set_time(30.0)
+        assert replayer.get_active_window() == _window("Terminal")
+        assert replayer.is_system_active() is True
+
+        replayer.set_time(61.0)
+        assert replayer.get_active_window() == _window("Browser")
+        assert replayer.window_since() == datetime(2024, 12, 24, 9, 1, 0, 600000)
+
+        replayer.set_time(150.0)
+        assert replayer.is_system_active() is False
+        assert replayer.now() == datetime(2024, 12, 24, 9, 2, 30)
+
+
+class TestReplayTrace:
+    """Test replaying a trace into the real capture pipeline."""
+
+    def test_replay_drives_monitor_and_pipeline(self, tmp_path: Path) -> None:
+        """Verify window changes, periodic captures and lock gaps are replayed."""
+        from auto_daily.capture_pipeline import AsyncCapturePipeline
+        from auto_daily.screen_dedup import ScreenDeduplicator
+
+        backend = MagicMock()
+        backend.perform_ocr_buffer.return_value = "text"
+        pipeline = AsyncCapturePipeline(
+            ocr_workers=2,
+            queue_size=64,
+            backpressure="block",
+            ocr_backend=backend,
+            deduplicator=ScreenDeduplicator(mode="off"),
+            capture=lambda context: b"frame",
+        )
+
+        pipeline.start()
+        stats = replay_trace(
+            _trace(),
+            pipeline,
+            tmp_path,
+            speed=0,
+            poll_interval=0.1,
+            capture_interval=60.0,
+            settle_ms=1000,
+        )
+        pipeline.stop()
+
+        # Terminal→Browser and Browser→Editor; the Slack peek is suppressed
+        assert stats.window_changes == 2
+        assert stats.suppressed == 2
+        # Periodic captures at 0, 60, 180 and 240 s; 120 s is locked
+        assert stats.periodic_captures == 4
+        assert pipeline.stats.processed == 6
+
+        entries = [
+            json.loads(line)
+            for path in sorted(tmp_path.rglob("*.jsonl"))
+            for line in path.read_text().splitlines()
+        ]
+        assert len(entries) == 6
+        # Window changes are logged at the time the window became frontmost
+        assert "2024-12-24T09:01:00.600000" in [entry["timestamp"] for entry in entries]
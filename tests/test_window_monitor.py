@@ -87,3 +87,92 @@ def test_background_monitoring():
     call_args = callback.call_args[0]
     assert call_args[0] == {"app_name": "App1", "window_title": "Title1"}
     assert call_args[1] == {"app_name": "App2", "window_title": "Title2"}
+
+
+def test_get_active_window_bounds():
+    """AppleScript の出力からアクティブウィンドウの位置とサイズを取得できる。"""
+    from auto_daily.window_monitor import get_active_window_bounds
+
+    with patch(
+        "auto_daily.window_monitor.subprocess.run",
+        return_value=MagicMock(stdout="10,25,1280,800\n"),
+    ):
+        assert get_active_window_bounds() == (10, 25, 1280, 800)
+
+    # ウィンドウがない場合は None
+    with patch(
+        "auto_daily.window_monitor.subprocess.run",
+        return_value=MagicMock(stdout="\n"),
+    ):
+        assert get_active_window_bounds() is None
+
+
+def test_window_change_waits_for_settle_time():
+    """新しいウィンドウが settle 時間だけ前面に留まってからイベントを発火する。"""
+    callback = MagicMock()
+    now = 0.0
+    monitor = WindowMonitor(on_window_change=callback, settle_ms=500, clock=lambda: now)
+    window_a = {"app_name": "App1", "window_title": "Title1"}
+    window_b = {"app_name": "App2", "window_title": "Title2"}
+
+    monitor._check_window_change(window_a)
+    monitor._check_window_change(window_b)
+    callback.assert_not_called()
+
+    now = 0.6
+    monitor._check_window_change(window_b)
+    callback.assert_called_once_with(window_a, window_b)
+    assert monitor.current_window_since is not None
+    assert monitor.suppressed_count == 0
+
+
+def test_rapid_window_switches_are_suppressed():
+    """A→B→A や素早い切り替えはまとめられ、抑制数がカウントされる。"""
+    callback = MagicMock()
+    now = 0.0
+    monitor = WindowMonitor(on_window_change=callback, settle_ms=500, clock=lambda: now)
+    window_a = {"app_name": "App1", "window_title": "Title1"}
+    window_b = {"app_name": "App2", "window_title": "Title2"}
+    window_c = {"app_name": "App3", "window_title": "Title3"}
+
+    monitor._check_window_change(window_a)
+
+    # A→B→A: B は settle 前に離れたので発火しない
+    now = 0.1
+    monitor._check_window_change(window_b)
+    now = 0.2
+    monitor._check_window_change(window_a)
+    assert monitor.suppressed_count == 1
+
+    # A→B→C: 途中の B は抑制され、C だけが発火する
+    now = 0.3
+    monitor._check_window_change(window_b)
+    now = 0.4
+    monitor._check_window_change(window_c)
+    now = 1.0
+    monitor._check_window_change(window_c)
+
+    callback.assert_called_once_with(window_a, window_c)
+    assert monitor.suppressed_count == 2
+
+
+def test_monitor_reads_from_window_source():
+    """WindowSource を渡すと、そのソースからアクティブウィンドウを取得する。"""
+    callback = MagicMock()
+    source = MagicMock()
+    source.get_active_window.side_effect = [
+        {"app_name": "App1", "window_title": "Title1"},
+        {"app_name": "App2", "window_title": "Title2"},
+    ] + [{"app_name": "App2", "window_title": "Title2"}] * 100
+
+    with (
+        patch("auto_daily.window_monitor.get_active_window") as mock_get_window,
+        patch("auto_daily.window_monitor.is_system_active", return_value=True),
+    ):
+        monitor = WindowMonitor(on_window_change=callback, source=source)
+        monitor.start(interval=0.01)
+        time.sleep(0.2)
+        monitor.stop()
+
+    mock_get_window.assert_not_called()
+    assert callback.call_count == 1
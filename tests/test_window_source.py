@@ -0,0 +1,198 @@
+"""Tests for window_source module."""
+
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from auto_daily.window_source import (
+    AppleScriptWindowSource,
+    HelperWindowSource,
+    WindowSource,
+    get_window_source,
+    parse_window_bounds,
+    parse_window_line,
+)
+
+# 偽のヘルパー: 2 行出力したあと待機し続ける
+FAKE_HELPER = """
+import json, sys, time
+print(json.dumps(["Terminal", "zsh", None]), flush=True)
+print(json.dumps(["Slack", "general", None]), flush=True)
+time.sleep(60)
+"""
+
+# ウィンドウの位置とサイズも出力する偽のヘルパー
+BOUNDS_HELPER = """
+import json, time
+print(json.dumps(["Editor", "main.py", [10, 25, 1280, 800]]), flush=True)
+time.sleep(60)
+"""
+
+# 不正な行のあとに改行を含むタイトルを出力する偽のヘルパー
+MULTILINE_HELPER = """
+import json, time
+print("not json", flush=True)
+print(json.dumps(["Safari", "Release notes\\nVersion 2", None]), flush=True)
+time.sleep(60)
+"""
+
+# 1 行出力して間もなく終了する偽のヘルパー（クラッシュを模擬）
+CRASHING_HELPER = """
+import json, time
+print(json.dumps(["Editor", "main.py", None]), flush=True)
+time.sleep(0.3)
+"""
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> bool:
+    """Poll until predicate() is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_parse_window_line():
+    """JSON 形式の行をウィンドウ情報に変換できる。"""
+    assert parse_window_line('["Slack", "general | Workspace", null]\n') == {
+        "app_name": "Slack",
+        "window_title": "general | Workspace",
+    }
+    assert parse_window_line('["Finder", "", null]\n') == {
+        "app_name": "Finder",
+        "window_title": "",
+    }
+    assert parse_window_line('["Editor", "a|||b", [10, 25, 1280, 800]]\n') == {
+        "app_name": "Editor",
+        "window_title": "a|||b",
+    }
+    with pytest.raises(ValueError):
+        parse_window_line("Finder|||\n")
+
+
+def test_parse_window_bounds():
+    """レコードの [x, y, width, height] を取り出し、無い・不正な場合は None を返す。"""
+    assert parse_window_bounds('["Editor", "main.py", [10, 25, 1280, 800]]') == (
+        10,
+        25,
+        1280,
+        800,
+    )
+    assert parse_window_bounds('["Editor", "main.py", [-5, 0, 640.5, 480]]') == (
+        -5,
+        0,
+        640,
+        480,
+    )
+    assert parse_window_bounds('["Finder", "", null]') is None
+    assert parse_window_bounds('["Finder", ""]') is None
+    assert parse_window_bounds('["Editor", "main.py", [10, 25, 0, 800]]') is None
+
+
+def test_sources_implement_protocol():
+    """AppleScript とヘルパーの両方が WindowSource プロトコルを満たす。"""
+    assert isinstance(AppleScriptWindowSource(), WindowSource)
+    assert isinstance(HelperWindowSource(command=["true"]), WindowSource)
+
+
+def test_helper_streams_latest_window():
+    """ヘルパープロセスの最新の出力をプロセスを起動せずに返す。"""
+    source = HelperWindowSource(command=[sys.executable, "-c", FAKE_HELPER])
+    try:
+        assert _wait_until(lambda: source.get_active_window()["app_name"] == "Slack")
+        assert source.get_active_window() == {
+            "app_name": "Slack",
+            "window_title": "general",
+        }
+        assert source.restarts == 0
+    finally:
+        source.close()
+
+
+def test_helper_reports_window_bounds():
+    """切り抜き用のウィンドウ範囲をヘルパーの出力から osascript なしで返す。"""
+    bounds_fallback = MagicMock(return_value=(0, 0, 1, 1))
+    source = HelperWindowSource(
+        command=[sys.executable, "-c", BOUNDS_HELPER],
+        bounds_fallback=bounds_fallback,
+    )
+    try:
+        assert source.get_active_window()["app_name"] == "Editor"
+        assert source.get_active_window_bounds() == (10, 25, 1280, 800)
+        bounds_fallback.assert_not_called()
+    finally:
+        source.close()
+
+
+def test_helper_keeps_multiline_titles_in_one_record():
+    """改行を含むタイトルを 1 つのウィンドウとして扱い、不正な行は読み飛ばす。"""
+    source = HelperWindowSource(command=[sys.executable, "-c", MULTILINE_HELPER])
+    try:
+        assert _wait_until(lambda: source.get_active_window()["app_name"] == "Safari")
+        assert source.get_active_window() == {
+            "app_name": "Safari",
+            "window_title": "Release notes\nVersion 2",
+        }
+    finally:
+        source.close()
+
+
+def test_helper_restarts_after_crash():
+    """ヘルパーが終了すると自動的に再起動する。"""
+    source = HelperWindowSource(
+        command=[sys.executable, "-c", CRASHING_HELPER], restart_delay=0.01
+    )
+    try:
+        assert source.get_active_window() == {
+            "app_name": "Editor",
+            "window_title": "main.py",
+        }
+        assert _wait_until(lambda: source.restarts >= 2)
+    finally:
+        source.close()
+
+
+def test_helper_forgets_window_after_crash():
+    """ヘルパーの終了後、再起動を待つ間は古いウィンドウではなくフォールバックを返す。"""
+    fallback = {"app_name": "Fallback", "window_title": ""}
+    source = HelperWindowSource(
+        command=[sys.executable, "-c", CRASHING_HELPER],
+        fallback=lambda: fallback,
+        restart_delay=30.0,
+    )
+    try:
+        assert source.get_active_window()["app_name"] == "Editor"
+        assert _wait_until(lambda: source.restarts >= 1)
+        assert source.get_active_window() == fallback
+    finally:
+        source.close()
+
+
+def test_helper_falls_back_when_unavailable():
+    """ヘルパーを起動できない場合はフォールバックを使う。"""
+    fallback = {"app_name": "Fallback", "window_title": ""}
+    source = HelperWindowSource(
+        command=["/nonexistent/window-helper"],
+        fallback=lambda: fallback,
+        startup_timeout=0.05,
+        restart_delay=0.01,
+        bounds_fallback=lambda: (0, 25, 800, 500),
+    )
+    try:
+        assert source.get_active_window() == fallback
+        assert source.get_active_window_bounds() == (0, 25, 800, 500)
+    finally:
+        source.close()
+
+
+def test_get_window_source_factory():
+    """AUTO_DAILY_WINDOW_SOURCE に応じたソースを返し、不明な値はエラーにする。"""
+    with patch.dict("os.environ", {"AUTO_DAILY_WINDOW_SOURCE": "applescript"}):
+        assert isinstance(get_window_source(), AppleScriptWindowSource)
+    assert isinstance(get_window_source("helper"), HelperWindowSource)
+    with pytest.raises(ValueError):
+        get_window_source("unknown")